@@ -9,6 +9,7 @@ echo ============================================================
 echo.
 echo Starting continuous monitoring system...
 echo This will:
+echo   - Collect watchlist data and scan for signals continuously
 echo   - Update data every hour
 echo   - Run dashboard analysis 3x daily ^(8am, 2pm, 8pm^)
 echo   - Perform daily data collection at 6am
@@ -17,6 +18,6 @@ echo Press Ctrl+C to stop
 echo.
 echo ============================================================
 
-python auto_updater.py
+python orchestrator.py
 
 pause
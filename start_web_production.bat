@@ -0,0 +1,18 @@
+@echo off
+echo ========================================
+echo Wind Catcher ^& River Turn - Web Interface (Production)
+echo ========================================
+echo.
+
+cd "c:\Users\peter\wind and river\trading_system\web"
+
+echo Starting production web server (waitress)...
+echo Open browser to: http://localhost:5000
+echo.
+echo Press Ctrl+C to stop the server
+echo ========================================
+echo.
+
+..\venv\Scripts\python.exe serve.py
+
+pause
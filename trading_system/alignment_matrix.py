@@ -0,0 +1,231 @@
+"""
+Multi-Timeframe Alignment Matrix for Wind Catcher & River Turn System
+Computes the symbol x timeframe Hull 21 trend/signal grid once and shares it
+between the CLI dashboard and the web interface
+
+Each cell is computed from the last 100 candles exactly like the dashboard's
+per-timeframe analysis. Symbols are processed in parallel, and the finished
+matrix is cached until the next candle close of its shortest timeframe.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from db_pool import ConnectionPool
+from utils import DATABASE_FILE, get_current_timestamp, next_candle_close
+
+# Candles loaded per symbol/timeframe and minimum needed for a cell
+CANDLE_LIMIT = 100
+MIN_CANDLES = 50
+HULL_PERIOD = 21
+
+# Timeframes agreeing on a trend before a symbol counts as aligned
+MIN_ALIGNED = 4
+
+_cache = {}
+_cache_lock = threading.Lock()
+_default_pool = None
+
+
+def _get_default_pool():
+    """Shared read-only pool used when the caller doesn't pass one"""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = ConnectionPool(DATABASE_FILE, size=8, read_only=True, row_factory=None)
+    return _default_pool
+
+
+def calculate_wma_values(values, period):
+    """
+    Weighted Moving Average over a numpy array
+
+    Same result as the dashboard's calculate_wma: NaN until `period` values
+    are available, and NaN for any window containing a NaN.
+
+    Args:
+        values (np.ndarray): Input values
+        period (int): WMA period
+
+    Returns:
+        np.ndarray: WMA values aligned with the input
+    """
+    result = np.full(len(values), np.nan)
+    if period <= 0 or len(values) < period:
+        return result
+
+    weights = np.arange(1, period + 1, dtype=float)
+    # convolve flips the kernel, so reverse it to weight the newest value highest
+    result[period - 1:] = np.convolve(values, weights[::-1], mode='valid') / weights.sum()
+    return result
+
+
+def calculate_hull_ma_values(values, period):
+    """
+    Hull Moving Average over a numpy array (see trading_dashboard.calculate_hull_ma)
+
+    Args:
+        values (np.ndarray): Close prices
+        period (int): Hull period
+
+    Returns:
+        np.ndarray: Hull MA values aligned with the input
+    """
+    if len(values) < period:
+        return np.full(len(values), np.nan)
+
+    wma_half = calculate_wma_values(values, int(period / 2))
+    wma_full = calculate_wma_values(values, period)
+    return calculate_wma_values(2 * wma_half - wma_full, int(np.sqrt(period)))
+
+
+def analyze_timeframe_cell(conn, symbol, timeframe):
+    """
+    Compute one matrix cell: Hull 21 trend and fresh break on the latest candle
+
+    Args:
+        conn (sqlite3.Connection): Database connection
+        symbol (str): Trading pair symbol
+        timeframe (str): Timeframe to analyze
+
+    Returns:
+        dict: timeframe, price, hull_21, trend, signal, timestamp (None if not enough data)
+    """
+    rows = conn.execute('''
+        SELECT timestamp, close
+        FROM price_data
+        WHERE symbol = ? AND timeframe = ?
+        ORDER BY timestamp DESC
+        LIMIT ?
+    ''', (symbol, timeframe, CANDLE_LIMIT)).fetchall()
+
+    if len(rows) < MIN_CANDLES:
+        return None
+
+    rows.reverse()
+    close = np.array([row[1] for row in rows], dtype=float)
+    hull = calculate_hull_ma_values(close, HULL_PERIOD)
+
+    latest_close, prev_close = close[-1], close[-2]
+    latest_hull, prev_hull = hull[-1], hull[-2]
+
+    signal_type = None
+    if not np.isnan(latest_hull) and not np.isnan(prev_hull):
+        if latest_close > latest_hull and prev_close <= prev_hull:
+            signal_type = 'BULLISH'
+        elif latest_close < latest_hull and prev_close >= prev_hull:
+            signal_type = 'BEARISH'
+
+    return {
+        'timeframe': timeframe,
+        'price': float(latest_close),
+        'hull_21': None if np.isnan(latest_hull) else float(latest_hull),
+        'trend': "BULLISH" if latest_close > latest_hull else "BEARISH",
+        'signal': signal_type,
+        'timestamp': int(rows[-1][0])
+    }
+
+
+def _analyze_symbol(pool, symbol, timeframes):
+    """Compute every timeframe cell for one symbol on a pooled connection"""
+    with pool.connection() as conn:
+        return {tf: analyze_timeframe_cell(conn, symbol, tf) for tf in timeframes}
+
+
+def find_alignments(cells, timeframes, min_aligned=MIN_ALIGNED):
+    """
+    List symbols whose Hull trend agrees across at least `min_aligned` timeframes
+
+    Args:
+        cells (dict): {symbol: {timeframe: cell}} from build_alignment_matrix
+        timeframes (list): Timeframes in the matrix
+        min_aligned (int): Agreeing timeframes required
+
+    Returns:
+        list: Dicts with symbol, direction, count
+    """
+    alignments = []
+
+    for symbol, row in cells.items():
+        bullish_count = sum(1 for tf in timeframes if row.get(tf) and row[tf]['trend'] == 'BULLISH')
+        bearish_count = sum(1 for tf in timeframes if row.get(tf) and row[tf]['trend'] == 'BEARISH')
+
+        if bullish_count >= min_aligned:
+            alignments.append({'symbol': symbol, 'direction': 'BULLISH', 'count': bullish_count})
+        elif bearish_count >= min_aligned:
+            alignments.append({'symbol': symbol, 'direction': 'BEARISH', 'count': bearish_count})
+
+    return alignments
+
+
+def build_alignment_matrix(symbols, timeframes, pool=None, max_workers=8, settle_seconds=60):
+    """
+    Compute the symbol x timeframe grid, in parallel across symbols
+
+    Args:
+        symbols (list): Symbols (rows)
+        timeframes (list): Timeframes (columns)
+        pool (ConnectionPool): Read pool to use (one connection per worker thread)
+        max_workers (int): Worker threads
+        settle_seconds (int): Time after a candle close for the collector to store it
+
+    Returns:
+        dict: symbols, timeframes, cells, alignments, generated_at, expires_at
+    """
+    pool = pool or _get_default_pool()
+    symbols = list(symbols)
+    timeframes = list(timeframes)
+    now = get_current_timestamp()
+
+    workers = max(1, min(max_workers, len(symbols)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='alignment') as executor:
+        rows = list(executor.map(lambda symbol: _analyze_symbol(pool, symbol, timeframes), symbols))
+
+    cells = dict(zip(symbols, rows))
+
+    # Valid until the shortest timeframe's next close has been collected
+    expires_at = min(
+        (next_candle_close(tf, now - settle_seconds) + settle_seconds for tf in timeframes),
+        default=now
+    )
+
+    return {
+        'symbols': symbols,
+        'timeframes': timeframes,
+        'cells': cells,
+        'alignments': find_alignments(cells, timeframes),
+        'generated_at': now,
+        'expires_at': expires_at
+    }
+
+
+def get_alignment_matrix(symbols, timeframes, pool=None, refresh=False, **kwargs):
+    """
+    Cached build_alignment_matrix - rebuilt only after the next candle close
+
+    Args:
+        symbols (list): Symbols (rows)
+        timeframes (list): Timeframes (columns)
+        pool (ConnectionPool): Read pool to use
+        refresh (bool): Ignore any cached matrix
+        **kwargs: Passed to build_alignment_matrix
+
+    Returns:
+        dict: Matrix (see build_alignment_matrix)
+    """
+    key = (tuple(symbols), tuple(timeframes))
+
+    # Held while building so concurrent callers wait for one computation
+    with _cache_lock:
+        now = get_current_timestamp()
+        matrix = _cache.get(key)
+        if refresh or matrix is None or now >= matrix['expires_at']:
+            matrix = build_alignment_matrix(symbols, timeframes, pool=pool, **kwargs)
+
+            # Drop other expired matrices (watchlist changes leave old keys behind)
+            for stale in [k for k, m in _cache.items() if now >= m['expires_at']]:
+                del _cache[stale]
+            _cache[key] = matrix
+
+    return matrix
@@ -8,6 +8,9 @@ import numpy as np
 import sqlite3
 import yaml
 from datetime import datetime
+from utils import timeframe_to_seconds
+from indicator_engine import IndicatorEngine, median_price, sma
+from indicator_kernels import STATE_CODES, confirmed_transition
 
 def load_config():
     """Load configuration"""
@@ -37,24 +40,43 @@ def get_price_data(conn, symbol, timeframe='1h', limit=200):
     df['datetime'] = pd.to_datetime(df['timestamp'], unit='s')
     return df
 
+def data_requirements(timeframe='1h'):
+    """
+    Candles analyze_symbol_alligator needs (collected by lookback_planner.py)
+
+    The jaw (SMA 130) is the slowest line and states start at candle 130;
+    transitions look at the last 10 states. Retracement events are looked
+    for over the last 20 candles, each compared with the candle before, but
+    only kept when they're at most 10 hours old.
+
+    Args:
+        timeframe (str): Candle timeframe
+
+    Returns:
+        dict: min_bars (fewer and there is no analysis) and window (candles
+              loaded - older ones don't change the latest candle's signals)
+    """
+    event_candles = 10 * 3600 // timeframe_to_seconds(timeframe)
+    lookback = min(20, event_candles + 1)
+    window = max(130 + 10, 130 + lookback)
+    return {'min_bars': window, 'window': window}
+
+def indicator_nodes(multiplier=10):
+    """Indicator engine nodes the Alligator reads (jaw, teeth and lips SMAs of the median price)"""
+    return [sma(median_price(), period * multiplier) for period in (13, 8, 5)]
+
 def calculate_sma(prices, period):
     """Calculate Simple Moving Average"""
     return prices.rolling(window=period, min_periods=period).mean()
 
-def calculate_modified_alligator(df, multiplier=10):
-    """Calculate Modified Alligator with 10x multiplier"""
+def calculate_modified_alligator(df, multiplier=10, engine=None):
+    """Calculate Modified Alligator with 10x multiplier (jaw 130, teeth 80, lips 50)"""
     if len(df) < 130:
         return None, None, None
     
-    jaw_period = 13 * multiplier     # 130
-    teeth_period = 8 * multiplier    # 80
-    lips_period = 5 * multiplier     # 50
-    
-    median_price = (df['high'] + df['low']) / 2
-    
-    jaw = calculate_sma(median_price, jaw_period)
-    teeth = calculate_sma(median_price, teeth_period)
-    lips = calculate_sma(median_price, lips_period)
+    # SMAs of the median price - shared with AO when the engine is
+    engine = engine or IndicatorEngine(df)
+    jaw, teeth, lips = engine.evaluate(*indicator_nodes(multiplier))
     
     return jaw, teeth, lips
 
@@ -89,55 +111,34 @@ def detect_state_transitions(states, timestamps, lookback=10):
     recent_states = states[-lookback:]
     recent_timestamps = timestamps[-lookback:]
     
-    transitions = []
-    
-    for i in range(1, len(recent_states)):
-        prev_state = recent_states[i-1]
-        curr_state = recent_states[i]
-        transition_time = recent_timestamps[i]
-        
-        if prev_state == 'awake' and curr_state == 'sleeping':
-            confirmed = True
-            check_periods = min(3, len(recent_states) - i - 1)
-            for j in range(1, check_periods + 1):
-                if i + j < len(recent_states) and recent_states[i + j] != 'sleeping':
-                    confirmed = False
-                    break
-            
-            if confirmed:
-                hours_ago = (recent_timestamps[-1] - transition_time) / 3600
-                transitions.append({
-                    'type': 'awake_to_sleeping',
-                    'description': 'Market entered consolidation phase',
-                    'strength': 0.6,
-                    'significance': 'medium',
-                    'trigger_timestamp': transition_time,
-                    'hours_ago': hours_ago
-                })
-        
-        elif prev_state == 'sleeping' and curr_state == 'awake':
-            confirmed = True
-            check_periods = min(3, len(recent_states) - i - 1)
-            for j in range(1, check_periods + 1):
-                if i + j < len(recent_states) and recent_states[i + j] != 'awake':
-                    confirmed = False
-                    break
-            
-            if confirmed:
-                hours_ago = (recent_timestamps[-1] - transition_time) / 3600
-                transitions.append({
-                    'type': 'sleeping_to_awake',
-                    'description': 'Market broke out of consolidation',
-                    'strength': 0.7,
-                    'significance': 'high',
-                    'trigger_timestamp': transition_time,
-                    'hours_ago': hours_ago
-                })
-    
-    if transitions:
-        return [transitions[-1]]
+    # Latest sleeping <-> awake change held for up to 3 more states
+    # (see indicator_kernels.confirmed_transition)
+    codes = np.array([STATE_CODES.get(state, 0) for state in recent_states], dtype=np.int64)
+    i = confirmed_transition(codes, 3)
+    if i < 0:
+        return []
     
-    return transitions
+    transition_time = recent_timestamps[i]
+    hours_ago = (recent_timestamps[-1] - transition_time) / 3600
+    
+    if recent_states[i] == 'sleeping':
+        return [{
+            'type': 'awake_to_sleeping',
+            'description': 'Market entered consolidation phase',
+            'strength': 0.6,
+            'significance': 'medium',
+            'trigger_timestamp': transition_time,
+            'hours_ago': hours_ago
+        }]
+    
+    return [{
+        'type': 'sleeping_to_awake',
+        'description': 'Market broke out of consolidation',
+        'strength': 0.7,
+        'significance': 'high',
+        'trigger_timestamp': transition_time,
+        'hours_ago': hours_ago
+    }]
 
 def determine_price_zone(price, jaw, teeth, lips, trend_direction):
     """Determine which zone price is in relative to Alligator lines"""
@@ -245,13 +246,23 @@ def analyze_retracement_history(df, jaw, teeth, lips, trend_direction, lookback=
     
     return recent_events
 
-def analyze_symbol_alligator(conn, symbol, timeframe='1h'):
-    """Complete Alligator analysis for a symbol"""
-    df = get_price_data(conn, symbol, timeframe=timeframe, limit=200)
-    if df is None or len(df) < 150:
+def analyze_symbol_alligator(conn, symbol, timeframe='1h', engine=None):
+    """
+    Complete Alligator analysis for a symbol
+
+    engine: IndicatorEngine over candles the caller already loaded (shares
+    its indicators with the caller's other analyzers) - read from the
+    database if None
+    """
+    requirements = data_requirements(timeframe)
+    if engine is None:
+        df = get_price_data(conn, symbol, timeframe=timeframe, limit=requirements['window'])
+    else:
+        df = engine.frame.copy()
+    if df is None or len(df) < requirements['min_bars']:
         return None
     
-    jaw, teeth, lips = calculate_modified_alligator(df, multiplier=10)
+    jaw, teeth, lips = calculate_modified_alligator(df, multiplier=10, engine=engine)
     if jaw is None:
         return None
     
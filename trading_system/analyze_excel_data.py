@@ -1,6 +1,11 @@
 """
 Analyze Historical Trading Data from Excel
 Loads data from TRADING_DATA_REPORT.xlsx and runs all indicators to generate signals
+
+Usage:
+    python analyze_excel_data.py                # latest candle of every symbol/timeframe
+    python analyze_excel_data.py --history      # every bar reaching the threshold (history_signals.py)
+    python analyze_excel_data.py --history --min-score 1.8 --output ../doc/signals.csv
 """
 
 import sys
@@ -15,16 +20,20 @@ if sys.platform == 'win32':
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
         sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
+import argparse
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
 from openpyxl import load_workbook
 from utils import connect_to_database
 from master_confluence import analyze_master_confluence
+from parameter_sweep import load_candles
+from history_signals import default_min_score, write_history_signals, print_progress, print_summary
 
 # Configuration
 INPUT_FILE = Path('../doc/TRADING_DATA_REPORT.xlsx')
 OUTPUT_FILE = Path('../doc/SIGNALS_FROM_HISTORICAL_DATA.xlsx')
+HISTORY_OUTPUT_FILE = Path('../doc/HISTORY_SIGNALS_FROM_HISTORICAL_DATA.xlsx')
 
 def load_excel_data():
     """
@@ -226,6 +235,44 @@ def generate_signals_from_db():
 
     return all_signals
 
+def generate_history_signals_from_db(symbols=None, output=HISTORY_OUTPUT_FILE, min_score=None, workers=0):
+    """
+    Score every bar of every symbol/timeframe combination in the database
+    and stream the signals to a file
+
+    Unlike generate_signals_from_db, which scores the latest candle of each
+    combination, every bar reaching min_score is written (see
+    history_signals.py) - the combinations are scored in parallel.
+
+    Args:
+        symbols (list): Only these symbols (default: every stored one)
+        output (Path): .xlsx or .csv file
+        min_score (float): Lowest score written (default: confluence.min_score_display)
+        workers (int): Worker processes (0 = one per CPU)
+
+    Returns:
+        SignalWriter: The closed writer, None without data
+    """
+    print("\n🔍 Scoring every bar of the loaded data...")
+    print("=" * 80)
+
+    min_score = min_score if min_score is not None else default_min_score()
+
+    conn = connect_to_database()
+    try:
+        candles = load_candles(conn, symbols=symbols)
+    finally:
+        conn.close()
+
+    if not candles:
+        print("❌ No symbol/timeframe has enough candles to score")
+        return None
+
+    print(f"\nFound {len(candles)} symbol/timeframe combinations, writing every bar scoring {min_score}+\n")
+    writer = write_history_signals(candles, output, min_score=min_score, workers=workers, progress=print_progress)
+    print_summary(writer)
+    return writer
+
 def export_signals_to_excel(signals):
     """
     Export signals to Excel with multiple sheets for easy analysis
@@ -318,10 +365,18 @@ def export_signals_to_excel(signals):
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description="Generate signals from the historical trading data report")
+    parser.add_argument('--history', action='store_true', help="Every bar reaching the threshold, not just the latest")
+    parser.add_argument('--min-score', type=float, help="Lowest score written with --history (default: confluence.min_score_display)")
+    parser.add_argument('--workers', type=int, default=0, help="Worker processes with --history (0 = one per CPU)")
+    parser.add_argument('--output', type=Path, help=f"Output .xlsx or .csv with --history (default: {HISTORY_OUTPUT_FILE})")
+    args = parser.parse_args()
+    output = (args.output or HISTORY_OUTPUT_FILE) if args.history else OUTPUT_FILE
+
     print("🚀 Historical Trading Data Signal Analyzer")
     print("=" * 80)
     print(f"📋 Input:  {INPUT_FILE}")
-    print(f"📋 Output: {OUTPUT_FILE}")
+    print(f"📋 Output: {output}")
     print("=" * 80)
 
     # Step 1: Load Excel data
@@ -336,6 +391,14 @@ def main():
     print("\n🔄 STEP 2: Load Data into Database")
     clear_and_load_data_to_db(data_by_symbol)
 
+    if args.history:
+        # Step 3: Score every bar, streaming the signals to the output
+        print("\n🔄 STEP 3: Generate Signals from Every Bar")
+        writer = generate_history_signals_from_db(output=output, min_score=args.min_score, workers=args.workers)
+        if writer:
+            print(f"📊 Open the file: {output}")
+        return
+
     # Step 3: Generate signals using master confluence system
     print("\n🔄 STEP 3: Generate Signals")
     signals = generate_signals_from_db()
@@ -10,7 +10,7 @@ from datetime import datetime, timedelta
 from utils import (
     load_config, connect_to_database, validate_ohlcv_data,
     normalize_timestamp, get_current_timestamp, log_message,
-    get_python_executable, TRADING_SYSTEM_DIR
+    get_python_executable, update_pair_freshness, TRADING_SYSTEM_DIR
 )
 from hyperliquid_connector import connect_to_hyperliquid
 
@@ -56,6 +56,7 @@ def update_price_data(connector, conn, symbol, timeframe='1h', limit=5):
         cursor = conn.cursor()
         stored_count = 0
         skipped_count = 0
+        latest_timestamp = 0
         current_time = get_current_timestamp()
 
         for candle in ohlcv_data:
@@ -79,6 +80,7 @@ def update_price_data(connector, conn, symbol, timeframe='1h', limit=5):
                       low_price, close_price, volume, current_time))
 
                 stored_count += 1
+                latest_timestamp = max(latest_timestamp, timestamp)
 
             except ValueError as e:
                 skipped_count += 1
@@ -86,6 +88,9 @@ def update_price_data(connector, conn, symbol, timeframe='1h', limit=5):
             except Exception as e:
                 log_message(f"Error storing {symbol}: {e}", "ERROR")
 
+        if stored_count > 0:
+            update_pair_freshness(cursor, symbol, timeframe, latest_timestamp)
+
         conn.commit()
 
         if skipped_count > 0:
@@ -133,14 +138,22 @@ def check_for_new_signals(conn):
     finally:
         cursor.close()
 
-def daily_data_collection():
-    """Comprehensive daily data collection"""
+def daily_data_collection(connector=None, conn=None):
+    """
+    Comprehensive daily data collection
+
+    Args:
+        connector: Exchange connector to reuse (connects if None)
+        conn: Database connection to reuse (opened and closed here if None)
+    """
     log_message("🌅 Starting daily data collection", "INFO")
 
+    owns_conn = conn is None
     try:
-        config = load_config()
-        connector = connect_to_exchange(config)
-        conn = connect_to_database()
+        if connector is None:
+            connector = connect_to_exchange(load_config())
+        if owns_conn:
+            conn = connect_to_database()
     except Exception as e:
         log_message(f"❌ Setup failed: {e}", "ERROR")
         return
@@ -162,17 +175,26 @@ def daily_data_collection():
     # Check for signals
     signal_count = check_for_new_signals(conn)
 
-    conn.close()
+    if owns_conn:
+        conn.close()
     return total_collected
 
-def hourly_update():
-    """Quick hourly update"""
+def hourly_update(connector=None, conn=None):
+    """
+    Quick hourly update
+
+    Args:
+        connector: Exchange connector to reuse (connects if None)
+        conn: Database connection to reuse (opened and closed here if None)
+    """
     log_message("🔄 Hourly update starting", "INFO")
 
+    owns_conn = conn is None
     try:
-        config = load_config()
-        connector = connect_to_exchange(config)
-        conn = connect_to_database()
+        if connector is None:
+            connector = connect_to_exchange(load_config())
+        if owns_conn:
+            conn = connect_to_database()
     except Exception as e:
         log_message(f"❌ Hourly update setup failed: {e}", "ERROR")
         return
@@ -194,7 +216,8 @@ def hourly_update():
     # Check for new signals
     signal_count = check_for_new_signals(conn)
 
-    conn.close()
+    if owns_conn:
+        conn.close()
 
 def run_trading_dashboard():
     """Run the complete trading dashboard"""
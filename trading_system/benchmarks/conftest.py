@@ -0,0 +1,109 @@
+"""
+Benchmark Suite Configuration
+pytest-benchmark fixtures shared by the indicator and confluence benchmarks
+
+Usage (from the trading_system directory):
+    pip install -r benchmarks/requirements.txt
+    python -m pytest benchmarks                          # 200 and 10k bars
+    python -m pytest benchmarks --bench-large            # also 1M bars (slow)
+    python -m pytest benchmarks --benchmark-autosave     # save a baseline
+    python -m pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:20%
+
+Saved runs live in .benchmarks/; comparing against the last saved run fails
+the session when any benchmark's mean gets more than 20% slower.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Import trading_system modules and the synthetic data helpers
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + '/..')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_data import generate_candles, create_price_database
+
+SMALL_BARS = 200
+MEDIUM_BARS = 10_000
+LARGE_BARS = 1_000_000
+
+# Rounds for the 1M-bar runs (the loop-based indicators take many seconds per call)
+LARGE_ROUNDS = 1
+
+
+def pytest_addoption(parser):
+    parser.addoption('--bench-large', action='store_true', default=False,
+                     help="Also run the 1M-bar benchmarks")
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', "large: 1M-bar benchmark, only run with --bench-large")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--bench-large'):
+        return
+
+    skip_large = pytest.mark.skip(reason="1M-bar benchmark (run with --bench-large)")
+    for item in items:
+        if 'large' in item.keywords:
+            item.add_marker(skip_large)
+
+
+def bar_sizes():
+    """Parametrize values for the 200 / 10k / 1M bar benchmarks"""
+    return [
+        SMALL_BARS,
+        MEDIUM_BARS,
+        pytest.param(LARGE_BARS, marks=pytest.mark.large, id=str(LARGE_BARS))
+    ]
+
+
+_candle_cache = {}
+
+
+@pytest.fixture(scope='session')
+def make_candles():
+    """Factory returning cached synthetic candles: make_candles(n_bars, seed=42)"""
+    def factory(n_bars, seed=42):
+        key = (n_bars, seed)
+        if key not in _candle_cache:
+            _candle_cache[key] = generate_candles(n_bars, seed=seed)
+        return _candle_cache[key]
+    return factory
+
+
+@pytest.fixture(scope='session')
+def make_price_database(make_candles):
+    """Factory returning a cached in-memory price_data database with one BTC/1h series"""
+    databases = {}
+
+    def factory(n_bars, symbol='BTC', timeframe='1h'):
+        key = (n_bars, symbol, timeframe)
+        if key not in databases:
+            databases[key] = create_price_database({(symbol, timeframe): make_candles(n_bars)})
+        return databases[key]
+
+    yield factory
+
+    for conn in databases.values():
+        conn.close()
+
+
+@pytest.fixture
+def run_benchmark(benchmark):
+    """
+    Benchmark func(*args) under a group, with fixed rounds for 1M-bar inputs
+
+    Usage: run_benchmark('hull_ma_series', n_bars, func, *args)
+    """
+    def runner(group, n_bars, func, *args, **kwargs):
+        benchmark.group = group
+        benchmark.extra_info['bars'] = n_bars
+
+        if n_bars >= LARGE_BARS:
+            return benchmark.pedantic(func, args=args, kwargs=kwargs, rounds=LARGE_ROUNDS, iterations=1)
+        return benchmark(func, *args, **kwargs)
+
+    return runner
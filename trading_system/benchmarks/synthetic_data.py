@@ -0,0 +1,157 @@
+"""
+Synthetic OHLCV Data for Benchmarks
+Deterministic random-walk candles with volatility and volume regimes, shaped
+like the DataFrames get_price_data() returns
+
+The same seed always produces the same candles, so benchmark runs on
+different machines or commits work on identical input.
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from database_setup import create_price_tables
+from utils import store_candles
+
+# Regime name: (volatility per bar, drift per bar, volume multiplier)
+REGIMES = {
+    'quiet': (0.004, 0.0, 0.6),
+    'trend_up': (0.008, 0.0015, 1.2),
+    'trend_down': (0.009, -0.0015, 1.3),
+    'volatile': (0.020, 0.0, 2.5)
+}
+
+TIMEFRAME_SECONDS = {'15m': 900, '1h': 3600, '4h': 14400, '12h': 43200, '1d': 86400}
+
+
+def generate_candles(n_bars, seed=42, start_price=100.0, timeframe='1h',
+                     start_timestamp=1700000000, mean_regime_length=150):
+    """
+    Generate a deterministic random-walk candle series
+
+    Regimes switch after geometrically distributed runs, changing volatility,
+    drift and baseline volume. Occasional volume climaxes are added so the
+    volume detectors have something to find.
+
+    Args:
+        n_bars (int): Number of candles
+        seed (int): Random seed
+        start_price (float): First open price
+        timeframe (str): Candle spacing (15m, 1h, 4h, 12h, 1d)
+        start_timestamp (int): Unix timestamp of the first candle (seconds)
+        mean_regime_length (int): Average bars per regime
+
+    Returns:
+        pd.DataFrame: timestamp, open, high, low, close, volume, datetime
+    """
+    rng = np.random.default_rng(seed)
+    names = list(REGIMES)
+
+    # Regime per bar
+    regime_index = np.empty(n_bars, dtype=int)
+    position = 0
+    while position < n_bars:
+        length = int(rng.geometric(1.0 / mean_regime_length))
+        regime_index[position:position + length] = rng.integers(len(names))
+        position += length
+
+    params = np.array([REGIMES[name] for name in names])
+    volatility = params[regime_index, 0]
+    drift = params[regime_index, 1]
+    volume_multiplier = params[regime_index, 2]
+
+    # Log-price random walk
+    returns = drift + volatility * rng.standard_normal(n_bars)
+    close = start_price * np.exp(np.cumsum(returns))
+    open_ = np.empty(n_bars)
+    open_[0] = start_price
+    open_[1:] = close[:-1]
+
+    # Wicks extend beyond the body by a fraction of the bar's volatility
+    upper_wick = np.abs(rng.standard_normal(n_bars)) * volatility * 0.5
+    lower_wick = np.abs(rng.standard_normal(n_bars)) * volatility * 0.5
+    high = np.maximum(open_, close) * (1 + upper_wick)
+    low = np.minimum(open_, close) * (1 - lower_wick)
+
+    # Volume: lognormal around the regime baseline, bigger on large moves, rare climaxes
+    volume = 1000.0 * volume_multiplier * rng.lognormal(0.0, 0.3, n_bars)
+    volume *= 1 + 50 * np.abs(returns)
+    climax = rng.random(n_bars) < 0.01
+    volume[climax] *= rng.uniform(3.0, 6.0, climax.sum())
+
+    timestamp = start_timestamp + np.arange(n_bars, dtype=np.int64) * TIMEFRAME_SECONDS[timeframe]
+
+    df = pd.DataFrame({
+        'timestamp': timestamp,
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume
+    })
+    df['datetime'] = pd.to_datetime(df['timestamp'], unit='s')
+    return df
+
+
+def create_price_database(candles_by_pair, path=':memory:', clustered=False):
+    """
+    Build a price database
+
+    The default is the legacy price_data table (database_setup.py before
+    migration v4, plus the v2 index) so saved benchmark baselines stay
+    comparable; clustered=True builds price_candles with the price_data view.
+
+    Args:
+        candles_by_pair (dict): {(symbol, timeframe): DataFrame from generate_candles}
+        path (str): Database file, in memory by default
+        clustered (bool): Use the database_migration_v4.py layout
+
+    Returns:
+        sqlite3.Connection: Connection with the candles loaded
+    """
+    conn = sqlite3.connect(path, check_same_thread=False)
+    create_price_schema(conn, clustered)
+
+    cursor = conn.cursor()
+    for (symbol, timeframe), df in candles_by_pair.items():
+        store_candles(cursor, symbol, timeframe, candle_rows(df), 0)
+
+    conn.commit()
+    return conn
+
+
+def create_price_schema(conn, clustered=False):
+    """Create the empty legacy price_data table or the clustered layout"""
+    if clustered:
+        create_price_tables(conn.cursor())
+        return
+
+    conn.execute('''
+        CREATE TABLE price_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            symbol TEXT NOT NULL,
+            timeframe TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            open REAL NOT NULL,
+            high REAL NOT NULL,
+            low REAL NOT NULL,
+            close REAL NOT NULL,
+            volume REAL NOT NULL,
+            created_at INTEGER NOT NULL,
+            UNIQUE(symbol, timeframe, timestamp)
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX idx_price_data_symbol_timeframe_timestamp
+        ON price_data (symbol, timeframe, timestamp)
+    ''')
+
+
+def candle_rows(df):
+    """(timestamp, open, high, low, close, volume) tuples for store_candles()"""
+    return list(zip(
+        df['timestamp'].tolist(), df['open'].tolist(), df['high'].tolist(),
+        df['low'].tolist(), df['close'].tolist(), df['volume'].tolist()
+    ))
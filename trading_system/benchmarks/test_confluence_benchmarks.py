@@ -0,0 +1,66 @@
+"""
+End-to-End Confluence Benchmarks
+analyze_master_confluence against a price_data table holding 200, 10k and 1M
+candles - every analyzer reads the newest 200, so larger tables measure how
+the indexed lookups scale with history
+
+Also the detector's scan of 10 pairs in both watch directions, with every
+analyzer run vs stopping once a pair can't pass (min score or direction)
+"""
+
+import pytest
+
+from conftest import SMALL_BARS, bar_sizes
+from master_confluence import analyze_master_confluence, get_analyzer
+from synthetic_data import create_price_database
+
+SCAN_SYMBOLS = [f"SYM{i:02d}" for i in range(10)]
+
+
+@pytest.fixture(scope='module', autouse=True)
+def load_analyzers():
+    # Import the analyzers up front so the first round doesn't pay for it
+    for name in ('enhanced_hull_analyzer', 'enhanced_indicators', 'alligator_analyzer', 'ichimoku_analyzer'):
+        get_analyzer(name)
+
+
+@pytest.mark.parametrize('n_bars', bar_sizes())
+def test_analyze_master_confluence(run_benchmark, make_price_database, n_bars):
+    conn = make_price_database(n_bars)
+
+    result = run_benchmark('master_confluence', n_bars, analyze_master_confluence, conn, 'BTC', '1h')
+
+    assert result is not None
+    assert result['symbol'] == 'BTC'
+    assert 'score' in result['confluence']
+
+
+def scan_pairs(conn, short_circuit):
+    """(symbol, direction) pairs the detector would store a signal for"""
+    passed = []
+    for symbol in SCAN_SYMBOLS:
+        for direction in ('wind_catcher', 'river_turn'):
+            if short_circuit:
+                result = analyze_master_confluence(conn, symbol, '1h', direction=direction, min_score=1.2)
+            else:
+                result = analyze_master_confluence(conn, symbol, '1h')
+            confluence = result['confluence']
+            if ('short_circuit' not in result and confluence['score'] >= 1.2
+                    and confluence['primary_system'] == direction):
+                passed.append((symbol, direction))
+    return passed
+
+
+@pytest.mark.parametrize('short_circuit', [False, True], ids=['full', 'short_circuit'])
+def test_detector_scan(benchmark, make_candles, short_circuit):
+    conn = create_price_database({(symbol, '1h'): make_candles(SMALL_BARS + 60, seed=i)
+                                  for i, symbol in enumerate(SCAN_SYMBOLS)})
+
+    benchmark.group = 'detector_scan'
+    passed = benchmark.pedantic(scan_pairs, args=(conn, short_circuit), rounds=3, iterations=1)
+
+    benchmark.extra_info['passed'] = len(passed)
+    if short_circuit:
+        # Stopping early never drops a pair the full analysis passes
+        assert passed == scan_pairs(conn, False)
+    conn.close()
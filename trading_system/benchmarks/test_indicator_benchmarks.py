@@ -0,0 +1,112 @@
+"""
+Indicator Benchmarks
+Hull MA, Awesome Oscillator, modified Alligator, Ichimoku and the AO divergence
+finder at 200, 10k and 1M bars of synthetic candles
+
+Also every analyzer's indicators through one shared indicator engine vs one
+engine per analyzer (nothing shared), and the stateful signal kernels as
+Python vs numba-compiled (skipped without numba)
+"""
+
+import pandas as pd
+import pytest
+
+import alligator_analyzer
+import enhanced_hull_analyzer
+import enhanced_indicators
+import ichimoku_analyzer
+import indicator_kernels
+import master_confluence
+from conftest import SMALL_BARS, bar_sizes
+from indicators import calculate_hull_ma_series
+from enhanced_indicators import calculate_awesome_oscillator, analyze_ao_divergences
+from alligator_analyzer import calculate_modified_alligator
+from ichimoku_analyzer import calculate_ichimoku
+from indicator_engine import IndicatorEngine
+
+
+@pytest.mark.parametrize('n_bars', bar_sizes())
+def test_hull_ma_series(run_benchmark, make_candles, n_bars):
+    df = make_candles(n_bars)
+
+    hull = run_benchmark('hull_ma_series', n_bars, calculate_hull_ma_series, df['close'], 21)
+
+    assert len(hull) == n_bars
+    assert hull.notna().sum() > 0
+
+
+@pytest.mark.parametrize('n_bars', bar_sizes())
+def test_awesome_oscillator(run_benchmark, make_candles, n_bars):
+    df = make_candles(n_bars)
+
+    ao = run_benchmark('awesome_oscillator', n_bars, calculate_awesome_oscillator, df)
+
+    assert len(ao) == n_bars
+
+
+@pytest.mark.parametrize('n_bars', bar_sizes())
+def test_modified_alligator(run_benchmark, make_candles, n_bars):
+    df = make_candles(n_bars)
+
+    jaw, teeth, lips = run_benchmark('modified_alligator', n_bars, calculate_modified_alligator, df)
+
+    assert len(jaw) == len(teeth) == len(lips) == n_bars
+
+
+@pytest.mark.parametrize('n_bars', bar_sizes())
+def test_ichimoku(run_benchmark, make_candles, n_bars):
+    df = make_candles(n_bars)
+
+    ichimoku = run_benchmark('ichimoku', n_bars, calculate_ichimoku, df)
+
+    assert len(ichimoku['kijun_sen']) == n_bars
+
+
+@pytest.mark.parametrize('n_bars', bar_sizes())
+def test_ao_divergences(run_benchmark, make_candles, n_bars):
+    # analyze_ao_divergences adds an 'ao' column, so work on a private copy
+    df = make_candles(n_bars).copy()
+
+    analysis = run_benchmark('ao_divergences', n_bars, analyze_ao_divergences, df)
+
+    assert analysis is not None
+    assert 'divergences' in analysis
+
+
+def evaluate_analyzer_nodes(df, shared):
+    """Every analyzer's indicator nodes, in one engine or one engine each"""
+    engine = IndicatorEngine(df) if shared else None
+    series = []
+    for module in (enhanced_hull_analyzer, enhanced_indicators, alligator_analyzer,
+                   ichimoku_analyzer, master_confluence):
+        series += (engine or IndicatorEngine(df)).evaluate(*module.indicator_nodes())
+    return series
+
+
+@pytest.mark.parametrize('shared', [False, True], ids=['per_analyzer', 'shared'])
+@pytest.mark.parametrize('n_bars', bar_sizes())
+def test_indicator_engine(run_benchmark, make_candles, n_bars, shared):
+    df = make_candles(n_bars)
+
+    series = run_benchmark(f'indicator_engine_{n_bars}', n_bars, evaluate_analyzer_nodes, df, shared)
+
+    # Sharing nodes never changes a value
+    for shared_series, own_series in zip(series, evaluate_analyzer_nodes(df, False)):
+        pd.testing.assert_series_equal(shared_series, own_series)
+
+
+@pytest.mark.parametrize('jit', [False, True], ids=['python', 'jit'])
+@pytest.mark.parametrize('name', [func.__name__ for func in indicator_kernels.KERNELS])
+def test_indicator_kernel(benchmark, name, jit):
+    func = getattr(indicator_kernels, name)
+    if jit and not func.jit:
+        pytest.skip("numba not installed (or kernels.jit is false)")
+    args = indicator_kernels.sample_arguments(SMALL_BARS)[func]
+    run = func if jit else func.python
+    run(*args)
+
+    benchmark.group = f'indicator_kernel_{name}'
+    result = benchmark(run, *args)
+
+    # Compiled or not, a kernel finds the same candles
+    assert result == func.python(*args)
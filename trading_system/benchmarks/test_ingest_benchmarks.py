@@ -0,0 +1,91 @@
+"""
+Ingest Benchmarks
+collect_multi_timeframe_data() against mock_hyperliquid_server.py: the real
+connector and SDK over local HTTP, storing into an in-memory clustered
+database, so the whole ingest path runs without network access
+
+- a clean run over 20 synthetic markets
+- 20 ms of server latency with 1 and 4 fetch workers (the writer overlaps
+  with the fetches either way; more workers overlap the fetches too)
+- the same run with latency, server errors and rate-limit responses injected
+  (seeded, so every run fails the same requests)
+"""
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip('hyperliquid.info')
+
+from hyperliquid_connector import HyperliquidConnector
+from mock_hyperliquid_server import MockHyperliquidServer, synthetic_fixture
+from multi_timeframe_collector import collect_multi_timeframe_data
+from synthetic_data import create_price_schema
+
+INGEST_SYMBOLS = 20
+INGEST_LIMIT = 200
+
+COLLECTOR_CONFIG = {
+    'exchange': {'use_testnet': False},
+    'system': {'max_api_calls_per_second': 1000}
+}
+
+_fixture = {}
+
+
+def get_fixture():
+    """Cached synthetic fixture with INGEST_SYMBOLS markets of 1h candles"""
+    if 'fixture' not in _fixture:
+        _fixture['fixture'] = synthetic_fixture(INGEST_SYMBOLS, ('1h',), bars=1000)
+    return _fixture['fixture']
+
+
+def run_collection(server, config=COLLECTOR_CONFIG):
+    """Collect every synthetic market from the server into a fresh database"""
+    conn = sqlite3.connect(':memory:')
+    create_price_schema(conn, clustered=True)
+    connector = HyperliquidConnector(api_url=server.url)
+    symbols = {asset['name'] for asset in get_fixture()['responses']['meta']['universe']}
+
+    stats = collect_multi_timeframe_data(symbols, {'1h'}, config, conn,
+                                         limit=INGEST_LIMIT, connector=connector)
+    stats['stored'] = conn.execute("SELECT COUNT(*) FROM price_data").fetchone()[0]
+    conn.close()
+    return stats
+
+
+def test_collect_from_mock(benchmark):
+    with MockHyperliquidServer(get_fixture()) as server:
+        benchmark.group = 'ingest'
+        stats = benchmark.pedantic(run_collection, args=(server,), rounds=3, iterations=1)
+        benchmark.extra_info['requests'] = server.get_stats()['requests']
+
+    assert stats['successful'] == INGEST_SYMBOLS
+    assert stats['stored'] == INGEST_SYMBOLS * INGEST_LIMIT
+
+
+@pytest.mark.parametrize('fetch_workers', [1, 4])
+def test_collect_with_latency(benchmark, fetch_workers):
+    config = dict(COLLECTOR_CONFIG, collector={'fetch_workers': fetch_workers})
+    with MockHyperliquidServer(get_fixture(), latency=0.02) as server:
+        benchmark.group = 'ingest_latency'
+        stats = benchmark.pedantic(run_collection, args=(server, config), rounds=3, iterations=1)
+
+    benchmark.extra_info['candles_per_second'] = round(stats['candles_per_second'])
+    benchmark.extra_info['max_queue_depth'] = stats['max_queue_depth']
+    assert stats['stored'] == INGEST_SYMBOLS * INGEST_LIMIT
+
+
+def test_collect_with_faults(benchmark):
+    server = MockHyperliquidServer(get_fixture(), latency=0.005, jitter=0.005,
+                                   error_rate=0.1, rate_limit=15, seed=1)
+    with server:
+        benchmark.group = 'ingest'
+        stats = benchmark.pedantic(run_collection, args=(server,), rounds=1, iterations=1)
+        counters = server.get_stats()
+
+    benchmark.extra_info.update(counters)
+    # Connecting makes a spotMeta and a meta request; failed candle requests come back as "No data"
+    assert stats['failed'] > 0
+    assert stats['successful'] + stats['failed'] == INGEST_SYMBOLS
+    assert stats['stored'] == stats['successful'] * INGEST_LIMIT
@@ -0,0 +1,40 @@
+"""
+Lookback Planner Benchmarks
+Each analyzer loading the window lookback_planner.py plans for it vs the
+fixed 200 candles it used to load - same signals, less work (the
+analyzers' state and event loops run over every loaded candle)
+"""
+
+import pytest
+
+import alligator_analyzer
+import enhanced_hull_analyzer
+import ichimoku_analyzer
+from conftest import SMALL_BARS
+
+ANALYZERS = {
+    'hull': (enhanced_hull_analyzer, enhanced_hull_analyzer.analyze_symbol_hull, 'all_signals'),
+    'alligator': (alligator_analyzer, alligator_analyzer.analyze_symbol_alligator, 'retracement_events'),
+    'ichimoku': (ichimoku_analyzer, ichimoku_analyzer.analyze_symbol_ichimoku, 'significant_events')
+}
+
+
+def fixed_window(timeframe='1h'):
+    """The requirements before planning: always 200 candles"""
+    return {'min_bars': 0, 'window': SMALL_BARS}
+
+
+@pytest.mark.parametrize('planned', [False, True], ids=['fixed_200', 'planned'])
+@pytest.mark.parametrize('name', list(ANALYZERS))
+def test_analyzer_window(benchmark, monkeypatch, make_price_database, name, planned):
+    module, analyze, key = ANALYZERS[name]
+    conn = make_price_database(SMALL_BARS + 60)
+    expected = analyze(conn, 'BTC', '1h')[key]
+    if not planned:
+        monkeypatch.setattr(module, 'data_requirements', fixed_window)
+
+    benchmark.group = f'analyzer_window_{name}'
+    result = benchmark(analyze, conn, 'BTC', '1h')
+
+    # Candles older than the planned window never change the signals
+    assert result[key] == expected
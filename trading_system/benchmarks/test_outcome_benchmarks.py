@@ -0,0 +1,31 @@
+"""
+Signal Outcome Benchmarks
+compute_outcomes for 100k signals spread over a 10k-bar series
+"""
+
+import numpy as np
+
+from conftest import MEDIUM_BARS
+from signal_outcomes import compute_outcomes, DEFAULT_HORIZONS
+
+SIGNAL_COUNT = 100_000
+
+
+def test_compute_outcomes(run_benchmark, make_candles):
+    df = make_candles(MEDIUM_BARS)
+    rng = np.random.default_rng(7)
+
+    positions = rng.integers(0, MEDIUM_BARS, SIGNAL_COUNT)
+    entry_timestamps = df['timestamp'].values[positions]
+    entry_prices = df['close'].values[positions]
+    directions = np.where(rng.random(SIGNAL_COUNT) < 0.5, 1.0, -1.0)
+
+    outcomes = run_benchmark(
+        'signal_outcomes', MEDIUM_BARS, compute_outcomes,
+        entry_timestamps, entry_prices, directions,
+        df['timestamp'].values, df['high'].values, df['low'].values, df['close'].values,
+        DEFAULT_HORIZONS, 2.0, 1.0
+    )
+
+    assert outcomes['return_pct'].shape == (SIGNAL_COUNT, len(DEFAULT_HORIZONS))
+    assert outcomes['complete'][:, 0].mean() > 0.99
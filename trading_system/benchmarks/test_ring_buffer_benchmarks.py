@@ -0,0 +1,66 @@
+"""
+Candle Ring Buffer Benchmarks
+The detector's 200-bar read through the collector's shared-memory ring
+(candle_ring_buffer.py) vs SQLite:
+
+- the raw (200 x 6) array read out of the ring
+- the DataFrame get_price_data() returns, built from the ring
+- the same DataFrame read from a clustered database
+"""
+
+import pandas as pd
+import pytest
+
+import candle_ring_buffer
+from conftest import MEDIUM_BARS, SMALL_BARS
+from master_confluence import get_price_data
+from synthetic_data import candle_rows, create_price_database
+
+RING_SYMBOL = 'RINGBENCH'
+RING_SETTINGS = {'enabled': True, 'capacity': 512, 'max_age_seconds': 300}
+
+
+@pytest.fixture(scope='module')
+def ring_store(make_candles):
+    """A store whose RINGBENCH 1h ring holds the last 512 of MEDIUM_BARS candles"""
+    store = candle_ring_buffer.RingBufferStore(RING_SETTINGS)
+    store.write(RING_SYMBOL, '1h', candle_rows(make_candles(MEDIUM_BARS)))
+    ring = store.ring(RING_SYMBOL, '1h')
+
+    yield store
+
+    store.close()
+    ring.unlink()
+
+
+@pytest.fixture
+def use_ring(monkeypatch, ring_store):
+    """Route read_frame() through the benchmark store"""
+    monkeypatch.setattr(candle_ring_buffer, '_store', ring_store)
+    return ring_store
+
+
+def test_ring_array_read(benchmark, use_ring):
+    benchmark.group = 'candle_read'
+    window = benchmark(use_ring.read, RING_SYMBOL, '1h', SMALL_BARS)
+
+    assert window.shape == (SMALL_BARS, 6)
+
+
+def test_ring_frame_read(benchmark, use_ring, make_candles):
+    benchmark.group = 'candle_read'
+    df = benchmark(get_price_data, None, RING_SYMBOL, '1h', SMALL_BARS, use_ring=True)
+
+    expected = make_candles(MEDIUM_BARS).tail(SMALL_BARS).reset_index(drop=True)
+    pd.testing.assert_series_equal(df['close'], expected['close'])
+
+
+def test_sqlite_frame_read(benchmark, monkeypatch, make_candles):
+    monkeypatch.setattr(candle_ring_buffer, '_store', False)
+    conn = create_price_database({(RING_SYMBOL, '1h'): make_candles(MEDIUM_BARS)}, clustered=True)
+
+    benchmark.group = 'candle_read'
+    df = benchmark(get_price_data, conn, RING_SYMBOL, '1h', SMALL_BARS)
+    conn.close()
+
+    assert len(df) == SMALL_BARS
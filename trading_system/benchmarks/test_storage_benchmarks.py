@@ -0,0 +1,84 @@
+"""
+Price Storage Benchmarks
+Legacy price_data table vs the clustered price_candles layout
+(database_migration_v4.py) with 20 pairs of 10k candles:
+
+- insert rate through store_candles() (the collectors' write path)
+- the analyzers' ORDER BY timestamp DESC LIMIT 200 read
+- database size, recorded as extra_info['db_bytes']
+"""
+
+import sqlite3
+
+import pytest
+
+from conftest import MEDIUM_BARS
+from synthetic_data import create_price_database, create_price_schema, candle_rows
+from utils import store_candles
+
+LAYOUTS = ['legacy', 'clustered']
+SYMBOLS = [f"SYM{i:02d}" for i in range(20)]
+
+ANALYZER_QUERY = '''
+    SELECT timestamp, open, high, low, close, volume
+    FROM price_data
+    WHERE symbol = ? AND timeframe = ?
+    ORDER BY timestamp DESC
+    LIMIT 200
+'''
+
+_databases = {}
+
+
+def get_database(layout, make_candles):
+    """Cached in-memory database with every symbol's 1h series"""
+    if layout not in _databases:
+        candles = make_candles(MEDIUM_BARS)
+        _databases[layout] = create_price_database(
+            {(symbol, '1h'): candles for symbol in SYMBOLS}, clustered=(layout == 'clustered')
+        )
+    return _databases[layout]
+
+
+def database_bytes(conn):
+    """page_count * page_size"""
+    return conn.execute("PRAGMA page_count").fetchone()[0] * conn.execute("PRAGMA page_size").fetchone()[0]
+
+
+@pytest.mark.parametrize('layout', LAYOUTS)
+def test_insert_candles(benchmark, make_candles, layout):
+    rows = candle_rows(make_candles(MEDIUM_BARS))
+
+    def setup():
+        conn = sqlite3.connect(':memory:')
+        create_price_schema(conn, clustered=(layout == 'clustered'))
+        return (conn,), {}
+
+    def insert(conn):
+        cursor = conn.cursor()
+        for symbol in SYMBOLS:
+            store_candles(cursor, symbol, '1h', rows, 0)
+        conn.commit()
+        return conn
+
+    benchmark.group = 'price_storage_insert'
+    benchmark.extra_info['candles'] = len(rows) * len(SYMBOLS)
+    conn = benchmark.pedantic(insert, setup=setup, rounds=5, iterations=1)
+
+    benchmark.extra_info['db_bytes'] = database_bytes(conn)
+    assert conn.execute("SELECT COUNT(*) FROM price_data").fetchone()[0] == len(rows) * len(SYMBOLS)
+
+
+@pytest.mark.parametrize('layout', LAYOUTS)
+def test_analyzer_read(benchmark, make_candles, layout):
+    conn = get_database(layout, make_candles)
+
+    def read_all_pairs():
+        return [conn.execute(ANALYZER_QUERY, (symbol, '1h')).fetchall() for symbol in SYMBOLS]
+
+    benchmark.group = 'price_storage_read'
+    benchmark.extra_info['db_bytes'] = database_bytes(conn)
+    results = benchmark(read_all_pairs)
+
+    assert all(len(rows) == 200 for rows in results)
+    assert results[0][0][0] > results[0][-1][0]
@@ -0,0 +1,58 @@
+"""
+Parameter Sweep Benchmarks
+Whole-history confluence scoring (vectorized_confluence) for 200, 10k and 1M
+candles, one sweep run over several pairs, and every signal bar of several
+pairs streamed to CSV in this process vs a worker pool (history_signals.py)
+"""
+
+import numpy as np
+import pytest
+
+from conftest import bar_sizes, MEDIUM_BARS
+from history_signals import write_history_signals
+from parameter_sweep import COLUMNS, evaluate, get_sweep_settings
+from vectorized_confluence import compute_confluence
+
+
+@pytest.mark.parametrize('n_bars', bar_sizes())
+def test_compute_confluence(run_benchmark, make_candles, n_bars):
+    df = make_candles(n_bars)
+    columns = [df[name].values for name in ('high', 'low', 'close', 'volume')]
+
+    result = run_benchmark('vectorized_confluence', n_bars, compute_confluence,
+                           df['timestamp'].values, *columns)
+
+    assert len(result['score']) == n_bars
+
+
+def test_evaluate_parameter_set(run_benchmark, make_candles):
+    series = {}
+    for seed in range(4):
+        df = make_candles(MEDIUM_BARS, seed=seed)
+        series[(f'PAIR{seed}', '1h')] = (df['timestamp'].values,) + tuple(
+            df[name].values.astype(float) for name in ('high', 'low', 'close', 'volume'))
+    settings = dict(get_sweep_settings({}), horizon=6)
+
+    metrics = run_benchmark('parameter_sweep', MEDIUM_BARS, evaluate,
+                            {'alligator_multiplier': 8, 'min_score': 1.8}, series, settings)
+
+    assert metrics['signals'] > 0
+    assert metrics['bars'] == 4 * MEDIUM_BARS
+
+
+@pytest.mark.parametrize('workers', [1, 4], ids=['in_process', 'pool_4'])
+def test_history_signals(benchmark, make_candles, tmp_path, workers):
+    candles = {(f'PAIR{seed}', '1h'): np.array([make_candles(MEDIUM_BARS, seed=seed)[name].values
+                                                for name in COLUMNS], dtype=float)
+               for seed in range(4)}
+
+    benchmark.group = 'history_signals'
+    writer = benchmark.pedantic(write_history_signals, args=(candles, tmp_path / 'signals.csv'),
+                                kwargs={'workers': workers}, rounds=3, iterations=1)
+
+    benchmark.extra_info['signals'] = writer.rows
+    assert writer.rows > 0
+    # Pairs finish in any order, but every row is the same
+    lines = sorted((tmp_path / 'signals.csv').read_text(encoding='utf-8').splitlines())
+    write_history_signals(candles, tmp_path / 'in_process.csv', workers=1)
+    assert lines == sorted((tmp_path / 'in_process.csv').read_text(encoding='utf-8').splitlines())
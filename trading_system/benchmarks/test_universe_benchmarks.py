@@ -0,0 +1,28 @@
+"""
+Universe Scanner Benchmarks
+Ranking 150 symbols x 200 bars (one shared 1h grid) by the latest candle's
+master confluence, the way universe_scanner.py scores the whole market
+"""
+
+import numpy as np
+
+from conftest import SMALL_BARS
+from universe_scanner import COLUMNS, score_universe
+
+UNIVERSE_SYMBOLS = 150
+
+
+def test_score_universe(run_benchmark, make_candles):
+    frames = [make_candles(SMALL_BARS, seed=seed) for seed in range(UNIVERSE_SYMBOLS)]
+    store = {
+        'timeframe': '1h',
+        'timestamps': frames[0]['timestamp'].values,
+        'symbols': [f"SYM{seed:03d}" for seed in range(UNIVERSE_SYMBOLS)]
+    }
+    for column in COLUMNS:
+        store[column] = np.stack([df[column].values.astype(float) for df in frames])
+
+    rankings = run_benchmark('universe_scanner', SMALL_BARS, score_universe, store)
+
+    assert len(rankings) == UNIVERSE_SYMBOLS
+    assert rankings[0]['score'] >= rankings[-1]['score']
@@ -0,0 +1,435 @@
+"""
+Shared-Memory Candle Ring Buffer for Wind Catcher & River Turn
+Keeps the latest N candles of every (symbol, timeframe) in shared memory, so
+the signal detector reads the analysis window without going through SQLite
+
+The collector writes each pair's candles into its ring right after they are
+committed to SQLite (which stays the durable store). The signal detector
+maps the same segments and copies the window it needs out of them -
+a 200-bar read is a few microseconds instead of a SQL query and a
+read_sql_query DataFrame.
+
+Each ring is one shared-memory segment:
+- header (int64): layout version, capacity, count, head, sequence, updated_at, closed
+- data (float64, capacity x 6): timestamp, open, high, low, close, volume
+
+Writes are wrapped in a sequence lock (odd while writing), so readers retry
+instead of seeing half-written candles. There must be one writer process.
+Readers fall back to SQLite when a ring is missing, shorter than the window,
+or hasn't been written for max_age_seconds (e.g. the collector stopped).
+
+Segments outlive the process that created them, so a standalone collector
+can feed a separately running detector; --unlink removes them.
+
+Usage:
+    python candle_ring_buffer.py             # show the ring of every watchlist pair
+    python candle_ring_buffer.py --unlink    # remove every watchlist pair's ring
+"""
+
+import sys
+import io
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils import load_config, get_current_timestamp, format_timestamp
+
+DEFAULTS = {
+    'enabled': False,
+    'capacity': 512,
+    'max_age_seconds': 300
+}
+
+LAYOUT_VERSION = 1
+
+# Header slots (int64)
+VERSION, CAPACITY, COUNT, HEAD, SEQUENCE, UPDATED_AT, CLOSED = range(7)
+HEADER_SLOTS = 8
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+# Read attempts while the writer holds the sequence lock
+READ_RETRIES = 100
+
+# Seconds before a missing ring is looked up again
+MISSING_RETRY_SECONDS = 30
+
+
+def get_ring_settings(config=None):
+    """
+    Ring buffer settings from config.yaml (ring_buffer section)
+
+    Returns:
+        dict: enabled, capacity, max_age_seconds
+    """
+    config = config if config is not None else load_config()
+    settings = dict(DEFAULTS)
+    settings.update(config.get('ring_buffer') or {})
+    return settings
+
+
+def segment_name(symbol, timeframe):
+    """Shared-memory name of a pair's ring (short enough for every platform)"""
+    digest = hashlib.sha1(f"{symbol}|{timeframe}".encode('utf-8')).hexdigest()[:16]
+    return f"wrc_{digest}"
+
+
+def _open_segment(name, create=False, size=0):
+    """
+    Open a segment that isn't unlinked when this process exits
+
+    By default Python's resource tracker removes every segment a process
+    created or attached to when it exits, which would take the rings away
+    from the other processes.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    except TypeError:
+        # Python < 3.13 has no track argument
+        segment = shared_memory.SharedMemory(name=name, create=create, size=size)
+        if os.name == 'posix':
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(segment._name, 'shared_memory')
+        return segment
+
+
+class CandleRing:
+    """One pair's candles in a shared-memory segment"""
+
+    def __init__(self, segment):
+        self.segment = segment
+        header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=segment.buf)
+        self.capacity = int(header[CAPACITY])
+        self.header = header
+        self.data = np.ndarray((self.capacity, len(COLUMNS)), dtype=np.float64, buffer=segment.buf,
+                               offset=HEADER_SLOTS * 8)
+
+    @classmethod
+    def create(cls, symbol, timeframe, capacity):
+        """Create a pair's ring (or attach to it if another process already created it)"""
+        try:
+            segment = _open_segment(segment_name(symbol, timeframe), create=True,
+                                    size=HEADER_SLOTS * 8 + capacity * len(COLUMNS) * 8)
+        except FileExistsError:
+            return cls.attach(symbol, timeframe)
+
+        header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=segment.buf)
+        header[:] = 0
+        header[CAPACITY] = capacity
+        header[VERSION] = LAYOUT_VERSION
+        return cls(segment)
+
+    @classmethod
+    def attach(cls, symbol, timeframe):
+        """
+        Map an existing ring
+
+        Returns:
+            CandleRing: The ring, or None if no process has created it yet
+        """
+        try:
+            segment = _open_segment(segment_name(symbol, timeframe))
+        except FileNotFoundError:
+            return None
+
+        header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=segment.buf)
+        if header[VERSION] != LAYOUT_VERSION:
+            # Created by an incompatible version (or not initialized yet)
+            segment.close()
+            return None
+        return cls(segment)
+
+    def _order(self, count, head):
+        """Slots of the newest `count` candles, oldest first"""
+        return (head - count + np.arange(count)) % self.capacity
+
+    def write(self, candles, now=None):
+        """
+        Merge candles into the ring
+
+        Candles newer than the newest stored one are appended (the oldest
+        are overwritten once the ring is full); candles already stored are
+        replaced in place, like the collector's INSERT OR REPLACE. Older
+        candles that aren't in the ring are ignored.
+
+        Args:
+            candles (list): (timestamp, open, high, low, close, volume) tuples, oldest first
+            now (int): Write time (for tests)
+        """
+        rows = np.asarray(candles, dtype=np.float64).reshape(-1, len(COLUMNS))
+        if len(rows) == 0:
+            return
+
+        header = self.header
+        count, head = int(header[COUNT]), int(header[HEAD])
+        slots = self._order(count, head)
+        stored = self.data[slots, 0]
+        newest = stored[-1] if count else -np.inf
+
+        header[SEQUENCE] += 1
+        try:
+            older = rows[rows[:, 0] <= newest]
+            if len(older):
+                positions = np.minimum(np.searchsorted(stored, older[:, 0]), count - 1)
+                found = stored[positions] == older[:, 0]
+                self.data[slots[positions[found]]] = older[found]
+
+            newer = rows[rows[:, 0] > newest][-self.capacity:]
+            if len(newer):
+                self.data[(head + np.arange(len(newer))) % self.capacity] = newer
+                header[HEAD] = (head + len(newer)) % self.capacity
+                header[COUNT] = min(count + len(newer), self.capacity)
+
+            header[UPDATED_AT] = now or get_current_timestamp()
+            header[CLOSED] = 0
+        finally:
+            header[SEQUENCE] += 1
+
+    def read(self, n, max_age=None, now=None):
+        """
+        Copy the newest n candles
+
+        Args:
+            n (int): Candles wanted
+            max_age (int): Return None if the ring wasn't written for this many seconds
+            now (int): Current time (for tests)
+
+        Returns:
+            np.ndarray: (n x 6) copy, oldest first - None if the ring has fewer
+                        than n candles, is stale or closed, or stayed locked
+        """
+        header = self.header
+
+        for _ in range(READ_RETRIES):
+            sequence = int(header[SEQUENCE])
+            if sequence % 2:
+                time.sleep(0)
+                continue
+
+            count, head = int(header[COUNT]), int(header[HEAD])
+            if count < n or header[CLOSED]:
+                return None
+            if max_age is not None and (now or get_current_timestamp()) - header[UPDATED_AT] > max_age:
+                return None
+
+            window = self.data[self._order(n, head)]
+            if int(header[SEQUENCE]) == sequence:
+                return window
+
+        return None
+
+    def status(self):
+        """Candle count, newest candle and last write time"""
+        count, head = int(self.header[COUNT]), int(self.header[HEAD])
+        newest = int(self.data[(head - 1) % self.capacity, 0]) if count else None
+        return {
+            'capacity': self.capacity,
+            'count': count,
+            'newest': newest,
+            'updated_at': int(self.header[UPDATED_AT]),
+            'closed': bool(self.header[CLOSED])
+        }
+
+    def mark_closed(self):
+        """Tell readers to use SQLite (the writer is going away)"""
+        self.header[CLOSED] = 1
+
+    def close(self):
+        """Unmap the segment (it stays available to other processes)"""
+        self.header = self.data = None
+        self.segment.close()
+
+    def unlink(self):
+        """Remove the segment"""
+        if os.name == 'posix' and sys.version_info < (3, 13):
+            # _open_segment unregistered it, and unlink() unregisters it again
+            from multiprocessing import resource_tracker
+            resource_tracker.register(self.segment._name, 'shared_memory')
+        self.segment.unlink()
+
+
+class RingBufferStore:
+    """This process's mapped rings, by (symbol, timeframe)"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._rings = {}
+        self._missing = {}
+        self._lock = threading.Lock()
+
+    def ring(self, symbol, timeframe, create=False):
+        """
+        A pair's ring, mapped once per process
+
+        Args:
+            create (bool): Create the ring if it doesn't exist (the collector)
+
+        Returns:
+            CandleRing: The ring, or None if it doesn't exist (and create is False)
+        """
+        key = (symbol, timeframe)
+        ring = self._rings.get(key)
+        if ring is not None:
+            return ring
+
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is not None:
+                return ring
+
+            if create:
+                ring = CandleRing.create(symbol, timeframe, self.settings['capacity'])
+            elif time.monotonic() >= self._missing.get(key, 0):
+                ring = CandleRing.attach(symbol, timeframe)
+                if ring is None:
+                    # Don't look for it again on every read
+                    self._missing[key] = time.monotonic() + MISSING_RETRY_SECONDS
+
+            if ring is not None:
+                self._rings[key] = ring
+                self._missing.pop(key, None)
+            return ring
+
+    def write(self, symbol, timeframe, candles, now=None):
+        """Merge freshly stored candles into the pair's ring"""
+        self.ring(symbol, timeframe, create=True).write(candles, now)
+
+    def read(self, symbol, timeframe, n, now=None):
+        """Newest n candles as an (n x 6) array, or None if SQLite must be used"""
+        ring = self.ring(symbol, timeframe)
+        if ring is None:
+            return None
+        return ring.read(n, self.settings['max_age_seconds'], now)
+
+    def close(self, mark_closed=False):
+        """Unmap every ring (marking them closed first if this process was the writer)"""
+        with self._lock:
+            for ring in self._rings.values():
+                if mark_closed:
+                    ring.mark_closed()
+                ring.close()
+            self._rings = {}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store(settings=None):
+    """
+    This process's ring buffer store
+
+    Returns:
+        RingBufferStore: The store, or None if ring_buffer.enabled is off
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                settings = settings or get_ring_settings()
+                _store = RingBufferStore(settings) if settings['enabled'] else False
+    return _store or None
+
+
+def read_frame(symbol, timeframe, limit):
+    """
+    Newest `limit` candles as the DataFrame master_confluence.get_price_data returns
+
+    Only the signal detector reads through here (analyze_master_confluence's
+    use_ring) - the ring holds the live collector's candles, whatever
+    database another caller is analyzing.
+
+    Returns:
+        pd.DataFrame: timestamp, open, high, low, close, volume, datetime -
+                      None if disabled or SQLite must be used
+    """
+    store = get_store()
+    if store is None:
+        return None
+
+    window = store.read(symbol, timeframe, limit)
+    if window is None:
+        return None
+
+    import pandas as pd
+    # Built from columns - a third of the cost of building from the block and converting
+    timestamps = window[:, 0].astype(np.int64)
+    frame = {'timestamp': timestamps}
+    for i, column in enumerate(COLUMNS[1:], start=1):
+        frame[column] = window[:, i]
+    frame['datetime'] = timestamps.astype('datetime64[s]')
+    return pd.DataFrame(frame)
+
+
+def write_candles(symbol, timeframe, candles):
+    """Merge stored candles into the pair's ring (no-op if disabled)"""
+    store = get_store()
+    if store is not None:
+        store.write(symbol, timeframe, candles)
+
+
+def close_store(mark_closed=False):
+    """Unmap this process's rings (marking them closed if it was the writer)"""
+    if _store:
+        _store.close(mark_closed)
+
+
+def main():
+    """Show or remove the rings of every watchlist pair"""
+    from utils import connect_to_database
+    from multi_timeframe_collector import get_watchlist_requirements
+
+    parser = argparse.ArgumentParser(description="Inspect the shared-memory candle rings")
+    parser.add_argument('--unlink', action='store_true', help="Remove every watchlist pair's ring")
+    args = parser.parse_args()
+
+    print("💾 Wind Catcher & River Turn - Candle Ring Buffer")
+    print("="*60)
+
+    settings = get_ring_settings()
+    print(f"Enabled: {settings['enabled']}  Capacity: {settings['capacity']}  "
+          f"Max age: {settings['max_age_seconds']}s")
+
+    conn = connect_to_database()
+    try:
+        symbols, timeframes = get_watchlist_requirements(conn)
+    finally:
+        conn.close()
+
+    found = 0
+    print(f"\n{'Pair':<20}{'Candles':>9}  {'Newest':<20}{'Written':<20}")
+    print("-"*70)
+    for symbol in sorted(symbols):
+        for timeframe in sorted(timeframes):
+            ring = CandleRing.attach(symbol, timeframe)
+            if ring is None:
+                continue
+            found += 1
+            status = ring.status()
+            newest = format_timestamp(status['newest']) if status['newest'] else '-'
+            written = format_timestamp(status['updated_at']) if status['updated_at'] else '-'
+            print(f"{symbol + ' ' + timeframe:<20}{status['count']:>9}  {newest:<20}{written:<20}"
+                  f"{' (closed)' if status['closed'] else ''}")
+            if args.unlink:
+                ring.unlink()
+            ring.close()
+    print("-"*70)
+
+    if args.unlink:
+        print(f"🧹 Removed {found} rings")
+    else:
+        print(f"{found} rings")
+
+
+if __name__ == "__main__":
+    main()
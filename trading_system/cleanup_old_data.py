@@ -21,14 +21,25 @@ cursor.execute("SELECT COUNT(*) FROM price_data WHERE symbol LIKE '%ADA%' OR sym
 before_count = cursor.fetchone()[0]
 print(f"\n📊 Found {before_count} ADA/BNB candles to delete")
 
+def delete_candles(pattern):
+    """
+    Delete the candles of symbols matching a LIKE pattern
+
+    Counted before and after: on migrated databases price_data is a view
+    (database_migration_v4.py) and a DELETE through its INSTEAD OF trigger
+    leaves cursor.rowcount at 0.
+    """
+    query = "SELECT COUNT(*) FROM price_data WHERE symbol LIKE ?"
+    before = cursor.execute(query, (pattern,)).fetchone()[0]
+    cursor.execute("DELETE FROM price_data WHERE symbol LIKE ?", (pattern,))
+    return before - cursor.execute(query, (pattern,)).fetchone()[0]
+
 # Delete ADA data
-cursor.execute("DELETE FROM price_data WHERE symbol LIKE '%ADA%'")
-ada_deleted = cursor.rowcount
+ada_deleted = delete_candles('%ADA%')
 print(f"   ✅ Deleted {ada_deleted} ADA candles")
 
 # Delete BNB data
-cursor.execute("DELETE FROM price_data WHERE symbol LIKE '%BNB%'")
-bnb_deleted = cursor.rowcount
+bnb_deleted = delete_candles('%BNB%')
 print(f"   ✅ Deleted {bnb_deleted} BNB candles")
 
 # Commit changes
@@ -0,0 +1,123 @@
+"""
+Command Line Entry Point for Wind Catcher & River Turn
+One command for every tool in the system, with each subcommand's module only
+imported when that subcommand runs (so `cli.py watchlist` never loads pandas,
+scipy or the Hyperliquid SDK)
+
+Usage:
+    python cli.py                       # list commands
+    python cli.py watchlist             # show the current watchlist
+    python cli.py detect --once         # one signal scan
+    python cli.py monitor               # collection + detection + dashboard schedule
+    python cli.py web --server waitress
+    python cli.py importtime            # import-time benchmark for every command
+"""
+
+import os
+import runpy
+import sys
+from pathlib import Path
+
+# Fix Windows console encoding (in place, so scripts that re-wrap stdout still work)
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+TRADING_SYSTEM_DIR = Path(__file__).resolve().parent
+
+# name: (script relative to trading_system/, description)
+# Only the standard library is imported here - scripts are loaded on demand
+COMMANDS = {
+    'setup': ('database_setup.py', "Create the database"),
+    'migrate-v2': ('database_migration_v2.py', "Migrate the database to v2"),
+    'migrate-v3': ('database_migration_v3.py', "Add the v3 summary tables"),
+    'migrate-v4': ('database_migration_v4.py', "Move candles to the clustered price_candles table"),
+    'mock-exchange': ('mock_hyperliquid_server.py', "Serve recorded or synthetic Hyperliquid responses locally"),
+    'test-connection': ('test_connection.py', "Check the Hyperliquid connection"),
+    'collect': ('multi_timeframe_collector.py', "Collect candles for the watchlist timeframes"),
+    'ring-buffer': ('candle_ring_buffer.py', "Show or remove the shared-memory candle rings"),
+    'market-context': ('market_context.py', "Snapshot every market's context and preview skipped fetches"),
+    'schedule': ('scan_scheduler.py', "Show when each watchlist timeframe is fetched and analyzed next"),
+    'lookback': ('lookback_planner.py', "Show the candles each analyzer needs and the next fetch sizes"),
+    'indicators': ('indicator_engine.py', "Show the indicator DAG one master analysis evaluates and what it shares"),
+    'kernels': ('indicator_kernels.py', "Compile the signal kernels (numba) and time them against Python"),
+    'detect': ('signal_detector_service.py', "Run the signal detector (--once for a single scan)"),
+    'dashboard': ('trading_dashboard.py', "Print the trading dashboard"),
+    'monitor': ('orchestrator.py', "Run collection, detection and dashboard jobs (--once for one cycle)"),
+    'updater': ('auto_updater.py', "Run the legacy auto-updater"),
+    'outcomes': ('signal_outcomes.py', "Label stored signals with forward returns and MFE/MAE"),
+    'retention': ('retention.py', "Roll up, archive and delete old candles (--dry-run to preview)"),
+    'sweep': ('parameter_sweep.py', "Rank confluence settings by signal outcomes on stored history"),
+    'history-signals': ('history_signals.py', "Write every historical bar reaching the confluence threshold (CSV or Excel)"),
+    'universe': ('universe_scanner.py', "Rank every Hyperliquid perp by master confluence"),
+    'watchlist': ('check_watchlist.py', "Show the current watchlist"),
+    'update-watchlist': ('update_watchlist.py', "Replace the legacy watchlist pairs"),
+    'web': ('web/serve.py', "Run the web interface on a production server"),
+    'web-dev': ('web/app.py', "Run the web interface on Flask's development server"),
+    'importtime': ('import_benchmark.py', "Measure import time per command (-X importtime)"),
+}
+
+
+def print_usage():
+    """List the available commands"""
+    print("🌪️🌊 Wind Catcher & River Turn")
+    print("="*60)
+    print("Usage: python cli.py <command> [options]\n")
+    print("Commands:")
+    for name, (script, description) in COMMANDS.items():
+        print(f"  {name:18} {description}")
+    print("\nRun 'python cli.py <command> --help' for command options (where supported)")
+
+
+def run_command(name, args):
+    """
+    Run a command's script as __main__ with the given arguments
+
+    Args:
+        name (str): Command name from COMMANDS
+        args (list): Arguments passed on to the script
+
+    Returns:
+        int: Exit code
+    """
+    script = TRADING_SYSTEM_DIR / COMMANDS[name][0]
+
+    # Scripts use paths relative to their own directory (e.g. data/trading_system.db)
+    os.chdir(script.parent)
+    sys.path.insert(0, str(script.parent))
+    if script.parent != TRADING_SYSTEM_DIR:
+        sys.path.insert(1, str(TRADING_SYSTEM_DIR))
+    sys.argv = [str(script)] + list(args)
+
+    try:
+        runpy.run_path(str(script), run_name='__main__')
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code)
+        return 1
+    except KeyboardInterrupt:
+        print("\n⏹️ Stopped")
+        return 130
+
+    return 0
+
+
+def main(argv=None):
+    """CLI entry point"""
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        print_usage()
+        return 0
+
+    name, args = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"❌ Unknown command: {name}\n")
+        print_usage()
+        return 2
+
+    return run_command(name, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
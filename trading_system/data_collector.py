@@ -7,7 +7,8 @@ import time
 from datetime import datetime
 from utils import (
     load_config, connect_to_database, validate_ohlcv_data,
-    normalize_timestamp, get_current_timestamp, log_message
+    normalize_timestamp, get_current_timestamp, log_message,
+    update_pair_freshness, store_candles
 )
 from hyperliquid_connector import connect_to_hyperliquid
 
@@ -57,8 +58,10 @@ def fetch_and_store_ohlcv(connector, conn, symbol, timeframe='1h', limit=24):
         cursor = conn.cursor()
         stored_count = 0
         skipped_count = 0
+        latest_timestamp = 0
         current_time = get_current_timestamp()
 
+        candles = []
         for candle in ohlcv_data:
             try:
                 # Validate candle data
@@ -66,26 +69,17 @@ def fetch_and_store_ohlcv(connector, conn, symbol, timeframe='1h', limit=24):
 
                 # Normalize timestamp to seconds
                 timestamp = normalize_timestamp(candle[0])
-                open_price = candle[1]
-                high_price = candle[2]
-                low_price = candle[3]
-                close_price = candle[4]
-                volume = candle[5]
-
-                cursor.execute('''
-                    INSERT OR REPLACE INTO price_data
-                    (symbol, timeframe, timestamp, open, high, low, close, volume, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (symbol, timeframe, timestamp, open_price, high_price,
-                      low_price, close_price, volume, current_time))
-
-                stored_count += 1
+                candles.append((timestamp, *candle[1:6]))
+                latest_timestamp = max(latest_timestamp, timestamp)
 
             except ValueError as e:
                 skipped_count += 1
                 print(f"⚠️ Skipped invalid candle for {symbol}: {e}")
-            except Exception as e:
-                print(f"⚠️ Error storing candle for {symbol}: {e}")
+
+        if candles:
+            store_candles(cursor, symbol, timeframe, candles, current_time)
+            stored_count = len(candles)
+            update_pair_freshness(cursor, symbol, timeframe, latest_timestamp)
 
         conn.commit()
 
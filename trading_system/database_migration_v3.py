@@ -0,0 +1,219 @@
+"""
+Database Migration Script - Version 3
+Adds incrementally maintained summary tables so the web dashboard can answer
+stats/status requests with single-row lookups instead of full scans:
+
+- signal_daily_stats: per-day signal counters kept current by triggers on signals
+- pair_freshness: latest candle timestamp per symbol/timeframe, written by the collectors
+"""
+
+import sqlite3
+from utils import DATABASE_FILE, get_current_timestamp
+
+# Day key uses local time so it matches the dashboard's "since midnight" window
+SIGNAL_DAY = "date({row}.timestamp, 'unixepoch', 'localtime')"
+
+# Counter deltas for one signal row (used by the insert/delete/update triggers)
+SIGNAL_COUNTERS = {
+    'total': "1",
+    'perfect': "CASE WHEN {row}.confluence_score >= 3.0 THEN 1 ELSE 0 END",
+    'excellent': "CASE WHEN {row}.confluence_score >= 2.5 AND {row}.confluence_score < 3.0 THEN 1 ELSE 0 END",
+    'wind_catcher': "CASE WHEN {row}.system = 'wind_catcher' THEN 1 ELSE 0 END",
+    'river_turn': "CASE WHEN {row}.system = 'river_turn' THEN 1 ELSE 0 END"
+}
+
+
+def _add_counts_sql(row):
+    """Upsert adding one signal row's counters to its day"""
+    columns = ', '.join(SIGNAL_COUNTERS)
+    values = ', '.join(expr.format(row=row) for expr in SIGNAL_COUNTERS.values())
+    updates = ', '.join(f"{col} = {col} + excluded.{col}" for col in SIGNAL_COUNTERS)
+    return f"""
+            INSERT INTO signal_daily_stats (day, {columns})
+            VALUES ({SIGNAL_DAY.format(row=row)}, {values})
+            ON CONFLICT(day) DO UPDATE SET {updates};"""
+
+
+def _subtract_counts_sql(row):
+    """Update removing one signal row's counters from its day"""
+    updates = ', '.join(f"{col} = {col} - ({expr.format(row=row)})" for col, expr in SIGNAL_COUNTERS.items())
+    return f"""
+            UPDATE signal_daily_stats SET {updates}
+            WHERE day = {SIGNAL_DAY.format(row=row)};"""
+
+
+def create_signal_daily_stats(conn):
+    """Create the signal_daily_stats table and the triggers that maintain it"""
+    cursor = conn.cursor()
+
+    print("\n🔧 Creating signal_daily_stats table...")
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS signal_daily_stats (
+            day TEXT PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0,
+            perfect INTEGER NOT NULL DEFAULT 0,
+            excellent INTEGER NOT NULL DEFAULT 0,
+            wind_catcher INTEGER NOT NULL DEFAULT 0,
+            river_turn INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_signals_stats_insert
+        AFTER INSERT ON signals
+        BEGIN{_add_counts_sql('NEW')}
+        END
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_signals_stats_delete
+        AFTER DELETE ON signals
+        BEGIN{_subtract_counts_sql('OLD')}
+        END
+    ''')
+
+    # Only fires when a counted column changes (not for "notified" updates)
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_signals_stats_update
+        AFTER UPDATE OF timestamp, confluence_score, system ON signals
+        BEGIN{_subtract_counts_sql('OLD')}{_add_counts_sql('NEW')}
+        END
+    ''')
+
+    conn.commit()
+    print("✅ signal_daily_stats table and triggers created")
+
+
+def backfill_signal_daily_stats(conn):
+    """Rebuild signal_daily_stats from the existing signals"""
+    cursor = conn.cursor()
+
+    print("\n🔄 Backfilling signal_daily_stats...")
+
+    columns = ', '.join(SIGNAL_COUNTERS)
+    sums = ', '.join(f"SUM({expr.format(row='signals')})" for expr in SIGNAL_COUNTERS.values())
+
+    cursor.execute("DELETE FROM signal_daily_stats")
+    cursor.execute(f'''
+        INSERT INTO signal_daily_stats (day, {columns})
+        SELECT {SIGNAL_DAY.format(row='signals')}, {sums}
+        FROM signals
+        GROUP BY 1
+    ''')
+
+    conn.commit()
+    print(f"✅ Backfilled {cursor.rowcount} days of signal statistics")
+
+
+def create_pair_freshness(conn):
+    """Create the pair_freshness table"""
+    cursor = conn.cursor()
+
+    print("\n🔧 Creating pair_freshness table...")
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pair_freshness (
+            symbol TEXT NOT NULL,
+            timeframe TEXT NOT NULL,
+            last_timestamp INTEGER NOT NULL,
+            updated_at INTEGER NOT NULL,
+            PRIMARY KEY (symbol, timeframe)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_pair_freshness_last_timestamp
+        ON pair_freshness (last_timestamp DESC)
+    ''')
+
+    conn.commit()
+    print("✅ pair_freshness table created")
+
+
+def backfill_pair_freshness(conn):
+    """Seed pair_freshness with the latest candle of every stored pair"""
+    cursor = conn.cursor()
+
+    print("\n🔄 Backfilling pair_freshness...")
+
+    # GROUP BY symbol, timeframe walks idx_price_data_symbol_timeframe_timestamp
+    cursor.execute('''
+        INSERT OR REPLACE INTO pair_freshness (symbol, timeframe, last_timestamp, updated_at)
+        SELECT symbol, timeframe, MAX(timestamp), ?
+        FROM price_data
+        GROUP BY symbol, timeframe
+    ''', (get_current_timestamp(),))
+
+    conn.commit()
+    print(f"✅ Backfilled freshness for {cursor.rowcount} pairs")
+
+
+def verify_migration(conn):
+    """Verify the summary tables match the source tables"""
+    cursor = conn.cursor()
+
+    print("\n✅ Migration Verification:")
+    print("="*60)
+
+    cursor.execute("SELECT COALESCE(SUM(total), 0) FROM signal_daily_stats")
+    counted = cursor.fetchone()[0]
+    cursor.execute("SELECT COUNT(*) FROM signals")
+    actual = cursor.fetchone()[0]
+    status = "✅" if counted == actual else "❌"
+    print(f"{status} signal_daily_stats total: {counted} (signals table: {actual})")
+
+    cursor.execute("SELECT COUNT(*), MAX(last_timestamp) FROM pair_freshness")
+    pairs, latest = cursor.fetchone()
+    print(f"pair_freshness: {pairs} pairs, latest candle {latest}")
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE 'trg_signals_stats_%'")
+    triggers = cursor.fetchall()
+    print(f"\nTriggers created: {len(triggers)}")
+    for trigger in triggers:
+        print(f"  - {trigger[0]}")
+
+    print("="*60)
+
+
+def main():
+    """Run the database migration"""
+    print("🚀 Wind Catcher & River Turn - Database Migration to V3")
+    print("="*60)
+    print("\nThis migration will:")
+    print("  1. Create signal_daily_stats (maintained by triggers on signals)")
+    print("  2. Backfill it from existing signals")
+    print("  3. Create pair_freshness (updated by the data collectors)")
+    print("  4. Backfill it from existing price data")
+    print("\n⚠️  This is a NON-DESTRUCTIVE migration.")
+    print("   Existing tables are not modified and it is safe to re-run.")
+    print("="*60)
+
+    try:
+        conn = sqlite3.connect(str(DATABASE_FILE))
+        print(f"\n✅ Connected to database: {DATABASE_FILE}")
+
+        create_signal_daily_stats(conn)
+        backfill_signal_daily_stats(conn)
+        create_pair_freshness(conn)
+        backfill_pair_freshness(conn)
+        verify_migration(conn)
+
+        conn.close()
+
+        print("\n" + "="*60)
+        print("✅ DATABASE MIGRATION COMPLETED SUCCESSFULLY!")
+        print("="*60)
+
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,245 @@
+"""
+Database Migration Script - Version 4
+Moves candles into a clustered WITHOUT ROWID table with integer-coded symbols
+and timeframes:
+
+- symbols / timeframes: dictionary tables (id, name)
+- price_candles: one B-tree keyed by (symbol_id, timeframe_id, timestamp)
+- price_data: becomes a view over price_candles with INSTEAD OF triggers,
+  so existing queries and inserts keep working unchanged
+
+The old price_data table stored every candle three times (rowid table,
+UNIQUE autoindex and the v2 index), each keyed by repeated symbol/timeframe
+strings. The migration prints database size and the analyzers'
+"ORDER BY timestamp DESC LIMIT 200" read time before and after.
+
+Stop the orchestrator/collectors before running - the copy and the final
+VACUUM need exclusive access.
+"""
+
+import sqlite3
+import statistics
+import time
+from datetime import datetime
+
+from utils import DATABASE_FILE, has_clustered_price_data
+from database_setup import create_price_tables
+from retention import format_bytes
+
+# Old table is renamed to this while its rows are copied
+LEGACY_TABLE = 'price_data_v3'
+
+# Same read every analyzer's get_price_data() runs
+ANALYZER_QUERY = '''
+    SELECT timestamp, open, high, low, close, volume
+    FROM price_data
+    WHERE symbol = ? AND timeframe = ?
+    ORDER BY timestamp DESC
+    LIMIT 200
+'''
+
+# Pairs and repeats used for the read timing
+READ_PAIRS = 50
+READ_REPEATS = 20
+
+
+def backup_database(conn):
+    """Copy the database next to itself with the online backup API"""
+    backup_file = DATABASE_FILE.with_name(f"{DATABASE_FILE.name}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+    print(f"\n💾 Backing up to {backup_file.name}...")
+    backup = sqlite3.connect(str(backup_file))
+    try:
+        conn.backup(backup)
+    finally:
+        backup.close()
+    print("✅ Backup written")
+
+    return backup_file
+
+
+def measure_layout(conn):
+    """
+    Database size and median analyzer read time
+
+    Returns:
+        dict: bytes, read_ms (None without price data), pairs
+    """
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+
+    pairs = conn.execute(f'''
+        SELECT DISTINCT symbol, timeframe FROM price_data ORDER BY symbol, timeframe LIMIT {READ_PAIRS}
+    ''').fetchall()
+
+    timings = []
+    for symbol, timeframe in pairs:
+        for _ in range(READ_REPEATS):
+            started = time.perf_counter()
+            conn.execute(ANALYZER_QUERY, (symbol, timeframe)).fetchall()
+            timings.append(time.perf_counter() - started)
+
+    return {
+        'bytes': page_size * page_count,
+        'read_ms': statistics.median(timings) * 1000 if timings else None,
+        'pairs': len(pairs)
+    }
+
+
+def migrate_price_data(conn):
+    """
+    Copy price_data into price_candles and replace the table with the view
+
+    Runs in one transaction - on any error the database is left unchanged.
+
+    Returns:
+        int: Candles copied
+    """
+    cursor = conn.cursor()
+
+    print("\n🔧 Creating price_candles, symbols and timeframes...")
+
+    try:
+        cursor.execute("BEGIN")
+        cursor.execute(f"ALTER TABLE price_data RENAME TO {LEGACY_TABLE}")
+        create_price_tables(cursor)
+
+        cursor.execute(f"INSERT INTO symbols (symbol) SELECT DISTINCT symbol FROM {LEGACY_TABLE} ORDER BY symbol")
+        cursor.execute(f"INSERT INTO timeframes (timeframe) SELECT DISTINCT timeframe FROM {LEGACY_TABLE} ORDER BY timeframe")
+        print(f"✅ Coded {conn.execute('SELECT COUNT(*) FROM symbols').fetchone()[0]} symbols and "
+              f"{conn.execute('SELECT COUNT(*) FROM timeframes').fetchone()[0]} timeframes")
+
+        print("\n🔄 Copying candles...")
+        # Key order, so the new B-tree is built by appending
+        cursor.execute(f'''
+            INSERT INTO price_candles
+                (symbol_id, timeframe_id, timestamp, open, high, low, close, volume, created_at)
+            SELECT s.id, t.id, p.timestamp, p.open, p.high, p.low, p.close, p.volume, p.created_at
+            FROM {LEGACY_TABLE} p
+            JOIN symbols s ON s.symbol = p.symbol
+            JOIN timeframes t ON t.timeframe = p.timeframe
+            ORDER BY s.id, t.id, p.timestamp
+        ''')
+
+        copied = conn.execute("SELECT COUNT(*) FROM price_candles").fetchone()[0]
+        expected = conn.execute(f"SELECT COUNT(*) FROM {LEGACY_TABLE}").fetchone()[0]
+        if copied != expected:
+            raise RuntimeError(f"Copied {copied} candles but {LEGACY_TABLE} has {expected}")
+
+        cursor.execute(f"DROP TABLE {LEGACY_TABLE}")
+        cursor.execute(f"DELETE FROM sqlite_sequence WHERE name IN ('price_data', '{LEGACY_TABLE}')")
+        cursor.execute("COMMIT")
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+
+    print(f"✅ Copied {copied:,} candles")
+    return copied
+
+
+def compact_database(conn):
+    """
+    Rewrite the file so the dropped table's pages are released
+
+    Also switches to auto_vacuum = INCREMENTAL (only possible during a
+    VACUUM), so retention.py can shrink the file later on.
+    """
+    print("\n⏳ Running VACUUM...")
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    print("✅ Database compacted")
+
+
+def print_comparison(before, after):
+    """Print size and read time before -> after"""
+    print("\n📏 Before / after")
+    print("="*60)
+
+    change = (after['bytes'] - before['bytes']) / before['bytes'] * 100 if before['bytes'] else 0
+    print(f"   Database size        {format_bytes(before['bytes']):>10} → {format_bytes(after['bytes']):>10}  ({change:+.0f}%)")
+
+    if before['read_ms'] is not None and after['read_ms'] is not None:
+        print(f"   LIMIT 200 read       {before['read_ms']:>7.3f} ms → {after['read_ms']:>7.3f} ms  "
+              f"(median of {before['pairs']} pairs x {READ_REPEATS})")
+
+    print("="*60)
+
+
+def verify_migration(conn):
+    """Verify the view, triggers and the analyzer read's query plan"""
+    print("\n✅ Migration Verification:")
+    print("="*60)
+
+    candles = conn.execute("SELECT COUNT(*) FROM price_candles").fetchone()[0]
+    via_view = conn.execute("SELECT COUNT(*) FROM price_data").fetchone()[0]
+    status = "✅" if candles == via_view else "❌"
+    print(f"{status} price_data view: {via_view:,} candles (price_candles: {candles:,})")
+
+    triggers = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'price_data' ORDER BY name"
+    ).fetchall()
+    print(f"\nTriggers created: {len(triggers)}")
+    for trigger in triggers:
+        print(f"  - {trigger[0]}")
+
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {ANALYZER_QUERY}", ('BTC', '1h')).fetchall()
+    print("\nAnalyzer read plan:")
+    for row in plan:
+        print(f"  - {row[-1]}")
+
+    print("="*60)
+
+
+def main():
+    """Run the database migration"""
+    print("🚀 Wind Catcher & River Turn - Database Migration to V4")
+    print("="*60)
+    print("\nThis migration will:")
+    print("  1. Back up the database")
+    print("  2. Copy price_data into the clustered price_candles table")
+    print("  3. Replace the price_data table with a view over it")
+    print("  4. VACUUM to release the old table's pages")
+    print("\n⚠️  Stop the orchestrator and collectors first.")
+    print("   The old table is dropped - restore the backup to roll back.")
+    print("="*60)
+
+    try:
+        conn = sqlite3.connect(str(DATABASE_FILE), isolation_level=None)
+        print(f"\n✅ Connected to database: {DATABASE_FILE}")
+
+        if has_clustered_price_data(conn):
+            print("\n⏭️  price_data is already a view over price_candles, nothing to migrate")
+            verify_migration(conn)
+            conn.close()
+            return True
+
+        backup_database(conn)
+
+        print("\n⏱️  Measuring current layout...")
+        before = measure_layout(conn)
+
+        migrate_price_data(conn)
+        compact_database(conn)
+
+        after = measure_layout(conn)
+        print_comparison(before, after)
+        verify_migration(conn)
+
+        conn.close()
+
+        print("\n" + "="*60)
+        print("✅ DATABASE MIGRATION COMPLETED SUCCESSFULLY!")
+        print("="*60)
+
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
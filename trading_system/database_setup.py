@@ -6,6 +6,12 @@ This creates the SQLite database and tables for storing price data
 import sqlite3
 from datetime import datetime
 from utils import ensure_directories, DATABASE_FILE, get_current_timestamp
+from database_migration_v2 import enhance_signals_table
+from database_migration_v3 import create_signal_daily_stats, create_pair_freshness
+
+# Dictionary id of a view row's symbol/timeframe (used inside the price_data triggers)
+SYMBOL_ID = "(SELECT id FROM symbols WHERE symbol = {row}.symbol)"
+TIMEFRAME_ID = "(SELECT id FROM timeframes WHERE timeframe = {row}.timeframe)"
 
 def create_database():
     """Create the main database file"""
@@ -17,19 +23,56 @@ def create_database():
     conn = sqlite3.connect(str(DATABASE_FILE))
     print(f"✅ Connected to database: {DATABASE_FILE}")
 
+    # Lets retention.py return deleted candles' pages to the OS (only applies to a new, empty file)
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
     return conn
 
-def create_tables(conn):
-    """Create all the tables we need"""
-    
-    cursor = conn.cursor()
-    
-    # Table 1: Price data (OHLCV - Open, High, Low, Close, Volume)
+def _add_dictionary_entries_sql(row):
+    """Insert a view row's symbol/timeframe into the dictionary tables if they're new"""
+    # NOT EXISTS instead of INSERT OR IGNORE: an outer INSERT OR REPLACE would turn
+    # OR IGNORE into OR REPLACE and give an existing symbol a new id
+    return f"""
+            INSERT INTO symbols (symbol)
+            SELECT {row}.symbol WHERE NOT EXISTS (SELECT 1 FROM symbols WHERE symbol = {row}.symbol);
+            INSERT INTO timeframes (timeframe)
+            SELECT {row}.timeframe WHERE NOT EXISTS (SELECT 1 FROM timeframes WHERE timeframe = {row}.timeframe);"""
+
+def create_price_tables(cursor):
+    """
+    Create the clustered price_candles table and the price_data view over it
+
+    Candles live in one WITHOUT ROWID B-tree keyed by (symbol_id, timeframe_id,
+    timestamp), so a pair's candles are stored together in time order and the
+    analyzers' "ORDER BY timestamp DESC LIMIT 200" is a single range read.
+    Symbols and timeframes are stored once in dictionary tables.
+
+    price_data is a view with the old table's columns (minus id). Its INSTEAD
+    OF triggers translate inserts, updates and deletes, so scripts written
+    against the old table keep working - including INSERT OR REPLACE and
+    INSERT OR IGNORE, whose conflict policy applies to the trigger's insert.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor on the database
+    """
     cursor.execute('''
-        CREATE TABLE IF NOT EXISTS price_data (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            symbol TEXT NOT NULL,
-            timeframe TEXT NOT NULL,
+        CREATE TABLE IF NOT EXISTS symbols (
+            id INTEGER PRIMARY KEY,
+            symbol TEXT NOT NULL UNIQUE
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS timeframes (
+            id INTEGER PRIMARY KEY,
+            timeframe TEXT NOT NULL UNIQUE
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS price_candles (
+            symbol_id INTEGER NOT NULL,
+            timeframe_id INTEGER NOT NULL,
             timestamp INTEGER NOT NULL,
             open REAL NOT NULL,
             high REAL NOT NULL,
@@ -37,10 +80,62 @@ def create_tables(conn):
             close REAL NOT NULL,
             volume REAL NOT NULL,
             created_at INTEGER NOT NULL,
-            UNIQUE(symbol, timeframe, timestamp)
-        )
+            PRIMARY KEY (symbol_id, timeframe_id, timestamp)
+        ) WITHOUT ROWID
+    ''')
+
+    cursor.execute('''
+        CREATE VIEW IF NOT EXISTS price_data AS
+        SELECT s.symbol AS symbol, t.timeframe AS timeframe, c.timestamp AS timestamp,
+               c.open AS open, c.high AS high, c.low AS low, c.close AS close,
+               c.volume AS volume, c.created_at AS created_at
+        FROM price_candles c
+        JOIN symbols s ON s.id = c.symbol_id
+        JOIN timeframes t ON t.id = c.timeframe_id
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_price_data_insert
+        INSTEAD OF INSERT ON price_data
+        BEGIN{_add_dictionary_entries_sql('NEW')}
+            INSERT INTO price_candles
+                (symbol_id, timeframe_id, timestamp, open, high, low, close, volume, created_at)
+            VALUES ({SYMBOL_ID.format(row='NEW')}, {TIMEFRAME_ID.format(row='NEW')}, NEW.timestamp,
+                    NEW.open, NEW.high, NEW.low, NEW.close, NEW.volume, NEW.created_at);
+        END
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_price_data_update
+        INSTEAD OF UPDATE ON price_data
+        BEGIN{_add_dictionary_entries_sql('NEW')}
+            UPDATE price_candles SET
+                symbol_id = {SYMBOL_ID.format(row='NEW')}, timeframe_id = {TIMEFRAME_ID.format(row='NEW')},
+                timestamp = NEW.timestamp, open = NEW.open, high = NEW.high, low = NEW.low,
+                close = NEW.close, volume = NEW.volume, created_at = NEW.created_at
+            WHERE symbol_id = {SYMBOL_ID.format(row='OLD')} AND timeframe_id = {TIMEFRAME_ID.format(row='OLD')}
+              AND timestamp = OLD.timestamp;
+        END
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_price_data_delete
+        INSTEAD OF DELETE ON price_data
+        BEGIN
+            DELETE FROM price_candles
+            WHERE symbol_id = {SYMBOL_ID.format(row='OLD')} AND timeframe_id = {TIMEFRAME_ID.format(row='OLD')}
+              AND timestamp = OLD.timestamp;
+        END
     ''')
-    print("✅ Created price_data table")
+
+def create_tables(conn):
+    """Create all the tables we need"""
+    
+    cursor = conn.cursor()
+    
+    # Table 1: Price data (OHLCV - Open, High, Low, Close, Volume)
+    create_price_tables(cursor)
+    print("✅ Created price_candles table and price_data view")
     
     # Table 2: Watchlist (coins we're monitoring)
     cursor.execute('''
@@ -68,6 +163,14 @@ def create_tables(conn):
         )
     ''')
     print("✅ Created signals table")
+
+    # Confluence columns (database_migration_v2.py) - the v3 stats triggers count confluence_score
+    enhance_signals_table(conn)
+
+    # Summary tables the dashboard and lookback planner read instead of
+    # scanning signals and price_data (database_migration_v3.py)
+    create_signal_daily_stats(conn)
+    create_pair_freshness(conn)
     
     # Save changes
     conn.commit()
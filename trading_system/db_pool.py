@@ -0,0 +1,164 @@
+"""
+SQLite Connection Pool for Wind Catcher & River Turn Trading System
+Keeps a small set of open connections that request handlers and services reuse
+instead of connecting and closing on every call
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from utils import DATABASE_FILE
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of reusable SQLite connections
+
+    Connections are created lazily up to `size` and handed out LIFO so the
+    most recently used (warmest page cache) connection is reused first.
+    The pool is per process: a worker forked from a parent that already
+    opened connections starts with an empty pool of its own.
+    """
+
+    def __init__(self, database=None, size=8, read_only=True, timeout=5.0, row_factory=sqlite3.Row):
+        """
+        Initialize the pool
+
+        Args:
+            database (str/Path): Database file (defaults to DATABASE_FILE)
+            size (int): Maximum number of open connections
+            read_only (bool): Open connections with mode=ro (no writes possible)
+            timeout (float): Seconds to wait for a free connection / busy database
+            row_factory: sqlite3 row factory applied to every connection
+        """
+        self.database = Path(database or DATABASE_FILE).resolve()
+        self.size = size
+        self.read_only = read_only
+        self.timeout = timeout
+        self.row_factory = row_factory
+
+        self._reset()
+
+    def _reset(self):
+        """Start with no connections (also used after a fork)"""
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue(maxsize=self.size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _check_pid(self):
+        """Drop connections inherited from a parent process"""
+        if self._pid != os.getpid():
+            # SQLite connections must not cross fork(); abandon them without closing
+            self._reset()
+
+    def _create_connection(self):
+        """Open a new connection configured for pooled use"""
+        if self.read_only:
+            uri = f"{self.database.as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=self.timeout, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(str(self.database), timeout=self.timeout, check_same_thread=False)
+            # WAL (see enable_wal) only needs NORMAL sync to stay consistent
+            conn.execute("PRAGMA synchronous = NORMAL")
+
+        conn.row_factory = self.row_factory
+        return conn
+
+    def acquire(self):
+        """
+        Take a connection from the pool, opening a new one if below capacity
+
+        Returns:
+            sqlite3.Connection: Connection that must be given back with release()
+
+        Raises:
+            TimeoutError: If every connection stays busy for `timeout` seconds
+        """
+        self._check_pid()
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._create_connection()
+                except Exception:
+                    self._created -= 1
+                    raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No database connection available after {self.timeout}s")
+
+    def release(self, conn):
+        """Return a connection to the pool (rolls back any open transaction)"""
+        if self._pid != os.getpid():
+            return
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put_nowait(conn)
+        except (sqlite3.Error, queue.Full):
+            # Broken or surplus connection - drop it and free its slot
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager that borrows a connection for the duration of a block
+
+        Usage:
+            with pool.connection() as conn:
+                conn.execute(...)
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self):
+        """Close every idle connection (busy ones close when released)"""
+        self._check_pid()
+
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+def enable_wal(database=None):
+    """
+    Switch a database to write-ahead logging
+
+    WAL lets the web server's readers run while the collectors and the
+    signal detector write. The setting is stored in the database file, so
+    this only needs to run once, but it is cheap to repeat.
+
+    Args:
+        database (str/Path): Database file (defaults to DATABASE_FILE)
+
+    Returns:
+        str: Journal mode now in effect (e.g. 'wal')
+    """
+    conn = sqlite3.connect(str(Path(database or DATABASE_FILE)))
+    try:
+        return conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+    finally:
+        conn.close()
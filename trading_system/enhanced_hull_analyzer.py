@@ -8,6 +8,9 @@ import numpy as np
 import sqlite3
 import yaml
 from datetime import datetime
+from utils import timeframe_to_seconds
+from indicator_engine import IndicatorEngine, hull, weighted_moving_average
+from indicator_kernels import hull_cross_retests
 
 def load_config():
     """Load configuration"""
@@ -37,24 +40,34 @@ def get_price_data(conn, symbol, timeframe='1h', limit=200):
     df['datetime'] = pd.to_datetime(df['timestamp'], unit='s')
     return df
 
+def data_requirements(timeframe='1h'):
+    """
+    Candles analyze_symbol_hull needs (collected by lookback_planner.py)
+
+    Hull 34's first value needs 34 + int(sqrt(34)) - 1 = 38 candles. Crosses
+    are looked for up to 20 candles back, with the candle before each, but
+    only count when retested within 15 candles and 12 hours - on longer
+    timeframes the 12 hours reach back fewer candles.
+
+    Args:
+        timeframe (str): Candle timeframe
+
+    Returns:
+        dict: min_bars (fewer and there is no analysis) and window (candles
+              loaded - older ones don't change the latest candle's signals)
+    """
+    warmup = 34 + int(np.sqrt(34)) - 1
+    retest_candles = 12 * 3600 // timeframe_to_seconds(timeframe)
+    lookback = min(20, 15 + retest_candles)
+    return {'min_bars': warmup + lookback, 'window': warmup + lookback}
+
+def indicator_nodes():
+    """Indicator engine nodes analyze_symbol_hull reads (Hull 21 and 34 of the close)"""
+    return [hull('close', 21), hull('close', 34)]
+
 def calculate_wma(prices, period):
     """Calculate Weighted Moving Average"""
-    if len(prices) < period:
-        return pd.Series([np.nan] * len(prices), index=prices.index)
-    
-    weights = np.arange(1, period + 1)
-    wma = []
-    
-    for i in range(len(prices)):
-        if i < period - 1:
-            wma.append(np.nan)
-        else:
-            price_window = prices.iloc[i-period+1:i+1]
-            weighted_sum = np.sum(price_window * weights)
-            weight_sum = np.sum(weights)
-            wma.append(weighted_sum / weight_sum)
-    
-    return pd.Series(wma, index=prices.index)
+    return weighted_moving_average(prices, period)
 
 def calculate_hull_ma(prices, period):
     """Calculate Hull Moving Average"""
@@ -111,109 +124,60 @@ def detect_hull_cross_retests(df, lookback=20):
     if len(df) < lookback:
         return []
     
-    retests = []
+    # Crosses up to 5 candles before the latest, each one's first retest in
+    # the next 14 candles and 12 hours (see indicator_kernels.hull_cross_retests)
+    found = hull_cross_retests(
+        df['hull_21'].to_numpy(dtype=np.float64), df['hull_34'].to_numpy(dtype=np.float64),
+        df['close'].to_numpy(dtype=np.float64), df['high'].to_numpy(dtype=np.float64),
+        df['low'].to_numpy(dtype=np.float64), df['timestamp'].to_numpy(dtype=np.int64),
+        lookback, 15, 12
+    )
     
-    # Look for Hull 21/34 crosses in recent history
-    for i in range(len(df) - lookback, len(df) - 5):  # Don't check too recent for cross
-        if (pd.isna(df['hull_21'].iloc[i]) or pd.isna(df['hull_34'].iloc[i]) or
-            pd.isna(df['hull_21'].iloc[i-1]) or pd.isna(df['hull_34'].iloc[i-1])):
-            continue
-        
-        # Current and previous Hull values
-        curr_21 = df['hull_21'].iloc[i]
-        curr_34 = df['hull_34'].iloc[i]
-        prev_21 = df['hull_21'].iloc[i-1]
-        prev_34 = df['hull_34'].iloc[i-1]
-        
-        cross_detected = False
-        cross_type = None
+    retests = []
+    for j, bullish, slow_line in found:
+        cross_type = 'bullish' if bullish else 'bearish'
+        # Hull 34 retest is stronger
+        retest_line = 'Hull 34' if slow_line else 'Hull 21'
+        retest_strength = 0.8 if slow_line else 0.6
         
-        # Bullish cross: Hull 21 crosses above Hull 34
-        if curr_21 > curr_34 and prev_21 <= prev_34:
-            cross_detected = True
-            cross_type = 'bullish'
+        retest_time = df['timestamp'].iloc[j]
+        current_time = df['timestamp'].iloc[-1]
+        hours_ago = (current_time - retest_time) / 3600
         
-        # Bearish cross: Hull 21 crosses below Hull 34
-        elif curr_21 < curr_34 and prev_21 >= prev_34:
-            cross_detected = True
-            cross_type = 'bearish'
+        system = 'wind_catcher' if cross_type == 'bullish' else 'river_turn'
+        support_resistance = 'support' if cross_type == 'bullish' else 'resistance'
         
-        if cross_detected:
-            # Look for price retests after the cross
-            for j in range(i + 1, min(i + 15, len(df))):  # Check next 15 periods
-                if (pd.isna(df['hull_21'].iloc[j]) or pd.isna(df['hull_34'].iloc[j])):
-                    continue
-                
-                current_price = df['close'].iloc[j]
-                current_high = df['high'].iloc[j]
-                current_low = df['low'].iloc[j]
-                hull_21_val = df['hull_21'].iloc[j]
-                hull_34_val = df['hull_34'].iloc[j]
-                
-                retest_detected = False
-                retest_line = None
-                retest_strength = 0.6
-                
-                if cross_type == 'bullish':
-                    # After bullish cross, look for retests as support
-                    # Hull 34 retest (stronger signal)
-                    if current_low <= hull_34_val <= current_high and current_price >= hull_34_val:
-                        retest_detected = True
-                        retest_line = 'Hull 34'
-                        retest_strength = 0.8  # Hull 34 retest is stronger
-                    
-                    # Hull 21 retest (weaker signal)
-                    elif current_low <= hull_21_val <= current_high and current_price >= hull_21_val:
-                        retest_detected = True
-                        retest_line = 'Hull 21'
-                        retest_strength = 0.6
-                
-                elif cross_type == 'bearish':
-                    # After bearish cross, look for retests as resistance
-                    # Hull 34 retest (stronger signal)
-                    if current_low <= hull_34_val <= current_high and current_price <= hull_34_val:
-                        retest_detected = True
-                        retest_line = 'Hull 34'
-                        retest_strength = 0.8  # Hull 34 retest is stronger
-                    
-                    # Hull 21 retest (weaker signal) 
-                    elif current_low <= hull_21_val <= current_high and current_price <= hull_21_val:
-                        retest_detected = True
-                        retest_line = 'Hull 21'
-                        retest_strength = 0.6
-                
-                if retest_detected:
-                    # Check timing - only recent retests
-                    retest_time = df['timestamp'].iloc[j]
-                    current_time = df['timestamp'].iloc[-1]
-                    hours_ago = (current_time - retest_time) / 3600
-                    
-                    if hours_ago <= 12:  # Only retests within last 12 hours
-                        system = 'wind_catcher' if cross_type == 'bullish' else 'river_turn'
-                        support_resistance = 'support' if cross_type == 'bullish' else 'resistance'
-                        
-                        retests.append({
-                            'type': f'hull_cross_retest_{cross_type}',
-                            'system': system,
-                            'description': f'{retest_line} {support_resistance} retest after cross',
-                            'strength': retest_strength,
-                            'timestamp': retest_time,
-                            'hours_ago': hours_ago,
-                            'retest_line': retest_line
-                        })
-                        break  # Only record first retest per cross
+        retests.append({
+            'type': f'hull_cross_retest_{cross_type}',
+            'system': system,
+            'description': f'{retest_line} {support_resistance} retest after cross',
+            'strength': retest_strength,
+            'timestamp': retest_time,
+            'hours_ago': hours_ago,
+            'retest_line': retest_line
+        })
     
     return retests
 
-def analyze_symbol_hull(conn, symbol, timeframe='1h'):
-    """Complete Hull MA analysis for a symbol"""
-    df = get_price_data(conn, symbol, timeframe=timeframe, limit=200)
-    if df is None or len(df) < 50:
+def analyze_symbol_hull(conn, symbol, timeframe='1h', engine=None):
+    """
+    Complete Hull MA analysis for a symbol
+
+    engine: IndicatorEngine over candles the caller already loaded (shares
+    its indicators with the caller's other analyzers) - read from the
+    database if None
+    """
+    requirements = data_requirements(timeframe)
+    if engine is None:
+        df = get_price_data(conn, symbol, timeframe=timeframe, limit=requirements['window'])
+    else:
+        df = engine.frame.copy()
+    if df is None or len(df) < requirements['min_bars']:
         return None
+    engine = engine or IndicatorEngine(df)
     
     # Calculate Hull MAs
-    df['hull_21'] = calculate_hull_ma(df['close'], 21)
-    df['hull_34'] = calculate_hull_ma(df['close'], 34)
+    df['hull_21'], df['hull_34'] = engine.evaluate(*indicator_nodes())
     
     # Detect signals
     hull_breaks = detect_hull_breaks(df)
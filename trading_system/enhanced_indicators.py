@@ -9,6 +9,7 @@ import sqlite3
 import yaml
 from datetime import datetime
 from scipy.signal import argrelextrema
+from indicator_engine import IndicatorEngine, median_price, sma
 
 def load_config():
     """Load configuration"""
@@ -38,11 +39,32 @@ def get_price_data(conn, symbol, timeframe='1h', limit=200):
     df['datetime'] = pd.to_datetime(df['timestamp'], unit='s')
     return df
 
+def data_requirements(timeframe='1h'):
+    """
+    Candles analyze_symbol_with_ao needs (collected by lookback_planner.py)
+
+    AO (SMA 34 of the median price) needs 100 candles before divergences are
+    looked for. Divergences compare the last three pivots found in the whole
+    window, so unlike the other analyzers more history can change them - the
+    window stays at the 200 candles the signals were tuned on.
+
+    Args:
+        timeframe (str): Candle timeframe
+
+    Returns:
+        dict: min_bars (fewer and there is no analysis) and window (candles loaded)
+    """
+    return {'min_bars': 100, 'window': 200}
+
+def indicator_nodes(fast_period=5, slow_period=34):
+    """Indicator engine nodes AO reads (fast and slow SMAs of the median price)"""
+    return [sma(median_price(), fast_period), sma(median_price(), slow_period)]
+
 def calculate_sma(prices, period):
     """Calculate Simple Moving Average"""
     return prices.rolling(window=period, min_periods=period).mean()
 
-def calculate_awesome_oscillator(df, fast_period=5, slow_period=34):
+def calculate_awesome_oscillator(df, fast_period=5, slow_period=34, engine=None):
     """
     Calculate Awesome Oscillator (AO) - Bill Williams
     AO = SMA(high+low)/2, 5) - SMA((high+low)/2, 34)
@@ -50,12 +72,10 @@ def calculate_awesome_oscillator(df, fast_period=5, slow_period=34):
     if len(df) < slow_period:
         return pd.Series([np.nan] * len(df))
     
-    # Calculate median price (high+low)/2
-    median_price = (df['high'] + df['low']) / 2
-    
-    # Calculate fast and slow SMAs
-    fast_sma = calculate_sma(median_price, fast_period)
-    slow_sma = calculate_sma(median_price, slow_period)
+    # Fast and slow SMAs of the median price (high+low)/2 - shared with the
+    # Alligator when the engine is
+    engine = engine or IndicatorEngine(df)
+    fast_sma, slow_sma = engine.evaluate(*indicator_nodes(fast_period, slow_period))
     
     # AO = Fast SMA - Slow SMA
     ao = fast_sma - slow_sma
@@ -145,13 +165,13 @@ def detect_regular_divergence(price_data, oscillator_data, price_pivots, osc_piv
     
     return divergences
 
-def analyze_ao_divergences(df):
+def analyze_ao_divergences(df, engine=None):
     """Analyze Awesome Oscillator for divergences"""
     if len(df) < 100:
         return None
     
     # Calculate AO
-    df['ao'] = calculate_awesome_oscillator(df)
+    df['ao'] = calculate_awesome_oscillator(df, engine=engine)
     
     # Remove NaN values
     valid_data = df.dropna().copy()
@@ -203,14 +223,24 @@ def analyze_ao_divergences(df):
         'ao_pivots_low': ao_lows
     }
 
-def analyze_symbol_with_ao(conn, symbol, timeframe='1h'):
-    """Complete analysis including AO divergences"""
-    df = get_price_data(conn, symbol, timeframe=timeframe, limit=200)
-    if df is None or len(df) < 100:
+def analyze_symbol_with_ao(conn, symbol, timeframe='1h', engine=None):
+    """
+    Complete analysis including AO divergences
+
+    engine: IndicatorEngine over candles the caller already loaded (shares
+    its indicators with the caller's other analyzers) - read from the
+    database if None
+    """
+    requirements = data_requirements(timeframe)
+    if engine is None:
+        df = get_price_data(conn, symbol, timeframe=timeframe, limit=requirements['window'])
+    else:
+        df = engine.frame.copy()
+    if df is None or len(df) < requirements['min_bars']:
         return None
     
     # AO analysis
-    ao_analysis = analyze_ao_divergences(df)
+    ao_analysis = analyze_ao_divergences(df, engine=engine)
     if not ao_analysis:
         return None
     
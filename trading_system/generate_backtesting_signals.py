@@ -1,6 +1,11 @@
 """
 Generate Signals from Backtesting Watchlist Data
 Loads data from backtestingwatchlist.xlsx and generates all signals for comparison with TradingView
+
+Usage:
+    python generate_backtesting_signals.py              # latest candle of every symbol/timeframe
+    python generate_backtesting_signals.py --history    # every bar reaching the threshold (history_signals.py)
+    python generate_backtesting_signals.py --history --min-score 1.8 --output ../doc/signals.csv
 """
 
 import sys
@@ -15,15 +20,19 @@ if sys.platform == 'win32':
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
         sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
+import argparse
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
 from utils import connect_to_database
 from master_confluence import analyze_master_confluence
+from parameter_sweep import load_candles
+from history_signals import default_min_score, write_history_signals, print_progress, print_summary
 
 # Configuration
 INPUT_FILE = Path('../doc/backtestingwatchlist.xlsx')
 OUTPUT_FILE = Path('../doc/BACKTESTING_SIGNALS_REPORT.xlsx')
+HISTORY_OUTPUT_FILE = Path('../doc/BACKTESTING_HISTORY_SIGNALS.xlsx')
 
 # Symbols from the backtesting watchlist
 SYMBOLS = ['ETH', 'NEAR', 'UNI', 'BTC', 'APT', 'AERO', 'POPCAT', 'SUI', 'AAVE']
@@ -218,6 +227,42 @@ def generate_signals_for_all_combinations():
     print(f"✅ Generated {len(all_signals)} signals from backtesting data")
     return all_signals
 
+def generate_history_signals_for_all_combinations(output=HISTORY_OUTPUT_FILE, min_score=None, workers=0):
+    """
+    Score every bar of every symbol/timeframe and stream the signals to a file
+
+    Unlike generate_signals_for_all_combinations, which scores the latest
+    candle of each combination, every bar reaching min_score is written
+    (see history_signals.py) - the combinations are scored in parallel.
+
+    Args:
+        output (Path): .xlsx or .csv file
+        min_score (float): Lowest score written (default: confluence.min_score_display)
+        workers (int): Worker processes (0 = one per CPU)
+
+    Returns:
+        SignalWriter: The closed writer, None without data
+    """
+    print("\n🔍 Scoring every bar of every symbol/timeframe combination...")
+    print("=" * 80)
+
+    min_score = min_score if min_score is not None else default_min_score()
+
+    conn = connect_to_database()
+    try:
+        candles = load_candles(conn, symbols=SYMBOLS)
+    finally:
+        conn.close()
+
+    if not candles:
+        print("❌ No symbol/timeframe has enough candles to score")
+        return None
+
+    print(f"\n📊 Found {len(candles)} symbol/timeframe combinations, writing every bar scoring {min_score}+\n")
+    writer = write_history_signals(candles, output, min_score=min_score, workers=workers, progress=print_progress)
+    print_summary(writer)
+    return writer
+
 def export_signals_to_excel(signals):
     """
     Export signals to Excel file with multiple sheets for easy analysis
@@ -335,11 +380,19 @@ def export_signals_to_excel(signals):
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description="Generate signals from the backtesting watchlist data")
+    parser.add_argument('--history', action='store_true', help="Every bar reaching the threshold, not just the latest")
+    parser.add_argument('--min-score', type=float, help="Lowest score written with --history (default: confluence.min_score_display)")
+    parser.add_argument('--workers', type=int, default=0, help="Worker processes with --history (0 = one per CPU)")
+    parser.add_argument('--output', type=Path, help=f"Output .xlsx or .csv with --history (default: {HISTORY_OUTPUT_FILE})")
+    args = parser.parse_args()
+    output = (args.output or HISTORY_OUTPUT_FILE) if args.history else OUTPUT_FILE
+
     print("\n" + "=" * 80)
     print("🚀 BACKTESTING SIGNALS GENERATOR")
     print("=" * 80)
     print(f"📋 Input: {INPUT_FILE}")
-    print(f"📋 Output: {OUTPUT_FILE}")
+    print(f"📋 Output: {output}")
     print(f"📊 Symbols: {', '.join(SYMBOLS)}")
     print(f"⏱️  Timeframes: {', '.join(TIMEFRAMES)}")
     print("=" * 80)
@@ -362,6 +415,16 @@ def main():
         print("❌ No data stored in database")
         return
 
+    if args.history:
+        # Step 3: Score every bar, streaming the signals to the output
+        print("\n🔄 STEP 3: Generate Signals from Every Bar")
+        writer = generate_history_signals_for_all_combinations(output, args.min_score, args.workers)
+
+        elapsed = datetime.now() - start_time
+        print(f"\n⏱️  Total time: {elapsed.total_seconds():.1f} seconds")
+        print(f"📊 Total signals: {writer.rows if writer else 0}")
+        return
+
     # Step 3: Generate signals
     print("\n🔄 STEP 3: Generate Signals from All Data")
     signals = generate_signals_for_all_combinations()
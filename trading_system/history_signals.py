@@ -0,0 +1,415 @@
+"""
+Whole-History Signals for Wind Catcher & River Turn
+Every bar of the stored history that reaches the confluence threshold, for
+the backtesting reports - analyze_master_confluence only scores the latest
+candle of the window it loads:
+
+- each symbol/timeframe is scored bar by bar in one vectorized_confluence
+  pass (the master confluence rules, as if the analyzers' window ended at
+  that bar)
+- pairs are scored in parallel worker processes that map the candles from
+  one shared memory block (see parameter_sweep.share_candles)
+- rows are streamed to the output as each pair finishes - CSV, or an .xlsx
+  workbook written in openpyxl's write-only mode - so the report never has
+  to be held in memory
+
+A pair's first 199 bars are never scored (no full analyzer window).
+
+Usage:
+    python history_signals.py                               # every stored pair to logs/history_signals/
+    python history_signals.py --symbols BTC ETH --timeframes 1h 4h
+    python history_signals.py --min-score 1.8 --output ../doc/HISTORY_SIGNALS.xlsx
+    python history_signals.py --cooldown 4                  # one signal per pair per 4 hours, like the detector
+"""
+
+import sys
+import io
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+
+from utils import connect_to_database, load_config, LOGS_DIR
+from parameter_sweep import COLUMNS, load_candles, share_candles, split_candles
+from vectorized_confluence import (CLASS_CUTOFFS, CLASS_NAMES, WINDOW, WIND, RIVER, resolve_params,
+                                   classify_scores, compute_confluence, select_signals)
+
+HISTORY_DIR = LOGS_DIR / 'history_signals'
+
+SIGNAL_COLUMNS = ('Symbol', 'Timeframe', 'Timestamp', 'Date', 'Price', 'Direction', 'Score',
+                  'Classification', 'Hull_Score', 'AO_Score', 'Alligator_Score', 'Ichimoku_Score',
+                  'Volume_Score', 'Volume_Level', 'Volume_Ratio')
+
+# compute_confluence indicator_scores, in SIGNAL_COLUMNS order
+INDICATORS = ('hull', 'ao', 'alligator', 'ichimoku', 'volume')
+
+DIRECTIONS = {WIND: 'BULLISH', RIVER: 'BEARISH', 0: 'NEUTRAL'}
+
+# master_confluence.detect_volume_signals levels, from the lowest ratio up
+VOLUME_LEVELS = ('NORMAL', 'WARMING', 'HOT', 'CLIMAX')
+
+# Score of the reports' 'High Quality' rows
+HIGH_QUALITY_SCORE = 1.8
+
+# Data rows per sheet (Excel's limit minus the header)
+MAX_SHEET_ROWS = 1048575
+
+
+def default_min_score(config=None):
+    """confluence.min_score_display - the score the detector stores signals from"""
+    config = config if config is not None else load_config()
+    return (config.get('confluence') or {}).get('min_score_display', 1.2)
+
+
+def pair_signals(pair, series, params=None, min_score=1.2, cooldown_hours=0):
+    """
+    Every scored bar of one pair at or above min_score
+
+    Args:
+        pair (tuple): (symbol, timeframe)
+        series (tuple): (timestamps, high, low, close, volume) arrays
+        params (dict): Overrides for vectorized_confluence.DEFAULT_PARAMS
+        min_score (float): Lowest score emitted
+        cooldown_hours (float): Skip bars within this long of the previous
+                                emitted one, and bars without a primary system
+                                (the detector's rule) - 0 emits every bar
+
+    Returns:
+        list: Row tuples in SIGNAL_COLUMNS order, oldest first
+    """
+    symbol, timeframe = pair
+    timestamps, high, low, close, volume = series
+    params = resolve_params(params)
+
+    result = compute_confluence(timestamps, high, low, close, volume, params)
+    # Strengths are tenths - rounding drops the float noise of summing them
+    # over whole arrays, so thresholds and classes match the live analyzer's
+    score, system = np.round(result['score'], 2), result['system']
+    if cooldown_hours:
+        bars = select_signals(timestamps, score, system, min_score, cooldown_hours * 3600)
+    else:
+        bars = np.flatnonzero(result['scoreable'] & (score >= min_score))
+    if len(bars) == 0:
+        return []
+
+    classes = classify_scores(score[bars])
+    ratios = result['volume_ratio'][bars]
+    levels = np.searchsorted(np.asarray(params['volume_ratios'], dtype=float), np.nan_to_num(ratios), side='right')
+    parts = np.round(np.stack([result['indicator_scores'][name][bars] for name in INDICATORS], axis=1), 2) + 0.0
+
+    rows = []
+    for k, bar in enumerate(bars.tolist()):
+        timestamp = int(timestamps[bar])
+        rows.append((
+            symbol,
+            timeframe,
+            timestamp,
+            datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+            float(close[bar]),
+            DIRECTIONS[int(system[bar])],
+            float(score[bar]),
+            CLASS_NAMES[classes[k]] if classes[k] < len(CLASS_NAMES) else 'WEAK',
+            *parts[k].tolist(),
+            VOLUME_LEVELS[levels[k]],
+            round(float(ratios[k]), 2)
+        ))
+    return rows
+
+
+# ----------------------------------------------------------------------------
+# Worker processes
+# ----------------------------------------------------------------------------
+
+_worker = {}
+
+
+def _init_worker(shm_name, shape, layout, options):
+    """Map the shared candle block once per worker process"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    block = np.ndarray(shape, dtype=float, buffer=shm.buf)
+    _worker.update({
+        'shm': shm,
+        'series': split_candles(block, layout),
+        'options': options
+    })
+
+
+def _run_pair(pair):
+    """Score one pair in a worker"""
+    started = time.perf_counter()
+    rows = pair_signals(pair, _worker['series'][pair], **_worker['options'])
+    return pair, rows, time.perf_counter() - started
+
+
+def generate_signals(candles, params=None, min_score=1.2, cooldown_hours=0, workers=0):
+    """
+    Score every pair, in a process pool when there is more than one worker
+
+    Args:
+        candles (dict): From parameter_sweep.load_candles
+        params, min_score, cooldown_hours: See pair_signals
+        workers (int): Worker processes (0 = one per CPU, 1 = in this process)
+
+    Yields:
+        tuple: (pair, rows, seconds) as each pair finishes
+    """
+    options = {'params': params, 'min_score': min_score, 'cooldown_hours': cooldown_hours}
+    workers = min(workers or os.cpu_count() or 1, max(len(candles), 1))
+
+    if workers <= 1:
+        for pair, block in candles.items():
+            started = time.perf_counter()
+            series = (block[0].astype(np.int64),) + tuple(block[1:])
+            yield pair, pair_signals(pair, series, **options), time.perf_counter() - started
+        return
+
+    shm, layout = share_candles(candles)
+    total = sum(length for _, _, length in layout)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, (len(COLUMNS), total), layout, options)) as executor:
+            futures = [executor.submit(_run_pair, pair) for pair in candles]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# ----------------------------------------------------------------------------
+# Streaming writers
+# ----------------------------------------------------------------------------
+
+class SignalWriter:
+    """Signal rows written to a file as they arrive, with running totals for the summary"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.rows = 0
+        self.class_counts = [0] * (len(CLASS_CUTOFFS) + 1)
+        self.direction_counts = dict.fromkeys(DIRECTIONS.values(), 0)
+        self.symbols = set()
+        self.timeframes = set()
+        self.first_date = None
+        self.last_date = None
+
+    def write(self, rows):
+        """Append rows (tuples in SIGNAL_COLUMNS order)"""
+        if not rows:
+            return
+        self._write(rows)
+        self.rows += len(rows)
+        for row in rows:
+            self.class_counts[CLASS_NAMES.index(row[7]) if row[7] in CLASS_NAMES else -1] += 1
+            self.direction_counts[row[5]] += 1
+            self.symbols.add(row[0])
+            self.timeframes.add(row[1])
+            self.first_date = min(self.first_date or row[3], row[3])
+            self.last_date = max(self.last_date or row[3], row[3])
+
+    def summary(self):
+        """
+        Totals like the backtesting reports' Summary sheet
+
+        Returns:
+            list: (metric, value) pairs
+        """
+        at_least = [sum(self.class_counts[:index + 1]) for index in range(len(CLASS_CUTOFFS))]
+        return [('Total Signals', self.rows)] + [
+            (f"{name} Signals (≥{cutoff})", count)
+            for name, cutoff, count in zip(CLASS_NAMES, CLASS_CUTOFFS, at_least)
+        ] + [
+            ('', ''),
+            ('Bullish Signals', self.direction_counts['BULLISH']),
+            ('Bearish Signals', self.direction_counts['BEARISH']),
+            ('Neutral Signals', self.direction_counts['NEUTRAL']),
+            ('', ''),
+            ('Symbols Analyzed', ', '.join(sorted(self.symbols))),
+            ('Timeframes', ', '.join(sorted(self.timeframes))),
+            ('Date Range', f"{self.first_date} to {self.last_date}" if self.rows else ''),
+            ('Generated On', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        ]
+
+    def _write(self, rows):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSignalWriter(SignalWriter):
+    """Rows appended to one CSV file"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.file = open(self.path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(SIGNAL_COLUMNS)
+
+    def _write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class ExcelSignalWriter(SignalWriter):
+    """
+    Rows streamed into an .xlsx workbook (openpyxl write-only mode)
+
+    Every row goes to 'All Signals', rows scoring HIGH_QUALITY_SCORE or more
+    to 'High Quality', and each row to its symbol's sheet. A sheet that
+    reaches Excel's row limit continues in '<name> (2)'. 'Summary' is added
+    on close.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        from openpyxl import Workbook
+
+        self.workbook = Workbook(write_only=True)
+        self.sheets = {}
+        # Summary sheets first, symbols in the order they arrive
+        self._sheet('All Signals')
+        self._sheet('High Quality')
+
+    def _sheet(self, name):
+        """(worksheet, rows) currently taking a sheet name's rows"""
+        if name not in self.sheets or self.sheets[name][1] >= MAX_SHEET_ROWS:
+            part = self.sheets[name][2] + 1 if name in self.sheets else 1
+            title = name if part == 1 else f"{name} ({part})"
+            # Excel sheet names: at most 31 characters, none of / \ : * ? [ ]
+            for char in '/\\:*?[]':
+                title = title.replace(char, '_')
+            sheet = self.workbook.create_sheet(title[:31])
+            sheet.append(SIGNAL_COLUMNS)
+            self.sheets[name] = [sheet, 0, part]
+        return self.sheets[name]
+
+    def _append(self, name, row):
+        entry = self._sheet(name)
+        entry[0].append(row)
+        entry[1] += 1
+
+    def _write(self, rows):
+        for row in rows:
+            self._append('All Signals', row)
+            if row[6] >= HIGH_QUALITY_SCORE:
+                self._append('High Quality', row)
+            self._append(row[0], row)
+
+    def close(self):
+        summary = self.workbook.create_sheet('Summary')
+        summary.append(('Metric', 'Value'))
+        for metric, value in self.summary():
+            summary.append((metric, value))
+        self.workbook.save(self.path)
+
+
+def open_signal_writer(path):
+    """ExcelSignalWriter for an .xlsx path, CsvSignalWriter otherwise"""
+    if Path(path).suffix.lower() == '.xlsx':
+        return ExcelSignalWriter(path)
+    return CsvSignalWriter(path)
+
+
+def write_history_signals(candles, output, params=None, min_score=1.2, cooldown_hours=0, workers=0, progress=None):
+    """
+    Score every pair's whole history and stream the signal rows to a file
+
+    Args:
+        candles (dict): From parameter_sweep.load_candles
+        output (str or Path): .xlsx or .csv file
+        params, min_score, cooldown_hours, workers: See generate_signals
+        progress (callable): Called with (done, total, pair, rows, seconds) as pairs finish
+
+    Returns:
+        SignalWriter: The closed writer (rows and summary())
+    """
+    with open_signal_writer(output) as writer:
+        for done, (pair, rows, seconds) in enumerate(
+                generate_signals(candles, params, min_score, cooldown_hours, workers), 1):
+            writer.write(rows)
+            if progress:
+                progress(done, len(candles), pair, len(rows), seconds)
+    return writer
+
+
+def print_progress(done, total, pair, rows, seconds):
+    """Progress line for write_history_signals"""
+    symbol, timeframe = pair
+    print(f"   [{done}/{total}] {symbol} ({timeframe}): {rows} signals, {seconds * 1000:.0f}ms")
+
+
+def print_summary(writer):
+    """Print a writer's summary and where the rows went"""
+    print("\n" + "=" * 80)
+    print("📈 SIGNAL SUMMARY:")
+    for metric, value in writer.summary():
+        if metric:
+            print(f"   {metric}: {value}")
+    print("=" * 80)
+    print(f"✅ {writer.rows:,} signals saved to: {writer.path}")
+
+
+def main():
+    """Score the stored history and write every signal bar"""
+    parser = argparse.ArgumentParser(description="Every historical bar reaching the confluence threshold")
+    parser.add_argument('--symbols', nargs='+', help="Only these symbols")
+    parser.add_argument('--timeframes', nargs='+', help="Only these timeframes")
+    parser.add_argument('--min-score', type=float, help="Lowest score written (default: confluence.min_score_display)")
+    parser.add_argument('--cooldown', type=float, default=0,
+                        help="Hours between a pair's signals, like the detector (default: every bar)")
+    parser.add_argument('--workers', type=int, default=0, help="Worker processes (0 = one per CPU)")
+    parser.add_argument('--output', help="Output .csv or .xlsx (default: logs/history_signals/signals_<time>.csv)")
+    args = parser.parse_args()
+
+    print("📜 Wind Catcher & River Turn - Whole-History Signals")
+    print("="*60)
+
+    min_score = args.min_score if args.min_score is not None else default_min_score()
+    output = args.output or HISTORY_DIR / f"signals_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+
+    conn = connect_to_database()
+    try:
+        started = time.perf_counter()
+        candles = load_candles(conn, args.timeframes, symbols=args.symbols)
+    finally:
+        conn.close()
+
+    if not candles:
+        print(f"❌ No symbol/timeframe has more than {WINDOW} closed candles")
+        return 1
+
+    bars = sum(block.shape[1] for block in candles.values())
+    print(f"📊 Loaded {bars:,} candles across {len(candles)} pairs in {time.perf_counter() - started:.2f}s")
+    print(f"🔍 Writing every bar scoring {min_score} or more to {output}\n")
+
+    started = time.perf_counter()
+    writer = write_history_signals(candles, output, min_score=min_score, cooldown_hours=args.cooldown,
+                                   workers=args.workers, progress=print_progress)
+    print_summary(writer)
+    print(f"⏱️  {len(candles)} pairs in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,10 +3,9 @@ Hyperliquid DEX Connector for Wind Catcher & River Turn Trading System
 Handles all Hyperliquid API interactions for market data
 """
 
-from hyperliquid.info import Info
-from hyperliquid.utils import constants
 from datetime import datetime, timedelta
-from utils import normalize_timestamp, log_message
+from utils import normalize_timestamp, log_message, load_config
+from metrics import registry, span, timed
 
 
 class HyperliquidConnector:
@@ -15,22 +14,39 @@ class HyperliquidConnector:
     Provides methods to fetch market data from Hyperliquid
     """
 
-    def __init__(self, use_testnet=False):
+    def __init__(self, use_testnet=False, api_url=None, record_file=None):
         """
         Initialize Hyperliquid connector
 
         Args:
             use_testnet (bool): Use testnet if True, mainnet if False
+            api_url (str): API base URL, e.g. a mock_hyperliquid_server.py
+                           (default: exchange.api_url in config.yaml, else the real API)
+            record_file (str): Save every /info response to this fixture file for
+                               mock_hyperliquid_server.py (default: exchange.record_file)
         """
-        self.api_url = constants.TESTNET_API_URL if use_testnet else constants.MAINNET_API_URL
+        # The SDK is slow to import - only load it when a connector is created
+        from hyperliquid.info import Info
+        from hyperliquid.utils import constants
+
+        if api_url is None or record_file is None:
+            exchange = self._exchange_config()
+            api_url = api_url or exchange.get('api_url')
+            record_file = record_file or exchange.get('record_file')
+
+        self.api_url = api_url or (constants.TESTNET_API_URL if use_testnet else constants.MAINNET_API_URL)
         self.use_testnet = use_testnet
+        self.recorder = None
 
         try:
             # Initialize Info API (read-only, no credentials needed for public data)
             self.info = Info(self.api_url, skip_ws=True)
+            if record_file:
+                self._start_recording(record_file)
             self.connected = True
             log_message(
-                f"✅ Connected to Hyperliquid {'Testnet' if use_testnet else 'Mainnet'}",
+                f"✅ Connected to Hyperliquid {'Testnet' if use_testnet else 'Mainnet'}"
+                f"{'' if api_url is None else f' at {self.api_url}'}",
                 "INFO"
             )
         except Exception as e:
@@ -38,6 +54,33 @@ class HyperliquidConnector:
             log_message(f"❌ Failed to connect to Hyperliquid: {e}", "ERROR")
             raise
 
+    @staticmethod
+    def _exchange_config():
+        """exchange section of config.yaml (empty if there is no usable config)"""
+        try:
+            return load_config().get('exchange') or {}
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _start_recording(self, record_file):
+        """
+        Save every /info response to a fixture file
+
+        The SDK already fetched meta/spotMeta while connecting, so they are
+        requested once more to get them into the fixture.
+        """
+        from pathlib import Path
+        from mock_hyperliquid_server import FixtureRecorder
+
+        self.recorder = FixtureRecorder(Path(record_file))
+        post = self.info.post
+        self.info.post = lambda url_path, payload=None: self.recorder.record(payload or {}, post(url_path, payload))
+
+        for request_type in ('meta', 'spotMeta'):
+            self.info.post('/info', {'type': request_type})
+        log_message(f"📼 Recording Hyperliquid responses to {record_file}", "INFO")
+
+    @timed('connector.fetch_ohlcv')
     def fetch_ohlcv(self, symbol, timeframe='1h', limit=100):
         """
         Fetch OHLCV candle data from Hyperliquid
@@ -76,15 +119,17 @@ class HyperliquidConnector:
 
             # Fetch candles from Hyperliquid
             # Note: Hyperliquid SDK v0.20+ uses different API
-            candles = self.info.candles_snapshot(
-                coin_name,  # First positional arg: symbol
-                timeframe,  # Second positional arg: interval
-                start_time,  # Third positional arg: startTime
-                end_time    # Fourth positional arg: endTime
-            )
+            with span('connector.candles_snapshot'):
+                candles = self.info.candles_snapshot(
+                    coin_name,  # First positional arg: symbol
+                    timeframe,  # Second positional arg: interval
+                    start_time,  # Third positional arg: startTime
+                    end_time    # Fourth positional arg: endTime
+                )
 
             # Convert to standard format
             formatted_candles = self._format_candles(candles)
+            registry.inc('candles_fetched', len(formatted_candles))
 
             log_message(
                 f"📥 Fetched {len(formatted_candles)} candles for {coin_name} ({timeframe})",
@@ -97,6 +142,7 @@ class HyperliquidConnector:
             log_message(f"❌ Error fetching {symbol} data: {e}", "ERROR")
             return []
 
+    @timed('connector.get_available_markets')
     def get_available_markets(self):
         """
         Get list of available trading pairs on Hyperliquid
@@ -119,6 +165,48 @@ class HyperliquidConnector:
             log_message(f"❌ Error fetching markets: {e}", "ERROR")
             return []
 
+    @timed('connector.fetch_market_context')
+    def fetch_market_context(self):
+        """
+        Fetch the asset context of every listed perp in one request
+
+        Returns:
+            list: One dict per market - symbol, mark_price, prev_day_price, day_volume
+                  (24h notional), open_interest, funding
+                  Returns empty list on error
+        """
+        if not self.connected:
+            log_message("❌ Not connected to Hyperliquid", "ERROR")
+            return []
+
+        try:
+            with span('connector.meta_and_asset_ctxs'):
+                meta, asset_contexts = self.info.meta_and_asset_ctxs()
+
+            contexts = []
+            # Contexts are listed in the same order as meta['universe']
+            for asset, context in zip(meta.get('universe', []), asset_contexts):
+                if asset.get('isDelisted'):
+                    continue
+                try:
+                    contexts.append({
+                        'symbol': asset['name'],
+                        'mark_price': float(context['markPx']),
+                        'prev_day_price': float(context['prevDayPx']),
+                        'day_volume': float(context['dayNtlVlm']),
+                        'open_interest': float(context['openInterest']),
+                        'funding': float(context['funding'])
+                    })
+                except (KeyError, TypeError, ValueError) as e:
+                    log_message(f"⚠️ Error reading {asset.get('name')} context: {e}", "WARNING")
+
+            log_message(f"🧭 Fetched market context for {len(contexts)} markets", "INFO")
+            return contexts
+
+        except Exception as e:
+            log_message(f"❌ Error fetching market context: {e}", "ERROR")
+            return []
+
     def _normalize_symbol(self, symbol):
         """
         Normalize symbol format for Hyperliquid
@@ -256,18 +344,20 @@ class HyperliquidConnector:
         return formatted
 
 
-def connect_to_hyperliquid(use_testnet=False):
+def connect_to_hyperliquid(use_testnet=False, api_url=None, record_file=None):
     """
     Factory function to create Hyperliquid connector
 
     Args:
         use_testnet (bool): Use testnet if True
+        api_url (str): API base URL override (see HyperliquidConnector)
+        record_file (str): Fixture file to record responses to (see HyperliquidConnector)
 
     Returns:
         HyperliquidConnector: Connected instance or None on error
     """
     try:
-        connector = HyperliquidConnector(use_testnet=use_testnet)
+        connector = HyperliquidConnector(use_testnet=use_testnet, api_url=api_url, record_file=record_file)
         return connector
     except Exception as e:
         log_message(f"❌ Failed to create Hyperliquid connector: {e}", "ERROR")
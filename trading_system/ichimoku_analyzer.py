@@ -8,6 +8,9 @@ import numpy as np
 import sqlite3
 import yaml
 from datetime import datetime
+from utils import timeframe_to_seconds
+from indicator_engine import IndicatorEngine, midpoint
+from indicator_kernels import cloud_retests
 
 def load_config():
     """Load configuration"""
@@ -37,29 +40,55 @@ def get_price_data(conn, symbol, timeframe='1h', limit=200):
     df['datetime'] = pd.to_datetime(df['timestamp'], unit='s')
     return df
 
-def calculate_ichimoku(df, conversion_len=20, base_len=60, lead_span_b_len=120, displacement=30):
+def data_requirements(timeframe='1h'):
+    """
+    Candles analyze_symbol_ichimoku needs (collected by lookback_planner.py)
+
+    Senkou Span B (120-candle high/low) is the slowest component. Cloud color
+    changes are looked for over the last 20 candles, each compared with the
+    candle before, but only kept when they're at most 48 hours old - the
+    retests and Kijun touches after them fall inside the same candles.
+
+    Args:
+        timeframe (str): Candle timeframe
+
+    Returns:
+        dict: min_bars (fewer and there is no analysis) and window (candles
+              loaded - older ones don't change the latest candle's signals)
+    """
+    change_candles = 48 * 3600 // timeframe_to_seconds(timeframe)
+    lookback = min(20, change_candles + 1)
+    return {'min_bars': 120 + lookback, 'window': 120 + lookback}
+
+def indicator_nodes(conversion_len=20, base_len=60, lead_span_b_len=120):
+    """
+    Indicator engine nodes Ichimoku reads: the Tenkan-sen, Kijun-sen and
+    Senkou Span B high/low midpoints
+
+    A longer window made of whole shorter ones is built from them (the 60
+    candles from three 20s, the 120 from two 60s) instead of rescanning.
+    """
+    return [midpoint(conversion_len),
+            midpoint(base_len, bases=(conversion_len,)),
+            midpoint(lead_span_b_len, bases=(base_len, conversion_len))]
+
+def calculate_ichimoku(df, conversion_len=20, base_len=60, lead_span_b_len=120, displacement=30, engine=None):
     """Calculate Ichimoku Cloud components with your settings: 20, 60, 120, 30"""
-    if len(df) < lead_span_b_len + displacement:
+    # Every component has a value from the lead_span_b_len-th candle on (the
+    # spans aren't shifted, so the displacement needs no extra history)
+    if len(df) < lead_span_b_len:
         return None
     
     # Tenkan-sen (Conversion Line): (20-period high + 20-period low) / 2
-    high_conv = df['high'].rolling(window=conversion_len).max()
-    low_conv = df['low'].rolling(window=conversion_len).min()
-    tenkan_sen = (high_conv + low_conv) / 2
-    
     # Kijun-sen (Base Line): (60-period high + 60-period low) / 2
-    high_base = df['high'].rolling(window=base_len).max()
-    low_base = df['low'].rolling(window=base_len).min()
-    kijun_sen = (high_base + low_base) / 2
+    # Senkou Span B (Leading Span B): (120-period high + 120-period low) / 2, plotted 30 periods ahead
+    engine = engine or IndicatorEngine(df)
+    tenkan_sen, kijun_sen, senkou_span_b = engine.evaluate(
+        *indicator_nodes(conversion_len, base_len, lead_span_b_len))
     
     # Senkou Span A (Leading Span A): (Tenkan + Kijun) / 2, plotted 30 periods ahead
     senkou_span_a = (tenkan_sen + kijun_sen) / 2
     
-    # Senkou Span B (Leading Span B): (120-period high + 120-period low) / 2, plotted 30 periods ahead
-    high_lead_b = df['high'].rolling(window=lead_span_b_len).max()
-    low_lead_b = df['low'].rolling(window=lead_span_b_len).min()
-    senkou_span_b = (high_lead_b + low_lead_b) / 2
-    
     # Chikou Span (Lagging Span): Current close plotted 30 periods back
     chikou_span = df['close'].shift(-displacement)
     
@@ -126,49 +155,33 @@ def detect_price_cloud_retests(df, senkou_a, senkou_b, color_changes, lookback=2
     if not color_changes:
         return []
     
-    retests = []
+    # For each color change, the first close back inside the cloud in the
+    # next 19 candles and 24 hours (see indicator_kernels.cloud_retests)
+    found = cloud_retests(
+        df['timestamp'].to_numpy(dtype=np.int64), df['close'].to_numpy(dtype=np.float64),
+        senkou_a.to_numpy(dtype=np.float64), senkou_b.to_numpy(dtype=np.float64),
+        np.array([change['timestamp'] for change in color_changes], dtype=np.int64),
+        lookback, 24
+    )
     
-    # For each color change, look for price returning to the cloud
-    for change in color_changes:
-        change_timestamp = change['timestamp']
-        
-        # Find the index of the color change
-        change_index = None
-        for i, ts in enumerate(df['timestamp']):
-            if ts >= change_timestamp:
-                change_index = i
-                break
-        
-        if change_index is None or change_index >= len(df) - 5:
-            continue
+    retests = []
+    for k, i in found:
+        change = color_changes[k]
+        current_price = df['close'].iloc[i]
+        retest_time = df['timestamp'].iloc[i]
+        current_time = df['timestamp'].iloc[-1]
+        hours_ago = (current_time - retest_time) / 3600
         
-        # Look for price retests after the color change
-        for i in range(change_index + 1, min(change_index + lookback, len(df))):
-            if pd.isna(senkou_a.iloc[i]) or pd.isna(senkou_b.iloc[i]):
-                continue
-            
-            current_price = df['close'].iloc[i]
-            cloud_top = max(senkou_a.iloc[i], senkou_b.iloc[i])
-            cloud_bottom = min(senkou_a.iloc[i], senkou_b.iloc[i])
-            
-            # Check if price is inside the newly formed cloud
-            if cloud_bottom <= current_price <= cloud_top:
-                retest_time = df['timestamp'].iloc[i]
-                current_time = df['timestamp'].iloc[-1]
-                hours_ago = (current_time - retest_time) / 3600
-                
-                if hours_ago <= 24:  # Only recent retests
-                    retests.append({
-                        'type': 'cloud_retest',
-                        'description': f'Price retested newly formed {change["new_color"]} cloud',
-                        'cloud_color': change['new_color'],
-                        'timestamp': retest_time,
-                        'price': current_price,
-                        'hours_ago': hours_ago,
-                        'strength': 0.9,
-                        'related_change': change
-                    })
-                    break  # Only record first retest per color change
+        retests.append({
+            'type': 'cloud_retest',
+            'description': f'Price retested newly formed {change["new_color"]} cloud',
+            'cloud_color': change['new_color'],
+            'timestamp': retest_time,
+            'price': current_price,
+            'hours_ago': hours_ago,
+            'strength': 0.9,
+            'related_change': change
+        })
     
     return retests
 
@@ -216,14 +229,25 @@ def detect_kijun_touches(df, kijun_sen, lookback=6):
     
     return kijun_touches
 
-def analyze_symbol_ichimoku(conn, symbol, timeframe='1h'):
-    """Complete Ichimoku analysis for a symbol"""
-    df = get_price_data(conn, symbol, timeframe=timeframe, limit=200)
-    if df is None or len(df) < 150:
+def analyze_symbol_ichimoku(conn, symbol, timeframe='1h', engine=None):
+    """
+    Complete Ichimoku analysis for a symbol
+
+    engine: IndicatorEngine over candles the caller already loaded (shares
+    its indicators with the caller's other analyzers) - read from the
+    database if None
+    """
+    requirements = data_requirements(timeframe)
+    if engine is None:
+        df = get_price_data(conn, symbol, timeframe=timeframe, limit=requirements['window'])
+    else:
+        df = engine.frame.copy()
+    if df is None or len(df) < requirements['min_bars']:
         return None
     
     # Calculate Ichimoku components
-    ichimoku = calculate_ichimoku(df, conversion_len=20, base_len=60, lead_span_b_len=120, displacement=30)
+    ichimoku = calculate_ichimoku(df, conversion_len=20, base_len=60, lead_span_b_len=120, displacement=30,
+                                  engine=engine)
     if ichimoku is None:
         return None
     
@@ -0,0 +1,190 @@
+"""
+Import-Time Benchmark for Wind Catcher & River Turn
+Measures how long each CLI command spends importing modules before doing any
+work, using Python's -X importtime, and appends the results to
+logs/import_times.csv so regressions show up over time
+
+Each command's script is loaded in a fresh interpreter with run_name other than
+'__main__', so only its module-level code (imports) runs.
+
+Usage:
+    python import_benchmark.py                   # every command, 3 runs each
+    python import_benchmark.py detect dashboard  # selected commands
+    python import_benchmark.py detect --top 15   # slowest modules for a command
+    python import_benchmark.py --no-save
+"""
+
+import argparse
+import csv
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+from cli import COMMANDS, TRADING_SYSTEM_DIR
+
+RESULTS_FILE = TRADING_SYSTEM_DIR / 'logs' / 'import_times.csv'
+
+# Written to stderr just before the script is loaded; interpreter startup
+# imports above it are the same for every command and are ignored
+MARKER = '--import-benchmark--'
+
+# Commands whose scripts do real work at module level instead of in main()
+RUNS_ON_IMPORT = {'watchlist'}
+
+LOADER = (
+    "import sys, runpy\n"
+    "sys.path[:0] = [{script_dir!r}, {base_dir!r}]\n"
+    "sys.stderr.write({marker!r} + '\\n')\n"
+    "runpy.run_path({script!r}, run_name='import_benchmark')\n"
+)
+
+
+def parse_importtime(stderr):
+    """
+    Parse -X importtime output after the marker line
+
+    Args:
+        stderr (str): Interpreter stderr
+
+    Returns:
+        tuple: (total_us, modules) where modules is a list of (module, self_us, cumulative_us)
+    """
+    lines = stderr.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+
+    total_us = 0
+    modules = []
+
+    for line in lines:
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            continue
+
+        # Nested imports are indented under the module that triggered them
+        depth = len(name) - len(name.lstrip()) - 1
+        if depth == 0:
+            total_us += cumulative_us
+        modules.append((name.strip(), self_us, cumulative_us))
+
+    return total_us, modules
+
+
+def measure_command(name):
+    """
+    Measure one command's import time in a fresh interpreter
+
+    Args:
+        name (str): Command name from cli.COMMANDS
+
+    Returns:
+        tuple: (total_ms, modules) - see parse_importtime
+    """
+    script = TRADING_SYSTEM_DIR / COMMANDS[name][0]
+    code = LOADER.format(
+        script_dir=str(script.parent), base_dir=str(TRADING_SYSTEM_DIR),
+        marker=MARKER, script=str(script)
+    )
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=str(script.parent), capture_output=True, text=True, timeout=120
+    )
+
+    if MARKER not in result.stderr:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "no output")
+
+    total_us, modules = parse_importtime(result.stderr)
+    return total_us / 1000, modules
+
+
+def save_results(results):
+    """Append one row per command to logs/import_times.csv"""
+    RESULTS_FILE.parent.mkdir(exist_ok=True)
+    new_file = not RESULTS_FILE.exists()
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    with open(RESULTS_FILE, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(['timestamp', 'python', 'command', 'median_ms', 'min_ms', 'modules'])
+        for name, (median_ms, min_ms, module_count) in results.items():
+            writer.writerow([timestamp, sys.version.split()[0], name,
+                             f"{median_ms:.1f}", f"{min_ms:.1f}", module_count])
+
+
+def load_previous():
+    """Latest saved median per command, for the change column"""
+    previous = {}
+    if not RESULTS_FILE.exists():
+        return previous
+
+    with open(RESULTS_FILE, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            previous[row['command']] = float(row['median_ms'])
+
+    return previous
+
+
+def main():
+    """Run the import-time benchmark"""
+    parser = argparse.ArgumentParser(description="Measure import time per CLI command")
+    parser.add_argument('commands', nargs='*', help="Commands to measure (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per command (median is reported)")
+    parser.add_argument('--top', type=int, default=0, help="Also list the N slowest imports per command")
+    parser.add_argument('--no-save', action='store_true', help=f"Don't append to {RESULTS_FILE.name}")
+    args = parser.parse_args()
+
+    names = args.commands or [n for n in COMMANDS if n not in RUNS_ON_IMPORT and n != 'importtime']
+    unknown = [n for n in names if n not in COMMANDS]
+    if unknown:
+        print(f"❌ Unknown command(s): {', '.join(unknown)}")
+        return 2
+
+    previous = load_previous()
+    results = {}
+
+    print("⏱️ Import-Time Benchmark")
+    print("="*60)
+    print(f"{'Command':18} {'Median':>10} {'Min':>10} {'Modules':>8} {'Change':>10}")
+    print("-"*60)
+
+    for name in names:
+        try:
+            runs = [measure_command(name) for _ in range(max(1, args.repeat))]
+        except Exception as e:
+            print(f"{name:18} ❌ {e}")
+            continue
+
+        times = [total_ms for total_ms, _ in runs]
+        modules = runs[-1][1]
+        median_ms = statistics.median(times)
+        results[name] = (median_ms, min(times), len(modules))
+
+        change = ''
+        if name in previous and previous[name] > 0:
+            change = f"{(median_ms - previous[name]) / previous[name] * 100:+.0f}%"
+
+        print(f"{name:18} {median_ms:8.1f}ms {min(times):8.1f}ms {len(modules):8} {change:>10}")
+
+        if args.top:
+            for module, self_us, cumulative_us in sorted(modules, key=lambda m: m[2], reverse=True)[:args.top]:
+                print(f"    {module:40} {cumulative_us / 1000:8.1f}ms (self {self_us / 1000:.1f}ms)")
+
+    print("="*60)
+
+    if results and not args.no_save:
+        save_results(results)
+        print(f"📝 Results appended to {RESULTS_FILE}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""
+Indicator Engine for Wind Catcher & River Turn
+One analysis context's indicator series, each computed once no matter how
+many analyzers ask for it:
+
+- every indicator is registered with the inputs it reads - candle columns
+  or other indicators - so the indicators form a DAG (the Alligator's SMAs
+  and AO's SMAs share one median price node, Ichimoku's 120-candle high/low
+  is built from the 60-candle one, which is built from the 20-candle one)
+- IndicatorEngine wraps one candle frame (one symbol/timeframe analysis)
+  and memoizes every node it evaluates, dependencies first
+- analyze_master_confluence builds one engine over its candles and hands it
+  to every analyzer, so adding an analyzer only adds the nodes it doesn't
+  share with the others
+
+Values are the same as the analyzers' own calculations, bit for bit.
+
+Usage:
+    python indicator_engine.py      # show the master analysis DAG and what it reuses
+"""
+
+import sys
+import io
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# An indicator with its parameters - hashable, so it keys the memo.
+# Series inputs are candle column names or other nodes.
+Node = namedtuple('Node', ['name', 'params'])
+
+# Indicator name -> (function, inputs). inputs(**params) returns
+# {argument: column name or Node}; the function gets those series as
+# keyword arguments, followed by the params.
+INDICATORS = {}
+
+
+def node(name, **params):
+    """Node for a registered indicator"""
+    if name not in INDICATORS:
+        raise KeyError(f"Unknown indicator: {name}")
+    return Node(name, tuple(sorted(params.items())))
+
+
+def indicator(name, inputs):
+    """
+    Register an indicator function
+
+    Args:
+        name (str): Indicator name used by node()
+        inputs (callable): inputs(**params) -> {argument: column name or Node}
+    """
+    def register(func):
+        INDICATORS[name] = (func, inputs)
+        return func
+    return register
+
+
+# ----------------------------------------------------------------------------
+# Node constructors
+# ----------------------------------------------------------------------------
+
+def median_price():
+    """(high + low) / 2"""
+    return node('median_price')
+
+
+def sma(source, period, min_periods=None):
+    """Simple moving average, NaN until min_periods (default period) values"""
+    return node('sma', source=source, period=period, min_periods=min_periods)
+
+
+def wma(source, period):
+    """Weighted moving average"""
+    return node('wma', source=source, period=period)
+
+
+def hull(source, period):
+    """Hull moving average: WMA(2 * WMA(n/2) - WMA(n), sqrt(n))"""
+    return node('hull', source=source, period=period)
+
+
+def _nested(period, bases):
+    """The shorter windows that nest: each one made of whole windows of the next"""
+    nested = []
+    for base in bases:
+        if base and period > base and period % base == 0:
+            nested.append(base)
+            period = base
+    return tuple(nested)
+
+
+def rolling_max(source, period, bases=()):
+    """Highest value over `period` candles, built from the nested shorter windows in `bases`"""
+    return node('rolling_max', source=source, period=period, bases=_nested(period, bases))
+
+
+def rolling_min(source, period, bases=()):
+    """Lowest value over `period` candles, built from the nested shorter windows in `bases`"""
+    return node('rolling_min', source=source, period=period, bases=_nested(period, bases))
+
+
+def midpoint(period, bases=()):
+    """(highest high + lowest low) / 2 over `period` candles - the Ichimoku lines"""
+    return node('midpoint', period=period, bases=_nested(period, bases))
+
+
+# ----------------------------------------------------------------------------
+# Indicators
+# ----------------------------------------------------------------------------
+
+def weighted_moving_average(prices, period):
+    """
+    Weighted Moving Average of a Series
+
+    Same values as the analyzers' per-candle loop (np.sum over each window,
+    which skips NaN like pandas), computed over all windows at once.
+
+    Returns:
+        pd.Series: NaN for the first period - 1 candles
+    """
+    values = prices.to_numpy(dtype=float)
+    result = np.full(len(values), np.nan)
+    if len(values) < period:
+        return pd.Series(result, index=prices.index)
+
+    weights = np.arange(1, period + 1)
+    windows = np.lib.stride_tricks.sliding_window_view(values, period) * weights
+    windows[np.isnan(windows)] = 0.0
+    result[period - 1:] = windows.sum(axis=1) / np.sum(weights)
+    return pd.Series(result, index=prices.index)
+
+
+@indicator('median_price', inputs=lambda: {'high': 'high', 'low': 'low'})
+def _median_price(high, low):
+    return (high + low) / 2
+
+
+@indicator('sma', inputs=lambda source, **params: {'values': source})
+def _sma(values, source, period, min_periods):
+    return values.rolling(window=period, min_periods=min_periods or period).mean()
+
+
+@indicator('wma', inputs=lambda source, **params: {'values': source})
+def _wma(values, source, period):
+    return weighted_moving_average(values, period)
+
+
+@indicator('hull', inputs=lambda source, period: {
+    'values': source,
+    'wma_half': wma(source, int(period / 2)),
+    'wma_full': wma(source, period)
+})
+def _hull(values, wma_half, wma_full, source, period):
+    if len(values) < period:
+        return pd.Series([np.nan] * len(values), index=values.index)
+    return weighted_moving_average(2 * wma_half - wma_full, int(np.sqrt(period)))
+
+
+def _window_inputs(name):
+    """inputs() of rolling_max/rolling_min: the next shorter window if there is one, the source otherwise"""
+    def inputs(source, period, bases):
+        if bases:
+            return {'values': node(name, source=source, period=bases[0], bases=bases[1:])}
+        return {'values': source}
+    return inputs
+
+
+def _rolling_extreme(values, period, bases, rolling, reduce):
+    if not bases:
+        return rolling(values.rolling(window=period))
+
+    # The shorter windows ending every `base` candles back cover the period exactly
+    base = bases[0]
+    shifted = [values.shift(k * base).to_numpy() for k in range(period // base)]
+    return pd.Series(reduce.reduce(shifted), index=values.index)
+
+
+@indicator('rolling_max', inputs=_window_inputs('rolling_max'))
+def _rolling_max(values, source, period, bases):
+    return _rolling_extreme(values, period, bases, lambda window: window.max(), np.maximum)
+
+
+@indicator('rolling_min', inputs=_window_inputs('rolling_min'))
+def _rolling_min(values, source, period, bases):
+    return _rolling_extreme(values, period, bases, lambda window: window.min(), np.minimum)
+
+
+@indicator('midpoint', inputs=lambda period, bases: {
+    'highest': rolling_max('high', period, bases),
+    'lowest': rolling_min('low', period, bases)
+})
+def _midpoint(highest, lowest, period, bases):
+    return (highest + lowest) / 2
+
+
+# ----------------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------------
+
+class IndicatorEngine:
+    """Memoized indicator nodes over one candle frame"""
+
+    def __init__(self, frame):
+        """
+        Args:
+            frame (pd.DataFrame): Candles (timestamp, open, high, low, close, volume)
+        """
+        self.frame = frame
+        self._values = {}
+        self.stats = {'computed': 0, 'reused': 0}
+
+    def inputs(self, key):
+        """{argument: column name or Node} a node reads"""
+        _, inputs = INDICATORS[key.name]
+        return inputs(**dict(key.params))
+
+    def plan(self, *keys, pending=False):
+        """
+        Every node the given ones depend on, deduplicated, dependencies first
+
+        Args:
+            pending (bool): Leave out nodes already computed (and what only they need)
+
+        Returns:
+            list: Nodes in evaluation order
+        """
+        order = []
+        seen = set()
+
+        def visit(key):
+            if key in seen or (pending and key in self._values):
+                return
+            seen.add(key)
+            for source in self.inputs(key).values():
+                if isinstance(source, Node):
+                    visit(source)
+            order.append(key)
+
+        for key in keys:
+            visit(key)
+        return order
+
+    def get(self, key):
+        """
+        A node's series, computing it (and anything it needs) only once
+
+        Args:
+            key (Node or str): Indicator node, or a candle column name
+
+        Returns:
+            pd.Series: Aligned with the frame
+        """
+        if not isinstance(key, Node):
+            return self.frame[key]
+        if key in self._values:
+            self.stats['reused'] += 1
+            return self._values[key]
+
+        for dependency in self.plan(key, pending=True):
+            func, _ = INDICATORS[dependency.name]
+            arguments = {}
+            for name, source in self.inputs(dependency).items():
+                if not isinstance(source, Node):
+                    arguments[name] = self.frame[source]
+                    continue
+                if source in self._values:
+                    self.stats['reused'] += 1
+                arguments[name] = self._values[source]
+            self._values[dependency] = func(**arguments, **dict(dependency.params))
+            self.stats['computed'] += 1
+        return self._values[key]
+
+    def evaluate(self, *keys):
+        """Several nodes at once (see get)"""
+        return [self.get(key) for key in keys]
+
+
+def describe(key):
+    """Readable name of a node, e.g. sma(source=median_price(), period=130)"""
+    if not isinstance(key, Node):
+        return key
+    params = [f"{name}={describe(value)}" for name, value in key.params if value not in (None, ())]
+    return f"{key.name}({', '.join(params)})"
+
+
+def main():
+    """Show the nodes one master analysis evaluates and the ones its analyzers share"""
+    import importlib
+
+    # The analyzers' nodes come from the imported module, not this __main__ copy
+    engine_module = importlib.import_module('indicator_engine')
+
+    print("🧮 Wind Catcher & River Turn - Indicator Engine")
+    print("="*60)
+
+    # Synthetic candles: only the DAG's shape matters here
+    n = 200
+    close = pd.Series(100 + np.cumsum(np.sin(np.arange(n) / 7)))
+    frame = pd.DataFrame({'timestamp': np.arange(n) * 3600, 'open': close, 'high': close + 1,
+                          'low': close - 1, 'close': close, 'volume': 1000.0})
+
+    engine = engine_module.IndicatorEngine(frame)
+    users = {}
+    for module in ('enhanced_hull_analyzer', 'enhanced_indicators', 'alligator_analyzer',
+                   'ichimoku_analyzer', 'master_confluence'):
+        requested = importlib.import_module(module).indicator_nodes()
+        engine.evaluate(*requested)
+        for key in engine.plan(*requested):
+            users.setdefault(key, []).append(module)
+
+    print(f"\n{'Node':<56}{'Analyzers':>14}")
+    print("-"*70)
+    for key in engine.plan(*users):
+        print(f"{engine_module.describe(key):<56}{len(users[key]):>14}")
+    print("-"*70)
+
+    separate = sum(len(modules) for modules in users.values())
+    print(f"Nodes computed: {engine.stats['computed']} (each analyzer on its own: {separate})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Indicator Kernels for Wind Catcher & River Turn
+The analyzers' stateful candle loops - a Hull cross followed by a retest,
+an Alligator state change confirmed by the next states, price returning to
+a newly colored Ichimoku cloud - as plain loops over arrays:
+
+- with numba installed (pip install numba) each kernel is JIT-compiled on
+  first use and the machine code is cached on disk (kernels.cache_dir), so
+  a restarted service loads it instead of compiling again
+- without numba (or with kernels.jit: false) the same functions run as
+  Python over lists - still much faster than per-candle .iloc lookups
+
+Kernels only return candle indices and codes; the analyzers build their
+signal dicts from those, so both paths give identical signals.
+
+Usage:
+    python indicator_kernels.py     # compile (or load) every kernel and time both paths
+"""
+
+import sys
+import io
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+import os
+import threading
+import time
+from math import isnan
+
+import numpy as np
+
+from utils import TRADING_SYSTEM_DIR, load_config
+
+DEFAULTS = {
+    'jit': True,
+    'cache_dir': 'data/numba_cache'
+}
+
+# Alligator state codes (see alligator_analyzer.detect_state_transitions)
+STATE_CODES = {'sleeping': 1, 'awake': 2}
+
+_numba = None
+_numba_lock = threading.Lock()
+
+
+def get_kernel_settings(config=None):
+    """
+    Kernel settings from config.yaml (kernels section)
+
+    Returns:
+        dict: jit, cache_dir (a path under trading_system/, or None for
+              numba's default next to the source)
+    """
+    if config is None:
+        try:
+            config = load_config()
+        except Exception:
+            config = {}
+    settings = dict(DEFAULTS)
+    settings.update(config.get('kernels') or {})
+    if settings.get('cache_dir'):
+        settings['cache_dir'] = TRADING_SYSTEM_DIR / settings['cache_dir']
+    return settings
+
+
+def load_numba(settings=None):
+    """
+    numba, set up to cache compiled kernels in kernels.cache_dir
+
+    Returns:
+        module: numba, or None when it isn't installed or kernels.jit is false
+    """
+    global _numba
+    if _numba is None:
+        with _numba_lock:
+            if _numba is None:
+                settings = settings or get_kernel_settings()
+                module = False
+                if settings['jit']:
+                    try:
+                        import numba
+                        if settings['cache_dir']:
+                            os.makedirs(settings['cache_dir'], exist_ok=True)
+                            numba.config.CACHE_DIR = str(settings['cache_dir'])
+                        module = numba
+                    except ImportError:
+                        pass
+                _numba = module
+    return _numba or None
+
+
+class Kernel:
+    """A kernel function, JIT-compiled with numba when available"""
+
+    def __init__(self, func):
+        self.func = func
+        self.__name__ = func.__name__
+        self.__doc__ = func.__doc__
+        self._compiled = None
+
+    @property
+    def jit(self):
+        """True when calls run the numba-compiled kernel"""
+        return bool(self._resolve())
+
+    def _resolve(self):
+        if self._compiled is None:
+            numba = load_numba()
+            self._compiled = numba.njit(cache=True)(self.func) if numba else False
+        return self._compiled
+
+    def python(self, *args):
+        """Run the kernel as plain Python (arrays become lists)"""
+        return self.func(*[arg.tolist() if isinstance(arg, np.ndarray) else arg for arg in args])
+
+    def __call__(self, *args):
+        compiled = self._resolve()
+        if compiled:
+            return compiled(*args)
+        return self.python(*args)
+
+
+def kernel(func):
+    """Decorator: make func a Kernel (its body must compile in numba's nopython mode)"""
+    return Kernel(func)
+
+
+# ----------------------------------------------------------------------------
+# Kernels
+# ----------------------------------------------------------------------------
+
+@kernel
+def hull_cross_retests(fast, slow, close, high, low, timestamps, lookback, retest_candles, max_hours):
+    """
+    First retest of the Hull lines after each fast/slow cross
+
+    Crosses are looked for from `lookback` candles back up to 5 candles
+    before the latest; a retest is a candle within the next retest_candles
+    - 1 candles whose range touches a line and closes on the cross's side
+    of it (the slow line is checked first), at most max_hours old.
+
+    Args:
+        fast, slow (array): Hull lines (float64)
+        close, high, low (array): Candles (float64)
+        timestamps (array): Candle open times (int64)
+
+    Returns:
+        list: (retest index, 1 if bullish else 0, 1 if the slow line else 0) per retest
+    """
+    retests = []
+    n = len(close)
+    latest = timestamps[n - 1]
+
+    for i in range(n - lookback, n - 5):
+        if isnan(fast[i]) or isnan(slow[i]) or isnan(fast[i - 1]) or isnan(slow[i - 1]):
+            continue
+
+        if fast[i] > slow[i] and fast[i - 1] <= slow[i - 1]:
+            bullish = 1
+        elif fast[i] < slow[i] and fast[i - 1] >= slow[i - 1]:
+            bullish = 0
+        else:
+            continue
+
+        for j in range(i + 1, min(i + retest_candles, n)):
+            if isnan(fast[j]) or isnan(slow[j]):
+                continue
+
+            if low[j] <= slow[j] <= high[j] and (close[j] >= slow[j] if bullish else close[j] <= slow[j]):
+                line = 1
+            elif low[j] <= fast[j] <= high[j] and (close[j] >= fast[j] if bullish else close[j] <= fast[j]):
+                line = 0
+            else:
+                continue
+
+            if (latest - timestamps[j]) / 3600 <= max_hours:
+                retests.append((j, bullish, line))
+                break
+
+    return retests
+
+
+@kernel
+def confirmed_transition(states, confirm_states):
+    """
+    Last change between two known states that the next states confirm
+
+    A change at i is confirmed when states i + 1 .. i + confirm_states (as
+    many of them as there are) all equal the new state.
+
+    Args:
+        states (array): State codes (int64, 0 = unknown - see STATE_CODES)
+        confirm_states (int): States after the change that must match it
+
+    Returns:
+        int: Index of the change, -1 if there is none
+    """
+    n = len(states)
+    last = -1
+
+    for i in range(1, n):
+        if states[i - 1] == 0 or states[i] == 0 or states[i - 1] == states[i]:
+            continue
+
+        confirmed = True
+        for j in range(1, min(confirm_states, n - i - 1) + 1):
+            if states[i + j] != states[i]:
+                confirmed = False
+                break
+        if confirmed:
+            last = i
+
+    return last
+
+
+@kernel
+def cloud_retests(timestamps, close, span_a, span_b, change_times, lookback, max_hours):
+    """
+    First close inside the cloud after each color change
+
+    The scan starts after the first candle at or after the change (changes
+    within the last 5 candles are skipped) and covers lookback - 1 candles;
+    retests older than max_hours don't count.
+
+    Args:
+        timestamps (array): Candle open times (int64)
+        close, span_a, span_b (array): Closes and Senkou spans (float64)
+        change_times (array): Color change timestamps (int64)
+
+    Returns:
+        list: (change position, retest index) per retest
+    """
+    retests = []
+    n = len(timestamps)
+    latest = timestamps[n - 1]
+
+    for k in range(len(change_times)):
+        change_index = -1
+        for i in range(n):
+            if timestamps[i] >= change_times[k]:
+                change_index = i
+                break
+
+        if change_index == -1 or change_index >= n - 5:
+            continue
+
+        for i in range(change_index + 1, min(change_index + lookback, n)):
+            if isnan(span_a[i]) or isnan(span_b[i]):
+                continue
+
+            if (min(span_a[i], span_b[i]) <= close[i] <= max(span_a[i], span_b[i])
+                    and (latest - timestamps[i]) / 3600 <= max_hours):
+                retests.append((k, i))
+                break
+
+    return retests
+
+
+KERNELS = (hull_cross_retests, confirmed_transition, cloud_retests)
+
+
+def sample_arguments(n=200):
+    """Arguments of every kernel, typed like the analyzers' calls"""
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    timestamps = np.arange(n, dtype=np.int64) * 3600
+    line = lambda lag: np.convolve(close, np.ones(lag) / lag, mode='same')
+    return {
+        hull_cross_retests: (line(5), line(9), close, close + 1, close - 1, timestamps, 20, 15, 12),
+        confirmed_transition: (rng.integers(0, 3, 10).astype(np.int64), 3),
+        cloud_retests: (timestamps, close, line(7), line(21), timestamps[-15:-5].copy(), 20, 24)
+    }
+
+
+def warm_up(settings=None):
+    """
+    Compile (or load from the cache) every kernel now instead of on the
+    first analysis - a kernel numba can't compile runs as Python
+
+    Args:
+        settings (dict): Kernel settings (read from config.yaml if None)
+
+    Returns:
+        bool: True if the kernels run JIT-compiled
+    """
+    load_numba(settings)
+    for func, args in sample_arguments(20).items():
+        try:
+            func(*args)
+        except Exception as e:
+            if not func.jit:
+                raise
+            print(f"⚠️  Kernel {func.__name__} failed to compile, running it as Python: {e}")
+            func._compiled = False
+    return all(func.jit for func in KERNELS)
+
+
+def main():
+    """Compile every kernel and time it against the Python path"""
+    print("⚙️  Wind Catcher & River Turn - Indicator Kernels")
+    print("="*60)
+
+    settings = get_kernel_settings()
+    numba = load_numba(settings)
+    if numba:
+        print(f"Backend: numba {numba.__version__} (cache: {settings['cache_dir'] or '__pycache__'})")
+    elif settings['jit']:
+        print("Backend: Python (numba not installed - pip install numba)")
+    else:
+        print("Backend: Python (kernels.jit is false)")
+
+    start = time.perf_counter()
+    warm_up(settings)
+    print(f"Compiled / loaded in {time.perf_counter() - start:.2f}s")
+
+    print(f"\n{'Kernel':<24}{'Python':>12}{'JIT':>12}{'Speedup':>10}")
+    print("-"*58)
+    for func, args in sample_arguments().items():
+        timings = []
+        for run in ([func.python] + ([func] if func.jit else [])):
+            start = time.perf_counter()
+            for _ in range(200):
+                result = run(*args)
+            timings.append((time.perf_counter() - start) / 200 * 1e6)
+            if run is not func.python:
+                assert result == func.python(*args)
+        jit = f"{timings[1]:.1f}µs" if len(timings) > 1 else "-"
+        speedup = f"{timings[0] / timings[1]:.0f}x" if len(timings) > 1 else "-"
+        print(f"{func.__name__:<24}{timings[0]:>10.1f}µs{jit:>12}{speedup:>10}")
+    print("-"*58)
+
+
+if __name__ == "__main__":
+    main()
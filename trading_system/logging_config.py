@@ -0,0 +1,240 @@
+"""
+Logging Subsystem for Wind Catcher & River Turn
+Queue-backed logging so hot paths (per-fetch connector logs, collectors,
+the detector) never wait on disk
+
+Records are put on an in-memory queue and written by a background thread to:
+- logs/alerts.log: the same "[time] LEVEL: message" lines as before, rotated by size or time
+- logs/system.jsonl: one JSON object per record (time, level, module, message, ...)
+
+Every process (orchestrator, web server, collectors, pool workers) writes
+the same files, so only one of them rotates: the process whose script is
+logging.rotate_owner (the orchestrator by default). The others open, append
+and close the file per record, like the old writer, so the owner can
+rename it under them - on Windows, where a file another process has open
+can't be renamed, the owner copies and truncates it instead. Without the
+owner running the files just grow.
+
+Levels can be set per module in config.yaml:
+
+    logging:
+      level: INFO
+      levels:
+        hyperliquid_connector: WARNING
+
+utils.log_message() is the usual entry point; modules can also use
+get_logger(__name__) with the standard logging API.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from utils import ALERTS_LOG, LOGS_DIR, load_config
+
+ROOT_LOGGER = 'windriver'
+
+# log_message's extra level between INFO and WARNING
+SUCCESS = 25
+logging.addLevelName(SUCCESS, 'SUCCESS')
+
+DEFAULTS = {
+    'level': 'INFO',
+    'max_bytes': 10 * 1024 * 1024,
+    'backup_count': 5,
+    'rotate_when': None,
+    'json_file': 'system.jsonl',
+    'rotate_owner': 'orchestrator',
+    'levels': {}
+}
+
+TEXT_FORMAT = '[%(asctime)s] %(levelname)s: %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_lock = threading.Lock()
+_listener = None
+_pid = None
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Format a record as a single JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'module': record.name[len(ROOT_LOGGER) + 1:] or ROOT_LOGGER,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def level_number(level):
+    """
+    Convert a level name (INFO, SUCCESS, WARNING, ...) to its number
+
+    Unknown names are treated as INFO, as log_message always accepted any level string.
+    """
+    if isinstance(level, int):
+        return level
+    number = logging.getLevelName(str(level).upper())
+    return number if isinstance(number, int) else logging.INFO
+
+
+def _load_logging_config():
+    """Logging section of config.yaml merged over the defaults"""
+    settings = dict(DEFAULTS)
+    try:
+        settings.update(load_config().get('logging') or {})
+    except Exception:
+        # Logging must work even without a valid config
+        pass
+    return settings
+
+
+class AppendFileHandler(logging.Handler):
+    """Open, append and close the file per record - never holds it open for the rotating process"""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def emit(self, record):
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(self.format(record) + '\n')
+        except Exception:
+            self.handleError(record)
+
+
+def _rotate(source, dest):
+    """Move the full log to its backup, copying and truncating it when another process has it open (Windows)"""
+    try:
+        os.rename(source, dest)
+    except PermissionError:
+        shutil.copyfile(source, dest)
+        open(source, 'w').close()
+
+
+def process_name():
+    """Name of the running script (e.g. 'orchestrator'), with the pid for multiprocessing workers"""
+    main_file = getattr(sys.modules.get('__main__'), '__file__', None)
+    name = Path(main_file).stem if main_file else 'main'
+    if multiprocessing.parent_process() is not None:
+        name = f'{name}-worker-{os.getpid()}'
+    return name
+
+
+def owns_rotation(settings):
+    """True if this process rotates the log files (see logging.rotate_owner)"""
+    return bool(settings.get('rotate_owner')) and process_name() == settings['rotate_owner']
+
+
+def _file_handler(path, settings, formatter, rotate=True):
+    """
+    File handler for one log file
+
+    Rotating by time if rotate_when is set, else by size - or appending
+    only, when another process owns rotation
+    """
+    if not rotate:
+        handler = AppendFileHandler(path)
+    elif settings.get('rotate_when'):
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=settings['rotate_when'], backupCount=settings['backup_count'], encoding='utf-8'
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=settings['max_bytes'], backupCount=settings['backup_count'], encoding='utf-8'
+        )
+    if rotate:
+        handler.rotator = _rotate
+    handler.setFormatter(formatter)
+    return handler
+
+
+def setup_logging(settings=None):
+    """
+    Start the background log writer (safe to call repeatedly)
+
+    Re-creates the writer thread after a fork, since threads don't survive it.
+
+    Args:
+        settings (dict): Logging settings (defaults to config.yaml's logging section)
+    """
+    global _listener, _pid
+
+    with _lock:
+        if _listener is not None and _pid == os.getpid():
+            return
+
+        settings = settings or _load_logging_config()
+        LOGS_DIR.mkdir(parents=True, exist_ok=True)
+
+        rotate = owns_rotation(settings)
+        handlers = [_file_handler(ALERTS_LOG, settings, logging.Formatter(TEXT_FORMAT, DATE_FORMAT), rotate)]
+        if settings.get('json_file'):
+            handlers.append(_file_handler(LOGS_DIR / settings['json_file'], settings, JsonLineFormatter(), rotate))
+
+        log_queue = queue.Queue(-1)
+        root = logging.getLogger(ROOT_LOGGER)
+        root.handlers = [logging.handlers.QueueHandler(log_queue)]
+        root.setLevel(level_number(settings.get('level', 'INFO')))
+        root.propagate = False
+
+        for module, level in (settings.get('levels') or {}).items():
+            logging.getLogger(f'{ROOT_LOGGER}.{module}').setLevel(level_number(level))
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+        if _pid is None:
+            atexit.register(stop_logging)
+        _pid = os.getpid()
+
+
+def stop_logging():
+    """Flush queued records and stop the background writer"""
+    global _listener
+
+    with _lock:
+        if _listener is None:
+            return
+        if _pid == os.getpid():
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+        _listener = None
+
+
+def get_logger(name):
+    """
+    Get the logger for a module, starting the background writer if needed
+
+    Args:
+        name (str): Module name (usually __name__; '__main__' maps to the script name)
+
+    Returns:
+        logging.Logger: Logger under the 'windriver' hierarchy
+    """
+    if _listener is None or _pid != os.getpid():
+        setup_logging()
+
+    if name == '__main__':
+        main_file = getattr(sys.modules['__main__'], '__file__', None)
+        name = Path(main_file).stem if main_file else 'main'
+
+    return logging.getLogger(f'{ROOT_LOGGER}.{name}')
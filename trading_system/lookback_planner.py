@@ -0,0 +1,206 @@
+"""
+Lookback Planner for Wind Catcher & River Turn
+Sizes candle reads and fetches from what the analyzers actually need,
+instead of a fixed 200 candles everywhere:
+
+- every analyzer module declares data_requirements(timeframe): min_bars
+  (fewer and it returns no analysis) and window (the candles it loads -
+  older ones don't change the latest candle's signals)
+- plan_bars combines an analyzer set per timeframe: master_confluence loads
+  the set's window and needs its min_bars
+- candles_to_fetch sizes a collector fetch: the window for a pair that has
+  nothing stored, otherwise only the candles opened since the newest stored
+  one (plus that one, which may have been stored while still forming)
+
+Requirements are derived from each analyzer's own periods and recency
+limits, so the longer timeframes need fewer candles (a 12-hour retest limit
+is 12 candles on 1h but one on 12h).
+
+Usage:
+    python lookback_planner.py      # show the planned candles for the watchlist timeframes
+"""
+
+import sys
+import io
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+import importlib
+import sqlite3
+from functools import lru_cache
+
+from utils import get_current_timestamp, timeframe_to_seconds, candle_open_time
+
+# Analyzer name -> (module, requirements function). Modules are imported on
+# first use, like master_confluence.get_analyzer (enhanced_indicators pulls in scipy)
+ANALYZERS = {
+    'hull': ('enhanced_hull_analyzer', 'data_requirements'),
+    'ao': ('enhanced_indicators', 'data_requirements'),
+    'alligator': ('alligator_analyzer', 'data_requirements'),
+    'ichimoku': ('ichimoku_analyzer', 'data_requirements'),
+    'volume': ('master_confluence', 'volume_requirements')
+}
+
+# Everything analyze_master_confluence runs
+MASTER_ANALYZERS = ('hull', 'ao', 'alligator', 'ichimoku', 'volume')
+
+# Timeframes shown by main() when the watchlist has none
+DEFAULT_TIMEFRAMES = ('5m', '15m', '1h', '4h', '12h', '1d')
+
+
+@lru_cache(maxsize=None)
+def analyzer_requirements(name, timeframe):
+    """
+    One analyzer's declared requirements for a timeframe
+
+    Args:
+        name (str): Key of ANALYZERS
+        timeframe (str): Candle timeframe
+
+    Returns:
+        dict: min_bars, window
+    """
+    module, function = ANALYZERS[name]
+    return getattr(importlib.import_module(module), function)(timeframe)
+
+
+@lru_cache(maxsize=None)
+def plan_bars(timeframe, analyzers=MASTER_ANALYZERS):
+    """
+    Candles an analyzer set needs on a timeframe
+
+    Args:
+        timeframe (str): Candle timeframe
+        analyzers (tuple): Keys of ANALYZERS
+
+    Returns:
+        dict: min_bars and window (the largest of the set's), and
+              'analyzers' with each one's requirements
+    """
+    requirements = {name: analyzer_requirements(name, timeframe) for name in analyzers}
+    return {
+        'min_bars': max(r['min_bars'] for r in requirements.values()),
+        'window': max(r['window'] for r in requirements.values()),
+        'analyzers': requirements
+    }
+
+
+def required_bars(timeframe, analyzers=MASTER_ANALYZERS):
+    """Candles to keep and load for a timeframe (the set's window)"""
+    return plan_bars(timeframe, tuple(analyzers))['window']
+
+
+def candles_to_fetch(timeframe, last_timestamp=None, now=None, analyzers=MASTER_ANALYZERS):
+    """
+    Candles a collector fetch needs to bring a pair up to date
+
+    Args:
+        timeframe (str): Candle timeframe
+        last_timestamp (int): Newest stored candle (None if nothing is stored)
+        now (int): Current time
+        analyzers (tuple): Analyzer set the candles are for
+
+    Returns:
+        int: The window without stored candles, otherwise the candles opened
+             since the newest stored one plus that one - never more than the window
+    """
+    window = required_bars(timeframe, analyzers)
+    if last_timestamp is None:
+        return window
+
+    now = now or get_current_timestamp()
+    missing = (candle_open_time(timeframe, now) - int(last_timestamp)) // timeframe_to_seconds(timeframe)
+    return int(min(window, max(missing, 0) + 1))
+
+
+def last_candle_times(conn, pairs):
+    """
+    Newest stored candle of each pair
+
+    Read from pair_freshness (database_migration_v3.py), or from price_data
+    on databases without it.
+
+    Args:
+        conn: Database connection
+        pairs (iterable): (symbol, timeframe) tuples
+
+    Returns:
+        dict: {(symbol, timeframe): last_timestamp} - pairs with nothing stored are left out
+    """
+    pairs = set(pairs)
+    try:
+        rows = conn.execute("SELECT symbol, timeframe, last_timestamp FROM pair_freshness").fetchall()
+        return {(symbol, timeframe): last for symbol, timeframe, last in rows if (symbol, timeframe) in pairs}
+    except sqlite3.OperationalError:
+        pass
+
+    last_times = {}
+    for symbol, timeframe in pairs:
+        row = conn.execute("SELECT MAX(timestamp) FROM price_data WHERE symbol = ? AND timeframe = ?",
+                           (symbol, timeframe)).fetchone()
+        if row and row[0] is not None:
+            last_times[(symbol, timeframe)] = row[0]
+    return last_times
+
+
+def fetch_limits(conn, pairs, now=None, analyzers=MASTER_ANALYZERS):
+    """
+    Candles to fetch for each pair (see candles_to_fetch)
+
+    Args:
+        conn: Database connection
+        pairs (iterable): (symbol, timeframe) tuples
+        now (int): Current time
+        analyzers (tuple): Analyzer set the candles are for
+
+    Returns:
+        dict: {(symbol, timeframe): candles}
+    """
+    pairs = set(pairs)
+    now = now or get_current_timestamp()
+    last_times = last_candle_times(conn, pairs)
+    return {pair: candles_to_fetch(pair[1], last_times.get(pair), now, analyzers) for pair in pairs}
+
+
+def main():
+    """Show the candles each analyzer needs per watchlist timeframe"""
+    from utils import connect_to_database
+    from multi_timeframe_collector import get_watchlist_requirements
+
+    print("📐 Wind Catcher & River Turn - Lookback Planner")
+    print("="*60)
+
+    conn = connect_to_database()
+    try:
+        symbols, timeframes = get_watchlist_requirements(conn)
+        limits = fetch_limits(conn, {(s, tf) for s in symbols for tf in timeframes})
+    finally:
+        conn.close()
+
+    if not timeframes:
+        print("\n⚠️  No timeframes in user_watchlists - showing the common ones")
+        timeframes = DEFAULT_TIMEFRAMES
+
+    print(f"\nCandles loaded per analyzer (minimum / window):")
+    print(f"\n{'Timeframe':<10}" + "".join(f"{name:>12}" for name in MASTER_ANALYZERS) + f"{'Master':>12}")
+    print("-"*(22 + 12*len(MASTER_ANALYZERS)))
+    for timeframe in sorted(timeframes, key=timeframe_to_seconds):
+        plan = plan_bars(timeframe)
+        cells = [f"{r['min_bars']}/{r['window']}" for r in list(plan['analyzers'].values()) + [plan]]
+        print(f"{timeframe:<10}" + "".join(f"{cell:>12}" for cell in cells))
+    print("-"*(22 + 12*len(MASTER_ANALYZERS)))
+
+    if limits:
+        fetched = sum(limits.values())
+        print(f"\nNext collection fetches {fetched:,} candles for {len(limits)} pairs "
+              f"({fetched / len(limits):.1f} per pair)")
+        for timeframe in sorted({tf for _, tf in limits}, key=timeframe_to_seconds):
+            sizes = [candles for (_, tf), candles in limits.items() if tf == timeframe]
+            spread = f"{min(sizes)}-{max(sizes)}" if min(sizes) != max(sizes) else min(sizes)
+            print(f"  {timeframe:<6} {spread} candles per pair")
+
+
+if __name__ == "__main__":
+    main()
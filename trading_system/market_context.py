@@ -0,0 +1,248 @@
+"""
+Market Context Snapshot for Wind Catcher & River Turn
+One metaAndAssetCtxs request returns mark price, 24h volume, open interest and
+funding for every Hyperliquid perp. The collector takes a snapshot once per
+cycle and uses it to skip candle fetches that would change nothing:
+
+- a pair is always fetched when it has no stored candles, when a new candle
+  has opened since its last stored one, or when it was last fetched more than
+  max_skip_seconds ago
+- otherwise it is skipped while the mark price is within min_move_pct of the
+  stored close of its forming candle
+- markets under min_day_volume (24h notional) are deprioritized: they are
+  only fetched at candle opens and after max_skip_seconds
+
+The latest snapshot is kept in the market_context table (one row per market).
+
+Usage:
+    python market_context.py        # take a snapshot and show which pairs would be fetched
+"""
+
+import sys
+import io
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+from utils import connect_to_database, load_config, get_current_timestamp, candle_open_time
+from metrics import registry
+
+DEFAULTS = {
+    'enabled': True,
+    'min_move_pct': 0.1,
+    'min_day_volume': 0.0,
+    'max_skip_seconds': 600
+}
+
+# Snapshot fields stored per market
+CONTEXT_FIELDS = ('mark_price', 'prev_day_price', 'day_volume', 'open_interest', 'funding')
+
+
+def get_context_settings(config=None):
+    """
+    Fetch pre-filter settings from config.yaml (market_context section)
+
+    Returns:
+        dict: enabled, min_move_pct, min_day_volume, max_skip_seconds
+    """
+    config = config if config is not None else load_config()
+    settings = dict(DEFAULTS)
+    settings.update(config.get('market_context') or {})
+    return settings
+
+
+def create_context_table(conn):
+    """Create the market_context table (safe to re-run)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS market_context (
+            symbol TEXT PRIMARY KEY,
+            timestamp INTEGER NOT NULL,
+            mark_price REAL NOT NULL,
+            prev_day_price REAL,
+            day_volume REAL,
+            open_interest REAL,
+            funding REAL
+        ) WITHOUT ROWID
+    ''')
+    conn.commit()
+
+
+def store_market_context(conn, contexts, timestamp):
+    """
+    Replace the stored snapshot of every market in `contexts`
+
+    Args:
+        conn (sqlite3.Connection): Database connection
+        contexts (list): From HyperliquidConnector.fetch_market_context
+        timestamp (int): Time the snapshot was taken
+
+    Returns:
+        int: Markets stored
+    """
+    create_context_table(conn)
+    conn.executemany(f'''
+        INSERT OR REPLACE INTO market_context (symbol, timestamp, {', '.join(CONTEXT_FIELDS)})
+        VALUES (?, ?, {', '.join('?' for _ in CONTEXT_FIELDS)})
+    ''', [(context['symbol'], timestamp) + tuple(context[field] for field in CONTEXT_FIELDS)
+          for context in contexts])
+    conn.commit()
+    return len(contexts)
+
+
+def load_market_context(conn):
+    """
+    Latest stored snapshot
+
+    Returns:
+        dict: symbol -> dict with timestamp and the CONTEXT_FIELDS (empty if none stored)
+    """
+    create_context_table(conn)
+    rows = conn.execute(f"SELECT symbol, timestamp, {', '.join(CONTEXT_FIELDS)} FROM market_context").fetchall()
+    return {row[0]: dict(zip(('timestamp',) + CONTEXT_FIELDS, row[1:])) for row in rows}
+
+
+def take_snapshot(connector, conn, now=None):
+    """
+    Fetch and store the whole-universe snapshot
+
+    Returns:
+        dict: symbol -> context (empty if the request failed)
+    """
+    now = now or get_current_timestamp()
+    contexts = connector.fetch_market_context()
+    if not contexts:
+        return {}
+
+    store_market_context(conn, contexts, now)
+    return {context['symbol']: dict(context, timestamp=now) for context in contexts}
+
+
+def coin_name(symbol):
+    """Market name of a watchlist symbol ('BTC/USDT' -> 'BTC')"""
+    return symbol.split('/')[0]
+
+
+def price_move_pct(context, close):
+    """Absolute move of the mark price from a close, in percent"""
+    return abs(context['mark_price'] - close) / close * 100 if close else float('inf')
+
+
+def fetch_reason(cursor, symbol, timeframe, context, settings, now):
+    """
+    Why a pair's candles need fetching this cycle
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor on the database
+        symbol (str): Watchlist symbol
+        timeframe (str): Candle timeframe
+        context (dict): The symbol's market context (None if not in the snapshot)
+        settings (dict): From get_context_settings
+        now (int): Current time
+
+    Returns:
+        str: 'no_candles', 'candle_opened', 'stale', 'no_context' or 'moved' -
+             None if the fetch can be skipped
+    """
+    cursor.execute('''
+        SELECT timestamp, close, created_at
+        FROM price_data
+        WHERE symbol = ? AND timeframe = ?
+        ORDER BY timestamp DESC
+        LIMIT 1
+    ''', (symbol, timeframe))
+    latest = cursor.fetchone()
+
+    if latest is None:
+        return 'no_candles'
+
+    timestamp, close, fetched_at = latest
+    if candle_open_time(timeframe, now) > timestamp:
+        return 'candle_opened'
+    if now - fetched_at >= settings['max_skip_seconds']:
+        return 'stale'
+    if context is None:
+        return 'no_context'
+    if (context['day_volume'] or 0) < settings['min_day_volume']:
+        return None
+    if price_move_pct(context, close) >= settings['min_move_pct']:
+        return 'moved'
+    return None
+
+
+def select_pairs(conn, symbols, timeframe, contexts, settings, now=None):
+    """
+    Split a timeframe's symbols into the ones to fetch and the ones to skip
+
+    Args:
+        conn (sqlite3.Connection): Database connection
+        symbols (set): Watchlist symbols
+        timeframe (str): Candle timeframe
+        contexts (dict): From take_snapshot / load_market_context
+        settings (dict): From get_context_settings
+        now (int): Current time
+
+    Returns:
+        tuple: (set of symbols to fetch, set of skipped symbols)
+    """
+    now = now or get_current_timestamp()
+    cursor = conn.cursor()
+
+    fetch = set()
+    for symbol in symbols:
+        if fetch_reason(cursor, symbol, timeframe, contexts.get(coin_name(symbol)), settings, now):
+            fetch.add(symbol)
+    cursor.close()
+
+    skipped = set(symbols) - fetch
+    registry.inc('candle_fetches_skipped', len(skipped))
+    return fetch, skipped
+
+
+def main():
+    """Take a snapshot and show which watchlist pairs the collector would fetch"""
+    from hyperliquid_connector import connect_to_hyperliquid
+    from multi_timeframe_collector import get_watchlist_requirements
+
+    print("🧭 Wind Catcher & River Turn - Market Context")
+    print("="*60)
+
+    config = load_config()
+    settings = get_context_settings(config)
+
+    connector = connect_to_hyperliquid(use_testnet=config['exchange'].get('use_testnet', False))
+    if connector is None:
+        print("❌ Could not connect to Hyperliquid")
+        return
+
+    conn = connect_to_database()
+    try:
+        contexts = take_snapshot(connector, conn)
+        if not contexts:
+            print("❌ No market context returned")
+            return
+        print(f"✅ Stored context for {len(contexts)} markets")
+
+        symbols, timeframes = get_watchlist_requirements(conn)
+        total = skipped_total = 0
+        now = get_current_timestamp()
+
+        print(f"\n{'Timeframe':<10}{'Pairs':>7}{'Fetch':>7}{'Skip':>7}")
+        print("-"*31)
+        for timeframe in sorted(timeframes):
+            fetch, skipped = select_pairs(conn, symbols, timeframe, contexts, settings, now)
+            total += len(symbols)
+            skipped_total += len(skipped)
+            print(f"{timeframe:<10}{len(symbols):>7}{len(fetch):>7}{len(skipped):>7}")
+        print("-"*31)
+
+        if total:
+            # The snapshot itself costs one request
+            calls = total - skipped_total + 1
+            print(f"API calls this cycle: {calls} instead of {total} ({(total - calls) / total * 100:+.0f}% saved)")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,24 +11,48 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
+import importlib
+import time
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from utils import load_config, connect_to_database
+from metrics import registry, span, timed
+from candle_ring_buffer import read_frame
+from lookback_planner import plan_bars
+from indicator_engine import IndicatorEngine, sma
+
+# Analyzer modules are imported on first use so importing this module stays
+# cheap (enhanced_indicators pulls in scipy)
+_analyzers = {}
+
+def get_analyzer(name):
+    """Import an analyzer module (enhanced_hull_analyzer, alligator_analyzer, ...) once"""
+    module = _analyzers.get(name)
+    if module is None:
+        try:
+            module = importlib.import_module(name)
+        except ImportError as e:
+            print(f"❌ Error importing analyzer modules: {e}")
+            print("   Make sure all analyzer files are in the same directory")
+            raise
+        _analyzers[name] = module
+    return module
+
+def get_price_data(conn, symbol, timeframe='1h', limit=200, use_ring=False):
+    """
+    Get price data for analysis
+
+    use_ring: Try the collector's shared-memory ring first (ring_buffer.enabled) -
+    only for a conn on the live database the collector writes, since the
+    ring holds its candles whatever conn is passed
+    """
+    if use_ring:
+        with span('read_ring'):
+            df = read_frame(symbol, timeframe, limit)
+        if df is not None:
+            return df
 
-# Import analyzer modules properly
-try:
-    import enhanced_hull_analyzer
-    import enhanced_indicators
-    import alligator_analyzer
-    import ichimoku_analyzer
-except ImportError as e:
-    print(f"❌ Error importing analyzer modules: {e}")
-    print("   Make sure all analyzer files are in the same directory")
-    raise
-
-def get_price_data(conn, symbol, timeframe='1h', limit=200):
-    """Get price data for analysis"""
     query = '''
         SELECT timestamp, open, high, low, close, volume
         FROM price_data 
@@ -37,29 +61,35 @@ def get_price_data(conn, symbol, timeframe='1h', limit=200):
         LIMIT ?
     '''
     
-    df = pd.read_sql_query(query, conn, params=(symbol, timeframe, limit))
+    with span('get_price_data'):
+        df = pd.read_sql_query(query, conn, params=(symbol, timeframe, limit))
     
     if df.empty:
         return None
     
-    df = df.sort_values('timestamp').reset_index(drop=True)
-    df['datetime'] = pd.to_datetime(df['timestamp'], unit='s')
+    with span('build_dataframe'):
+        df = df.sort_values('timestamp').reset_index(drop=True)
+        df['datetime'] = pd.to_datetime(df['timestamp'], unit='s')
     return df
 
 # Analyzer wrapper functions with proper error handling
-def get_hull_signals(conn, symbol, timeframe='1h'):
+@timed('get_hull_signals')
+def get_hull_signals(conn, symbol, timeframe='1h', engine=None):
     """Get Hull MA signals from enhanced_hull_analyzer"""
+    analyzer = get_analyzer('enhanced_hull_analyzer')
     try:
-        result = enhanced_hull_analyzer.analyze_symbol_hull(conn, symbol, timeframe)
+        result = analyzer.analyze_symbol_hull(conn, symbol, timeframe, engine=engine)
         return result['all_signals'] if result else []
     except Exception as e:
         print(f"⚠️ Error getting Hull signals for {symbol}: {e}")
         return []
 
-def get_ao_signals(conn, symbol, timeframe='1h'):
+@timed('get_ao_signals')
+def get_ao_signals(conn, symbol, timeframe='1h', engine=None):
     """Get AO divergence signals from enhanced_indicators"""
+    analyzer = get_analyzer('enhanced_indicators')
     try:
-        result = enhanced_indicators.analyze_symbol_with_ao(conn, symbol, timeframe)
+        result = analyzer.analyze_symbol_with_ao(conn, symbol, timeframe, engine=engine)
         if result and result.get('ao_analysis', {}).get('divergences'):
             signals = []
             for div in result['ao_analysis']['divergences']:
@@ -75,10 +105,12 @@ def get_ao_signals(conn, symbol, timeframe='1h'):
         print(f"⚠️ Error getting AO signals for {symbol}: {e}")
         return []
 
-def get_alligator_signals(conn, symbol, timeframe='1h'):
+@timed('get_alligator_signals')
+def get_alligator_signals(conn, symbol, timeframe='1h', engine=None):
     """Get Alligator signals from alligator_analyzer"""
+    analyzer = get_analyzer('alligator_analyzer')
     try:
-        result = alligator_analyzer.analyze_symbol_alligator(conn, symbol, timeframe)
+        result = analyzer.analyze_symbol_alligator(conn, symbol, timeframe, engine=engine)
         if result and result.get('retracement_events'):
             signals = []
             for event in result['retracement_events']:
@@ -96,10 +128,12 @@ def get_alligator_signals(conn, symbol, timeframe='1h'):
         print(f"⚠️ Error getting Alligator signals for {symbol}: {e}")
         return []
 
-def get_ichimoku_signals(conn, symbol, timeframe='1h'):
+@timed('get_ichimoku_signals')
+def get_ichimoku_signals(conn, symbol, timeframe='1h', engine=None):
     """Get Ichimoku signals from ichimoku_analyzer"""
+    analyzer = get_analyzer('ichimoku_analyzer')
     try:
-        result = ichimoku_analyzer.analyze_symbol_ichimoku(conn, symbol, timeframe)
+        result = analyzer.analyze_symbol_ichimoku(conn, symbol, timeframe, engine=engine)
         if result and result.get('significant_events'):
             signals = []
             for event in result['significant_events']:
@@ -122,13 +156,30 @@ def get_ichimoku_signals(conn, symbol, timeframe='1h'):
         print(f"⚠️ Error getting Ichimoku signals for {symbol}: {e}")
         return []
 
-def detect_volume_signals(df, monitoring_candles=3):
+def volume_requirements(timeframe='1h', monitoring_candles=3):
+    """
+    Candles detect_volume_signals needs (collected by lookback_planner.py)
+
+    Each of the last monitoring_candles candles is compared with a baseline of
+    up to 120 candles (at least 24).
+
+    Returns:
+        dict: min_bars and window
+    """
+    return {'min_bars': 24, 'window': 120 + monitoring_candles - 1}
+
+def indicator_nodes(n_bars=120):
+    """Indicator engine nodes the volume signals read (the up-to-120-candle volume baseline)"""
+    return [sma('volume', min(120, n_bars), min_periods=24)]
+
+@timed('detect_volume_signals')
+def detect_volume_signals(df, monitoring_candles=3, engine=None):
     """Detect volume signals"""
     if len(df) < 24:
         return []
     
-    baseline_periods = min(120, len(df))
-    df['volume_baseline'] = df['volume'].rolling(window=baseline_periods, min_periods=24).mean()
+    engine = engine or IndicatorEngine(df)
+    df['volume_baseline'], = engine.evaluate(*indicator_nodes(len(df)))
     
     recent_data = df.tail(monitoring_candles)
     volume_signals = []
@@ -161,6 +212,7 @@ def detect_volume_signals(df, monitoring_candles=3):
     
     return volume_signals
 
+@timed('calculate_master_confluence')
 def calculate_master_confluence(hull_signals, ao_signals, alligator_signals, ichimoku_signals, volume_signals):
     """Calculate master confluence score from all indicators"""
     total_score = 0
@@ -240,18 +292,190 @@ def calculate_master_confluence(hull_signals, ao_signals, alligator_signals, ich
         'signal_count': signal_count
     }
 
-def analyze_master_confluence(conn, symbol, timeframe='1h'):
-    """Master confluence analysis combining all indicators"""
-    df = get_price_data(conn, symbol, timeframe=timeframe, limit=200)
-    if df is None or len(df) < 150:
+# Analyzers in calculate_master_confluence order - the first one with a
+# signal decides primary_system
+CONFLUENCE_STAGES = ('hull', 'ao', 'alligator', 'ichimoku')
+
+SIGNAL_FUNCTIONS = {
+    'hull': get_hull_signals,
+    'ao': get_ao_signals,
+    'alligator': get_alligator_signals,
+    'ichimoku': get_ichimoku_signals
+}
+
+# Seconds per call on a 200-candle window - the starting point for the
+# measured costs that order the stages (cheapest first)
+STAGE_COSTS = {'ichimoku': 0.005, 'alligator': 0.006, 'hull': 0.004, 'ao': 0.020}
+_stage_costs = dict(STAGE_COSTS)
+
+# Weight of the latest call in the measured stage costs
+COST_SMOOTHING = 0.2
+
+# Scores are summed in a different order than calculate_master_confluence does
+BOUND_MARGIN = 1e-6
+
+SYSTEMS = {1: 'wind_catcher', -1: 'river_turn', 0: None}
+
+
+def estimate_signal_scores(df):
+    """
+    Each analyzer's score and system for the latest candle, without running it
+
+    vectorized_confluence applies the analyzers' rules with NumPy over the
+    same window and matches them exactly, in a few milliseconds per pair.
+
+    Returns:
+        dict: {stage: (score, system)} - system is 'wind_catcher', 'river_turn' or None
+    """
+    from vectorized_confluence import hull_scores, ao_scores, alligator_scores, ichimoku_scores
+
+    timestamps = df['timestamp'].values.astype(np.int64)
+    high, low, close = (df[column].values.astype(float) for column in ('high', 'low', 'close'))
+    parts = {
+        'hull': hull_scores(timestamps, high, low, close),
+        'ao': ao_scores(high, low, start=len(close) - 1),
+        'alligator': alligator_scores(timestamps, high, low, close),
+        'ichimoku': ichimoku_scores(timestamps, high, low, close)
+    }
+    return {stage: (float(p.score[-1]), SYSTEMS[int(p.system[-1])]) for stage, p in parts.items()}
+
+
+def volume_contribution(volume_signals):
+    """What the volume signals add to the confluence score"""
+    if not volume_signals:
+        return 0.0
+    latest_volume = volume_signals[-1]
+    return latest_volume['strength'] + (0.3 if latest_volume['ratio'] >= 1.5 else 0.0)
+
+
+def short_circuit_reason(signals, estimates, volume_score, direction=None, min_score=None):
+    """
+    Why the remaining analyzers can't change the outcome for the detector
+
+    Args:
+        signals (dict): {stage: signals} of the analyzers run so far
+        estimates (dict): From estimate_signal_scores, used for the others
+        volume_score (float): From volume_contribution
+        direction (str): Watch direction the primary system must match
+        min_score (float): Score the pair must reach
+
+    Returns:
+        str: 'score' (even the upper bound is below min_score), 'direction'
+             (the primary system can't be `direction`) - None to keep going
+    """
+    if min_score is not None:
+        bound = volume_score + BOUND_MARGIN
+        for stage in CONFLUENCE_STAGES:
+            if stage in signals:
+                bound += sum(signal['strength'] for signal in signals[stage])
+            else:
+                bound += estimates[stage][0]
+        if bound < min_score:
+            return 'score'
+
+    if direction is not None:
+        system = None
+        for stage in CONFLUENCE_STAGES:
+            if stage in signals:
+                system = signals[stage][0]['system'] if signals[stage] else None
+            else:
+                system = estimates[stage][1]
+            if system:
+                break
+        if system != direction:
+            return 'direction'
+
+    return None
+
+
+def evaluate_signals(conn, symbol, timeframe, df, volume_signals, direction=None, min_score=None, engine=None):
+    """
+    Run the analyzers cheapest first, stopping once the outcome is decided
+
+    Before each analyzer the score's upper bound (signals found so far plus
+    the estimates of the analyzers not run yet) is checked against min_score,
+    and the primary system against the watch direction. The analyzers share
+    the engine's indicators (each reads its own candles if None).
+
+    Returns:
+        tuple: ({stage: signals} of the analyzers that ran, short-circuit dict or None)
+    """
+    if direction is None and min_score is None:
+        return {stage: SIGNAL_FUNCTIONS[stage](conn, symbol, timeframe, engine) for stage in CONFLUENCE_STAGES}, None
+
+    with span('estimate_signal_scores'):
+        estimates = estimate_signal_scores(df)
+    volume_score = volume_contribution(volume_signals)
+    signals = {}
+
+    while len(signals) < len(CONFLUENCE_STAGES):
+        reason = short_circuit_reason(signals, estimates, volume_score, direction, min_score)
+        if reason:
+            skipped = [stage for stage in CONFLUENCE_STAGES if stage not in signals]
+            registry.inc(f'confluence_short_circuit_{reason}')
+            return signals, {
+                'reason': reason,
+                'skipped': skipped,
+                'seconds_saved': sum(_stage_costs[stage] for stage in skipped)
+            }
+
+        stage = min((stage for stage in CONFLUENCE_STAGES if stage not in signals), key=_stage_costs.get)
+        started = time.perf_counter()
+        signals[stage] = SIGNAL_FUNCTIONS[stage](conn, symbol, timeframe, engine)
+        _stage_costs[stage] += COST_SMOOTHING * (time.perf_counter() - started - _stage_costs[stage])
+
+        # The estimates should be exact - count it if one wasn't
+        score = sum(signal['strength'] for signal in signals[stage])
+        system = signals[stage][0]['system'] if signals[stage] else None
+        if abs(score - estimates[stage][0]) > BOUND_MARGIN or system != estimates[stage][1]:
+            registry.inc('confluence_estimate_mismatches')
+
+    return signals, None
+
+
+@timed('analyze_master_confluence')
+def analyze_master_confluence(conn, symbol, timeframe='1h', direction=None, min_score=None, use_ring=False):
+    """
+    Master confluence analysis combining all indicators
+
+    Without direction and min_score every analyzer runs. With them (the
+    signal detector), analysis stops as soon as the pair can no longer reach
+    min_score with direction as its primary system - see evaluate_signals.
+
+    Args:
+        conn: Database connection
+        symbol: Trading symbol
+        timeframe: Timeframe
+        direction: Watch direction ('wind_catcher' / 'river_turn') the primary system must match
+        min_score: Score the pair must reach
+        use_ring: Read the candles from the collector's ring when it has them
+                  (the signal detector on the live database - see get_price_data)
+
+    Returns:
+        dict: Signals per analyzer and the confluence - when analysis stopped
+              early, 'short_circuit' holds reason, skipped and seconds_saved
+              and the skipped analyzers' signal lists are empty
+    """
+    # Every analyzer's warm-up and lookback (lookback_planner.py)
+    plan = plan_bars(timeframe)
+    df = get_price_data(conn, symbol, timeframe=timeframe, limit=plan['window'], use_ring=use_ring)
+    if df is None or len(df) < plan['min_bars']:
         return None
 
-    # Get signals from all dedicated analyzers
-    hull_signals = get_hull_signals(conn, symbol, timeframe)
-    ao_signals = get_ao_signals(conn, symbol, timeframe)
-    alligator_signals = get_alligator_signals(conn, symbol, timeframe)
-    ichimoku_signals = get_ichimoku_signals(conn, symbol, timeframe)
-    volume_signals = detect_volume_signals(df.copy())
+    # One indicator engine for every analyzer - shared series are computed once
+    # and the candles are read once (indicator_engine.py)
+    engine = IndicatorEngine(df)
+
+    # Get signals from the dedicated analyzers
+    volume_signals = detect_volume_signals(df.copy(), engine=engine)
+    signals, short_circuit = evaluate_signals(conn, symbol, timeframe, df, volume_signals, direction, min_score,
+                                              engine)
+    registry.inc('indicator_nodes_computed', engine.stats['computed'])
+    registry.inc('indicator_nodes_reused', engine.stats['reused'])
+    hull_signals = signals.get('hull', [])
+    ao_signals = signals.get('ao', [])
+    alligator_signals = signals.get('alligator', [])
+    ichimoku_signals = signals.get('ichimoku', [])
     
     # Calculate master confluence
     confluence = calculate_master_confluence(
@@ -261,7 +485,7 @@ def analyze_master_confluence(conn, symbol, timeframe='1h'):
     # Get latest values
     latest = df.iloc[-1]
     
-    return {
+    result = {
         'symbol': symbol,
         'timeframe': timeframe,
         'timestamp': latest['timestamp'],
@@ -274,6 +498,9 @@ def analyze_master_confluence(conn, symbol, timeframe='1h'):
         'volume_signals': volume_signals,
         'confluence': confluence
     }
+    if short_circuit:
+        result['short_circuit'] = short_circuit
+    return result
 
 def main():
     """Main master confluence analysis"""
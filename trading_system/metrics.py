@@ -0,0 +1,346 @@
+"""
+Timing Metrics for Wind Catcher & River Turn
+Lightweight spans and histograms around the scan pipeline's hot paths
+(database reads, DataFrame construction, each analyzer, confluence scoring,
+signal saving, Telegram and the exchange connector)
+
+Spans are aggregated into cumulative histograms and a per-cycle view. The
+detector writes a snapshot to logs/scan_metrics.json after every cycle, which
+the web interface serves at /api/metrics in Prometheus text format.
+
+Usage:
+    from metrics import registry, span, timed
+
+    with span('get_price_data'):
+        df = pd.read_sql_query(...)
+
+    @timed('get_hull_signals')
+    def get_hull_signals(...):
+        ...
+"""
+
+import cProfile
+import functools
+import io
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+from utils import LOGS_DIR, get_current_timestamp
+
+METRICS_FILE = LOGS_DIR / 'scan_metrics.json'
+PROFILE_DIR = LOGS_DIR / 'profiles'
+
+# Upper bounds in seconds - from sub-millisecond DB reads up to slow API calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = 'windriver'
+
+
+class Histogram:
+    """Fixed-bucket duration histogram"""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        """Record one duration"""
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                index = i
+                break
+
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self):
+        """JSON-serializable form (bucket counts are not cumulative)"""
+        return {
+            'buckets': list(self.buckets),
+            'counts': list(self.counts),
+            'count': self.count,
+            'sum': self.sum,
+            'max': self.max
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe collection of span histograms, counters and gauges"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.enabled = True
+        self.cycles = 0
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._cycle_histograms = {}
+        self._last_cycle = None
+        self._counters = {}
+        self._gauges = {}
+        self._cycle_started = None
+
+    def observe(self, name, seconds):
+        """Record a duration for a span name"""
+        with self._lock:
+            for histograms in (self._histograms, self._cycle_histograms):
+                histogram = histograms.get(name)
+                if histogram is None:
+                    histogram = histograms[name] = Histogram(self.buckets)
+                histogram.observe(seconds)
+
+    def inc(self, name, amount=1):
+        """Increase a counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def set_gauge(self, name, value):
+        """Set a gauge to its current value"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[name] = value
+
+    @contextmanager
+    def span(self, name):
+        """Time the enclosed block (recorded even if it raises)"""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def start_cycle(self):
+        """Begin a new scan cycle (per-cycle histograms start empty)"""
+        with self._lock:
+            self._cycle_histograms = {}
+            self._cycle_started = time.perf_counter()
+
+    def end_cycle(self):
+        """
+        Finish the current scan cycle
+
+        Returns:
+            dict: {span: histogram dict} for the cycle just finished
+        """
+        with self._lock:
+            duration = time.perf_counter() - self._cycle_started if self._cycle_started else 0.0
+            self.cycles += 1
+            self._last_cycle = {
+                'finished_at': get_current_timestamp(),
+                'duration': duration,
+                'spans': {name: h.to_dict() for name, h in self._cycle_histograms.items()}
+            }
+            self._cycle_histograms = {}
+            self._cycle_started = None
+            return self._last_cycle
+
+    def snapshot(self):
+        """
+        Current metrics as a JSON-serializable dict
+
+        Returns:
+            dict: generated_at, cycles, spans, counters, gauges, last_cycle
+        """
+        with self._lock:
+            return {
+                'generated_at': get_current_timestamp(),
+                'cycles': self.cycles,
+                'spans': {name: h.to_dict() for name, h in self._histograms.items()},
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+                'last_cycle': self._last_cycle
+            }
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self.cycles = 0
+            self._histograms = {}
+            self._cycle_histograms = {}
+            self._last_cycle = None
+            self._counters = {}
+            self._gauges = {}
+            self._cycle_started = None
+
+
+# Process-wide registry used by the instrumented modules
+registry = MetricsRegistry()
+
+
+def span(name):
+    """Time a block on the shared registry (see MetricsRegistry.span)"""
+    return registry.span(name)
+
+
+def timed(name):
+    """Decorator timing every call of a function as span `name`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with registry.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def save_snapshot(path=METRICS_FILE):
+    """Write the shared registry's snapshot for other processes (atomic replace)"""
+    try:
+        path.parent.mkdir(exist_ok=True)
+        tmp_file = path.with_suffix('.tmp')
+        tmp_file.write_text(json.dumps(registry.snapshot(), indent=2), encoding='utf-8')
+        tmp_file.replace(path)
+    except Exception as e:
+        print(f"⚠️ Could not save scan metrics: {e}")
+
+
+def load_snapshot(path=METRICS_FILE):
+    """
+    Read a snapshot written by save_snapshot
+
+    Returns:
+        dict: Snapshot, or None if no process has written one yet
+    """
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def _escape_label(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    """Prometheus sample value"""
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(snapshot, prefix=METRIC_PREFIX):
+    """
+    Render a snapshot in the Prometheus text exposition format (version 0.0.4)
+
+    Args:
+        snapshot (dict): From MetricsRegistry.snapshot / load_snapshot (None renders an empty set)
+        prefix (str): Metric name prefix
+
+    Returns:
+        str: Exposition text
+    """
+    lines = []
+    snapshot = snapshot or {}
+
+    def metric(name, metric_type, help_text):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+
+    spans = snapshot.get('spans', {})
+    if spans:
+        name = 'span_duration_seconds'
+        metric(name, 'histogram', "Time spent in instrumented scan pipeline steps")
+        for span_name, histogram in sorted(spans.items()):
+            label = f'span="{_escape_label(span_name)}"'
+            cumulative = 0
+            for bound, count in zip(histogram['buckets'], histogram['counts']):
+                cumulative += count
+                lines.append(f'{prefix}_{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_{name}_bucket{{{label},le="+Inf"}} {histogram["count"]}')
+            lines.append(f'{prefix}_{name}_sum{{{label}}} {_format_value(histogram["sum"])}')
+            lines.append(f'{prefix}_{name}_count{{{label}}} {histogram["count"]}')
+
+    last_cycle = snapshot.get('last_cycle')
+    if last_cycle:
+        metric('last_cycle_duration_seconds', 'gauge', "Wall time of the most recent scan cycle")
+        lines.append(f"{prefix}_last_cycle_duration_seconds {_format_value(float(last_cycle['duration']))}")
+
+        metric('last_cycle_finished_timestamp_seconds', 'gauge', "When the most recent scan cycle finished")
+        lines.append(f"{prefix}_last_cycle_finished_timestamp_seconds {last_cycle['finished_at']}")
+
+        cycle_spans = sorted(last_cycle.get('spans', {}).items())
+        for name, key, help_text in (
+            ('last_cycle_span_seconds', 'sum', "Total time per span in the most recent scan cycle"),
+            ('last_cycle_span_max_seconds', 'max', "Slowest single call per span in the most recent scan cycle"),
+            ('last_cycle_span_calls', 'count', "Calls per span in the most recent scan cycle")
+        ):
+            metric(name, 'gauge', help_text)
+            for span_name, histogram in cycle_spans:
+                lines.append(f'{prefix}_{name}{{span="{_escape_label(span_name)}"}} {_format_value(histogram[key])}')
+
+    metric('scan_cycles_total', 'counter', "Scan cycles completed since the detector started")
+    lines.append(f"{prefix}_scan_cycles_total {snapshot.get('cycles', 0)}")
+
+    for counter, value in sorted(snapshot.get('counters', {}).items()):
+        metric(f'{counter}_total', 'counter', f"Count of {counter.replace('_', ' ')}")
+        lines.append(f"{prefix}_{counter}_total {_format_value(value)}")
+
+    for gauge, value in sorted(snapshot.get('gauges', {}).items()):
+        metric(gauge, 'gauge', f"Current {gauge.replace('_', ' ')}")
+        lines.append(f"{prefix}_{gauge} {_format_value(value)}")
+
+    if 'generated_at' in snapshot:
+        metric('metrics_snapshot_timestamp_seconds', 'gauge', "When this snapshot was written")
+        lines.append(f"{prefix}_metrics_snapshot_timestamp_seconds {snapshot['generated_at']}")
+
+    return '\n'.join(lines) + '\n'
+
+
+def print_cycle_summary(cycle, top=8):
+    """Print the slowest spans of a finished cycle (from end_cycle)"""
+    spans = sorted(cycle['spans'].items(), key=lambda item: item[1]['sum'], reverse=True)
+    if not spans:
+        return
+
+    print(f"\n⏱️ Cycle timing ({cycle['duration']:.2f}s):")
+    for name, histogram in spans[:top]:
+        average_ms = histogram['sum'] / histogram['count'] * 1000 if histogram['count'] else 0
+        print(f"   {name:28s} {histogram['sum']:7.3f}s  {histogram['count']:5d} calls  "
+              f"avg {average_ms:7.1f}ms  max {histogram['max'] * 1000:7.1f}ms")
+
+
+@contextmanager
+def profile_to(label, top=20):
+    """
+    Run the enclosed block under cProfile and dump the stats
+
+    Writes logs/profiles/<label>_<timestamp>.prof (open with pstats or snakeviz)
+    and prints the top functions by cumulative time. Only the calling thread
+    is profiled.
+
+    Args:
+        label (str): File name prefix
+        top (int): Functions to print
+    """
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    path = PROFILE_DIR / f"{label}_{time.strftime('%Y%m%d_%H%M%S')}.prof"
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield path
+    finally:
+        profiler.disable()
+        profiler.dump_stats(str(path))
+
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(top)
+        print(f"\n🔬 Profile saved to {path}")
+        print(output.getvalue())
@@ -0,0 +1,393 @@
+"""
+Mock Hyperliquid Server for Wind Catcher & River Turn
+Serves the /info API from recorded (or synthetic) responses, so collectors,
+the orchestrator and the benchmarks can run without network access
+
+Fixtures:
+- recorded: set exchange.record_file in config.yaml and run any collector -
+  HyperliquidConnector saves every /info response it receives to that file
+- synthetic: --synthetic N builds N random-walk markets (seeded, so every run
+  serves the same candles)
+
+Replayed candles are shifted by whole candles so the latest recorded candle
+is the one forming at request time - a fixture recorded last month still
+looks live. Latency, server errors and rate-limit (429) responses can be
+injected to load-test the collectors' error handling.
+
+Usage:
+    python mock_hyperliquid_server.py                                 # replay data/fixtures/hyperliquid.json
+    python mock_hyperliquid_server.py --synthetic 150 --timeframes 1h 4h
+    python mock_hyperliquid_server.py --latency 80 --jitter 40 --error-rate 0.02 --rate-limit 10
+
+Then point the system at it with exchange.api_url: http://127.0.0.1:8750 in config.yaml.
+"""
+
+import sys
+import io
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from utils import TRADING_SYSTEM_DIR, candle_open_time, get_current_timestamp, timeframe_to_seconds
+
+DEFAULT_FIXTURE = TRADING_SYSTEM_DIR / 'data' / 'fixtures' / 'hyperliquid.json'
+DEFAULT_PORT = 8750
+
+# Hyperliquid returns at most this many candles per candleSnapshot request
+MAX_CANDLES = 5000
+
+
+# ----------------------------------------------------------------------------
+# Fixtures
+# ----------------------------------------------------------------------------
+
+def empty_fixture():
+    """
+    Fixture layout
+
+    responses: latest response per request type (meta, spotMeta, metaAndAssetCtxs, ...)
+    candles: "<coin> <interval>" -> raw candles sorted by open time
+    """
+    return {'responses': {}, 'candles': {}}
+
+
+def candle_key(coin, interval):
+    """Fixture key of a coin's candles"""
+    return f"{coin} {interval}"
+
+
+def load_fixture(path=DEFAULT_FIXTURE):
+    """Load a fixture file"""
+    with open(path, 'r', encoding='utf-8') as file:
+        fixture = json.load(file)
+    fixture.setdefault('responses', {})
+    fixture.setdefault('candles', {})
+    return fixture
+
+
+def save_fixture(fixture, path=DEFAULT_FIXTURE):
+    """Write a fixture file (to a temp file first, so readers never see half a file)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix('.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(fixture, file)
+    os.replace(temp_path, path)
+
+
+class FixtureRecorder:
+    """Collects /info responses into a fixture file (see HyperliquidConnector record_file)"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (Path): Fixture file - extended if it already exists
+        """
+        self.path = path
+        self.fixture = load_fixture(path) if path.exists() else empty_fixture()
+        self._lock = threading.Lock()
+
+    def record(self, payload, response):
+        """
+        Add one request's response and save the fixture
+
+        Candles are merged by open time (the forming candle is overwritten by
+        later fetches); every other request type keeps its latest response.
+        """
+        with self._lock:
+            if payload.get('type') == 'candleSnapshot':
+                request = payload['req']
+                key = candle_key(request['coin'], request['interval'])
+                candles = {candle['t']: candle for candle in self.fixture['candles'].get(key, [])}
+                candles.update((candle['t'], candle) for candle in response)
+                self.fixture['candles'][key] = [candles[t] for t in sorted(candles)]
+            else:
+                self.fixture['responses'][payload.get('type')] = response
+
+            save_fixture(self.fixture, self.path)
+        return response
+
+
+def synthetic_fixture(n_symbols, timeframes=('1h',), bars=1000, seed=0, start_time=1700000000):
+    """
+    Deterministic random-walk markets
+
+    Args:
+        n_symbols (int): Markets to create (named SYN000, SYN001, ...)
+        timeframes (tuple): Intervals with candles
+        bars (int): Candles per market and interval
+        seed (int): Random seed
+        start_time (int): Approximate open time of the first candle (seconds)
+
+    Returns:
+        dict: Fixture (see empty_fixture)
+    """
+    rng = np.random.default_rng(seed)
+    names = [f"SYN{i:03d}" for i in range(n_symbols)]
+    fixture = empty_fixture()
+    last_close = {}
+
+    for name in names:
+        start_price = float(np.exp(rng.uniform(-2, 8)))
+        for interval in timeframes:
+            length = timeframe_to_seconds(interval)
+            opens = candle_open_time(interval, start_time) + np.arange(bars) * length
+
+            returns = rng.normal(0, 0.004 * np.sqrt(length / 3600), bars)
+            close = start_price * np.exp(np.cumsum(returns))
+            open_price = np.concatenate([[start_price], close[:-1]])
+            spread = np.abs(rng.normal(0, 0.002, (2, bars))) * close
+            high = np.maximum(open_price, close) + spread[0]
+            low = np.minimum(open_price, close) - spread[1]
+            volume = rng.lognormal(8, 0.6, bars)
+
+            fixture['candles'][candle_key(name, interval)] = [{
+                't': int(opens[i]) * 1000, 'T': (int(opens[i]) + length) * 1000 - 1,
+                's': name, 'i': interval,
+                'o': f"{open_price[i]:.6g}", 'h': f"{high[i]:.6g}", 'l': f"{low[i]:.6g}",
+                'c': f"{close[i]:.6g}", 'v': f"{volume[i]:.2f}", 'n': int(rng.integers(10, 500))
+            } for i in range(bars)]
+            last_close[name] = close[-1]
+
+    universe = [{'name': name, 'szDecimals': 2, 'maxLeverage': 20} for name in names]
+    fixture['responses']['meta'] = {'universe': universe}
+    fixture['responses']['spotMeta'] = {'universe': [], 'tokens': []}
+    fixture['responses']['metaAndAssetCtxs'] = [{'universe': universe}, [{
+        'markPx': f"{last_close[name]:.6g}",
+        'prevDayPx': f"{last_close[name] * (1 + rng.normal(0, 0.03)):.6g}",
+        'dayNtlVlm': f"{rng.lognormal(14, 1.5):.2f}",
+        'openInterest': f"{rng.lognormal(10, 1):.2f}",
+        'funding': f"{rng.normal(0, 0.00002):.8f}"
+    } for name in names]]
+    return fixture
+
+
+# ----------------------------------------------------------------------------
+# Server
+# ----------------------------------------------------------------------------
+
+class _InfoHandler(BaseHTTPRequestHandler):
+    """POST /info like the Hyperliquid API, GET /stats for the server's counters"""
+
+    def do_POST(self):
+        mock = self.server.mock
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            payload = {}
+
+        status, response = mock.handle(self.path, payload)
+        self._send(status, response)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self._send(200, self.server.mock.get_stats())
+        else:
+            self._send(404, None)
+
+    def _send(self, status, response):
+        data = json.dumps(response).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Requests are counted in get_stats() instead of logged one by one
+        pass
+
+
+class MockHyperliquidServer:
+    """Local /info server replaying a fixture, with injectable latency, errors and rate limits"""
+
+    def __init__(self, fixture, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, rate_limit=0, seed=0, shift_time=True):
+        """
+        Args:
+            fixture (dict): From load_fixture / synthetic_fixture
+            host (str): Address to bind
+            port (int): Port to bind (0 = any free port)
+            latency (float): Seconds added to every response
+            jitter (float): Up to this many extra seconds, drawn per request
+            error_rate (float): Fraction of requests answered with a 500
+            rate_limit (float): Requests per second before answering 429 (0 = unlimited)
+            seed (int): Seed for jitter and injected errors
+            shift_time (bool): Shift candles so the latest one is forming at request time
+        """
+        self.fixture = fixture
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.shift_time = shift_time
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = float(rate_limit)
+        self._refilled = time.monotonic()
+        self.stats = {'requests': 0, 'errors': 0, 'rate_limited': 0, 'by_type': {}}
+
+        self.httpd = ThreadingHTTPServer((host, port), _InfoHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL to use as exchange.api_url"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='mock-hyperliquid', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def get_stats(self):
+        """Request counters"""
+        with self._lock:
+            return json.loads(json.dumps(self.stats))
+
+    def _take_token(self):
+        """Token bucket holding up to one second of requests"""
+        now = time.monotonic()
+        self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled) * self.rate_limit)
+        self._refilled = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def handle(self, path, payload):
+        """
+        Answer one request
+
+        Returns:
+            tuple: (HTTP status, JSON-serializable response)
+        """
+        request_type = payload.get('type')
+
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['by_type'][request_type] = self.stats['by_type'].get(request_type, 0) + 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate and self._random.random() < self.error_rate
+            limited = self.rate_limit and not self._take_token()
+            if limited:
+                self.stats['rate_limited'] += 1
+            elif fail:
+                self.stats['errors'] += 1
+
+        if delay:
+            time.sleep(delay)
+
+        if path != '/info':
+            return 404, None
+        if limited:
+            return 429, None
+        if fail:
+            return 500, None
+        if request_type == 'candleSnapshot':
+            return 200, self.candles(payload.get('req', {}))
+        if request_type in self.fixture['responses']:
+            return 200, self.fixture['responses'][request_type]
+        return 422, {'code': None, 'msg': f"No recorded response for {request_type}", 'data': None}
+
+    def candles(self, request):
+        """Recorded candles within the request's time range (shifted if shift_time)"""
+        interval = request.get('interval')
+        candles = self.fixture['candles'].get(candle_key(request.get('coin'), interval), [])
+        if not candles:
+            return []
+
+        end_time = int(request.get('endTime') or get_current_timestamp() * 1000)
+        start_time = int(request.get('startTime') or 0)
+
+        shift = 0
+        if self.shift_time:
+            shift = candle_open_time(interval, end_time // 1000) * 1000 - candles[-1]['t']
+
+        selected = [dict(candle, t=candle['t'] + shift, T=candle['T'] + shift) for candle in candles
+                    if start_time <= candle['t'] + shift <= end_time]
+        return selected[-MAX_CANDLES:]
+
+
+def main():
+    """Run the mock server until Ctrl+C"""
+    parser = argparse.ArgumentParser(description="Serve recorded or synthetic Hyperliquid /info responses")
+    parser.add_argument('--fixture', default=str(DEFAULT_FIXTURE), help="Fixture file to replay")
+    parser.add_argument('--synthetic', type=int, metavar='N', help="Serve N synthetic markets instead of a fixture")
+    parser.add_argument('--timeframes', nargs='+', default=['1h'], help="Synthetic intervals")
+    parser.add_argument('--bars', type=int, default=1000, help="Synthetic candles per market and interval")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for synthetic data, jitter and errors")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--latency', type=float, default=0.0, help="Milliseconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Up to this many extra milliseconds per response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with a 500")
+    parser.add_argument('--rate-limit', type=float, default=0, help="Requests per second before answering 429")
+    parser.add_argument('--no-shift', action='store_true', help="Serve candles at their recorded times")
+    args = parser.parse_args()
+
+    print("🧪 Wind Catcher & River Turn - Mock Hyperliquid Server")
+    print("="*60)
+
+    if args.synthetic:
+        fixture = synthetic_fixture(args.synthetic, args.timeframes, args.bars, args.seed)
+        print(f"🎲 {args.synthetic} synthetic markets, {args.bars} candles per {'/'.join(args.timeframes)}")
+    else:
+        try:
+            fixture = load_fixture(args.fixture)
+        except FileNotFoundError:
+            print(f"❌ Fixture not found: {args.fixture}")
+            print("   Record one with exchange.record_file in config.yaml, or use --synthetic N")
+            return
+        print(f"📼 {args.fixture}: {len(fixture['candles'])} candle series, "
+              f"{len(fixture['responses'])} other responses")
+
+    server = MockHyperliquidServer(fixture, host=args.host, port=args.port,
+                                   latency=args.latency / 1000, jitter=args.jitter / 1000,
+                                   error_rate=args.error_rate, rate_limit=args.rate_limit,
+                                   seed=args.seed, shift_time=not args.no_shift)
+
+    print(f"✅ Serving on {server.url}")
+    print(f"   Set exchange.api_url: {server.url} in config.yaml to use it")
+    print(f"   Counters: {server.url}/stats")
+    print("\n🔄 Press Ctrl+C to stop")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n⏹️ Stopped after {server.get_stats()['requests']} requests")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
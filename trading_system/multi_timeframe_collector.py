@@ -10,11 +10,17 @@ import io
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 
+import queue
 import sqlite3
+import threading
 from datetime import datetime
 import time
-from utils import DATABASE_FILE, load_config, get_current_timestamp
+from utils import (DATABASE_FILE, load_config, get_current_timestamp, normalize_timestamp,
+                   update_pair_freshness, store_candles)
 from hyperliquid_connector import HyperliquidConnector
+from metrics import registry, span
+from candle_ring_buffer import write_candles
+from lookback_planner import fetch_limits
 
 def get_watchlist_requirements(conn):
     """
@@ -42,99 +48,218 @@ def get_watchlist_requirements(conn):
 
     return symbols, timeframes
 
-def collect_multi_timeframe_data(symbols, timeframes, config, conn, limit=200):
+class CallSpacer:
+    """Spaces call starts at least 1 / calls_per_second apart, across threads"""
+
+    def __init__(self, calls_per_second):
+        self.interval = 1.0 / calls_per_second if calls_per_second else 0.0
+        self._next_call = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until this thread's call may start"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_call)
+            self._next_call = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _fetch_worker(connector, pairs, batches, spacer):
+    """
+    Fetch pairs until the work queue is empty, pushing one batch per pair
+
+    The queue holds (symbol, timeframe, limit) - each pair's candle count.
+
+    Batches are (symbol, timeframe, candles, error). Every pair produces a
+    batch, failed or not, so the writer always knows when it is done.
+    """
+    while True:
+        try:
+            symbol, timeframe, limit = pairs.get_nowait()
+        except queue.Empty:
+            return
+
+        spacer.wait()
+        try:
+            with span('collector.fetch'):
+                ohlcv = connector.fetch_ohlcv(symbol, timeframe, limit=limit)
+            candles = [(normalize_timestamp(timestamp), open_price, high, low, close, volume)
+                       for timestamp, open_price, high, low, close, volume in ohlcv or []]
+            error = None if candles else "No data returned"
+        except Exception as e:
+            candles, error = [], str(e)
+
+        # Blocks while the writer is behind, so memory stays bounded
+        batches.put((symbol, timeframe, candles, error))
+
+
+def _write_batches(conn, cursor, group, stats):
+    """
+    Store a group of fetched batches in one transaction
+
+    Each pair is written inside a savepoint, so a pair whose insert fails
+    leaves no rows behind and is reported on its own; if the commit itself
+    fails, the whole group is rolled back and reported as failed.
+    """
+    current_time = get_current_timestamp()
+    errors = []
+
+    with span('collector.write'):
+        for symbol, timeframe, candles, error in group:
+            if error is None:
+                # Outside a transaction, releasing the savepoint would commit the pair on its own
+                if not conn.in_transaction:
+                    cursor.execute("BEGIN")
+                cursor.execute("SAVEPOINT pair")
+                try:
+                    store_candles(cursor, symbol, timeframe, candles, current_time)
+                    update_pair_freshness(cursor, symbol, timeframe, max(candle[0] for candle in candles))
+                    cursor.execute("RELEASE pair")
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO pair")
+                    cursor.execute("RELEASE pair")
+                    error = str(e)
+            errors.append(error)
+
+        try:
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            errors = [error or f"Commit failed: {e}" for error in errors]
+
+    stats['commits'] += 1
+    registry.inc('collector_commits')
+
+    for (symbol, timeframe, candles, _), error in zip(group, errors):
+        if error is None:
+            # Committed - now visible to the detector through the shared-memory ring too
+            try:
+                write_candles(symbol, timeframe, candles)
+            except Exception as e:
+                print(f"⚠️ Could not update the {symbol} {timeframe} candle ring: {e}")
+            stats['successful'] += 1
+            stats['stored'].add((symbol, timeframe))
+            stats['candles_stored'] += len(candles)
+            registry.inc('candles_written', len(candles))
+            print(f"\n📊 {symbol} ({timeframe})... ✅ {len(candles)} candles")
+        elif error == "No data returned":
+            stats['failed'] += 1
+            stats['errors'].append(f"{symbol} {timeframe}: {error}")
+            print(f"\n📊 {symbol} ({timeframe})... ⚠️  No data")
+        else:
+            stats['failed'] += 1
+            stats['errors'].append(f"{symbol} {timeframe}: {error}")
+            print(f"\n📊 {symbol} ({timeframe})... ❌ Error: {error}")
+
+
+def collect_multi_timeframe_data(symbols, timeframes, config, conn, limit=None, connector=None):
     """
     Collect data for all symbol/timeframe combinations
 
+    Fetching and writing are pipelined: fetch workers push decoded candle
+    batches into a bounded queue while the calling thread - the only one
+    using `conn` - drains it, writing every batch waiting in the queue in
+    one transaction. Network and disk time overlap instead of adding up.
+
     Args:
         symbols: Set of symbols to fetch
         timeframes: Set of timeframes to fetch
-        config: Configuration dict
+        config: Configuration dict (system.max_api_calls_per_second and the collector section)
         conn: Database connection
-        limit: Number of candles to fetch per symbol/timeframe
+        limit: Number of candles to fetch per symbol/timeframe - None sizes each
+               pair's fetch with lookback_planner.fetch_limits (the analysis window
+               for a new pair, the candles since the newest stored one otherwise)
+        connector: HyperliquidConnector to reuse (a new one is created if None)
 
     Returns:
-        dict with statistics
+        dict with statistics (also stored - the (symbol, timeframe) pairs committed -
+        commits, max_queue_depth, seconds, candles_per_second)
     """
     # Initialize connector
-    use_testnet = config['exchange'].get('use_testnet', False)
-    connector = HyperliquidConnector(use_testnet=use_testnet)
+    if connector is None:
+        use_testnet = config['exchange'].get('use_testnet', False)
+        connector = HyperliquidConnector(use_testnet=use_testnet)
+
+    settings = config.get('collector') or {}
+    fetch_workers = max(1, settings.get('fetch_workers', 2))
+    queue_size = max(1, settings.get('queue_size', 32))
+    commit_batches = max(1, settings.get('commit_batches', 16))
 
     stats = {
         'total_combinations': 0,
         'successful': 0,
         'failed': 0,
         'candles_stored': 0,
-        'errors': []
+        'candles_requested': 0,
+        'errors': [],
+        'stored': set(),
+        'commits': 0,
+        'max_queue_depth': 0,
+        'seconds': 0.0,
+        'candles_per_second': 0.0
     }
 
-    # Calculate rate limit (Hyperliquid allows ~5 calls/sec)
+    # Calculate rate limit (Hyperliquid allows ~5 calls/sec) - shared by all fetch workers
     max_calls_per_second = config['system'].get('max_api_calls_per_second', 5)
-    delay_between_calls = 1.0 / max_calls_per_second
+    spacer = CallSpacer(max_calls_per_second)
 
     print(f"\n🔄 Multi-Timeframe Data Collection")
     print(f"="*60)
     print(f"Symbols: {len(symbols)}")
     print(f"Timeframes: {sorted(timeframes)}")
     print(f"Total combinations: {len(symbols) * len(timeframes)}")
+    print(f"Candles per pair: {limit if limit else 'planned (lookback_planner.py)'}")
     print(f"Rate limit: {max_calls_per_second} calls/second")
+    print(f"Pipeline: {fetch_workers} fetch workers, queue of {queue_size}, up to {commit_batches} pairs per commit")
     print(f"="*60)
 
-    cursor = conn.cursor()
-
-    for symbol in sorted(symbols):
-        for timeframe in sorted(timeframes):
-            stats['total_combinations'] += 1
-
-            try:
-                print(f"\n📊 {symbol} ({timeframe})...", end=" ")
-
-                # Fetch OHLCV data
-                ohlcv = connector.fetch_ohlcv(symbol, timeframe, limit=limit)
-
-                if not ohlcv or len(ohlcv) == 0:
-                    print(f"⚠️  No data")
-                    stats['failed'] += 1
-                    stats['errors'].append(f"{symbol} {timeframe}: No data returned")
-                    continue
-
-                # Store in database
-                stored_count = 0
-                current_time = get_current_timestamp()
+    combinations = [(symbol, timeframe) for symbol in sorted(symbols) for timeframe in sorted(timeframes)]
+    limits = fetch_limits(conn, combinations) if not limit else dict.fromkeys(combinations, limit)
 
-                for candle in ohlcv:
-                    timestamp, open_price, high, low, close, volume = candle
+    pairs = queue.Queue()
+    for symbol, timeframe in combinations:
+        pairs.put((symbol, timeframe, limits[(symbol, timeframe)]))
+    stats['total_combinations'] = pairs.qsize()
+    stats['candles_requested'] = sum(limits.values())
 
-                    # Convert timestamp from ms to seconds if needed
-                    if timestamp > 10000000000:
-                        timestamp = timestamp // 1000
+    batches = queue.Queue(maxsize=queue_size)
+    workers = [threading.Thread(target=_fetch_worker, args=(connector, pairs, batches, spacer),
+                                name=f'fetch-{i}', daemon=True)
+               for i in range(min(fetch_workers, stats['total_combinations']))]
 
-                    try:
-                        cursor.execute('''
-                            INSERT OR REPLACE INTO price_data
-                            (symbol, timeframe, timestamp, open, high, low, close, volume, created_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (symbol, timeframe, timestamp, open_price, high, low, close, volume, current_time))
-                        stored_count += 1
-                    except Exception as e:
-                        stats['errors'].append(f"{symbol} {timeframe} candle error: {e}")
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
 
-                conn.commit()
-                stats['successful'] += 1
-                stats['candles_stored'] += stored_count
+    cursor = conn.cursor()
+    remaining = stats['total_combinations']
 
-                print(f"✅ {stored_count} candles")
+    while remaining:
+        group = [batches.get()]
+        depth = batches.qsize() + 1
+        stats['max_queue_depth'] = max(stats['max_queue_depth'], depth)
+        registry.set_gauge('collector_queue_depth', depth)
 
-                # Rate limiting
-                time.sleep(delay_between_calls)
+        while len(group) < commit_batches:
+            try:
+                group.append(batches.get_nowait())
+            except queue.Empty:
+                break
 
-            except Exception as e:
-                print(f"❌ Error: {e}")
-                stats['failed'] += 1
-                stats['errors'].append(f"{symbol} {timeframe}: {str(e)}")
-                continue
+        remaining -= len(group)
+        _write_batches(conn, cursor, group, stats)
 
     cursor.close()
+    for worker in workers:
+        worker.join()
+
+    stats['seconds'] = time.perf_counter() - started
+    if stats['seconds'] > 0:
+        stats['candles_per_second'] = stats['candles_stored'] / stats['seconds']
+    registry.set_gauge('collector_queue_depth', 0)
+    registry.set_gauge('collector_candles_per_second', round(stats['candles_per_second'], 1))
 
     return stats
 
@@ -147,6 +272,11 @@ def print_collection_summary(stats):
     print(f"✅ Successful: {stats['successful']}")
     print(f"❌ Failed: {stats['failed']}")
     print(f"📈 Total candles stored: {stats['candles_stored']}")
+    if stats.get('candles_requested'):
+        print(f"📐 Candles requested: {stats['candles_requested']}")
+    if stats.get('commits'):
+        print(f"⚡ {stats['candles_per_second']:,.0f} candles/s over {stats['seconds']:.1f}s "
+              f"({stats['commits']} commits, max queue depth {stats['max_queue_depth']})")
 
     if stats['errors']:
         print(f"\n⚠️  Errors ({len(stats['errors'])}):")
@@ -182,7 +312,7 @@ def main():
             return
 
         # Collect data
-        stats = collect_multi_timeframe_data(symbols, timeframes, config, conn, limit=200)
+        stats = collect_multi_timeframe_data(symbols, timeframes, config, conn)
 
         # Print summary
         print_collection_summary(stats)
@@ -0,0 +1,565 @@
+"""
+Orchestrator for Wind Catcher & River Turn Trading System
+One long-running process that runs data collection, signal detection and the
+dashboard as scheduled jobs
+
+Replaces running auto_updater.py, multi_timeframe_collector.py and
+signal_detector_service.py side by side (and auto_updater launching
+trading_dashboard.py as a subprocess). The exchange connector, database pool,
+Telegram bot and analysis caches stay alive between jobs, and every job's
+duration and overlap with other jobs is recorded.
+
+Usage:
+    python orchestrator.py            # run until Ctrl+C
+    python orchestrator.py --once     # run every job once and print metrics
+"""
+
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import schedule
+
+from utils import (
+    DATABASE_FILE, LOGS_DIR, load_config, log_message, get_current_timestamp
+)
+from db_pool import ConnectionPool, enable_wal
+from auto_updater import connect_to_exchange, daily_data_collection, hourly_update
+from multi_timeframe_collector import get_watchlist_requirements, collect_multi_timeframe_data
+from signal_detector_service import SignalDetectorService
+from signal_outcomes import get_outcome_settings, update_outcomes
+from retention import get_retention_settings, apply_retention
+from market_context import get_context_settings, take_snapshot, select_pairs
+from candle_ring_buffer import close_store
+from scan_scheduler import get_schedule_settings, ScanScheduler
+from lookback_planner import required_bars
+import trading_dashboard
+
+METRICS_FILE = LOGS_DIR / 'orchestrator_metrics.json'
+
+
+class JobMetrics:
+    """Duration and overlap statistics for one scheduled job"""
+
+    def __init__(self, name):
+        self.name = name
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0              # Triggered while the previous run was still going
+        self.overlapped_runs = 0      # Runs that started while another job was running
+        self.total_duration = 0.0
+        self.last_duration = None
+        self.max_duration = 0.0
+        self.last_started = None
+        self.last_finished = None
+        self.last_error = None
+
+    def to_dict(self):
+        """Metrics as a JSON-serializable dict"""
+        return {
+            'runs': self.runs,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'overlapped_runs': self.overlapped_runs,
+            'mean_duration': round(self.total_duration / self.runs, 3) if self.runs else None,
+            'last_duration': round(self.last_duration, 3) if self.last_duration is not None else None,
+            'max_duration': round(self.max_duration, 3),
+            'last_started': self.last_started,
+            'last_finished': self.last_finished,
+            'last_error': self.last_error
+        }
+
+
+class Orchestrator:
+    """Scheduler running every trading system job in one process"""
+
+    def __init__(self, config=None):
+        """
+        Initialize shared resources
+
+        Args:
+            config (dict): Configuration (loaded from config.yaml if None)
+        """
+        self.config = config or load_config()
+        settings = self.config.get('orchestrator', {})
+
+        self.collection_interval = self.config['system'].get('data_collection_interval', 60)
+        self.scan_interval = self.config['system'].get('signal_scan_interval', 300)
+        # None = sized by lookback_planner.py (the analysis window / the candles since the last stored one)
+        self.initial_limit = settings.get('initial_candles')
+        self.incremental_limit = settings.get('incremental_candles')
+        self.outcome_settings = get_outcome_settings(self.config)
+        self.outcome_interval = self.config.get('outcomes', {}).get('update_interval', 900)
+        self.retention_settings = get_retention_settings(self.config)
+        self.context_settings = get_context_settings(self.config)
+        self.scan_scheduler = ScanScheduler(get_schedule_settings(self.config))
+        max_workers = settings.get('max_workers', 4)
+
+        # Readers never block the collector's writes (and vice versa) in WAL mode
+        try:
+            enable_wal(DATABASE_FILE)
+        except Exception as e:
+            log_message(f"Could not enable WAL: {e}", "WARNING")
+
+        # One writable connection per worker; plain tuples like connect_to_database()
+        self.pool = ConnectionPool(DATABASE_FILE, size=max_workers, read_only=False,
+                                   timeout=30.0, row_factory=None)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+
+        self._connector = None
+        self._connector_lock = threading.Lock()
+        self._detector = None
+        self._backfilled = set()
+
+        # Candle fetches the market context pre-filter let through / skipped
+        self.fetch_counts = {'fetched': 0, 'skipped': 0, 'snapshots': 0}
+
+        self.metrics = {}
+        self._running = set()         # Submitted and not finished (queued or executing)
+        self._active = 0              # Currently executing
+        self._max_concurrent = 0
+        self._state_lock = threading.Lock()
+
+        self.jobs = {
+            'collect': self.run_collection,
+            'detect': self.run_detection,
+            'scan': self.run_scheduled_scans,
+            'outcomes': self.run_outcomes,
+            'retention': self.run_retention,
+            'hourly_update': self.run_hourly_update,
+            'daily_collection': self.run_daily_collection,
+            'dashboard': self.run_dashboard
+        }
+        for name in self.jobs:
+            self.metrics[name] = JobMetrics(name)
+
+    # ------------------------------------------------------------------
+    # Shared resources
+    # ------------------------------------------------------------------
+
+    @property
+    def connector(self):
+        """Exchange connector, created once and recreated only after a failure"""
+        with self._connector_lock:
+            if self._connector is None:
+                self._connector = connect_to_exchange(self.config)
+                if self._connector is None:
+                    raise ConnectionError("Could not connect to exchange")
+            return self._connector
+
+    def reset_connector(self):
+        """Drop the connector so the next job reconnects"""
+        with self._connector_lock:
+            self._connector = None
+
+    @property
+    def detector(self):
+        """Signal detector (and its Telegram bot), created on first use"""
+        if self._detector is None:
+            self._detector = SignalDetectorService()
+        return self._detector
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def collect_timeframe(self, conn, timeframe, symbols, contexts=None, limit=None):
+        """
+        Collect one timeframe's symbols
+
+        Pairs not stored yet (new ones, or ones whose first fetch failed) get
+        the analysis window (initial_candles if set); the rest get the candles
+        opened since their newest stored one (or the last `limit` /
+        incremental_candles) and, given a market context snapshot, are
+        skipped while their price hasn't moved.
+
+        Args:
+            conn: Database connection
+            timeframe (str): Candle timeframe
+            symbols (set): Symbols to collect
+            contexts (dict): From take_snapshot (no pre-filter if None)
+            limit (int): Candles per known pair (incremental_candles, or planned, if None)
+
+        Returns:
+            dict: fetched (set of symbols stored), attempted, failed, skipped
+        """
+        result = {'fetched': set(), 'attempted': 0, 'failed': 0, 'skipped': 0}
+
+        new_symbols = {s for s in symbols if (s, timeframe) not in self._backfilled}
+        known_symbols = set(symbols) - new_symbols
+        if contexts:
+            known_symbols, flat_symbols = select_pairs(conn, known_symbols, timeframe,
+                                                       contexts, self.context_settings)
+            result['skipped'] = len(flat_symbols)
+
+        initial_limit = self.initial_limit or required_bars(timeframe)
+        for batch, batch_limit in ((new_symbols, initial_limit), (known_symbols, limit or self.incremental_limit)):
+            if not batch:
+                continue
+            stats = collect_multi_timeframe_data(batch, {timeframe}, self.config, conn,
+                                                 limit=batch_limit, connector=self.connector)
+            result['attempted'] += stats['total_combinations']
+            result['failed'] += stats['failed']
+            result['fetched'] |= {symbol for symbol, _ in stats['stored']}
+
+        # A new pair whose first fetch failed gets the full window again next time
+        self._backfilled |= {(s, timeframe) for s in new_symbols if s in result['fetched']}
+        self.fetch_counts['fetched'] += result['attempted']
+        self.fetch_counts['skipped'] += result['skipped']
+        return result
+
+    def run_collection(self):
+        """Collect every user_watchlists symbol/timeframe"""
+        with self.pool.connection() as conn:
+            symbols, timeframes = get_watchlist_requirements(conn)
+            if not symbols or not timeframes:
+                return
+
+            attempted = failed = skipped = 0
+
+            # One whole-universe snapshot decides which known pairs need fetching
+            contexts = None
+            if self.context_settings['enabled']:
+                contexts = take_snapshot(self.connector, conn)
+                self.fetch_counts['snapshots'] += 1
+
+            for timeframe in sorted(timeframes):
+                result = self.collect_timeframe(conn, timeframe, symbols, contexts)
+                attempted += result['attempted']
+                failed += result['failed']
+                skipped += result['skipped']
+
+            if skipped:
+                log_message(f"🧭 Skipped {skipped} of {attempted + skipped} candle fetches (price within "
+                            f"{self.context_settings['min_move_pct']}% of the last close)", "INFO")
+
+            if attempted and failed == attempted:
+                # Every call failed - the connection is probably gone
+                self.reset_connector()
+
+    def run_detection(self):
+        """Scan user_watchlists for new confluence signals"""
+        with self.pool.connection() as conn:
+            self.detector.run_once(conn)
+
+    def run_scheduled_scans(self):
+        """
+        Fetch and analyze the timeframes the scan scheduler says are due
+
+        Close and startup runs fetch and analyze all of a timeframe's pairs.
+        Intrabar runs only refresh the forming candle of pairs that moved
+        (per the market context pre-filter) and only analyze those.
+        """
+        with self.pool.connection() as conn:
+            by_timeframe = {}
+            for symbol, timeframe, _ in self.detector.get_watchlist_entries(conn):
+                by_timeframe.setdefault(timeframe, set()).add(symbol)
+
+            contexts = None
+            for timeframe, kind, close_time in self.scan_scheduler.due(by_timeframe):
+                symbols = by_timeframe[timeframe]
+                started = time.perf_counter()
+                cpu_started = time.thread_time()
+                result = {'fetched': set(), 'attempted': 0, 'failed': 0}
+                analyzed = 0
+
+                try:
+                    if kind == 'intrabar':
+                        # One snapshot per job, shared by every intrabar timeframe
+                        if contexts is None and self.context_settings['enabled']:
+                            contexts = take_snapshot(self.connector, conn)
+                            self.fetch_counts['snapshots'] += 1
+                        result = self.collect_timeframe(conn, timeframe, symbols, contexts,
+                                                        limit=self.scan_scheduler.settings['intrabar_candles'])
+                        symbols = result['fetched']
+                    else:
+                        result = self.collect_timeframe(conn, timeframe, symbols)
+
+                    if result['attempted'] and result['failed'] == result['attempted']:
+                        self.reset_connector()
+
+                    if symbols:
+                        self.detector.run_once(conn, timeframe=timeframe, symbols=symbols)
+                        analyzed = len(symbols)
+                    failed = False
+                except Exception as e:
+                    log_message(f"❌ {timeframe} {kind} scan failed: {e}", "ERROR")
+                    failed = True
+
+                # CPU of this thread only - the collector's fetch workers decode on their own threads
+                self.scan_scheduler.record(timeframe, kind, close_time, len(result['fetched']), analyzed,
+                                           time.perf_counter() - started, time.thread_time() - cpu_started,
+                                           failed)
+
+    def submit_due_scans(self):
+        """Queue the scan job once a timeframe's run is due"""
+        next_run = self.scan_scheduler.next_run_at()
+        if next_run is not None and next_run > get_current_timestamp():
+            return
+        with self._state_lock:
+            if 'scan' in self._running:
+                # Whatever became due meanwhile is picked up by the next tick after it finishes
+                return
+        self.submit('scan')
+
+    def run_outcomes(self):
+        """Label signals with their outcomes as new candles close"""
+        with self.pool.connection() as conn:
+            stats = update_outcomes(conn, self.outcome_settings)
+        if stats['signals']:
+            log_message(f"🎯 Updated outcomes for {stats['signals']} signals ({stats['completed']} complete)", "INFO")
+
+    def run_retention(self):
+        """Roll up, archive and delete candles past their retention period"""
+        with self.pool.connection() as conn:
+            result = apply_retention(conn, self.retention_settings)
+        deleted = sum(stats['deleted'] for stats in result['rules'].values())
+        reclaimed = result['before']['total_bytes'] - result['after']['total_bytes']
+        log_message(f"🧹 Retention removed {deleted} candles, reclaimed {reclaimed // 1024} KB", "INFO")
+
+    def run_hourly_update(self):
+        """Legacy watchlist hourly update (auto_updater.hourly_update)"""
+        with self.pool.connection() as conn:
+            hourly_update(connector=self.connector, conn=conn)
+
+    def run_daily_collection(self):
+        """Legacy watchlist daily collection (auto_updater.daily_data_collection)"""
+        with self.pool.connection() as conn:
+            daily_data_collection(connector=self.connector, conn=conn)
+
+    def run_dashboard(self):
+        """Trading dashboard, in-process (shares the alignment matrix cache)"""
+        log_message("📊 Running trading dashboard analysis", "INFO")
+        with self.pool.connection() as conn:
+            trading_dashboard.main(conn)
+        log_message("📊 Dashboard analysis completed successfully", "SUCCESS")
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def submit(self, name):
+        """
+        Queue a job on the worker pool unless its previous run is still going
+
+        Returns:
+            Future: The queued job, or None if it was skipped
+        """
+        with self._state_lock:
+            if name in self._running:
+                self.metrics[name].skipped += 1
+                log_message(f"⏭️ Skipping {name} - previous run still in progress", "WARNING")
+                return None
+            self._running.add(name)
+
+        return self.executor.submit(self._run_job, name)
+
+    def _run_job(self, name):
+        """Run one job and record its metrics"""
+        metrics = self.metrics[name]
+
+        with self._state_lock:
+            self._active += 1
+            self._max_concurrent = max(self._max_concurrent, self._active)
+            if self._active > 1:
+                metrics.overlapped_runs += 1
+
+        metrics.last_started = get_current_timestamp()
+        started = time.perf_counter()
+
+        try:
+            self.jobs[name]()
+            metrics.last_error = None
+        except Exception as e:
+            metrics.failures += 1
+            metrics.last_error = str(e)
+            log_message(f"❌ Job {name} failed: {e}", "ERROR")
+        finally:
+            duration = time.perf_counter() - started
+            metrics.runs += 1
+            metrics.total_duration += duration
+            metrics.last_duration = duration
+            metrics.max_duration = max(metrics.max_duration, duration)
+            metrics.last_finished = get_current_timestamp()
+
+            with self._state_lock:
+                self._active -= 1
+                self._running.discard(name)
+
+            self.save_metrics()
+
+    def schedule_jobs(self):
+        """Register every job with the scheduler"""
+        scheduled_scans = self.scan_scheduler.settings['enabled']
+        if scheduled_scans:
+            # Each timeframe is fetched and analyzed around its own candle closes
+            schedule.every(1).seconds.do(self.submit_due_scans)
+        else:
+            schedule.every(self.collection_interval).seconds.do(self.submit, 'collect')
+            schedule.every(self.scan_interval).seconds.do(self.submit, 'detect')
+        schedule.every(self.outcome_interval).seconds.do(self.submit, 'outcomes')
+
+        # Same times as auto_updater.schedule_tasks
+        schedule.every().day.at("06:00").do(self.submit, 'daily_collection')
+        schedule.every().hour.at(":05").do(self.submit, 'hourly_update')
+        schedule.every().day.at("08:00").do(self.submit, 'dashboard')
+        schedule.every().day.at("14:00").do(self.submit, 'dashboard')
+        schedule.every().day.at("20:00").do(self.submit, 'dashboard')
+        if self.retention_settings['enabled'] and self.retention_settings['rules']:
+            schedule.every().day.at(self.retention_settings['run_at']).do(self.submit, 'retention')
+
+        log_message("⏰ Orchestrator jobs configured:", "INFO")
+        if scheduled_scans:
+            settle = self.scan_scheduler.settings['settle_seconds']
+            log_message(f"   🔄 {settle}s after each candle close (and intrabar for moved pairs) - "
+                        f"Collection and signal detection per timeframe", "INFO")
+        else:
+            log_message(f"   🔄 Every {self.collection_interval}s - Multi-timeframe collection", "INFO")
+            log_message(f"   🔍 Every {self.scan_interval}s - Signal detection", "INFO")
+        log_message("   📅 06:00 - Daily data collection", "INFO")
+        log_message("   🔄 Every hour - Legacy watchlist update", "INFO")
+        log_message("   📊 08:00, 14:00, 20:00 - Dashboard analysis", "INFO")
+        if self.retention_settings['enabled'] and self.retention_settings['rules']:
+            log_message(f"   🧹 {self.retention_settings['run_at']} - Data retention", "INFO")
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def get_metrics(self):
+        """All job metrics as a dict"""
+        with self._state_lock:
+            running = sorted(self._running)
+            max_concurrent = self._max_concurrent
+
+        return {
+            'updated_at': get_current_timestamp(),
+            'running': running,
+            'max_concurrent_jobs': max_concurrent,
+            'candle_fetches': dict(self.fetch_counts),
+            'timeframes': self.scan_scheduler.get_metrics(),
+            'jobs': {name: m.to_dict() for name, m in self.metrics.items()}
+        }
+
+    def save_metrics(self):
+        """Write metrics to logs/orchestrator_metrics.json"""
+        try:
+            METRICS_FILE.parent.mkdir(exist_ok=True)
+            tmp_file = METRICS_FILE.with_suffix('.tmp')
+            tmp_file.write_text(json.dumps(self.get_metrics(), indent=2), encoding='utf-8')
+            tmp_file.replace(METRICS_FILE)
+        except Exception as e:
+            print(f"⚠️ Could not save orchestrator metrics: {e}")
+
+    def print_metrics(self):
+        """Print a job metrics table"""
+        metrics = self.get_metrics()
+
+        print(f"\n📊 ORCHESTRATOR METRICS - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print("="*80)
+        print(f"{'Job':<18}{'Runs':>6}{'Fail':>6}{'Skip':>6}{'Overlap':>9}{'Mean s':>10}{'Last s':>10}{'Max s':>10}")
+        print("-"*80)
+        for name, m in metrics['jobs'].items():
+            mean = f"{m['mean_duration']:.2f}" if m['mean_duration'] is not None else '-'
+            last = f"{m['last_duration']:.2f}" if m['last_duration'] is not None else '-'
+            print(f"{name:<18}{m['runs']:>6}{m['failures']:>6}{m['skipped']:>6}"
+                  f"{m['overlapped_runs']:>9}{mean:>10}{last:>10}{m['max_duration']:>10.2f}")
+        print("-"*80)
+        print(f"Max concurrent jobs: {metrics['max_concurrent_jobs']}")
+        counts = metrics['candle_fetches']
+        if counts['fetched'] + counts['skipped']:
+            # Each snapshot is one request of its own
+            calls = counts['fetched'] + counts['snapshots']
+            total = counts['fetched'] + counts['skipped']
+            print(f"Candle API calls: {calls} instead of {total} "
+                  f"({(total - calls) / total * 100:+.0f}% saved by the market context pre-filter)")
+
+        timeframes = {tf: m for tf, m in metrics['timeframes'].items() if sum(m['runs'].values())}
+        if timeframes:
+            print("-"*80)
+            print(f"{'Timeframe':<11}{'Closes':>7}{'Intra':>7}{'Fetched':>9}{'Analyzed':>10}"
+                  f"{'Mean s':>9}{'CPU s':>9}{'Latency':>9}{'Max lat':>9}")
+            for timeframe, m in timeframes.items():
+                latency = f"{m['mean_close_latency']:.1f}" if m['mean_close_latency'] is not None else '-'
+                print(f"{timeframe:<11}{m['runs']['close']:>7}{m['runs']['intrabar']:>7}{m['pairs_fetched']:>9}"
+                      f"{m['pairs_analyzed']:>10}{m['mean_duration']:>9.2f}{m['cpu_seconds']:>9.2f}"
+                      f"{latency:>9}{m['max_close_latency']:>9.1f}")
+        print("="*80)
+
+    # ------------------------------------------------------------------
+    # Main loops
+    # ------------------------------------------------------------------
+
+    def run_once(self):
+        """Run every job once, in dependency order, then print metrics"""
+        for name in ['collect', 'detect', 'outcomes', 'hourly_update', 'dashboard']:
+            future = self.submit(name)
+            if future:
+                future.result()
+
+        self.print_metrics()
+        self.shutdown()
+
+    def run_forever(self):
+        """Run the scheduler until Ctrl+C"""
+        self.schedule_jobs()
+
+        # Fresh data and signals right away instead of waiting a full interval
+        if self.scan_scheduler.settings['enabled']:
+            self.submit('scan')
+        else:
+            self.submit('collect')
+            self.submit('detect')
+
+        last_report = time.time()
+
+        try:
+            while True:
+                schedule.run_pending()
+
+                if time.time() - last_report >= 3600:
+                    self.print_metrics()
+                    last_report = time.time()
+
+                time.sleep(1)
+
+        except KeyboardInterrupt:
+            log_message("⏹️ Orchestrator stopped by user", "INFO")
+            print("\n⏹️ Stopping - waiting for running jobs to finish...")
+            self.shutdown()
+            self.print_metrics()
+
+    def shutdown(self):
+        """Stop accepting jobs, wait for running ones and close connections"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.pool.close_all()
+        # Readers in other processes go back to SQLite once the writer is gone
+        close_store(mark_closed=True)
+        self.save_metrics()
+
+
+def main():
+    """Main orchestrator entry point"""
+    print("🚀 Wind Catcher & River Turn - Orchestrator")
+    print("="*60)
+
+    log_message("🚀 Orchestrator starting", "INFO")
+    orchestrator = Orchestrator()
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--once':
+        orchestrator.run_once()
+        return
+
+    print("✅ Scheduler configured and running")
+    print(f"📝 Job metrics: {METRICS_FILE}")
+    print("\n🔄 System running... Press Ctrl+C to stop")
+    print("-"*60)
+
+    orchestrator.run_forever()
+
+
+if __name__ == "__main__":
+    main()
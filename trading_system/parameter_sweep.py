@@ -0,0 +1,498 @@
+"""
+Parameter Sweep for Wind Catcher & River Turn
+Scores a grid of confluence settings over the stored candle history in
+parallel and ranks them by what price did after their signals
+
+Every parameter set is run through vectorized_confluence over each stored
+symbol/timeframe. The bars it would have signalled on (score >= min_score,
+4-hour cooldown like the detector) are labelled with signal_outcomes, and
+the sets are ranked by the chosen metric at one horizon.
+
+Candles are loaded from the database once and copied into a single shared
+memory block. Worker processes map that block as NumPy arrays, so a task
+only carries parameter sets. Sets that differ only in thresholds go to the
+same worker as one task and reuse its cached indicator results.
+
+Usage:
+    python parameter_sweep.py                             # grid from config.yaml (sweep section)
+    python parameter_sweep.py --workers 4 --metric win_rate
+    python parameter_sweep.py --timeframes 1h 4h --top 10
+    python parameter_sweep.py --grid my_grid.yaml         # YAML mapping of parameter: [values]
+"""
+
+import sys
+import io
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import csv
+import itertools
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils import connect_to_database, load_config, get_current_timestamp, timeframe_to_seconds, LOGS_DIR
+from signal_outcomes import compute_outcomes, get_outcome_settings
+from vectorized_confluence import DEFAULT_PARAMS, WINDOW, WIND, compute_confluence, select_signals
+
+SWEEP_DIR = LOGS_DIR / 'sweeps'
+
+METRICS = ['avg_return', 'win_rate', 'target_rate', 'signals']
+
+# Rows of the shared candle block
+COLUMNS = ('timestamp', 'high', 'low', 'close', 'volume')
+
+# Parameters that don't change any indicator (sets differing only in these share a task)
+THRESHOLD_PARAMS = ('min_score',)
+
+# Indicator results kept per worker (each is a few arrays the length of one pair's history)
+CACHE_ENTRIES = 256
+
+DEFAULT_SETTINGS = {
+    'workers': 0,
+    'horizon': 6,
+    'metric': 'avg_return',
+    'min_signals': 20,
+    'timeframes': [],
+    'grid': {
+        'alligator_multiplier': [8, 10, 13],
+        'min_score': [1.2, 1.8, 2.5]
+    }
+}
+
+
+class LRUCache(OrderedDict):
+    """Dict that drops its least recently used entries beyond max_entries"""
+
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        super().__init__()
+        self.max_entries = max_entries
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_entries:
+            self.popitem(last=False)
+
+
+def get_sweep_settings(config=None):
+    """
+    Sweep settings from config.yaml (sweep section) merged over the defaults
+
+    Returns:
+        dict: workers, horizon, metric, min_signals, timeframes, grid,
+              plus target_pct/stop_pct from the outcomes section
+    """
+    config = config if config is not None else load_config()
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(config.get('sweep') or {})
+
+    outcome_settings = get_outcome_settings(config)
+    settings['target_pct'] = outcome_settings['target_pct']
+    settings['stop_pct'] = outcome_settings['stop_pct']
+    return settings
+
+
+def expand_grid(grid):
+    """
+    Every combination of the grid's values
+
+    Args:
+        grid (dict): Parameter name -> list of values (see DEFAULT_PARAMS for names)
+
+    Returns:
+        list: Parameter dicts, in grid order
+    """
+    unknown = set(grid) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+
+    names = list(grid)
+    values = [[tuple(v) if isinstance(v, list) else v for v in grid[name]] for name in names]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def load_candles(conn, timeframes=None, now=None, symbols=None):
+    """
+    Closed candles of every stored symbol/timeframe with enough history to score
+
+    Args:
+        conn: Database connection
+        timeframes (list): Only these timeframes (default: all stored)
+        now (int): Current time - the candle still forming at it is left out
+        symbols (list): Only these symbols (default: all stored)
+
+    Returns:
+        dict: {(symbol, timeframe): np.ndarray of shape (len(COLUMNS), bars)}
+    """
+    now = now or get_current_timestamp()
+    pairs = conn.execute("SELECT DISTINCT symbol, timeframe FROM price_data ORDER BY symbol, timeframe").fetchall()
+
+    candles = {}
+    for symbol, timeframe in pairs:
+        if timeframes and timeframe not in timeframes:
+            continue
+        if symbols and symbol not in symbols:
+            continue
+        try:
+            cutoff = now - timeframe_to_seconds(timeframe)
+        except ValueError:
+            continue
+
+        rows = conn.execute('''
+            SELECT timestamp, high, low, close, volume
+            FROM price_data
+            WHERE symbol = ? AND timeframe = ? AND timestamp <= ?
+            ORDER BY timestamp
+        ''', (symbol, timeframe, cutoff)).fetchall()
+
+        if len(rows) > WINDOW:
+            candles[(symbol, timeframe)] = np.array(rows, dtype=float).T
+
+    return candles
+
+
+def share_candles(candles):
+    """
+    Copy candle arrays into one shared memory block
+
+    Returns:
+        tuple: (SharedMemory, layout) - layout is [(pair, start, length)] into the block's columns
+    """
+    total = sum(block.shape[1] for block in candles.values())
+    shm = shared_memory.SharedMemory(create=True, size=max(len(COLUMNS) * total * 8, 8))
+    shared = np.ndarray((len(COLUMNS), total), dtype=float, buffer=shm.buf)
+
+    layout = []
+    start = 0
+    for pair, block in candles.items():
+        length = block.shape[1]
+        shared[:, start:start + length] = block
+        layout.append((pair, start, length))
+        start += length
+
+    return shm, layout
+
+
+def split_candles(block, layout):
+    """
+    Per-pair views into a candle block (no copies except int64 timestamps)
+
+    Returns:
+        dict: {(symbol, timeframe): (timestamps, high, low, close, volume)}
+    """
+    series = {}
+    for pair, start, length in layout:
+        columns = block[:, start:start + length]
+        series[pair] = (columns[0].astype(np.int64),) + tuple(columns[1:])
+    return series
+
+
+def evaluate(params, series, settings, cache=None):
+    """
+    Run one parameter set over every pair and score its signals
+
+    Args:
+        params (dict): Parameter overrides (see DEFAULT_PARAMS)
+        series (dict): From split_candles
+        settings (dict): From get_sweep_settings
+        cache (dict): Indicator result cache shared across calls
+
+    Returns:
+        dict: signals, wind_catcher, river_turn, avg_return, win_rate, avg_mfe,
+              avg_mae, target_rate, stop_rate, bars
+    """
+    horizon = int(settings['horizon'])
+    min_score = params.get('min_score', DEFAULT_PARAMS['min_score'])
+    returns, mfe, mae, target, stop = [], [], [], [], []
+    wind = river = bars = 0
+
+    for pair, (timestamps, high, low, close, volume) in series.items():
+        result = compute_confluence(timestamps, high, low, close, volume, params, cache, pair)
+        signals = select_signals(timestamps, result['score'], result['system'], min_score)
+        bars += len(timestamps)
+        if len(signals) == 0:
+            continue
+
+        directions = result['system'][signals].astype(float)
+        outcomes = compute_outcomes(
+            timestamps[signals], close[signals], directions, timestamps, high, low, close,
+            [horizon], settings['target_pct'], settings['stop_pct']
+        )
+
+        complete = outcomes['complete'][:, 0]
+        wind += int((directions[complete] == WIND).sum())
+        river += int((directions[complete] != WIND).sum())
+        returns.append(outcomes['return_pct'][complete, 0])
+        mfe.append(outcomes['mfe_pct'][complete, 0])
+        mae.append(outcomes['mae_pct'][complete, 0])
+        target.append(~np.isnan(outcomes['bars_to_target'][complete, 0]))
+        stop.append(~np.isnan(outcomes['bars_to_stop'][complete, 0]))
+
+    returns = np.concatenate(returns) if returns else np.array([])
+
+    def mean(parts):
+        values = np.concatenate(parts) if parts else np.array([])
+        return float(values.mean()) if len(values) else float('nan')
+
+    return {
+        'signals': len(returns),
+        'wind_catcher': wind,
+        'river_turn': river,
+        'avg_return': float(returns.mean()) if len(returns) else float('nan'),
+        'win_rate': float((returns > 0).mean()) if len(returns) else float('nan'),
+        'avg_mfe': mean(mfe),
+        'avg_mae': mean(mae),
+        'target_rate': mean(target),
+        'stop_rate': mean(stop),
+        'bars': bars
+    }
+
+
+# ----------------------------------------------------------------------------
+# Worker processes
+# ----------------------------------------------------------------------------
+
+_worker = {}
+
+
+def _init_worker(shm_name, shape, layout, settings):
+    """Map the shared candle block once per worker process"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    block = np.ndarray(shape, dtype=float, buffer=shm.buf)
+    _worker.update({
+        'shm': shm,
+        'series': split_candles(block, layout),
+        'settings': settings,
+        'cache': LRUCache()
+    })
+
+
+def _run_task(runs):
+    """Evaluate (index, params) runs in a worker, timing each one"""
+    results = []
+    for index, params in runs:
+        started = time.perf_counter()
+        metrics = evaluate(params, _worker['series'], _worker['settings'], _worker['cache'])
+        metrics['seconds'] = time.perf_counter() - started
+        metrics['worker'] = os.getpid()
+        results.append({'index': index, 'params': params, 'metrics': metrics})
+    return results
+
+
+def group_runs(param_sets):
+    """
+    Group parameter sets that share indicator settings into one task each
+
+    Returns:
+        list: Lists of (index, params)
+    """
+    groups = {}
+    for index, params in enumerate(param_sets):
+        key = tuple(sorted((name, value) for name, value in params.items() if name not in THRESHOLD_PARAMS))
+        groups.setdefault(key, []).append((index, params))
+    return list(groups.values())
+
+
+def run_sweep(candles, param_sets, settings, workers=None, progress=None):
+    """
+    Evaluate every parameter set over the candles in a process pool
+
+    Args:
+        candles (dict): From load_candles
+        param_sets (list): From expand_grid
+        settings (dict): From get_sweep_settings
+        workers (int): Worker processes (default: settings['workers'], 0 = one per CPU)
+        progress (callable): Called with (done, total, result) as runs finish
+
+    Returns:
+        list: Result dicts (index, params, metrics) in grid order
+    """
+    workers = workers if workers is not None else int(settings.get('workers') or 0)
+    workers = min(workers or os.cpu_count() or 1, max(len(group_runs(param_sets)), 1))
+
+    shm, layout = share_candles(candles)
+    total = sum(length for _, _, length in layout)
+    results = []
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shm.name, (len(COLUMNS), total), layout, settings)) as executor:
+            futures = [executor.submit(_run_task, runs) for runs in group_runs(param_sets)]
+            for future in as_completed(futures):
+                for result in future.result():
+                    results.append(result)
+                    if progress:
+                        progress(len(results), len(param_sets), result)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return sorted(results, key=lambda result: result['index'])
+
+
+def rank_results(results, metric='avg_return', min_signals=0):
+    """
+    Sort results best first; sets with fewer than min_signals go last
+
+    Returns:
+        list: Results with a 'rank' added
+    """
+    def key(result):
+        value = result['metrics'][metric]
+        enough = result['metrics']['signals'] >= min_signals and value == value
+        return (not enough, -value if value == value else 0)
+
+    ranked = sorted(results, key=key)
+    for rank, result in enumerate(ranked, 1):
+        result['rank'] = rank
+    return ranked
+
+
+def format_params(params, names=None):
+    """Short description of a parameter set, e.g. 'alligator_multiplier=10 min_score=1.2'"""
+    parts = []
+    for name, value in params.items():
+        if names is not None and name not in names:
+            continue
+        if isinstance(value, (tuple, list)):
+            value = '/'.join(f"{v:g}" for v in value)
+        parts.append(f"{name}={value}")
+    return ' '.join(parts) or 'defaults'
+
+
+def print_results(ranked, settings, metric, top=20):
+    """Print the ranked results table"""
+    print(f"\n🏆 Ranked by {metric} at {settings['horizon']} bars "
+          f"(target {settings['target_pct']}%, stop {settings['stop_pct']}%, "
+          f"min {settings['min_signals']} signals)")
+    # Only show the parameters that differ between sets
+    varying = [name for name in ranked[0]['params']
+               if len({result['params'].get(name) for result in ranked}) > 1] if ranked else []
+    fixed = {name: value for name, value in (ranked[0]['params'].items() if ranked else []) if name not in varying}
+    if fixed:
+        print(f"Fixed: {format_params(fixed)}")
+
+    print("="*110)
+    print(f"{'Rank':>4} {'Signals':>8} {'Avg ret':>9} {'Win rate':>9} {'Avg MFE':>9} "
+          f"{'Avg MAE':>9} {'Target':>8} {'Time':>8}  Parameters")
+    print("-"*110)
+
+    for result in ranked[:top]:
+        m = result['metrics']
+        low = " ⚠️" if m['signals'] < settings['min_signals'] else ""
+        print(f"{result['rank']:>4} {m['signals']:>8} {m['avg_return']:>8.2f}% {m['win_rate'] * 100:>8.1f}% "
+              f"{m['avg_mfe']:>8.2f}% {m['avg_mae']:>8.2f}% {m['target_rate'] * 100:>7.1f}% "
+              f"{m['seconds'] * 1000:>6.0f}ms  {format_params(result['params'], varying)}{low}")
+
+    print("="*110)
+
+
+def save_results(ranked, path=None):
+    """
+    Write the ranked results to CSV (logs/sweeps/sweep_<time>.csv by default)
+
+    Returns:
+        Path: File written
+    """
+    path = path or SWEEP_DIR / f"sweep_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    param_names = sorted({name for result in ranked for name in result['params']})
+    metric_names = ['signals', 'wind_catcher', 'river_turn', 'avg_return', 'win_rate', 'avg_mfe',
+                    'avg_mae', 'target_rate', 'stop_rate', 'bars', 'seconds', 'worker']
+
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['rank'] + param_names + metric_names)
+        for result in ranked:
+            params = [result['params'].get(name, DEFAULT_PARAMS[name]) for name in param_names]
+            params = ['/'.join(map(str, v)) if isinstance(v, (tuple, list)) else v for v in params]
+            writer.writerow([result['rank']] + params + [result['metrics'][name] for name in metric_names])
+
+    return path
+
+
+def main():
+    """Run the sweep from config.yaml and print the ranking"""
+    parser = argparse.ArgumentParser(description="Rank confluence settings by signal outcomes on stored history")
+    parser.add_argument('--grid', help="YAML file with the parameter grid (default: config.yaml sweep.grid)")
+    parser.add_argument('--workers', type=int, help="Worker processes (0 = one per CPU)")
+    parser.add_argument('--metric', choices=METRICS, help="Ranking metric")
+    parser.add_argument('--horizon', type=int, help="Bars after the signal used for ranking")
+    parser.add_argument('--min-signals', type=int, help="Sets with fewer signals are ranked last")
+    parser.add_argument('--timeframes', nargs='+', help="Only these timeframes")
+    parser.add_argument('--top', type=int, default=20, help="Rows to print")
+    parser.add_argument('--no-save', action='store_true', help="Don't write the CSV to logs/sweeps/")
+    args = parser.parse_args()
+
+    print("🧪 Wind Catcher & River Turn - Parameter Sweep")
+    print("="*60)
+
+    settings = get_sweep_settings()
+    for name in ('workers', 'metric', 'horizon', 'min_signals', 'timeframes'):
+        if getattr(args, name) is not None:
+            settings[name] = getattr(args, name)
+
+    grid = settings['grid']
+    if args.grid:
+        import yaml
+        with open(args.grid, 'r', encoding='utf-8') as file:
+            grid = yaml.safe_load(file) or {}
+
+    try:
+        param_sets = expand_grid(grid)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    conn = connect_to_database()
+    try:
+        started = time.perf_counter()
+        candles = load_candles(conn, settings['timeframes'])
+    finally:
+        conn.close()
+
+    if not candles:
+        print(f"❌ No symbol/timeframe has more than {WINDOW} closed candles")
+        return 1
+
+    bars = sum(block.shape[1] for block in candles.values())
+    print(f"📊 Loaded {bars:,} candles across {len(candles)} pairs in {time.perf_counter() - started:.2f}s")
+    print(f"🔧 {len(param_sets)} parameter sets, ranking by {settings['metric']} at {settings['horizon']} bars")
+
+    def progress(done, total, result):
+        m = result['metrics']
+        print(f"   [{done}/{total}] {m['signals']} signals, {m['seconds'] * 1000:.0f}ms  "
+              f"{format_params(result['params'])}")
+
+    started = time.perf_counter()
+    results = run_sweep(candles, param_sets, settings, workers=settings['workers'], progress=progress)
+    elapsed = time.perf_counter() - started
+
+    ranked = rank_results(results, settings['metric'], settings['min_signals'])
+    print_results(ranked, settings, settings['metric'], args.top)
+    print(f"⏱️  {len(results)} runs in {elapsed:.2f}s "
+          f"({sum(r['metrics']['seconds'] for r in results):.2f}s of worker time)")
+
+    if not args.no_save:
+        print(f"💾 Results saved to {save_results(ranked)}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
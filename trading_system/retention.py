@@ -0,0 +1,479 @@
+"""
+Data Retention for Wind Catcher & River Turn
+Keeps price_data small by rolling old short-timeframe candles into a larger
+timeframe, archiving them to cold storage and deleting them in batches
+
+Rules are per timeframe (config.yaml retention section), e.g.
+
+    retention:
+      rules:
+        15m: {keep_days: 30, rollup: 1h}
+
+keeps 30 days of 15m candles. Older ones are aggregated into 1h candles
+(existing 1h candles from the exchange take precedence), copied to the
+archive database and deleted from price_data.
+
+Work is done in short time slices, one write transaction each, so the
+collector and detector keep running alongside. After each slice freed pages
+are returned to the OS with incremental vacuum (needs auto_vacuum =
+INCREMENTAL - see --enable-incremental-vacuum).
+
+Usage:
+    python retention.py                              # apply the rules
+    python retention.py --dry-run                    # show what would be removed
+    python retention.py --report                     # table and index sizes only
+    python retention.py --enable-incremental-vacuum  # one-off VACUUM to switch auto_vacuum mode
+"""
+
+import sys
+import io
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import sqlite3
+import time
+
+from utils import (connect_to_database, load_config, get_current_timestamp, log_message,
+                   timeframe_to_seconds, candle_offset, candle_open_time, TRADING_SYSTEM_DIR,
+                   has_clustered_price_data, get_series_ids)
+
+DEFAULTS = {
+    'enabled': True,
+    'run_at': '03:30',
+    'batch_candles': 5000,
+    'vacuum_pages': 1000,
+    'archive': 'data/archive/price_archive.db',
+    'rules': {}
+}
+
+# auto_vacuum modes (PRAGMA auto_vacuum)
+AUTO_VACUUM_MODES = {0: 'NONE', 1: 'FULL', 2: 'INCREMENTAL'}
+
+
+def get_retention_settings(config=None):
+    """
+    Retention settings from config.yaml merged over the defaults
+
+    Returns:
+        dict: enabled, run_at, batch_candles, vacuum_pages, archive (Path or None),
+              rules ({timeframe: {'keep_days': int, 'rollup': str or None}})
+
+    Raises:
+        ValueError: If a rule is invalid
+    """
+    config = config if config is not None else load_config()
+    settings = dict(DEFAULTS)
+    settings.update(config.get('retention') or {})
+
+    rules = {}
+    for timeframe, rule in (settings.get('rules') or {}).items():
+        rule = rule or {}
+        keep_days = rule.get('keep_days')
+        rollup = rule.get('rollup')
+
+        if not isinstance(keep_days, (int, float)) or keep_days <= 0:
+            raise ValueError(f"retention.rules.{timeframe}.keep_days must be a positive number")
+
+        length = timeframe_to_seconds(timeframe)
+        if rollup:
+            rollup_length = timeframe_to_seconds(rollup)
+            if rollup_length <= length or rollup_length % length:
+                raise ValueError(f"retention.rules.{timeframe}.rollup must be a multiple of {timeframe}")
+
+        rules[timeframe] = {'keep_days': keep_days, 'rollup': rollup or None}
+
+    settings['rules'] = rules
+    if settings.get('archive'):
+        settings['archive'] = TRADING_SYSTEM_DIR / settings['archive']
+    return settings
+
+
+# ----------------------------------------------------------------------------
+# Storage report
+# ----------------------------------------------------------------------------
+
+def get_storage_stats(conn):
+    """
+    Size of the candle tables and their indexes, free pages and total database size
+
+    Per-object sizes come from the dbstat virtual table and are None when
+    SQLite was built without it.
+
+    Returns:
+        dict: objects ({name: bytes}), free_bytes, total_bytes, auto_vacuum
+    """
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+    names = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE tbl_name IN ('price_data', 'price_candles', 'symbols', 'timeframes') "
+        "AND type IN ('table', 'index') ORDER BY type DESC, name"
+    )]
+
+    objects = {}
+    for name in names:
+        try:
+            row = conn.execute("SELECT pgsize FROM dbstat WHERE name = ? AND aggregate = TRUE", (name,)).fetchone()
+            objects[name] = row[0] if row else 0
+        except sqlite3.OperationalError:
+            objects[name] = None
+
+    return {
+        'objects': objects,
+        'free_bytes': freelist * page_size,
+        'total_bytes': page_count * page_size,
+        'auto_vacuum': AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum))
+    }
+
+
+def format_bytes(size):
+    """Human readable size, e.g. '12.4 MB'"""
+    if size is None:
+        return 'n/a'
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def print_storage_report(before, after=None):
+    """Print sizes, or before -> after with the change when both are given"""
+    print(f"\n📦 Storage (auto_vacuum = {(after or before)['auto_vacuum']})")
+    print("="*80)
+
+    rows = [(name, size, (after or {}).get('objects', {}).get(name)) for name, size in before['objects'].items()]
+    rows.append(('Free pages', before['free_bytes'], after['free_bytes'] if after else None))
+    rows.append(('Database', before['total_bytes'], after['total_bytes'] if after else None))
+
+    for name, size_before, size_after in rows:
+        if after is None:
+            print(f"   {name:44} {format_bytes(size_before):>12}")
+        else:
+            change = (size_after - size_before) if None not in (size_before, size_after) else None
+            change = f"({'+' if change and change > 0 else ''}{format_bytes(change)})" if change is not None else ''
+            print(f"   {name:44} {format_bytes(size_before):>10} → {format_bytes(size_after):>10}  {change}")
+
+    print("="*80)
+
+
+# ----------------------------------------------------------------------------
+# Retention
+# ----------------------------------------------------------------------------
+
+def attach_archive(conn, path):
+    """Attach the cold storage database as `archive`, creating its table if needed"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn.execute("ATTACH DATABASE ? AS archive", (str(path),))
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS archive.price_data (
+            symbol TEXT NOT NULL,
+            timeframe TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            open REAL NOT NULL,
+            high REAL NOT NULL,
+            low REAL NOT NULL,
+            close REAL NOT NULL,
+            volume REAL NOT NULL,
+            created_at INTEGER NOT NULL,
+            archived_at INTEGER NOT NULL,
+            PRIMARY KEY (symbol, timeframe, timestamp)
+        ) WITHOUT ROWID
+    ''')
+    conn.commit()
+
+
+def get_pair_target(conn, symbol, timeframe):
+    """
+    Table, key columns and key values that select one pair's candles for writing
+
+    Migrated databases (database_migration_v4.py) are written through
+    price_candles directly - the price_data view's triggers work row by row
+    and don't report rowcount.
+
+    Returns:
+        tuple: (table, (symbol column, timeframe column), (symbol key, timeframe key))
+    """
+    if has_clustered_price_data(conn):
+        return 'price_candles', ('symbol_id', 'timeframe_id'), get_series_ids(conn.cursor(), symbol, timeframe)
+    return 'price_data', ('symbol', 'timeframe'), (symbol, timeframe)
+
+
+def get_cutoff(timeframe, rule, now):
+    """
+    First timestamp to keep for a rule
+
+    Aligned down to the rollup candle so only whole rollup candles are aggregated.
+    """
+    cutoff = now - int(rule['keep_days'] * 86400)
+    return candle_open_time(rule['rollup'] or timeframe, cutoff)
+
+
+def count_expired(conn, timeframe, cutoff):
+    """Candles per symbol older than the cutoff"""
+    return conn.execute('''
+        SELECT symbol, COUNT(*)
+        FROM price_data
+        WHERE timeframe = ? AND timestamp < ?
+        GROUP BY symbol
+        ORDER BY symbol
+    ''', (timeframe, cutoff)).fetchall()
+
+
+def rollup_slice(conn, pair, rollup_key, rollup, start, end, now):
+    """
+    Aggregate one slice of candles into the rollup timeframe
+
+    Open is the first candle's open, close the last one's close, high/low
+    the extremes and volume the sum. Rollup candles that already exist
+    (fetched from the exchange) are left untouched.
+
+    Args:
+        pair (tuple): get_pair_target() of the source symbol/timeframe
+        rollup_key (tuple): Key values of the same symbol in the rollup timeframe
+
+    Returns:
+        int: Rollup candles inserted
+    """
+    table, (symbol_column, timeframe_column), (symbol, timeframe) = pair
+    length = timeframe_to_seconds(rollup)
+    offset = candle_offset(rollup)
+
+    cursor = conn.execute(f'''
+        INSERT OR IGNORE INTO {table} ({symbol_column}, {timeframe_column}, timestamp, open, high, low, close, volume, created_at)
+        SELECT :rollup_symbol, :rollup_timeframe, bucket,
+               MAX(CASE WHEN first_row = 1 THEN open END), MAX(high), MIN(low),
+               MAX(CASE WHEN last_row = 1 THEN close END), SUM(volume), :now
+        FROM (
+            SELECT (timestamp - :offset) / :length * :length + :offset AS bucket,
+                   open, high, low, close, volume,
+                   ROW_NUMBER() OVER (PARTITION BY (timestamp - :offset) / :length ORDER BY timestamp) AS first_row,
+                   ROW_NUMBER() OVER (PARTITION BY (timestamp - :offset) / :length ORDER BY timestamp DESC) AS last_row
+            FROM {table}
+            WHERE {symbol_column} = :symbol AND {timeframe_column} = :timeframe AND timestamp >= :start AND timestamp < :end
+        )
+        GROUP BY bucket
+    ''', {'symbol': symbol, 'timeframe': timeframe, 'rollup_symbol': rollup_key[0], 'rollup_timeframe': rollup_key[1],
+          'start': start, 'end': end, 'length': length, 'offset': offset, 'now': now})
+    return cursor.rowcount
+
+
+def archive_slice(conn, symbol, timeframe, start, end, now):
+    """
+    Copy one slice of candles to the attached archive database
+
+    Returns:
+        int: Candles archived (already archived ones are skipped)
+    """
+    cursor = conn.execute('''
+        INSERT OR IGNORE INTO archive.price_data
+            (symbol, timeframe, timestamp, open, high, low, close, volume, created_at, archived_at)
+        SELECT symbol, timeframe, timestamp, open, high, low, close, volume, created_at, ?
+        FROM price_data
+        WHERE symbol = ? AND timeframe = ? AND timestamp >= ? AND timestamp < ?
+    ''', (now, symbol, timeframe, start, end))
+    return cursor.rowcount
+
+
+def run_incremental_vacuum(conn, pages=None):
+    """
+    Return free pages to the OS (all of them if pages is None)
+
+    sqlite3's execute() only steps this pragma once, which frees a single
+    page - executescript() runs it to completion.
+    """
+    conn.executescript(f"PRAGMA incremental_vacuum({int(pages)});" if pages else "PRAGMA incremental_vacuum;")
+
+
+def apply_rule(conn, timeframe, rule, settings, now, incremental_vacuum=False):
+    """
+    Roll up, archive and delete every candle of a timeframe older than its rule allows
+
+    Each slice of batch_candles candles per symbol is one transaction:
+    rollup, archive copy, delete, commit - then incremental vacuum.
+
+    Returns:
+        dict: symbols, deleted, archived, rolled_up, batches
+    """
+    stats = {'symbols': 0, 'deleted': 0, 'archived': 0, 'rolled_up': 0, 'batches': 0}
+    cutoff = get_cutoff(timeframe, rule, now)
+    align = rule['rollup'] or timeframe
+
+    # Slices hold batch_candles candles, rounded up to whole rollup candles
+    align_length = timeframe_to_seconds(align)
+    slice_length = max(int(settings['batch_candles']), 1) * timeframe_to_seconds(timeframe)
+    slice_length = -(-slice_length // align_length) * align_length
+
+    for symbol, _ in count_expired(conn, timeframe, cutoff):
+        stats['symbols'] += 1
+        pair = get_pair_target(conn, symbol, timeframe)
+        table, (symbol_column, timeframe_column), key = pair
+        if rule['rollup']:
+            rollup_key = get_pair_target(conn, symbol, rule['rollup'])[2]
+
+        while True:
+            first = conn.execute(f'''
+                SELECT MIN(timestamp) FROM {table}
+                WHERE {symbol_column} = ? AND {timeframe_column} = ? AND timestamp < ?
+            ''', (*key, cutoff)).fetchone()[0]
+            if first is None:
+                break
+
+            start = candle_open_time(align, first)
+            end = min(start + slice_length, cutoff)
+
+            try:
+                if rule['rollup']:
+                    stats['rolled_up'] += rollup_slice(conn, pair, rollup_key, rule['rollup'], start, end, now)
+                if settings.get('archive'):
+                    stats['archived'] += archive_slice(conn, symbol, timeframe, start, end, now)
+
+                cursor = conn.execute(f'''
+                    DELETE FROM {table}
+                    WHERE {symbol_column} = ? AND {timeframe_column} = ? AND timestamp >= ? AND timestamp < ?
+                ''', (*key, start, end))
+                stats['deleted'] += cursor.rowcount
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+
+            stats['batches'] += 1
+            if incremental_vacuum:
+                run_incremental_vacuum(conn, settings['vacuum_pages'])
+
+    return stats
+
+
+def apply_retention(conn, settings=None, now=None):
+    """
+    Apply every retention rule
+
+    Args:
+        conn (sqlite3.Connection): Writable database connection
+        settings (dict): From get_retention_settings (loaded from config if None)
+        now (int): Current time (for tests)
+
+    Returns:
+        dict: rules ({timeframe: apply_rule stats}), before/after storage stats, seconds
+    """
+    started = time.perf_counter()
+    settings = settings or get_retention_settings()
+    now = now or get_current_timestamp()
+
+    before = get_storage_stats(conn)
+    incremental_vacuum = before['auto_vacuum'] == 'INCREMENTAL'
+
+    if settings.get('archive'):
+        attach_archive(conn, settings['archive'])
+
+    results = {}
+    try:
+        for timeframe, rule in settings['rules'].items():
+            results[timeframe] = apply_rule(conn, timeframe, rule, settings, now, incremental_vacuum)
+    finally:
+        if settings.get('archive'):
+            conn.execute("DETACH DATABASE archive")
+
+    if incremental_vacuum:
+        # Whatever is still free after the per-batch passes
+        run_incremental_vacuum(conn)
+
+    return {
+        'rules': results,
+        'before': before,
+        'after': get_storage_stats(conn),
+        'seconds': time.perf_counter() - started
+    }
+
+
+def enable_incremental_vacuum(conn):
+    """
+    Switch the database to auto_vacuum = INCREMENTAL
+
+    The mode only takes effect after a full VACUUM, which rewrites the whole
+    file - run this once while the system is stopped.
+    """
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+
+
+def print_plan(conn, settings, now):
+    """Print what each rule would remove (dry run)"""
+    print("\n🔎 Dry run - nothing is changed")
+    print("="*80)
+
+    for timeframe, rule in settings['rules'].items():
+        cutoff = get_cutoff(timeframe, rule, now)
+        expired = count_expired(conn, timeframe, cutoff)
+        rollup = f", roll up into {rule['rollup']}" if rule['rollup'] else ""
+        print(f"\n{timeframe}: keep {rule['keep_days']} days{rollup} (before {cutoff})")
+
+        if not expired:
+            print("   Nothing to remove")
+        for symbol, count in expired:
+            print(f"   {symbol:12} {count:>10,} candles")
+
+    print("="*80)
+
+
+def main():
+    """Apply the retention rules and report reclaimed space"""
+    parser = argparse.ArgumentParser(description="Roll up, archive and delete old candles")
+    parser.add_argument('--dry-run', action='store_true', help="Show what would be removed")
+    parser.add_argument('--report', action='store_true', help="Only print table and index sizes")
+    parser.add_argument('--enable-incremental-vacuum', action='store_true',
+                        help="Switch to auto_vacuum = INCREMENTAL (full VACUUM - stop the system first)")
+    args = parser.parse_args()
+
+    print("🧹 Wind Catcher & River Turn - Data Retention")
+    print("="*60)
+
+    settings = get_retention_settings()
+    conn = connect_to_database()
+
+    try:
+        if args.enable_incremental_vacuum:
+            before = get_storage_stats(conn)
+            print("⏳ Running VACUUM...")
+            enable_incremental_vacuum(conn)
+            print_storage_report(before, get_storage_stats(conn))
+            return
+
+        if args.report:
+            print_storage_report(get_storage_stats(conn))
+            return
+
+        if not settings['rules']:
+            print("ℹ️  No retention rules configured (config.yaml retention.rules)")
+            return
+
+        if args.dry_run:
+            print_plan(conn, settings, get_current_timestamp())
+            return
+
+        result = apply_retention(conn, settings)
+
+        for timeframe, stats in result['rules'].items():
+            print(f"✅ {timeframe}: deleted {stats['deleted']:,} candles across {stats['symbols']} symbols "
+                  f"({stats['archived']:,} archived, {stats['rolled_up']:,} rollup candles, {stats['batches']} batches)")
+
+        print_storage_report(result['before'], result['after'])
+        if result['after']['auto_vacuum'] != 'INCREMENTAL':
+            print("ℹ️  Freed pages are reused by new candles but the file doesn't shrink - "
+                  "run with --enable-incremental-vacuum once to return them to the OS")
+        print(f"⏱️  Done in {result['seconds']:.2f}s")
+
+        deleted = sum(stats['deleted'] for stats in result['rules'].values())
+        log_message(f"🧹 Retention removed {deleted} candles in {result['seconds']:.1f}s", "INFO")
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Candle-Close Scan Scheduler for Wind Catcher & River Turn
+Decides when each timeframe's pairs are fetched and analyzed, instead of
+rescanning every pair on one fixed interval:
+
+- settle_seconds after each candle close, a timeframe's pairs get a close
+  run: their candles are fetched and every pair is analyzed (a 12h pair twice
+  a day, a 15m pair right after each of its 96 closes)
+- between closes, every intrabar_seconds, an intrabar run fetches only the
+  last intrabar_candles candles of the pairs the market context pre-filter
+  says moved, and analyzes only those
+- per timeframe it records the close-to-analysis latency, wall time and
+  the scan thread's CPU time
+
+orchestrator.py runs the scans when scan_schedule.enabled is on.
+
+Usage:
+    python scan_scheduler.py        # show the upcoming runs for the watchlist timeframes
+"""
+
+import sys
+import io
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+import threading
+
+from utils import (load_config, get_current_timestamp, timeframe_to_seconds, next_candle_close,
+                   candle_open_time, format_timestamp)
+from metrics import registry
+
+DEFAULTS = {
+    'enabled': True,
+    'settle_seconds': 5,
+    'intrabar_seconds': {'default': 300},
+    'intrabar_candles': 3
+}
+
+# Seconds between checks for watchlist timeframes while there are none
+IDLE_RECHECK_SECONDS = 60
+
+# Run kinds, in the order due runs are handled
+RUN_KINDS = ('close', 'startup', 'intrabar')
+
+
+def get_schedule_settings(config=None):
+    """
+    Fetch scan scheduling settings from config.yaml (scan_schedule section)
+
+    intrabar_seconds may be a number or a {timeframe: seconds} mapping with an
+    optional 'default' entry; it is always returned as a mapping.
+
+    Returns:
+        dict: enabled, settle_seconds, intrabar_seconds, intrabar_candles
+    """
+    config = config if config is not None else load_config()
+    settings = dict(DEFAULTS)
+    settings.update(config.get('scan_schedule') or {})
+
+    intrabar = settings['intrabar_seconds']
+    if not isinstance(intrabar, dict):
+        intrabar = {'default': intrabar or 0}
+    settings['intrabar_seconds'] = intrabar
+    return settings
+
+
+def intrabar_interval(settings, timeframe):
+    """
+    Seconds between intrabar refreshes of a timeframe
+
+    Returns:
+        int: 0 if the timeframe is only scanned at candle closes
+    """
+    intrabar = settings['intrabar_seconds']
+    interval = intrabar.get(timeframe, intrabar.get('default', 0)) or 0
+
+    # A refresh as long as the candle itself is just the close run
+    return interval if interval < timeframe_to_seconds(timeframe) else 0
+
+
+class TimeframeMetrics:
+    """Run counts, latency and CPU time of one timeframe's scans"""
+
+    def __init__(self, timeframe):
+        self.timeframe = timeframe
+        self.runs = {kind: 0 for kind in RUN_KINDS}
+        self.failures = 0
+        self.pairs_fetched = 0
+        self.pairs_analyzed = 0
+        self.total_duration = 0.0
+        self.total_cpu = 0.0
+        self.last_latency = None
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+
+    def record(self, kind, close_time, fetched, analyzed, duration, cpu, finished_at, failed=False):
+        """Add one finished run (close_time is the candle close a close run was for)"""
+        self.runs[kind] += 1
+        self.failures += int(failed)
+        self.pairs_fetched += fetched
+        self.pairs_analyzed += analyzed
+        self.total_duration += duration
+        self.total_cpu += cpu
+
+        if kind == 'close':
+            latency = finished_at - close_time
+            self.last_latency = latency
+            self.max_latency = max(self.max_latency, latency)
+            self.total_latency += latency
+            registry.observe(f'close_latency_{self.timeframe}', latency)
+
+    def to_dict(self):
+        """Metrics as a JSON-serializable dict"""
+        runs = sum(self.runs.values())
+        closes = self.runs['close']
+        return {
+            'runs': dict(self.runs),
+            'failures': self.failures,
+            'pairs_fetched': self.pairs_fetched,
+            'pairs_analyzed': self.pairs_analyzed,
+            'mean_duration': round(self.total_duration / runs, 3) if runs else None,
+            'cpu_seconds': round(self.total_cpu, 3),
+            'mean_cpu': round(self.total_cpu / runs, 3) if runs else None,
+            'mean_close_latency': round(self.total_latency / closes, 3) if closes else None,
+            'last_close_latency': round(self.last_latency, 3) if self.last_latency is not None else None,
+            'max_close_latency': round(self.max_latency, 3)
+        }
+
+
+class ScanScheduler:
+    """Next run of every watchlist timeframe, and what each run recorded"""
+
+    def __init__(self, settings=None):
+        """
+        Args:
+            settings (dict): From get_schedule_settings (loaded from config.yaml if None)
+        """
+        self.settings = settings or get_schedule_settings()
+        self.metrics = {}
+        self._next = {}               # timeframe -> (run_at, kind, close_time)
+        self._idle_until = None
+        self._lock = threading.Lock()
+
+    def plan(self, timeframe, now):
+        """
+        The run that follows one at `now`
+
+        Returns:
+            tuple: (run_at, kind, close_time) - an intrabar run if one fits
+                   before the next close run, the close run otherwise
+        """
+        settle = self.settings['settle_seconds']
+        close_time = next_candle_close(timeframe, now - settle)
+        interval = intrabar_interval(self.settings, timeframe)
+
+        if interval and now + interval < close_time + settle:
+            return now + interval, 'intrabar', close_time
+        return close_time + settle, 'close', close_time
+
+    def due(self, timeframes, now=None):
+        """
+        Take the runs that are due, planning each timeframe's next one
+
+        A timeframe seen for the first time runs right away ('startup', which
+        fetches and analyzes like a close run). Timeframes no longer in the
+        watchlist are forgotten.
+
+        Args:
+            timeframes (iterable): Watchlist timeframes
+            now (int): Current time
+
+        Returns:
+            list: (timeframe, kind, close_time) - close runs first, shortest
+                  timeframes first within a kind
+        """
+        now = now or get_current_timestamp()
+        timeframes = set(timeframes)
+
+        with self._lock:
+            for timeframe in set(self._next) - timeframes:
+                del self._next[timeframe]
+            for timeframe in timeframes - set(self._next):
+                self._next[timeframe] = (now, 'startup', candle_open_time(timeframe, now))
+                self.metrics.setdefault(timeframe, TimeframeMetrics(timeframe))
+            self._idle_until = None if timeframes else now + IDLE_RECHECK_SECONDS
+
+            due = []
+            for timeframe, (run_at, kind, close_time) in self._next.items():
+                if run_at <= now:
+                    due.append((timeframe, kind, close_time))
+                    self._next[timeframe] = self.plan(timeframe, now)
+
+        return sorted(due, key=lambda run: (RUN_KINDS.index(run[1]), timeframe_to_seconds(run[0])))
+
+    def next_run_at(self):
+        """
+        When the next run is due
+
+        Returns:
+            int: Unix timestamp, or None before the first due() call
+        """
+        with self._lock:
+            if self._idle_until is not None:
+                return self._idle_until
+            return min((run_at for run_at, _, _ in self._next.values()), default=None)
+
+    def record(self, timeframe, kind, close_time, fetched, analyzed, duration, cpu, failed=False):
+        """Record a finished run (see TimeframeMetrics.record)"""
+        with self._lock:
+            metrics = self.metrics.setdefault(timeframe, TimeframeMetrics(timeframe))
+            metrics.record(kind, close_time, fetched, analyzed, duration, cpu,
+                           get_current_timestamp(), failed)
+
+    def get_metrics(self):
+        """Per-timeframe metrics with each timeframe's next run, shortest timeframe first"""
+        with self._lock:
+            result = {}
+            for timeframe in sorted(self.metrics, key=timeframe_to_seconds):
+                result[timeframe] = self.metrics[timeframe].to_dict()
+                upcoming = self._next.get(timeframe)
+                if upcoming:
+                    result[timeframe]['next_run'] = {'at': upcoming[0], 'kind': upcoming[1]}
+            return result
+
+
+def runs_per_day(settings, timeframe):
+    """
+    Close and intrabar runs a timeframe gets per day
+
+    Returns:
+        tuple: (close runs, intrabar runs)
+    """
+    length = timeframe_to_seconds(timeframe)
+    closes = 86400 / length
+    interval = intrabar_interval(settings, timeframe)
+    # Refreshes that fit between one close run and the next
+    intrabar = (length - 1) // interval * closes if interval else 0
+    return closes, intrabar
+
+
+def main():
+    """Show when each watchlist timeframe is scanned next"""
+    from utils import connect_to_database
+    from multi_timeframe_collector import get_watchlist_requirements
+
+    print("⏰ Wind Catcher & River Turn - Scan Schedule")
+    print("="*60)
+
+    settings = get_schedule_settings()
+    conn = connect_to_database()
+    try:
+        symbols, timeframes = get_watchlist_requirements(conn)
+    finally:
+        conn.close()
+
+    if not timeframes:
+        print("\n⚠️  No timeframes in user_watchlists")
+        return
+
+    status = "enabled" if settings['enabled'] else "disabled (orchestrator uses fixed intervals)"
+    print(f"Close-aware scheduling: {status}")
+    print(f"Settle time after close: {settings['settle_seconds']}s")
+    print(f"Intrabar refreshes fetch the last {settings['intrabar_candles']} candles of moved pairs")
+
+    scheduler = ScanScheduler(settings)
+    now = get_current_timestamp()
+    scheduler.due(timeframes, now)
+
+    print(f"\n{'Timeframe':<10}{'Next close':>21}{'Next run':>21}{'Kind':>10}{'Intrabar':>10}{'Runs/day':>10}")
+    print("-"*82)
+    for timeframe in sorted(timeframes, key=timeframe_to_seconds):
+        run_at, kind, close_time = scheduler._next[timeframe]
+        interval = intrabar_interval(settings, timeframe)
+        closes, intrabar = runs_per_day(settings, timeframe)
+        print(f"{timeframe:<10}{format_timestamp(close_time):>21}{format_timestamp(run_at):>21}{kind:>10}"
+              f"{(f'{interval}s' if interval else '-'):>10}{closes + intrabar:>10.0f}")
+    print("-"*82)
+
+    # The fixed-interval loop scans every pair once per signal_scan_interval
+    interval = load_config()['system'].get('signal_scan_interval', 300)
+    scheduled = sum(sum(runs_per_day(settings, tf)) for tf in timeframes) * len(symbols)
+    fixed = 86400 / interval * len(timeframes) * len(symbols)
+    print(f"Pair scans per day (at most): {scheduled:,.0f} instead of {fixed:,.0f} every {interval}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,9 @@ import json
 from datetime import datetime
 from utils import connect_to_database, load_config, get_current_timestamp
 from master_confluence import analyze_master_confluence
+from indicator_kernels import get_kernel_settings, warm_up
 from telegram_bot import TelegramBot
+import metrics
 
 
 class SignalDetectorService:
@@ -28,6 +30,17 @@ class SignalDetectorService:
         self.config = load_config()
         self.scan_interval = self.config['system'].get('signal_scan_interval', 300)
         self.min_score_display = self.config['confluence'].get('min_score_display', 1.2)
+        # Stop analyzing a pair once it can't reach min_score_display in its watch direction
+        self.short_circuit = self.config['confluence'].get('short_circuit', True)
+
+        # Span timings per cycle (served at /api/metrics) and optional cProfile dumps
+        metrics_config = self.config.get('metrics', {})
+        metrics.registry.enabled = metrics_config.get('enabled', True)
+        self.profile = metrics_config.get('profile', False)
+
+        # Compile (or load the cached) signal kernels now rather than in the first scan
+        if warm_up(get_kernel_settings(self.config)):
+            print(f"✅ Signal kernels JIT-compiled (numba)")
 
         # Initialize Telegram bot
         try:
@@ -86,6 +99,7 @@ class SignalDetectorService:
 
         return count > 0
 
+    @metrics.timed('save_signal')
     def save_signal(self, conn, analysis_result):
         """
         Save a signal to the database
@@ -143,6 +157,10 @@ class SignalDetectorService:
         cursor = conn.cursor()
 
         try:
+            with metrics.span('encode_signal_json'):
+                indicators_json = json.dumps(indicators_firing)
+                details_json = json.dumps(details)
+
             cursor.execute('''
                 INSERT INTO signals (
                     timestamp, symbol, timeframe, system, signal_type,
@@ -154,8 +172,8 @@ class SignalDetectorService:
             ''', (
                 timestamp, symbol, timeframe, primary_system, signal_type,
                 price, score, classification,
-                json.dumps(indicators_firing), volume_level, volume_ratio,
-                json.dumps(details), 0, current_time
+                indicators_json, volume_level, volume_ratio,
+                details_json, 0, current_time
             ))
 
             conn.commit()
@@ -180,9 +198,16 @@ class SignalDetectorService:
         conn.commit()
         cursor.close()
 
-    def scan_watchlists(self, conn):
+    def scan_watchlists(self, conn, timeframe=None, symbols=None, use_ring=True):
         """
-        Scan all watchlist entries for new signals
+        Scan watchlist entries for new signals
+
+        Args:
+            conn: Database connection
+            timeframe: Only scan entries on this timeframe (all if None)
+            symbols: Only scan entries for these symbols (all if None)
+            use_ring: Read candles from the collector's shared-memory ring when it
+                      has them - False if conn isn't the live database
 
         Returns:
             dict: Statistics about the scan
@@ -192,11 +217,17 @@ class SignalDetectorService:
             'signals_found': 0,
             'signals_saved': 0,
             'alerts_sent': 0,
+            'short_circuited': {'direction': 0, 'score': 0},
+            'seconds_saved': 0.0,
             'errors': []
         }
 
         # Get watchlist entries
         watchlist = self.get_watchlist_entries(conn)
+        if timeframe is not None:
+            watchlist = [entry for entry in watchlist if entry[1] == timeframe]
+        if symbols is not None:
+            watchlist = [entry for entry in watchlist if entry[0] in symbols]
 
         if not watchlist:
             print("⚠️ No entries in user_watchlists table")
@@ -210,11 +241,22 @@ class SignalDetectorService:
 
             try:
                 # Analyze symbol on this timeframe
-                result = analyze_master_confluence(conn, symbol, timeframe)
+                if self.short_circuit:
+                    result = analyze_master_confluence(conn, symbol, timeframe, direction=direction,
+                                                       min_score=self.min_score_display, use_ring=use_ring)
+                else:
+                    result = analyze_master_confluence(conn, symbol, timeframe, use_ring=use_ring)
 
                 if not result:
                     continue
 
+                # Stopped early - it can't pass the checks below
+                short_circuit = result.get('short_circuit')
+                if short_circuit:
+                    stats['short_circuited'][short_circuit['reason']] += 1
+                    stats['seconds_saved'] += short_circuit['seconds_saved']
+                    continue
+
                 confluence = result['confluence']
                 score = confluence['score']
                 classification = confluence['classification']
@@ -241,16 +283,19 @@ class SignalDetectorService:
 
                 if signal_id:
                     stats['signals_saved'] += 1
+                    metrics.registry.inc('signals_saved')
                     print(f"  💫 {symbol:8s} {timeframe:4s} - {classification} ({score:.2f}) - Saved (ID: {signal_id})")
 
                     # Send Telegram alert if enabled and score is high enough
                     if self.telegram_bot and self.telegram_bot.should_send_alert(result):
                         try:
-                            success = self.telegram_bot.send_signal_alert(result)
+                            with metrics.span('telegram_send'):
+                                success = self.telegram_bot.send_signal_alert(result)
 
                             if success:
                                 self.mark_signal_notified(conn, signal_id)
                                 stats['alerts_sent'] += 1
+                                metrics.registry.inc('alerts_sent')
                                 print(f"      📱 Telegram alert sent!")
                             else:
                                 print(f"      ⚠️  Telegram alert failed")
@@ -265,16 +310,37 @@ class SignalDetectorService:
 
         return stats
 
-    def run_once(self):
-        """Run one scan cycle"""
+    def run_once(self, conn=None, timeframe=None, symbols=None, use_ring=True):
+        """
+        Run one scan cycle
+
+        Args:
+            conn: Database connection to reuse (opened and closed here if None)
+            timeframe: Only scan entries on this timeframe (all if None)
+            symbols: Only scan entries for these symbols (all if None)
+            use_ring: Read candles from the collector's ring (see scan_watchlists)
+        """
+        if self.profile:
+            with metrics.profile_to('scan'):
+                return self._run_cycle(conn, timeframe, symbols, use_ring)
+        return self._run_cycle(conn, timeframe, symbols, use_ring)
+
+    def _run_cycle(self, conn, timeframe=None, symbols=None, use_ring=True):
+        """Run one scan cycle, recording its span timings"""
+        scope = f" ({timeframe})" if timeframe else ""
         print(f"\n{'='*60}")
-        print(f"🔍 Signal Detection Cycle - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"🔍 Signal Detection Cycle{scope} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*60}")
 
-        conn = connect_to_database()
+        owns_conn = conn is None
+        if owns_conn:
+            conn = connect_to_database()
+
+        metrics.registry.start_cycle()
 
         try:
-            stats = self.scan_watchlists(conn)
+            with metrics.span('scan_watchlists'):
+                stats = self.scan_watchlists(conn, timeframe, symbols, use_ring)
 
             # Print summary
             print(f"\n📋 Scan Summary:")
@@ -283,13 +349,27 @@ class SignalDetectorService:
             print(f"   Signals saved: {stats['signals_saved']}")
             print(f"   Telegram alerts sent: {stats['alerts_sent']}")
 
+            short_circuited = sum(stats['short_circuited'].values())
+            if stats['scanned']:
+                metrics.registry.set_gauge('confluence_skip_rate', round(short_circuited / stats['scanned'], 3))
+                metrics.registry.set_gauge('confluence_seconds_saved', round(stats['seconds_saved'], 3))
+            if short_circuited:
+                print(f"   Stopped early: {short_circuited} of {stats['scanned']} "
+                      f"({stats['short_circuited']['direction']} direction, {stats['short_circuited']['score']} score) "
+                      f"- ~{stats['seconds_saved']:.1f}s of analysis skipped")
+
             if stats['errors']:
                 print(f"   ⚠️  Errors: {len(stats['errors'])}")
 
             return stats
 
         finally:
-            conn.close()
+            if owns_conn:
+                conn.close()
+
+            if metrics.registry.enabled:
+                metrics.print_cycle_summary(metrics.registry.end_cycle())
+                metrics.save_snapshot()
 
     def run_continuous(self):
         """Run continuous scanning loop"""
@@ -343,9 +423,12 @@ def main():
     """Main entry point"""
     service = SignalDetectorService()
 
+    # --profile dumps a cProfile of every cycle to logs/profiles/
+    if '--profile' in sys.argv[1:]:
+        service.profile = True
+
     # Run one scan or continuous?
-    import sys
-    if len(sys.argv) > 1 and sys.argv[1] == '--once':
+    if '--once' in sys.argv[1:]:
         service.run_once()
     else:
         service.run_continuous()
@@ -0,0 +1,400 @@
+"""
+Signal Outcome Engine for Wind Catcher & River Turn
+Labels every stored signal with what price did afterwards, so confluence
+thresholds can be tuned from data instead of by eye
+
+For each signal and horizon (bars after the signal candle) it stores:
+- return_pct: direction-adjusted close-to-close return
+- mfe_pct / mae_pct: maximum favourable / adverse excursion within the horizon
+- bars_to_target / bars_to_stop: first bar reaching target_pct / stop_pct (NULL if not reached)
+
+Wind Catcher signals are scored as longs and River Turn signals as shorts.
+Outcomes are computed with NumPy over all signals of a symbol/timeframe at
+once. Horizons that haven't closed yet are stored as incomplete and
+recomputed on the next update, as new candles arrive.
+
+Usage:
+    python signal_outcomes.py              # update outcomes and print the report
+    python signal_outcomes.py --rebuild    # recompute every signal
+    python signal_outcomes.py --report     # report only
+"""
+
+import sys
+import io
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import time
+
+import numpy as np
+
+from utils import connect_to_database, load_config, get_current_timestamp, timeframe_to_seconds
+from metrics import span
+
+DEFAULT_HORIZONS = [1, 3, 6, 12, 24]
+DEFAULT_TARGET_PCT = 2.0
+DEFAULT_STOP_PCT = 1.0
+
+# Trade direction per system
+SYSTEM_DIRECTION = {'wind_catcher': 1, 'river_turn': -1}
+
+
+def create_outcomes_table(conn):
+    """Create the signal_outcomes table (safe to re-run)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS signal_outcomes (
+            signal_id INTEGER NOT NULL,
+            horizon INTEGER NOT NULL,
+            return_pct REAL,
+            mfe_pct REAL,
+            mae_pct REAL,
+            bars_to_target INTEGER,
+            bars_to_stop INTEGER,
+            bars_available INTEGER NOT NULL,
+            complete INTEGER NOT NULL DEFAULT 0,
+            updated_at INTEGER NOT NULL,
+            PRIMARY KEY (signal_id, horizon)
+        ) WITHOUT ROWID
+    ''')
+    conn.commit()
+
+
+def get_outcome_settings(config=None):
+    """
+    Outcome settings from config.yaml (outcomes section)
+
+    Returns:
+        dict: horizons (sorted list of bars), target_pct, stop_pct
+    """
+    config = config if config is not None else load_config()
+    settings = config.get('outcomes', {})
+
+    return {
+        'horizons': sorted(set(int(h) for h in settings.get('horizons', DEFAULT_HORIZONS))),
+        'target_pct': float(settings.get('target_pct', DEFAULT_TARGET_PCT)),
+        'stop_pct': float(settings.get('stop_pct', DEFAULT_STOP_PCT))
+    }
+
+
+def compute_outcomes(entry_timestamps, entry_prices, directions, timestamps, high, low, close,
+                     horizons, target_pct, stop_pct):
+    """
+    Compute outcomes for many signals on one candle series
+
+    Every signal's forward window is gathered into one (signals x max horizon)
+    matrix, so the work is a handful of array operations whatever the count.
+
+    Args:
+        entry_timestamps (np.ndarray): Signal candle timestamps (seconds)
+        entry_prices (np.ndarray): Signal prices
+        directions (np.ndarray): 1 for long, -1 for short
+        timestamps (np.ndarray): Closed candle timestamps, ascending
+        high, low, close (np.ndarray): Candle prices aligned with timestamps
+        horizons (list): Sorted horizons in bars
+        target_pct (float): Favourable move counted as reaching the target
+        stop_pct (float): Adverse move counted as reaching the stop
+
+    Returns:
+        dict: Arrays of shape (signals, horizons) - return_pct, mfe_pct, mae_pct,
+              bars_to_target, bars_to_stop (NaN where undefined), complete (bool),
+              plus bars_available of shape (signals,)
+    """
+    horizons = np.asarray(horizons)
+    max_horizon = int(horizons[-1])
+    n_candles = len(timestamps)
+
+    # Signal candle = last candle at or before the signal timestamp
+    entry_index = np.searchsorted(timestamps, entry_timestamps, side='right') - 1
+
+    index = entry_index[:, None] + np.arange(1, max_horizon + 1)[None, :]
+    valid = (index < n_candles) & (entry_index[:, None] >= 0)
+    index = np.clip(index, 0, max(n_candles - 1, 0))
+
+    price = entry_prices[:, None]
+    direction = directions[:, None]
+
+    if n_candles:
+        bar_high, bar_low, bar_close = high[index], low[index], close[index]
+    else:
+        bar_high = bar_low = bar_close = np.full(index.shape, np.nan)
+
+    # Excursions in percent, positive = further in that direction
+    favourable = np.where(direction > 0, bar_high / price - 1, 1 - bar_low / price) * 100
+    adverse = np.where(direction > 0, 1 - bar_low / price, bar_high / price - 1) * 100
+    favourable = np.where(valid, favourable, -np.inf)
+    adverse = np.where(valid, adverse, -np.inf)
+
+    running_mfe = np.maximum.accumulate(favourable, axis=1)
+    running_mae = np.maximum.accumulate(adverse, axis=1)
+    returns = direction * (bar_close / price - 1) * 100
+
+    bars_available = valid.sum(axis=1)
+    columns = horizons - 1
+    complete = bars_available[:, None] >= horizons[None, :]
+    started = bars_available[:, None] > 0
+
+    def first_bar(hit):
+        """1-based bar of the first hit within each horizon, NaN if none"""
+        first = np.where(hit.any(axis=1), hit.argmax(axis=1) + 1, 0)[:, None]
+        return np.where((first > 0) & (first <= horizons[None, :]), first, np.nan)
+
+    return {
+        'return_pct': np.where(complete, returns[:, columns], np.nan),
+        'mfe_pct': np.where(started, running_mfe[:, columns], np.nan),
+        'mae_pct': np.where(started, running_mae[:, columns], np.nan),
+        'bars_to_target': first_bar(favourable >= target_pct),
+        'bars_to_stop': first_bar(adverse >= stop_pct),
+        'complete': complete,
+        'bars_available': bars_available
+    }
+
+
+def get_pending_signals(conn, max_horizon, rebuild=False):
+    """
+    Signals whose longest horizon hasn't been labelled as complete yet
+
+    Returns:
+        list: (id, symbol, timeframe, timestamp, price, system) tuples
+    """
+    query = '''
+        SELECT s.id, s.symbol, s.timeframe, s.timestamp, s.price, s.system
+        FROM signals s
+        WHERE s.timeframe IS NOT NULL
+          AND s.system IN ('wind_catcher', 'river_turn')
+    '''
+    params = ()
+
+    if not rebuild:
+        query += '''
+          AND NOT EXISTS (
+              SELECT 1 FROM signal_outcomes o
+              WHERE o.signal_id = s.id AND o.horizon = ? AND o.complete = 1
+          )
+        '''
+        params = (max_horizon,)
+
+    return conn.execute(query + ' ORDER BY s.symbol, s.timeframe', params).fetchall()
+
+
+def load_closed_candles(conn, symbol, timeframe, since, now):
+    """
+    Closed candles of one pair from `since` onwards as NumPy arrays
+
+    The newest stored candle is usually still forming - it's excluded until it closes.
+
+    Returns:
+        tuple: (timestamps, high, low, close)
+    """
+    cutoff = now - timeframe_to_seconds(timeframe)
+
+    rows = conn.execute('''
+        SELECT timestamp, high, low, close
+        FROM price_data
+        WHERE symbol = ? AND timeframe = ? AND timestamp >= ? AND timestamp <= ?
+        ORDER BY timestamp
+    ''', (symbol, timeframe, since, cutoff)).fetchall()
+
+    if not rows:
+        empty = np.array([], dtype=float)
+        return np.array([], dtype=np.int64), empty, empty, empty
+
+    data = np.array(rows, dtype=float)
+    return data[:, 0].astype(np.int64), data[:, 1], data[:, 2], data[:, 3]
+
+
+def update_outcomes(conn, settings=None, rebuild=False):
+    """
+    Compute and store outcomes for every signal that isn't fully labelled
+
+    Args:
+        conn (sqlite3.Connection): Writable database connection
+        settings (dict): From get_outcome_settings (loaded from config if None)
+        rebuild (bool): Recompute every signal, not just incomplete ones
+
+    Returns:
+        dict: signals, rows, completed, pairs, seconds
+    """
+    started = time.perf_counter()
+    settings = settings or get_outcome_settings()
+    horizons = settings['horizons']
+    now = get_current_timestamp()
+
+    create_outcomes_table(conn)
+
+    with span('outcomes.load_signals'):
+        pending = get_pending_signals(conn, horizons[-1], rebuild=rebuild)
+
+    stats = {'signals': len(pending), 'rows': 0, 'completed': 0, 'pairs': 0}
+
+    if rebuild:
+        conn.execute("DELETE FROM signal_outcomes")
+    else:
+        # Outcomes of deleted signals
+        conn.execute("DELETE FROM signal_outcomes WHERE signal_id NOT IN (SELECT id FROM signals)")
+
+    # Group signal rows by pair (already sorted by symbol, timeframe)
+    groups = {}
+    for row in pending:
+        groups.setdefault((row[1], row[2]), []).append(row)
+
+    for (symbol, timeframe), rows in groups.items():
+        try:
+            timeframe_to_seconds(timeframe)
+        except ValueError:
+            continue
+
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        entry_timestamps = np.array([row[3] for row in rows], dtype=np.int64)
+        entry_prices = np.array([row[4] for row in rows], dtype=float)
+        directions = np.array([SYSTEM_DIRECTION[row[5]] for row in rows], dtype=float)
+
+        with span('outcomes.load_candles'):
+            candles = load_closed_candles(conn, symbol, timeframe, int(entry_timestamps.min()), now)
+
+        with span('outcomes.compute'):
+            outcomes = compute_outcomes(
+                entry_timestamps, entry_prices, directions, *candles,
+                horizons, settings['target_pct'], settings['stop_pct']
+            )
+
+        with span('outcomes.store'):
+            stored = _store_outcomes(conn, ids, horizons, outcomes, now)
+
+        stats['rows'] += stored
+        stats['completed'] += int(outcomes['complete'][:, -1].sum())
+        stats['pairs'] += 1
+
+    conn.commit()
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+
+def _store_outcomes(conn, ids, horizons, outcomes, now):
+    """Upsert one pair's outcome matrices (NaN stored as NULL)"""
+
+    def column(name, cast):
+        values = outcomes[name].ravel().tolist()
+        return [None if value != value else cast(value) for value in values]
+
+    n_horizons = len(horizons)
+    rows = zip(
+        np.repeat(ids, n_horizons).tolist(),
+        np.tile(horizons, len(ids)).tolist(),
+        column('return_pct', float),
+        column('mfe_pct', float),
+        column('mae_pct', float),
+        column('bars_to_target', int),
+        column('bars_to_stop', int),
+        np.repeat(outcomes['bars_available'], n_horizons).tolist(),
+        outcomes['complete'].ravel().astype(int).tolist(),
+        [now] * (len(ids) * n_horizons)
+    )
+
+    cursor = conn.executemany('''
+        INSERT OR REPLACE INTO signal_outcomes (
+            signal_id, horizon, return_pct, mfe_pct, mae_pct,
+            bars_to_target, bars_to_stop, bars_available, complete, updated_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    return cursor.rowcount
+
+
+def summarize_outcomes(conn, group_by='confluence_class'):
+    """
+    Aggregate complete outcomes per group and horizon
+
+    Args:
+        conn (sqlite3.Connection): Database connection
+        group_by (str): 'confluence_class', 'system' or 'score' (0.5-wide score buckets)
+
+    Returns:
+        list: Dicts with group, horizon, signals, avg_return, win_rate,
+              avg_mfe, avg_mae, target_rate, stop_rate
+    """
+    group_expr = {
+        'confluence_class': "COALESCE(s.confluence_class, 'UNKNOWN')",
+        'system': "s.system",
+        'score': "printf('%.1f+', CAST(s.confluence_score * 2 AS INTEGER) / 2.0)"
+    }[group_by]
+
+    rows = conn.execute(f'''
+        SELECT {group_expr} AS grp, o.horizon,
+               COUNT(*),
+               AVG(o.return_pct),
+               AVG(CASE WHEN o.return_pct > 0 THEN 1.0 ELSE 0.0 END),
+               AVG(o.mfe_pct),
+               AVG(o.mae_pct),
+               AVG(CASE WHEN o.bars_to_target IS NOT NULL THEN 1.0 ELSE 0.0 END),
+               AVG(CASE WHEN o.bars_to_stop IS NOT NULL THEN 1.0 ELSE 0.0 END)
+        FROM signal_outcomes o
+        JOIN signals s ON s.id = o.signal_id
+        WHERE o.complete = 1
+        GROUP BY grp, o.horizon
+        ORDER BY grp, o.horizon
+    ''').fetchall()
+
+    keys = ['group', 'horizon', 'signals', 'avg_return', 'win_rate',
+            'avg_mfe', 'avg_mae', 'target_rate', 'stop_rate']
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def print_report(summary, settings):
+    """Print summarize_outcomes results as a table per group"""
+    if not summary:
+        print("\nℹ️  No completed outcomes yet")
+        return
+
+    print(f"\n📈 Signal Outcomes (target {settings['target_pct']}%, stop {settings['stop_pct']}%)")
+    print("="*86)
+
+    current_group = None
+    for row in summary:
+        if row['group'] != current_group:
+            current_group = row['group']
+            print(f"\n{current_group}")
+            print(f"  {'Bars':>5} {'Signals':>8} {'Avg ret':>9} {'Win rate':>9} "
+                  f"{'Avg MFE':>9} {'Avg MAE':>9} {'Target':>8} {'Stop':>8}")
+            print("  " + "-"*80)
+
+        print(f"  {row['horizon']:>5} {row['signals']:>8} {row['avg_return']:>8.2f}% "
+              f"{row['win_rate'] * 100:>8.1f}% {row['avg_mfe']:>8.2f}% {row['avg_mae']:>8.2f}% "
+              f"{row['target_rate'] * 100:>7.1f}% {row['stop_rate'] * 100:>7.1f}%")
+
+    print("="*86)
+
+
+def main():
+    """Update outcomes and print the report"""
+    parser = argparse.ArgumentParser(description="Label stored signals with their outcomes")
+    parser.add_argument('--rebuild', action='store_true', help="Recompute every signal")
+    parser.add_argument('--report', action='store_true', help="Only print the report")
+    parser.add_argument('--by', choices=['confluence_class', 'system', 'score'], default='confluence_class',
+                        help="Report grouping")
+    args = parser.parse_args()
+
+    print("🎯 Wind Catcher & River Turn - Signal Outcomes")
+    print("="*60)
+
+    settings = get_outcome_settings()
+    conn = connect_to_database()
+
+    try:
+        if not args.report:
+            stats = update_outcomes(conn, settings, rebuild=args.rebuild)
+            print(f"✅ Labelled {stats['signals']} signals across {stats['pairs']} pairs "
+                  f"({stats['rows']} rows, {stats['completed']} complete) in {stats['seconds']:.2f}s")
+        else:
+            create_outcomes_table(conn)
+
+        print_report(summarize_outcomes(conn, args.by), settings)
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
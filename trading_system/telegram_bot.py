@@ -3,7 +3,6 @@ Telegram Bot Module for Wind Catcher & River Turn
 Sends formatted trading signal alerts to Telegram
 """
 
-import requests
 from datetime import datetime
 from utils import load_config
 
@@ -58,6 +57,9 @@ class TelegramBot:
         if not self.enabled:
             return False
 
+        # Imported on first send so disabled bots never load requests
+        import requests
+
         url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
 
         payload = {
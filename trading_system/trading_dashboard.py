@@ -17,6 +17,7 @@ import sqlite3
 import yaml
 from datetime import datetime, timedelta
 import time
+from alignment_matrix import get_alignment_matrix
 
 def load_config():
     """Load configuration"""
@@ -288,46 +289,10 @@ def print_trading_recommendations(results):
     if not any([perfect_signals, good_signals, watch_signals]):
         print("✅ No immediate action required - continue monitoring")
 
-def analyze_multi_timeframe(conn, symbol, timeframes=['3m', '5m', '30m', '1h', '2h', '4h']):
-    """Analyze symbol across multiple timeframes"""
-    results = {}
-
-    for tf in timeframes:
-        df = get_price_data(conn, symbol, timeframe=tf, limit=100)
-        if df is None or len(df) < 50:
-            results[tf] = None
-            continue
-
-        # Calculate indicators
-        df['hull_21'] = calculate_hull_ma(df['close'], 21)
-
-        # Get latest values
-        latest = df.iloc[-1]
-        prev = df.iloc[-2] if len(df) > 1 else latest
-
-        # Hull signals
-        signal_type = None
-        if pd.notna(latest['hull_21']) and pd.notna(prev['hull_21']):
-            if latest['close'] > latest['hull_21'] and prev['close'] <= prev['hull_21']:
-                signal_type = 'BULLISH'
-            elif latest['close'] < latest['hull_21'] and prev['close'] >= prev['hull_21']:
-                signal_type = 'BEARISH'
-
-        # Current trend
-        trend = "BULLISH" if latest['close'] > latest['hull_21'] else "BEARISH"
-
-        results[tf] = {
-            'timeframe': tf,
-            'price': latest['close'],
-            'hull_21': latest['hull_21'],
-            'trend': trend,
-            'signal': signal_type
-        }
-
-    return results
-
-def print_multi_timeframe_overview(conn, symbols, timeframes=['3m', '5m', '30m', '1h', '2h', '4h']):
+def print_multi_timeframe_overview(matrix):
     """Print multi-timeframe overview for all symbols"""
+    timeframes = matrix['timeframes']
+
     print("\n📊 MULTI-TIMEFRAME OVERVIEW")
     print("="*80)
 
@@ -338,8 +303,8 @@ def print_multi_timeframe_overview(conn, symbols, timeframes=['3m', '5m', '30m',
     print(header)
     print("-"*80)
 
-    for symbol in symbols:
-        mtf_results = analyze_multi_timeframe(conn, symbol, timeframes)
+    for symbol in matrix['symbols']:
+        mtf_results = matrix['cells'][symbol]
 
         # Symbol row
         row = f"{symbol:<12}"
@@ -359,42 +324,27 @@ def print_multi_timeframe_overview(conn, symbols, timeframes=['3m', '5m', '30m',
 
     print("\nLegend: 🌪️=Bullish Signal | 🌊=Bearish Signal | 🟢=Bullish Trend | 🔴=Bearish Trend")
 
-def print_timeframe_alignment(conn, symbols, timeframes=['3m', '5m', '30m', '1h', '2h', '4h']):
+def print_timeframe_alignment(matrix):
     """Print symbols with multi-timeframe alignment"""
     print("\n🎯 TIMEFRAME ALIGNMENT (Confluence Across TFs)")
     print("="*80)
 
-    alignments = []
-
-    for symbol in symbols:
-        mtf_results = analyze_multi_timeframe(conn, symbol, timeframes)
-
-        bullish_count = sum(1 for tf in timeframes if mtf_results.get(tf) and mtf_results[tf]['trend'] == 'BULLISH')
-        bearish_count = sum(1 for tf in timeframes if mtf_results.get(tf) and mtf_results[tf]['trend'] == 'BEARISH')
-
-        if bullish_count >= 4:
-            alignments.append({
-                'symbol': symbol,
-                'direction': 'BULLISH',
-                'count': bullish_count,
-                'emoji': '🌪️'
-            })
-        elif bearish_count >= 4:
-            alignments.append({
-                'symbol': symbol,
-                'direction': 'BEARISH',
-                'count': bearish_count,
-                'emoji': '🌊'
-            })
+    alignments = matrix['alignments']
 
     if alignments:
         for align in alignments:
-            print(f"{align['emoji']} {align['symbol']:<12} {align['direction']:<7} - {align['count']}/{len(timeframes)} timeframes aligned")
+            emoji = '🌪️' if align['direction'] == 'BULLISH' else '🌊'
+            print(f"{emoji} {align['symbol']:<12} {align['direction']:<7} - {align['count']}/{len(matrix['timeframes'])} timeframes aligned")
     else:
         print("⚠️  No strong multi-timeframe alignment detected")
 
-def main():
-    """Main dashboard function"""
+def main(conn=None):
+    """
+    Main dashboard function
+
+    Args:
+        conn: Database connection to reuse (opened and closed here if None)
+    """
     current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
     # New timeframes for day trading
@@ -407,7 +357,9 @@ def main():
     print("="*80)
 
     # Connect to database
-    conn = connect_to_database()
+    owns_conn = conn is None
+    if owns_conn:
+        conn = connect_to_database()
 
     # Get watchlist
     cursor = conn.cursor()
@@ -425,11 +377,14 @@ def main():
     print(f"📈 Analyzing {len(normalized_watchlist)} symbols: {', '.join(normalized_watchlist)}")
     print("-"*80)
 
+    # Symbol x timeframe grid, computed once for both sections below
+    matrix = get_alignment_matrix(normalized_watchlist, TIMEFRAMES)
+
     # Multi-timeframe overview
-    print_multi_timeframe_overview(conn, normalized_watchlist, TIMEFRAMES)
+    print_multi_timeframe_overview(matrix)
 
     # Timeframe alignment
-    print_timeframe_alignment(conn, normalized_watchlist, TIMEFRAMES)
+    print_timeframe_alignment(matrix)
 
     # Analyze 1h timeframe for detailed signals (compatibility with old dashboard)
     results = []
@@ -454,7 +409,8 @@ def main():
     print("💡 Collecting data every 1 minute - optimized for day trading")
     print("="*80)
 
-    conn.close()
+    if owns_conn:
+        conn.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
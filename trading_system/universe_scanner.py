@@ -0,0 +1,398 @@
+"""
+Universe Scanner for Wind Catcher & River Turn
+Scores every Hyperliquid perp - not just the user_watchlists pairs - and ranks
+the top candidates by master confluence
+
+Candles for the whole universe are kept per timeframe as 2-D arrays
+(symbols x bars) on one shared time grid, stored in data/universe/<timeframe>.npz.
+Scoring runs vectorized_confluence once over the whole matrix, so every
+indicator is computed cross-sectionally for all symbols at once (only the AO
+pivot walk loops over symbols) and only the latest closed candle is scored.
+Scores are the same ones analyze_master_confluence gives that candle.
+
+Each run first refreshes the store: stored symbols only fetch the candles
+since their last bar, new listings fetch a full window. Fetching is bound by
+the API rate limit (system.max_api_calls_per_second); scoring ~150 symbols
+takes a fraction of a second.
+
+Usage:
+    python universe_scanner.py                      # refresh 1h and rank
+    python universe_scanner.py --timeframe 4h --top 30
+    python universe_scanner.py --no-fetch           # rank the stored candles only
+"""
+
+import sys
+import io
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from utils import (connect_to_database, load_config, log_message, get_current_timestamp,
+                   normalize_timestamp, timeframe_to_seconds, candle_open_time, format_timestamp,
+                   TRADING_SYSTEM_DIR)
+from metrics import span
+from market_context import store_market_context, price_move_pct
+from vectorized_confluence import (WINDOW, WIND, RIVER, CLASS_NAMES, compute_confluence,
+                                   classify_scores)
+
+DEFAULTS = {
+    'timeframes': ['1h'],
+    'bars': WINDOW,
+    'top_n': 20,
+    'min_score': 0.0,
+    'min_day_volume': 0.0,
+    'store': 'data/universe'
+}
+
+# OHLCV matrices kept per timeframe (symbols x bars)
+COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+SYSTEM_NAMES = {WIND: 'Wind Catcher', RIVER: 'River Turn', 0: '-'}
+
+
+def get_universe_settings(config=None):
+    """
+    Universe scan settings from config.yaml merged over the defaults
+
+    Returns:
+        dict: timeframes, bars (at least WINDOW), top_n, min_score, min_day_volume,
+              store (Path), calls_per_second
+    """
+    config = config if config is not None else load_config()
+    settings = dict(DEFAULTS)
+    settings.update(config.get('universe') or {})
+
+    settings['bars'] = max(int(settings['bars']), WINDOW)
+    settings['store'] = TRADING_SYSTEM_DIR / settings['store']
+    settings['calls_per_second'] = config.get('system', {}).get('max_api_calls_per_second', 5)
+    return settings
+
+
+# ----------------------------------------------------------------------------
+# Candle store
+# ----------------------------------------------------------------------------
+
+def grid_end(timeframe, now):
+    """Open time of the latest closed candle"""
+    return candle_open_time(timeframe, now) - timeframe_to_seconds(timeframe)
+
+
+def empty_store(timeframe, bars, end):
+    """Store with no symbols whose grid ends at `end`"""
+    length = timeframe_to_seconds(timeframe)
+    store = {
+        'timeframe': timeframe,
+        'timestamps': end - np.arange(bars - 1, -1, -1, dtype=np.int64) * length,
+        'symbols': []
+    }
+    for column in COLUMNS:
+        store[column] = np.empty((0, bars))
+    return store
+
+
+def load_store(path, timeframe):
+    """
+    Load a timeframe's store
+
+    Returns:
+        dict: timeframe, timestamps (bars,), symbols (list), open/high/low/close/volume
+              (symbols x bars, NaN where a candle is missing) - None if not stored yet
+    """
+    if not path.exists():
+        return None
+
+    with np.load(path) as data:
+        store = {column: data[column] for column in COLUMNS}
+        store['timestamps'] = data['timestamps']
+        store['symbols'] = data['symbols'].tolist()
+    store['timeframe'] = timeframe
+    return store
+
+
+def save_store(store, path):
+    """Write the store (to a temp file first, so readers never see half a file)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix('.tmp')
+    with open(temp_path, 'wb') as handle:
+        np.savez(handle, timestamps=store['timestamps'], symbols=np.array(store['symbols'], dtype=str),
+                 **{column: store[column] for column in COLUMNS})
+    os.replace(temp_path, path)
+
+
+def align_store(store, symbols, end, bars):
+    """
+    The store moved onto a grid of `bars` candles ending at `end`, with one row per symbol
+
+    Candles still on the new grid are kept, symbols no longer listed are
+    dropped and new symbols get empty (NaN) rows.
+    """
+    aligned = empty_store(store['timeframe'], bars, end)
+    aligned['symbols'] = list(symbols)
+    for column in COLUMNS:
+        aligned[column] = np.full((len(symbols), bars), np.nan)
+
+    old_rows = {symbol: row for row, symbol in enumerate(store['symbols'])}
+    keep = [(row, old_rows[symbol]) for row, symbol in enumerate(symbols) if symbol in old_rows]
+    new_columns = np.searchsorted(aligned['timestamps'], store['timestamps'])
+    on_grid = ((new_columns < bars) &
+               (aligned['timestamps'][np.minimum(new_columns, bars - 1)] == store['timestamps']))
+
+    if keep and on_grid.any():
+        new_rows, old_rows = (np.array(rows) for rows in zip(*keep))
+        for column in COLUMNS:
+            aligned[column][np.ix_(new_rows, new_columns[on_grid])] = store[column][np.ix_(old_rows, np.flatnonzero(on_grid))]
+
+    return aligned
+
+
+def missing_candles(store, row):
+    """Candles after the symbol's last stored one (the whole grid if it has none)"""
+    stored = np.flatnonzero(~np.isnan(store['close'][row]))
+    return len(store['timestamps']) - (stored[-1] + 1 if len(stored) else 0)
+
+
+def merge_candles(store, row, candles):
+    """
+    Write fetched candles into a symbol's row
+
+    Args:
+        store (dict): Aligned store
+        row (int): Symbol's row
+        candles (list): [[timestamp, open, high, low, close, volume], ...] from fetch_ohlcv
+
+    Returns:
+        int: Candles that landed on the grid (the forming candle never does)
+    """
+    if not candles:
+        return 0
+
+    data = np.array(candles, dtype=float)
+    timestamps = np.array([normalize_timestamp(candle[0]) for candle in candles], dtype=np.int64)
+    columns = np.searchsorted(store['timestamps'], timestamps)
+    on_grid = columns < len(store['timestamps'])
+    on_grid[on_grid] = store['timestamps'][columns[on_grid]] == timestamps[on_grid]
+
+    for index, column in enumerate(COLUMNS, start=1):
+        store[column][row, columns[on_grid]] = data[on_grid, index]
+    return int(on_grid.sum())
+
+
+def refresh_store(connector, store, calls_per_second=5):
+    """
+    Fetch what every symbol in the store is missing
+
+    Returns:
+        dict: fetched (symbols), candles, failed (symbol list), seconds
+    """
+    started = time.perf_counter()
+    stats = {'fetched': 0, 'candles': 0, 'failed': [], 'seconds': 0.0}
+    delay = 1.0 / calls_per_second if calls_per_second else 0.0
+
+    for row, symbol in enumerate(store['symbols']):
+        missing = missing_candles(store, row)
+        if missing == 0:
+            continue
+
+        # One extra candle for the forming one, which is dropped
+        candles = connector.fetch_ohlcv(symbol, store['timeframe'], limit=missing + 1)
+        if not candles:
+            stats['failed'].append(symbol)
+        else:
+            stats['fetched'] += 1
+            stats['candles'] += merge_candles(store, row, candles)
+        time.sleep(delay)
+
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+
+# ----------------------------------------------------------------------------
+# Scoring
+# ----------------------------------------------------------------------------
+
+def score_universe(store, params=None):
+    """
+    Master confluence of the latest closed candle for every symbol with a full window
+
+    Args:
+        store (dict): Aligned store (see load_store)
+        params (dict): Overrides for vectorized_confluence.DEFAULT_PARAMS
+
+    Returns:
+        list: One dict per scored symbol (symbol, score, class, system, close,
+              volume_ratio), highest score first
+    """
+    timestamps = store['timestamps'][-WINDOW:]
+    if len(timestamps) < WINDOW:
+        return []
+
+    window = {column: store[column][:, -WINDOW:] for column in COLUMNS}
+    complete = np.flatnonzero(~np.isnan(np.stack(list(window.values()))).any(axis=(0, 2)))
+    if len(complete) == 0:
+        return []
+
+    with span('universe.score'):
+        result = compute_confluence(timestamps, *(window[column][complete] for column in ('high', 'low', 'close', 'volume')),
+                                    params=params, start=WINDOW - 1)
+
+    score = result['score'][:, -1]
+    system = result['system'][:, -1]
+    classes = classify_scores(score)
+    rankings = [{
+        'symbol': store['symbols'][row],
+        'score': float(score[index]),
+        'class': CLASS_NAMES[classes[index]] if classes[index] < len(CLASS_NAMES) else 'WEAK',
+        'system': int(system[index]),
+        'close': float(window['close'][row, -1]),
+        'volume_ratio': float(result['volume_ratio'][index, -1])
+    } for index, row in enumerate(complete)]
+
+    rankings.sort(key=lambda ranking: ranking['score'], reverse=True)
+    return rankings
+
+
+def scan_timeframe(connector, timeframe, settings, markets=None, now=None, fetch=True):
+    """
+    Refresh one timeframe's store and rank the universe
+
+    Args:
+        connector (HyperliquidConnector): Exchange connector (unused when fetch is False)
+        timeframe (str): Timeframe to scan
+        settings (dict): From get_universe_settings
+        markets (list): Symbols to keep in the store (default: the stored ones)
+        now (int): Current time (for tests)
+        fetch (bool): Fetch missing candles before scoring
+
+    Returns:
+        dict: rankings, symbols, scored, refresh (refresh_store stats or None),
+              candle (open time of the scored candle), score_seconds
+    """
+    now = now or get_current_timestamp()
+    path = settings['store'] / f"{timeframe}.npz"
+    store = load_store(path, timeframe) or empty_store(timeframe, settings['bars'], grid_end(timeframe, now))
+    store = align_store(store, markets if markets is not None else store['symbols'],
+                        grid_end(timeframe, now), settings['bars'])
+
+    refresh = None
+    if fetch:
+        refresh = refresh_store(connector, store, settings['calls_per_second'])
+        save_store(store, path)
+
+    started = time.perf_counter()
+    rankings = score_universe(store)
+    score_seconds = time.perf_counter() - started
+
+    return {
+        'rankings': rankings,
+        'symbols': len(store['symbols']),
+        'scored': len(rankings),
+        'refresh': refresh,
+        'candle': int(store['timestamps'][-1]),
+        'score_seconds': score_seconds
+    }
+
+
+def print_rankings(timeframe, result, top_n, min_score=0.0):
+    """Print the top candidates of one timeframe scan"""
+    print(f"\n🌐 Universe {timeframe} - candle {format_timestamp(result['candle'])}")
+    print("="*80)
+
+    refresh = result['refresh']
+    if refresh:
+        print(f"📥 Refreshed {refresh['fetched']} symbols ({refresh['candles']:,} candles) in {refresh['seconds']:.1f}s")
+        if refresh['failed']:
+            print(f"⚠️  No data for {len(refresh['failed'])} symbols: {', '.join(refresh['failed'][:10])}"
+                  f"{' ...' if len(refresh['failed']) > 10 else ''}")
+    print(f"⏱️  Scored {result['scored']} of {result['symbols']} symbols in {result['score_seconds'] * 1000:.0f} ms")
+
+    candidates = [ranking for ranking in result['rankings'] if ranking['score'] >= min_score][:top_n]
+    if not candidates:
+        print("\nNo candidates")
+        print("="*80)
+        return
+
+    print(f"\n{'#':>3}  {'Symbol':12} {'Score':>6}  {'Class':11} {'System':13} {'Close':>14} {'Volume':>7}")
+    print("-"*80)
+    for rank, ranking in enumerate(candidates, start=1):
+        print(f"{rank:>3}  {ranking['symbol']:12} {ranking['score']:>6.2f}  {ranking['class']:11} "
+              f"{SYSTEM_NAMES[ranking['system']]:13} {ranking['close']:>14.6g} {ranking['volume_ratio']:>6.2f}x")
+    print("="*80)
+
+
+def select_markets(connector, min_day_volume=0.0):
+    """
+    Markets to scan, from one market context snapshot (also stored for the collector)
+
+    Markets under min_day_volume (24h notional) are left out; the rest are
+    ordered by how far their mark price moved over the day, so the movers'
+    candles are fetched first.
+
+    Returns:
+        list: Market names (empty if the snapshot failed)
+    """
+    contexts = connector.fetch_market_context()
+    if not contexts:
+        return []
+
+    conn = connect_to_database()
+    try:
+        store_market_context(conn, contexts, get_current_timestamp())
+    finally:
+        conn.close()
+
+    liquid = [context for context in contexts if context['day_volume'] >= min_day_volume]
+    liquid.sort(key=lambda context: price_move_pct(context, context['prev_day_price']), reverse=True)
+    return [context['symbol'] for context in liquid]
+
+
+def main():
+    """Refresh the universe stores and print the top candidates"""
+    parser = argparse.ArgumentParser(description="Rank every Hyperliquid perp by master confluence")
+    parser.add_argument('--timeframe', action='append', help="Timeframe to scan (repeatable, default from config)")
+    parser.add_argument('--top', type=int, help="Candidates to show")
+    parser.add_argument('--min-score', type=float, help="Only show candidates with at least this score")
+    parser.add_argument('--no-fetch', action='store_true', help="Rank the stored candles without fetching")
+    args = parser.parse_args()
+
+    print("🌐 Wind Catcher & River Turn - Universe Scanner")
+    print("="*60)
+
+    config = load_config()
+    settings = get_universe_settings(config)
+    timeframes = args.timeframe or settings['timeframes']
+    top_n = args.top or settings['top_n']
+    min_score = args.min_score if args.min_score is not None else settings['min_score']
+
+    connector = None
+    markets = None
+    if not args.no_fetch:
+        from hyperliquid_connector import connect_to_hyperliquid
+        connector = connect_to_hyperliquid(use_testnet=config['exchange'].get('use_testnet', False))
+        if connector is None:
+            print("❌ Could not connect to Hyperliquid")
+            return
+        markets = select_markets(connector, settings['min_day_volume'])
+        if not markets:
+            print("❌ No markets returned by Hyperliquid")
+            return
+        print(f"📋 {len(markets)} markets")
+
+    for timeframe in timeframes:
+        result = scan_timeframe(connector, timeframe, settings, markets=markets, fetch=not args.no_fetch)
+        print_rankings(timeframe, result, top_n, min_score)
+
+        if result['rankings']:
+            best = result['rankings'][0]
+            log_message(f"🌐 Universe {timeframe}: {result['scored']} symbols scored, "
+                        f"top {best['symbol']} {best['score']:.2f}", "INFO")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,9 +35,11 @@ def update_timeframes():
 
         print(f"\nFound {price_data_count} price_data entries with 8h timeframe")
 
-        # Update price_data
+        # Update price_data - counted from what's left, since an UPDATE through the
+        # migrated price_data view (database_migration_v4.py) leaves rowcount at 0
         cursor.execute("UPDATE price_data SET timeframe = '12h' WHERE timeframe = '8h'")
-        price_data_updated = cursor.rowcount
+        cursor.execute("SELECT COUNT(*) FROM price_data WHERE timeframe = '8h'")
+        price_data_updated = price_data_count - cursor.fetchone()[0]
 
         conn.commit()
 
@@ -6,7 +6,6 @@ Handles paths, configuration, database connections, and common operations
 import os
 import sys
 import sqlite3
-import yaml
 from pathlib import Path
 from datetime import datetime
 
@@ -50,6 +49,9 @@ def load_config():
             f"Please create config/config.yaml in the trading_system directory."
         )
 
+    # Imported here so scripts that never read the config don't pay for yaml
+    import yaml
+
     try:
         with open(CONFIG_FILE, 'r', encoding='utf-8') as file:
             config = yaml.safe_load(file)
@@ -149,6 +151,94 @@ def connect_to_database():
         raise sqlite3.Error(f"Failed to connect to database: {e}")
 
 
+def update_pair_freshness(cursor, symbol, timeframe, last_timestamp):
+    """
+    Record the newest stored candle for a symbol/timeframe pair
+
+    Keeps the pair_freshness table (database_migration_v3.py) current so the
+    dashboard never has to scan price_data for its "last update" time.
+    Does nothing on databases that haven't been migrated yet.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor inside the collector's write transaction
+        symbol (str): Trading pair symbol
+        timeframe (str): Candle timeframe
+        last_timestamp (int): Newest candle timestamp just written (seconds)
+    """
+    try:
+        cursor.execute('''
+            INSERT INTO pair_freshness (symbol, timeframe, last_timestamp, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(symbol, timeframe) DO UPDATE SET
+                last_timestamp = MAX(last_timestamp, excluded.last_timestamp),
+                updated_at = excluded.updated_at
+        ''', (symbol, timeframe, last_timestamp, get_current_timestamp()))
+    except sqlite3.OperationalError:
+        # pair_freshness table not created yet
+        pass
+
+
+def has_clustered_price_data(conn):
+    """
+    True when candles live in the clustered price_candles table (database_migration_v4.py)
+
+    Before the migration price_data is a plain table; afterwards it's a view.
+
+    Args:
+        conn (sqlite3.Connection or sqlite3.Cursor): Database connection
+    """
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = 'price_data'").fetchone()
+    return row is not None and row[0] == 'view'
+
+
+def get_series_ids(cursor, symbol, timeframe):
+    """
+    Dictionary ids of a symbol and timeframe, adding them if they're new
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor on a migrated database
+        symbol (str): Trading pair symbol
+        timeframe (str): Candle timeframe
+
+    Returns:
+        tuple: (symbol_id, timeframe_id)
+    """
+    cursor.execute("INSERT OR IGNORE INTO symbols (symbol) VALUES (?)", (symbol,))
+    cursor.execute("INSERT OR IGNORE INTO timeframes (timeframe) VALUES (?)", (timeframe,))
+    symbol_id = cursor.execute("SELECT id FROM symbols WHERE symbol = ?", (symbol,)).fetchone()[0]
+    timeframe_id = cursor.execute("SELECT id FROM timeframes WHERE timeframe = ?", (timeframe,)).fetchone()[0]
+    return symbol_id, timeframe_id
+
+
+def store_candles(cursor, symbol, timeframe, candles, created_at):
+    """
+    Insert or replace one pair's candles
+
+    On migrated databases the rows go straight into price_candles with the
+    pair's ids looked up once, skipping the per-row price_data view trigger.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor inside the collector's write transaction
+        symbol (str): Trading pair symbol
+        timeframe (str): Candle timeframe
+        candles (list): (timestamp, open, high, low, close, volume) tuples, timestamps in seconds
+        created_at (int): Write time stored with every candle
+    """
+    if has_clustered_price_data(cursor):
+        symbol_id, timeframe_id = get_series_ids(cursor, symbol, timeframe)
+        cursor.executemany('''
+            INSERT OR REPLACE INTO price_candles
+            (symbol_id, timeframe_id, timestamp, open, high, low, close, volume, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(symbol_id, timeframe_id, *candle, created_at) for candle in candles])
+    else:
+        cursor.executemany('''
+            INSERT OR REPLACE INTO price_data
+            (symbol, timeframe, timestamp, open, high, low, close, volume, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(symbol, timeframe, *candle, created_at) for candle in candles])
+
+
 def validate_ohlcv_data(candle):
     """
     Validate OHLCV candle data from exchange
@@ -229,6 +319,83 @@ def get_current_timestamp():
     return int(datetime.now().timestamp())
 
 
+def timeframe_to_seconds(timeframe):
+    """
+    Convert a timeframe string to its candle length in seconds
+
+    Args:
+        timeframe (str): Timeframe such as '3m', '1h', '12h', '1d', '1w'
+
+    Returns:
+        int: Candle length in seconds
+
+    Raises:
+        ValueError: If the timeframe can't be parsed
+    """
+    units = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+    try:
+        amount = int(timeframe[:-1])
+        unit = units[timeframe[-1]]
+    except (ValueError, KeyError, IndexError):
+        raise ValueError(f"Invalid timeframe: {timeframe}")
+
+    if amount <= 0:
+        raise ValueError(f"Invalid timeframe: {timeframe}")
+
+    return amount * unit
+
+
+def next_candle_close(timeframe, now=None):
+    """
+    Get the time the currently forming candle closes
+
+    Candles are aligned to UTC multiples of their length (weekly candles
+    start on Monday 00:00 UTC), matching Hyperliquid's candle boundaries.
+
+    Args:
+        timeframe (str): Timeframe such as '15m' or '4h'
+        now (int): Unix timestamp in seconds (defaults to the current time)
+
+    Returns:
+        int: Unix timestamp in seconds of the next candle close
+    """
+    if now is None:
+        now = get_current_timestamp()
+
+    return candle_open_time(timeframe, now) + timeframe_to_seconds(timeframe)
+
+
+def candle_offset(timeframe):
+    """
+    Seconds a timeframe's candle boundaries are shifted from multiples of its length
+
+    Args:
+        timeframe (str): Timeframe such as '15m' or '1w'
+
+    Returns:
+        int: 0, or 4 days for weekly candles
+    """
+    # The Unix epoch is a Thursday; shift weekly candles to start on Monday
+    return 4 * 86400 if timeframe.endswith('w') else 0
+
+
+def candle_open_time(timeframe, timestamp):
+    """
+    Get the open time of the candle containing a timestamp
+
+    Args:
+        timeframe (str): Timeframe such as '15m' or '4h'
+        timestamp (int): Unix timestamp in seconds
+
+    Returns:
+        int: Unix timestamp in seconds of the candle open
+    """
+    length = timeframe_to_seconds(timeframe)
+    offset = candle_offset(timeframe)
+    return int((timestamp - offset) // length) * length + offset
+
+
 def format_timestamp(timestamp, format_str='%Y-%m-%d %H:%M:%S'):
     """
     Format Unix timestamp to readable string
@@ -245,24 +412,28 @@ def format_timestamp(timestamp, format_str='%Y-%m-%d %H:%M:%S'):
 
 def log_message(message, level='INFO'):
     """
-    Log message to alerts.log file with proper encoding
+    Log message to alerts.log (and logs/system.jsonl) and print it
+
+    The file write happens on the logging subsystem's background thread
+    (see logging_config.py), so callers never wait on disk. Messages below
+    the calling module's configured level are dropped.
 
     Args:
         message (str): Message to log
         level (str): Log level (INFO, WARNING, ERROR, SUCCESS)
     """
-    ensure_directories()
+    from logging_config import get_logger, level_number
 
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    log_entry = f"[{timestamp}] {level}: {message}\n"
+    # Log under the calling module so per-module levels apply
+    logger = get_logger(sys._getframe(1).f_globals.get('__name__', 'utils'))
+    levelno = level_number(level)
+    if not logger.isEnabledFor(levelno):
+        return
 
-    try:
-        with open(ALERTS_LOG, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
-    except Exception as e:
-        print(f"Failed to write to log file: {e}")
+    logger.log(levelno, message)
 
     # Also print to console
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     print(f"{timestamp} - {message}")
 
 
@@ -276,6 +447,3 @@ def get_python_executable():
     """
     return sys.executable
 
-
-# Initialize directories on import
-ensure_directories()
@@ -0,0 +1,682 @@
+"""
+Whole-History Confluence Scoring for Wind Catcher & River Turn
+Computes the master confluence score for every bar of a candle series at once,
+with the indicator settings and thresholds as parameters instead of constants
+
+analyze_master_confluence() scores one bar (the latest) from a 200-candle
+window. This module reproduces the same rules for every bar t as if the
+window ended at t, using NumPy over whole arrays (plus short loops over
+pivot and cross events), so a parameter set can be evaluated over months of
+history in milliseconds:
+
+- Hull: first close through the fast Hull, and first retest after a fast/slow cross
+- AO: regular divergences between the last price and AO pivots
+- Alligator: red-blue zone entries and blue line contacts in the last 10 hours
+- Ichimoku: retests of a newly coloured cloud and Kijun-sen touches
+- Volume: ratio to the 120-candle baseline, with the confirmation bonus
+
+Scores and primary systems match analyze_master_confluence bar for bar
+(the only blind spot is the first 199 bars, which never have a full window).
+"""
+
+from bisect import bisect_left
+
+import numpy as np
+
+from alignment_matrix import calculate_hull_ma_values
+
+# Current hard-coded settings of the live analyzers
+DEFAULT_PARAMS = {
+    'hull_fast': 21,
+    'hull_slow': 34,
+    'alligator_multiplier': 10,
+    'ichimoku': (20, 60, 120, 30),           # conversion, base, lead span B, displacement
+    'volume_ratios': (1.5, 2.0, 3.0),        # WARMING, HOT, CLIMAX
+    'min_score': 1.2                         # confluence.min_score_display
+}
+
+# calculate_master_confluence classes (anything lower is WEAK)
+CLASS_CUTOFFS = (3.0, 2.5, 1.8, 1.2, 0.8)
+CLASS_NAMES = ('PERFECT', 'EXCELLENT', 'VERY GOOD', 'GOOD', 'INTERESTING')
+
+# Analyzer window (get_price_data limit) - bars before this can't be scored
+WINDOW = 200
+
+WIND = 1
+RIVER = -1
+
+
+def resolve_params(params=None):
+    """DEFAULT_PARAMS updated with the given overrides"""
+    resolved = dict(DEFAULT_PARAMS)
+    resolved.update(params or {})
+    return resolved
+
+
+# ----------------------------------------------------------------------------
+# Array helpers
+# ----------------------------------------------------------------------------
+
+def _cumsum(values):
+    """Cumulative sum along the bar axis with a leading 0"""
+    zeros = np.zeros(np.shape(values)[:-1] + (1,))
+    return np.concatenate((zeros, np.cumsum(values, axis=-1, dtype=float)), axis=-1)
+
+
+def _rows(func, *arrays):
+    """func(*series) for one series, or stacked over the rows of symbols x bars arrays"""
+    if np.ndim(arrays[0]) == 1:
+        return func(*arrays)
+    return np.stack([func(*row) for row in zip(*arrays)])
+
+
+def _at(values, rows, bars):
+    """values at (row, bar) pairs - rows are ignored for a single series"""
+    return values[bars] if values.ndim == 1 else values[rows, bars]
+
+
+def _events(mask):
+    """(rows, bars) where a bars or symbols x bars mask is set (rows are 0 for a single series)"""
+    if mask.ndim == 1:
+        bars = np.flatnonzero(mask)
+        return np.zeros_like(bars), bars
+    return np.nonzero(mask)
+
+
+def rolling_mean(values, period):
+    """Simple moving average, NaN until `period` values are available"""
+    result = np.full(np.shape(values), np.nan)
+    if period <= 0 or np.shape(values)[-1] < period:
+        return result
+    cumsum = _cumsum(values)
+    result[..., period - 1:] = (cumsum[..., period:] - cumsum[..., :-period]) / period
+    return result
+
+
+def _rolling_extreme(values, period, func):
+    """Rolling max/min over `period` values, NaN until the window is full"""
+    result = np.full(np.shape(values), np.nan)
+    if period <= 0 or np.shape(values)[-1] < period:
+        return result
+    windows = np.lib.stride_tricks.sliding_window_view(values, period, axis=-1)
+    result[..., period - 1:] = func(windows, axis=-1)
+    return result
+
+
+def window_sum(values, lo, hi):
+    """
+    Sum of values[lo[t]..hi[t]] (inclusive) for every t
+
+    Args:
+        values (np.ndarray): Per-bar values (bars, or symbols x bars)
+        lo, hi (np.ndarray): Inclusive bounds per bar (empty when lo > hi)
+    """
+    n = np.shape(values)[-1]
+    cumsum = _cumsum(values)
+    lo = np.clip(lo, 0, n)
+    hi = np.clip(hi + 1, 0, n)
+    return np.where(hi > lo, cumsum[..., hi] - cumsum[..., np.minimum(lo, hi)], 0.0)
+
+
+def add_ranges(target, starts, ends, amounts, rows=None):
+    """
+    Add amounts[k] to target[starts[k]..ends[k]] (inclusive) for every k
+
+    rows gives each range's row when target is symbols x bars.
+    """
+    keep = ends >= starts
+    if not keep.any():
+        return
+    diff = np.zeros(target.shape[:-1] + (target.shape[-1] + 1,))
+    index = (rows[keep],) if target.ndim > 1 else ()
+    np.add.at(diff, index + (starts[keep],), amounts[keep])
+    np.add.at(diff, index + (ends[keep] + 1,), -amounts[keep])
+    target += np.cumsum(diff[..., :-1], axis=-1)
+
+
+def last_bar_within(timestamps, anchors, seconds):
+    """Index of the last bar whose timestamp is <= timestamps[anchor] + seconds"""
+    return np.searchsorted(timestamps, timestamps[anchors] + seconds, side='right') - 1
+
+
+def first_bar_within(timestamps, seconds):
+    """For every t, the first bar with timestamps[t] - timestamp <= seconds"""
+    return np.searchsorted(timestamps, timestamps - seconds, side='left')
+
+
+def first_fresh_ranges(timestamps, events, candidates, hits, max_age, min_delay, lookback):
+    """
+    Bars at which each event's first still-fresh hit counts
+
+    The live analyzers scan the bars after an event (a cross, a cloud colour
+    change) and keep the first hit that is at most `max_age` seconds old. A
+    later hit takes over at bar t once the earlier ones have aged out.
+
+    Args:
+        timestamps (np.ndarray): Candle timestamps
+        events (np.ndarray): Event bar per row
+        candidates (np.ndarray): Bars scanned after each event (rows x scan length)
+        hits (np.ndarray): Which candidates are hits (same shape)
+        max_age (int): Maximum hit age in seconds
+        min_delay (int): Bars before an event is old enough to be checked
+        lookback (int): Bars an event stays in the checked window
+
+    Returns:
+        tuple: (starts, ends) bar ranges, same shape as candidates
+    """
+    n = len(timestamps)
+    expires = last_bar_within(timestamps, candidates, max_age)
+
+    previous_expiry = np.full(len(events), -1)
+    starts = np.zeros_like(candidates)
+    for k in range(candidates.shape[1]):
+        starts[:, k] = np.maximum(candidates[:, k], previous_expiry + 1)
+        previous_expiry = np.where(hits[:, k], expires[:, k], previous_expiry)
+
+    starts = np.maximum(starts, events[:, None] + min_delay)
+    ends = np.minimum(np.minimum(expires, events[:, None] + lookback - 1), n - 1)
+    return starts, ends
+
+
+def expand_ranges(starts, ends):
+    """
+    Every bar covered by a set of inclusive ranges
+
+    Returns:
+        tuple: (bars, owner) - covered bar and the index of its range
+    """
+    lengths = np.maximum(ends - starts + 1, 0)
+    owner = np.repeat(np.arange(len(starts)), lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + offsets, owner
+
+
+class ScoreParts:
+    """Per-bar strength and primary system for one indicator (bars, or symbols x bars)"""
+
+    def __init__(self, shape):
+        self.score = np.zeros(shape)
+        self.system = np.zeros(shape, dtype=int)
+
+    def claim(self, mask, system):
+        """
+        Set the system where nothing has claimed the bar yet
+
+        Claims must be made in the order the live analyzer lists its signals,
+        since calculate_master_confluence takes the system of the first one.
+        """
+        free = mask & (self.system == 0)
+        self.system[free] = system[free] if np.ndim(system) else system
+
+    def claim_ranges(self, rows, starts, ends, systems):
+        """
+        claim() for bar ranges given in signal order (earlier ranges win)
+
+        rows gives each range's row (ignored for a single series).
+        """
+        if len(starts) == 0:
+            return
+        # Ranges never cross a row end, so rows can be handled as one flat series
+        offset = rows * self.system.shape[-1]
+        bars, owner = expand_ranges(starts + offset, ends + offset)
+        first = np.full(self.system.size, len(starts))
+        np.minimum.at(first, bars, owner)
+        claimed = first < len(starts)
+        systems = systems[np.minimum(first, len(starts) - 1)]
+        self.claim(claimed.reshape(self.system.shape), systems.reshape(self.system.shape))
+
+
+# ----------------------------------------------------------------------------
+# Indicators
+# ----------------------------------------------------------------------------
+
+def hull_scores(timestamps, high, low, close, fast=21, slow=34, lookback=20):
+    """
+    Hull break (0.7) and cross retest (0.8 slow line / 0.6 fast line) strength per bar
+
+    Matches enhanced_hull_analyzer.detect_hull_breaks and detect_hull_cross_retests.
+    """
+    n = np.shape(close)[-1]
+    parts = ScoreParts(np.shape(close))
+    hull_fast = _rows(lambda values: calculate_hull_ma_values(values, fast), close)
+    hull_slow = _rows(lambda values: calculate_hull_ma_values(values, slow), close)
+
+    # Break: first close through the fast Hull
+    prev_close, prev_fast = np.roll(close, 1, axis=-1), np.roll(hull_fast, 1, axis=-1)
+    bullish = (close > hull_fast) & (prev_close <= prev_fast)
+    bearish = (close < hull_fast) & (prev_close >= prev_fast)
+    bullish[..., 0] = bearish[..., 0] = False
+    parts.score += (bullish | bearish) * 0.7
+    parts.claim(bullish, WIND)
+    parts.claim(bearish, RIVER)
+
+    # Crosses of the fast and slow Hull
+    prev_slow = np.roll(hull_slow, 1, axis=-1)
+    cross_up = (hull_fast > hull_slow) & (prev_fast <= prev_slow)
+    cross_down = (hull_fast < hull_slow) & (prev_fast >= prev_slow)
+    cross_up[..., 0] = cross_down[..., 0] = False
+
+    rows, crosses = _events(cross_up | cross_down)
+    if len(crosses) == 0:
+        return parts
+
+    # Retests in the 14 bars after each cross
+    candidates = crosses[:, None] + np.arange(1, 15)[None, :]
+    in_range = candidates < n
+    candidates = np.minimum(candidates, n - 1)
+    is_up = _at(cross_up, rows, crosses)[:, None]
+    rows = np.broadcast_to(rows[:, None], candidates.shape)
+
+    c_close, c_high, c_low = (_at(values, rows, candidates) for values in (close, high, low))
+    c_fast, c_slow = _at(hull_fast, rows, candidates), _at(hull_slow, rows, candidates)
+    holds_slow = np.where(is_up, c_close >= c_slow, c_close <= c_slow)
+    holds_fast = np.where(is_up, c_close >= c_fast, c_close <= c_fast)
+    slow_retest = (c_low <= c_slow) & (c_slow <= c_high) & holds_slow & in_range
+    fast_retest = (c_low <= c_fast) & (c_fast <= c_high) & holds_fast & in_range
+
+    # Each cross counts its first retest <= 12h old while it is 5-19 bars old
+    retest = slow_retest | fast_retest
+    strength = np.where(slow_retest, 0.8, 0.6)
+    starts, ends = first_fresh_ranges(timestamps, crosses, candidates, retest, 12 * 3600, 5, lookback)
+
+    systems = np.where(is_up, WIND, RIVER) * np.ones_like(candidates)
+    add_ranges(parts.score, starts[retest], ends[retest], strength[retest], rows[retest])
+    parts.claim_ranges(rows[retest], starts[retest], ends[retest], systems[retest])
+
+    return parts
+
+
+def _pivot_candidates(values, order, highs):
+    """
+    Pivot highs (or lows) as the live 200-candle window sees them at each bar
+
+    argrelextrema clips its comparisons at the window edge, so a bar already
+    counts as a pivot while fewer than `order` bars follow it, and drops out
+    again if a later bar breaks it.
+
+    Returns:
+        tuple: (confirmed, unconfirmed, run) - pivot masks and the bars after
+               each candidate that it still beats, all shaped like values
+    """
+    shape = np.shape(values)
+    n = shape[-1]
+    compare = np.greater if highs else np.less
+    candidate = np.ones(shape, dtype=bool)
+    for shift in range(1, order + 1):
+        before = np.concatenate((np.full(shape[:-1] + (shift,), np.nan), values[..., :-shift]), axis=-1)
+        candidate &= compare(values, before)
+
+    # Bars after the candidate that it still beats (up to `order`)
+    run = np.zeros(shape, dtype=int)
+    beaten = np.ones(shape, dtype=bool)
+    for shift in range(1, order + 1):
+        after = np.concatenate((values[..., shift:], np.full(shape[:-1] + (shift,), np.nan)), axis=-1)
+        beaten &= compare(values, after) | np.isnan(after)
+        run += beaten
+
+    confirmed = candidate & (run == order) & (np.arange(n) + order < n)
+    unconfirmed = candidate & ~confirmed & (run > 0)
+    return confirmed, unconfirmed, run
+
+
+def _pivot_bars(confirmed, unconfirmed, run):
+    """
+    One series' pivots from _pivot_candidates masks
+
+    Returns:
+        tuple: (confirmed pivot bars, unconfirmed pivot bars, last bar each
+                unconfirmed pivot is seen)
+    """
+    n = len(run)
+    pending = np.flatnonzero(unconfirmed)
+    return np.flatnonzero(confirmed), pending, pending + np.minimum(run[pending], n - 1 - pending)
+
+
+def _pivots_at(bar, pivots, order):
+    """The last 3 pivots seen at a bar (pivots as lists from _pivot_bars)"""
+    confirmed, pending, pending_until = pivots
+    end = bisect_left(confirmed, bar)
+    seen = confirmed[max(0, end - 3):end]
+    lo, hi = bisect_left(pending, bar - order), bisect_left(pending, bar)
+    recent = [k for k, until in zip(pending[lo:hi], pending_until[lo:hi]) if until >= bar]
+    if recent:
+        seen = sorted(seen + recent)
+    return seen[-3:]
+
+
+def _divergences(price, oscillator, price_pivots, osc_pivots, bullish):
+    """Number of regular divergences among the last 3 price/oscillator pivots"""
+    count = 0
+
+    for i in range(1, len(price_pivots)):
+        p1, p2 = price_pivots[i - 1], price_pivots[i]
+        o1 = o2 = None
+        for pivot in osc_pivots:
+            if abs(pivot - p1) <= 5:
+                o1 = pivot
+            if abs(pivot - p2) <= 5:
+                o2 = pivot
+        if o1 is None or o2 is None:
+            continue
+
+        if bullish and price[p2] < price[p1] and oscillator[o2] > oscillator[o1]:
+            count += 1
+        elif not bullish and price[p2] > price[p1] and oscillator[o2] < oscillator[o1]:
+            count += 1
+
+    return count
+
+
+def _divergence_counts(price, ao, price_pivots, ao_pivots, order, bullish, start=0):
+    """
+    Divergence count per bar for one side (price lows vs AO lows, or highs vs highs)
+
+    The pivots seen only change when a pivot appears or is broken, so
+    divergences are evaluated at those bars and carried forward. Counts are
+    only exact from bar `start` on.
+
+    Args:
+        price, ao (np.ndarray): One series
+        price_pivots, ao_pivots (tuple): Their _pivot_candidates masks
+    """
+    n = len(price)
+    price_pivots = _pivot_bars(*price_pivots)
+    ao_pivots = _pivot_bars(*ao_pivots)
+
+    # Pivots appear the bar after they form and unconfirmed ones drop out after their last bar
+    events = np.unique(np.concatenate([np.concatenate((confirmed, pending, until)) + 1
+                                       for confirmed, pending, until in (price_pivots, ao_pivots)]))
+    events = events[events < n]
+    # The last event before start carries into it, earlier ones aren't needed
+    events = events[max(np.searchsorted(events, start, side='right') - 1, 0):]
+
+    # Scalar lookups are much faster on lists than on NumPy arrays
+    price_pivots = tuple(array.tolist() for array in price_pivots)
+    ao_pivots = tuple(array.tolist() for array in ao_pivots)
+    price_values, ao_values = price.tolist(), ao.tolist()
+
+    counts = np.zeros(len(events))
+    for e, bar in enumerate(events.tolist()):
+        seen_price = _pivots_at(bar, price_pivots, order)
+        seen_ao = _pivots_at(bar, ao_pivots, order)
+        if len(seen_price) >= 2 and len(seen_ao) >= 2:
+            counts[e] = _divergences(price_values, ao_values, seen_price, seen_ao, bullish)
+
+    # Carry each event's count forward to the next event
+    position = np.searchsorted(events, np.arange(n), side='right') - 1
+    return np.where(position >= 0, counts[np.maximum(position, 0)] if len(events) else 0.0, 0.0)
+
+
+def ao_scores(high, low, order=5, fast=5, slow=34, start=0):
+    """
+    AO regular divergence strength (0.8 each) per bar
+
+    Matches enhanced_indicators.analyze_ao_divergences: bullish divergences
+    from price lows against AO lows, bearish from price highs against AO highs.
+    Only bars from `start` on are exact (earlier divergences aren't evaluated).
+    """
+    parts = ScoreParts(np.shape(high))
+    median = (high + low) / 2
+    ao = rolling_mean(median, fast) - rolling_mean(median, slow)
+
+    valid = ~np.isnan(ao)
+
+    counts = []
+    for price, bullish in ((low, True), (high, False)):
+        price_pivots = _pivot_candidates(np.where(valid, price, np.nan), order, not bullish)
+        ao_pivots = _pivot_candidates(ao, order, not bullish)
+        # Pivot walks are per series
+        counts.append(_rows(
+            lambda price, ao, *pivots: _divergence_counts(price, ao, pivots[:3], pivots[3:], order, bullish, start),
+            price, ao, *price_pivots, *ao_pivots
+        ))
+
+    bullish, bearish = counts
+    parts.score += (bullish + bearish) * 0.8
+    parts.claim(bullish > 0, WIND)
+    parts.claim(bearish > 0, RIVER)
+
+    return parts
+
+
+# Alligator price zones
+ZONE_UNKNOWN, ZONE_ABOVE_RED, ZONE_AT_BLUE, ZONE_BELOW_BLUE, ZONE_BETWEEN = range(5)
+
+
+def _alligator_zones(close, jaw, lips, bullish):
+    """alligator_analyzer.determine_price_zone for every bar and one trend direction"""
+    at_blue = np.abs(close - jaw) / jaw < 0.002
+    if bullish:
+        conditions = [close > lips, at_blue, close < jaw, (lips >= close) & (close >= jaw)]
+    else:
+        conditions = [close < lips, at_blue, close > jaw, (lips <= close) & (close <= jaw)]
+    return np.select(conditions, [ZONE_ABOVE_RED, ZONE_AT_BLUE, ZONE_BELOW_BLUE, ZONE_BETWEEN], ZONE_UNKNOWN)
+
+
+def alligator_scores(timestamps, high, low, close, multiplier=10, lookback=20, threshold_pct=0.15):
+    """
+    Alligator zone entry (0.7) and blue line contact (0.9) strength per bar
+
+    Matches alligator_analyzer.analyze_retracement_history (events in the last
+    10 hours, zones judged by the trend direction at bar t). Like
+    get_alligator_signals, every Alligator event counts for River Turn.
+    """
+    n = np.shape(close)[-1]
+    parts = ScoreParts(np.shape(close))
+    jaw_period = 13 * multiplier
+    median = (high + low) / 2
+    jaw = rolling_mean(median, jaw_period)
+    teeth = rolling_mean(median, 8 * multiplier)
+    lips = rolling_mean(median, 5 * multiplier)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        top = np.maximum(np.maximum(jaw, teeth), lips)
+        bottom = np.minimum(np.minimum(jaw, teeth), lips)
+        spread = (top - bottom) / top * 100
+        trending = ~np.isnan(spread) & (spread > threshold_pct)
+        up_trend = trending & (lips > teeth) & (teeth > jaw)
+        down_trend = trending & (lips < teeth) & (teeth < jaw)
+
+    t = np.arange(n)
+    since = first_bar_within(timestamps, 10 * 3600)
+    # Lines only exist inside the 200-candle window once the jaw SMA is full
+    first_line_bar = t - WINDOW + jaw_period
+    events_from = np.maximum.reduce([t - lookback + 1, since, first_line_bar])
+
+    for trend, bullish in ((up_trend, True), (down_trend, False)):
+        with np.errstate(invalid='ignore'):
+            zones = _alligator_zones(close, jaw, lips, bullish)
+        zones[np.isnan(jaw) | np.isnan(lips)] = ZONE_UNKNOWN
+        previous = np.concatenate((np.full(zones.shape[:-1] + (1,), ZONE_UNKNOWN), zones[..., :-1]), axis=-1)
+
+        entries = ((zones == ZONE_BETWEEN) & (previous != ZONE_BETWEEN)).astype(float)
+        entries[..., 0] = 0.0
+        contacts = (zones == ZONE_AT_BLUE).astype(float)
+
+        # A zone entry also needs the previous bar's lines inside the window
+        strength = (window_sum(entries, np.maximum(events_from, first_line_bar + 1), t) * 0.7 +
+                    window_sum(contacts, events_from, t) * 0.9)
+        parts.score += np.where(trend, strength, 0.0)
+
+    parts.claim(parts.score > 0, RIVER)
+    return parts
+
+
+def ichimoku_scores(timestamps, high, low, close, settings=(20, 60, 120, 30), lookback=20, kijun_lookback=6):
+    """
+    Cloud retest (0.9) and Kijun-sen touch (0.7) strength per bar
+
+    Matches ichimoku_analyzer.detect_price_cloud_retests and detect_kijun_touches.
+    """
+    conversion_len, base_len, lead_span_b_len, _ = settings
+    n = np.shape(close)[-1]
+    parts = ScoreParts(np.shape(close))
+    t = np.arange(n)
+
+    tenkan = (_rolling_extreme(high, conversion_len, np.max) + _rolling_extreme(low, conversion_len, np.min)) / 2
+    kijun = (_rolling_extreme(high, base_len, np.max) + _rolling_extreme(low, base_len, np.min)) / 2
+    span_a = (tenkan + kijun) / 2
+    span_b = (_rolling_extreme(high, lead_span_b_len, np.max) + _rolling_extreme(low, lead_span_b_len, np.min)) / 2
+
+    # Cloud colour changes (green: A > B, red: A < B, neutral: equal)
+    valid = ~np.isnan(span_a) & ~np.isnan(span_b)
+    color = np.sign(np.where(valid, span_a - span_b, 0.0))
+    rows, changes = _events(valid[..., 1:] & valid[..., :-1] & (color[..., 1:] != color[..., :-1]))
+    if len(changes):
+        _cloud_retests(parts, timestamps, close, span_a, span_b, color, rows, changes + 1, lookback)
+
+    # Kijun touches in the last 6 bars: support for Wind Catcher, otherwise River Turn
+    with np.errstate(invalid='ignore'):
+        touch = (low <= kijun) & (kijun <= high)
+        support = touch & (close > kijun)
+    touch_from = np.maximum(t - kijun_lookback + 1, t - WINDOW + base_len)
+    parts.score += window_sum(touch.astype(float), touch_from, t) * 0.7
+
+    # The first touch in the window decides the system
+    next_touch = np.minimum.accumulate(np.where(touch, t, n)[..., ::-1], axis=-1)[..., ::-1]
+    first_touch = next_touch[..., np.clip(touch_from, 0, n - 1)]
+    touched = first_touch <= t
+    first_support = np.take_along_axis(support, np.minimum(first_touch, n - 1), axis=-1)
+    parts.claim(touched, np.where(first_support, WIND, RIVER))
+
+    return parts
+
+
+def _cloud_retests(parts, timestamps, close, span_a, span_b, color, rows, changes, lookback):
+    """Add cloud retest strength (0.9) and systems to the Ichimoku parts"""
+    n = np.shape(close)[-1]
+
+    # Closes inside the cloud in the 19 bars after each change
+    candidates = changes[:, None] + np.arange(1, lookback)[None, :]
+    in_range = candidates < n
+    candidates = np.minimum(candidates, n - 1)
+    change_color = _at(color, rows, changes)
+    rows = np.broadcast_to(rows[:, None], candidates.shape)
+    c_close, c_span_a, c_span_b = (_at(values, rows, candidates) for values in (close, span_a, span_b))
+    with np.errstate(invalid='ignore'):
+        cloud_top = np.maximum(c_span_a, c_span_b)
+        cloud_bottom = np.minimum(c_span_a, c_span_b)
+        inside = (cloud_bottom <= c_close) & (c_close <= cloud_top) & in_range
+
+    # Each change counts its first retest <= 24h old while it is 5-19 bars and <= 48h old
+    starts, ends = first_fresh_ranges(timestamps, changes, candidates, inside, 24 * 3600, 5, lookback)
+    ends = np.minimum(ends, last_bar_within(timestamps, changes, 48 * 3600)[:, None])
+
+    systems = np.where(change_color > 0, WIND, RIVER)[:, None] * np.ones_like(candidates)
+    add_ranges(parts.score, starts[inside], ends[inside], np.full(inside.sum(), 0.9), rows[inside])
+    parts.claim_ranges(rows[inside], starts[inside], ends[inside], systems[inside])
+
+
+def volume_scores(volume, ratios=(1.5, 2.0, 3.0), baseline_periods=120):
+    """
+    Volume strength and confirmation bonus per bar
+
+    Matches master_confluence.detect_volume_signals for the latest candle:
+    CLIMAX 1.0 / HOT 0.8 / WARMING 0.6 / NORMAL 0.2, plus 0.3 from the WARMING ratio.
+
+    Returns:
+        tuple: (score, ratio) arrays
+    """
+    warming, hot, climax = ratios
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = volume / rolling_mean(volume, baseline_periods)
+        strength = np.select([ratio >= climax, ratio >= hot, ratio >= warming], [1.0, 0.8, 0.6], 0.2)
+        bonus = np.where(ratio >= warming, 0.3, 0.0)
+    score = np.where(np.isnan(ratio), 0.0, strength + bonus)
+    return score, ratio
+
+
+# ----------------------------------------------------------------------------
+# Confluence
+# ----------------------------------------------------------------------------
+
+def classify_scores(scores, cutoffs=CLASS_CUTOFFS):
+    """Confluence class index per bar (0 = PERFECT ... 4 = INTERESTING, 5 = WEAK)"""
+    classes = np.full(np.shape(scores), len(cutoffs))
+    for index in reversed(range(len(cutoffs))):
+        classes[scores >= cutoffs[index]] = index
+    return classes
+
+
+def compute_confluence(timestamps, high, low, close, volume, params=None, cache=None, cache_key=None, start=0):
+    """
+    Master confluence score and primary system for every bar
+
+    Candles can be one series (bars) or several symbols on the same
+    timestamps (symbols x bars), which is scored in one pass per indicator.
+
+    Args:
+        timestamps (np.ndarray): Candle timestamps, ascending (shared by all rows)
+        high, low, close, volume (np.ndarray): Candles (bars, or symbols x bars)
+        params (dict): Overrides for DEFAULT_PARAMS
+        cache (dict): Optional per-indicator result cache (reused across parameter sets)
+        cache_key: Identifies the candle series in the cache (e.g. (symbol, timeframe))
+        start (int): First bar that needs a score - e.g. n - 1 to score only the
+                     latest candle, which skips most of the AO divergence walk
+
+    Returns:
+        dict: score, system (1 Wind Catcher / -1 River Turn / 0 none), volume_ratio,
+              scoreable (bars with a full analyzer window, from start on), and
+              indicator_scores - each indicator's part of the score
+              (hull, ao, alligator, ichimoku, volume)
+    """
+    params = resolve_params(params)
+    n = np.shape(close)[-1]
+
+    def cached(name, settings, func):
+        if cache is None:
+            return func()
+        key = (cache_key, name, settings)
+        if key not in cache:
+            cache[key] = func()
+        return cache[key]
+
+    hull = cached('hull', (params['hull_fast'], params['hull_slow']),
+                  lambda: hull_scores(timestamps, high, low, close, params['hull_fast'], params['hull_slow']))
+    ao = cached('ao', start, lambda: ao_scores(high, low, start=start))
+    alligator = cached('alligator', params['alligator_multiplier'],
+                       lambda: alligator_scores(timestamps, high, low, close, params['alligator_multiplier']))
+    ichimoku = cached('ichimoku', tuple(params['ichimoku']),
+                      lambda: ichimoku_scores(timestamps, high, low, close, tuple(params['ichimoku'])))
+    volume_score, volume_ratio = cached('volume', tuple(params['volume_ratios']),
+                                        lambda: volume_scores(volume, tuple(params['volume_ratios'])))
+
+    score = hull.score + ao.score + alligator.score + ichimoku.score + volume_score
+
+    # First indicator with a signal decides the system (same order as calculate_master_confluence)
+    system = np.zeros(np.shape(close), dtype=int)
+    for parts in (ichimoku, alligator, ao, hull):
+        system = np.where(parts.system != 0, parts.system, system)
+
+    scoreable = np.arange(n) >= max(WINDOW - 1, start)
+    return {
+        'score': np.where(scoreable, score, 0.0),
+        'system': np.where(scoreable, system, 0),
+        'volume_ratio': volume_ratio,
+        'scoreable': scoreable,
+        'indicator_scores': {
+            name: np.where(scoreable, values, 0.0)
+            for name, values in (('hull', hull.score), ('ao', ao.score), ('alligator', alligator.score),
+                                 ('ichimoku', ichimoku.score), ('volume', volume_score))
+        }
+    }
+
+
+def select_signals(timestamps, score, system, min_score, cooldown_seconds=4 * 3600):
+    """
+    Bars that would be stored as signals
+
+    Like the detector: score >= min_score with a primary system, and no second
+    signal on the same symbol/timeframe within the cooldown (4 hours).
+
+    Returns:
+        np.ndarray: Signal bar indices
+    """
+    candidates = np.flatnonzero((score >= min_score) & (system != 0))
+    selected = []
+    last = None
+    for index in candidates:
+        if last is None or timestamps[index] - timestamps[last] >= cooldown_seconds:
+            selected.append(index)
+            last = index
+    return np.array(selected, dtype=np.int64)
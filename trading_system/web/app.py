@@ -3,31 +3,109 @@ Flask Web Application for Wind Catcher & River Turn
 Main application file with API routes
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
 from flask_cors import CORS
 import sqlite3
 from datetime import datetime
+import gzip
+import hashlib
 import json
+import queue
 import sys
 import os
+import threading
+import time
 
 # Add parent directory to path to import utils
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + '/..')
 
-from utils import DATABASE_FILE, load_config, get_current_timestamp
+from utils import DATABASE_FILE, load_config, get_current_timestamp, timeframe_to_seconds
+from db_pool import ConnectionPool
+from event_broadcaster import EventBroadcaster
+from alignment_matrix import get_alignment_matrix
+from metrics import load_snapshot, render_prometheus
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for API requests
 
 # Load configuration
 config = load_config()
-
-
-def get_db_connection():
-    """Get database connection"""
-    conn = sqlite3.connect(str(DATABASE_FILE))
-    conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-    return conn
+web_config = config.get('web', {})
+
+# Per-process connection pools: read-only for GET endpoints, a small one for watchlist edits
+read_pool = ConnectionPool(DATABASE_FILE, size=web_config.get('read_pool_size', 8), read_only=True)
+write_pool = ConnectionPool(DATABASE_FILE, size=2, read_only=False)
+
+# Response compression and static asset caching
+COMPRESS_MIN_SIZE = web_config.get('compress_min_size', 500)
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/javascript', 'text/javascript',
+    'text/css', 'text/html', 'text/plain'
+}
+STATIC_MAX_AGE = web_config.get('static_max_age', 31536000)
+
+# Page size limits for /api/signals/recent
+MAX_SIGNALS_PAGE = 500
+
+# Cached signals-table version, refreshed only when the database files change
+_signals_version = {'fingerprint': None, 'version': None}
+_signals_version_lock = threading.Lock()
+
+# Server-Sent Events: one database watcher thread feeds every connected client
+broadcaster = EventBroadcaster()
+EVENT_POLL_INTERVAL = 2       # seconds between database change checks
+EVENT_HEARTBEAT = 15          # seconds between keep-alive comments
+EVENT_STATUS_INTERVAL = 60    # seconds between stats/status pushes
+_watcher_thread = None
+_watcher_lock = threading.Lock()
+_last_watchlists = None
+_watchlists_lock = threading.Lock()
+
+
+@app.url_defaults
+def add_static_version(endpoint, values):
+    """Append the file's mtime to static URLs so they can be cached for a year"""
+    if endpoint == 'static' and 'filename' in values:
+        try:
+            values['v'] = int(os.stat(os.path.join(app.static_folder, values['filename'])).st_mtime)
+        except OSError:
+            pass
+
+
+@app.after_request
+def add_cache_headers(response):
+    """Versioned static assets never change; everything else revalidates"""
+    if request.endpoint == 'static' and request.args.get('v') and response.status_code in (200, 304):
+        response.headers['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE}, immutable'
+    return response
+
+
+@app.after_request
+def compress_response(response):
+    """Gzip text responses (JSON, HTML, CSS, JS) for clients that accept it"""
+    if (response.status_code != 200
+            or response.is_streamed
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+        return response
+
+    # Static files are served as file wrappers - read them so they can be compressed
+    response.direct_passthrough = False
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+
+    # The compressed body is a different representation of the same resource
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+    return response
 
 
 # ============================================================================
@@ -73,40 +151,11 @@ def get_watchlists():
             }
         }
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     try:
-        cursor.execute("""
-            SELECT symbol, timeframe, direction
-            FROM user_watchlists
-            ORDER BY symbol, timeframe
-        """)
-
-        rows = cursor.fetchall()
-
-        # Organize by direction and timeframe
-        watchlists = {
-            'wind_catcher': {'12h': [], '1h': [], '15m': [], '4h': []},
-            'river_turn': {'12h': [], '1h': [], '15m': [], '4h': []}
-        }
-
-        for row in rows:
-            symbol = row['symbol']
-            timeframe = row['timeframe']
-            direction = row['direction']
-
-            if timeframe not in watchlists[direction]:
-                watchlists[direction][timeframe] = []
-
-            watchlists[direction][timeframe].append(symbol)
-
-        return jsonify(watchlists)
+        return jsonify(_load_watchlists())
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 
 @app.route('/api/watchlist/add', methods=['POST'])
@@ -132,7 +181,7 @@ def add_to_watchlist():
     if timeframe not in ['15m', '1h', '4h', '12h']:
         return jsonify({'error': 'Invalid timeframe'}), 400
 
-    conn = get_db_connection()
+    conn = write_pool.acquire()
     cursor = conn.cursor()
 
     try:
@@ -143,6 +192,7 @@ def add_to_watchlist():
         """, (symbol, timeframe, direction, get_current_timestamp(), 'Added via web'))
 
         conn.commit()
+        _publish_watchlists()
 
         return jsonify({
             'success': True,
@@ -152,7 +202,7 @@ def add_to_watchlist():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
-        conn.close()
+        write_pool.release(conn)
 
 
 @app.route('/api/watchlist/remove', methods=['DELETE'])
@@ -171,7 +221,7 @@ def remove_from_watchlist():
     if not symbol or not timeframe or not direction:
         return jsonify({'error': 'Missing required fields'}), 400
 
-    conn = get_db_connection()
+    conn = write_pool.acquire()
     cursor = conn.cursor()
 
     try:
@@ -181,6 +231,7 @@ def remove_from_watchlist():
         """, (symbol, timeframe, direction))
 
         conn.commit()
+        _publish_watchlists()
 
         return jsonify({
             'success': True,
@@ -190,7 +241,7 @@ def remove_from_watchlist():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
-        conn.close()
+        write_pool.release(conn)
 
 
 @app.route('/api/watchlist/move', methods=['POST'])
@@ -213,7 +264,7 @@ def move_watchlist_entry():
     if not symbol or not from_data or not to_data:
         return jsonify({'error': 'Missing required fields'}), 400
 
-    conn = get_db_connection()
+    conn = write_pool.acquire()
     cursor = conn.cursor()
 
     try:
@@ -232,6 +283,7 @@ def move_watchlist_entry():
               get_current_timestamp(), 'Moved via web'))
 
         conn.commit()
+        _publish_watchlists()
 
         return jsonify({
             'success': True,
@@ -241,7 +293,7 @@ def move_watchlist_entry():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
-        conn.close()
+        write_pool.release(conn)
 
 
 # ============================================================================
@@ -251,25 +303,43 @@ def move_watchlist_entry():
 @app.route('/api/signals/recent', methods=['GET'])
 def get_recent_signals():
     """
-    Get recent signals for the signal feed
+    Get recent signals for the signal feed (newest first, keyset paginated)
 
     Query params:
-        - limit: Max number of signals (default 50)
-        - since: Unix timestamp, only return signals after this time
+        - limit: Max number of signals (default 50, max 500)
+        - after: Cursor "timestamp:id", only return signals newer than it (polling)
+        - before: Cursor "timestamp:id", only return signals older than it (paging back)
+        - since: Unix timestamp, only return signals after this time (legacy polling)
+
+    Responds 304 Not Modified when If-None-Match matches the current ETag,
+    without touching the signals table.
 
     Returns:
         {
             "signals": [...],
-            "latest_timestamp": 1234567890
+            "latest_timestamp": 1234567890,
+            "latest_cursor": "1234567890:42",
+            "next_cursor": "1234560000:17"    # null when there are no older rows
         }
     """
-    limit = request.args.get('limit', 50, type=int)
+    limit = max(1, min(request.args.get('limit', 50, type=int), MAX_SIGNALS_PAGE))
     since = request.args.get('since', 0, type=int)
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    try:
+        after = _parse_cursor(request.args.get('after'))
+        before = _parse_cursor(request.args.get('before'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
     try:
+        etag = _signals_etag(limit, since, after, before)
+
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+
         query = """
             SELECT
                 id, timestamp, symbol, timeframe, system, signal_type,
@@ -286,45 +356,36 @@ def get_recent_signals():
             query += " AND timestamp > ?"
             params.append(since)
 
-        query += " ORDER BY timestamp DESC LIMIT ?"
+        # Keyset conditions on (timestamp, id) - stable even when timestamps repeat
+        if after:
+            query += " AND (timestamp > ? OR (timestamp = ? AND id > ?))"
+            params.extend([after[0], after[0], after[1]])
+
+        if before:
+            query += " AND (timestamp < ? OR (timestamp = ? AND id < ?))"
+            params.extend([before[0], before[0], before[1]])
+
+        query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
         params.append(limit)
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-
-        signals = []
-        latest_timestamp = 0
-
-        for row in rows:
-            signal = {
-                'id': row['id'],
-                'timestamp': row['timestamp'],
-                'datetime': datetime.fromtimestamp(row['timestamp']).strftime('%Y-%m-%d %H:%M:%S'),
-                'symbol': row['symbol'],
-                'timeframe': row['timeframe'],
-                'direction': row['system'],
-                'confluence_score': row['confluence_score'],
-                'confluence_class': row['confluence_class'],
-                'price': row['price'],
-                'volume_level': row['volume_level'],
-                'volume_ratio': row['volume_ratio'],
-                'indicators_summary': _format_indicators_summary(row['indicators_firing']),
-                'emoji': _get_confluence_emoji(row['confluence_class']),
-                'system_emoji': '🌪️' if row['system'] == 'wind_catcher' else '🌊'
-            }
+        with read_pool.connection() as conn:
+            rows = conn.execute(query, params).fetchall()
 
-            signals.append(signal)
-            latest_timestamp = max(latest_timestamp, row['timestamp'])
+        signals = [_format_signal_row(row) for row in rows]
+        latest_timestamp = rows[0]['timestamp'] if rows else 0
 
-        return jsonify({
+        response = jsonify({
             'signals': signals,
-            'latest_timestamp': latest_timestamp
+            'latest_timestamp': latest_timestamp,
+            'latest_cursor': _make_cursor(rows[0]) if rows else None,
+            'next_cursor': _make_cursor(rows[-1]) if len(rows) == limit else None
         })
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 
 @app.route('/api/signals/stats', methods=['GET'])
@@ -340,97 +401,376 @@ def get_signal_stats():
             "by_direction": {"wind_catcher": 8, "river_turn": 7}
         }
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     try:
-        # Get today's signals
-        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_timestamp = int(today_start.timestamp())
-
-        cursor.execute("""
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN confluence_score >= 3.0 THEN 1 ELSE 0 END) as perfect,
-                SUM(CASE WHEN confluence_score >= 2.5 AND confluence_score < 3.0 THEN 1 ELSE 0 END) as excellent,
-                SUM(CASE WHEN system = 'wind_catcher' THEN 1 ELSE 0 END) as wind_catcher,
-                SUM(CASE WHEN system = 'river_turn' THEN 1 ELSE 0 END) as river_turn
-            FROM signals
-            WHERE timestamp >= ?
-        """, (today_timestamp,))
-
-        row = cursor.fetchone()
-
-        return jsonify({
-            'total_today': row['total'] or 0,
-            'perfect_count': row['perfect'] or 0,
-            'excellent_count': row['excellent'] or 0,
-            'by_direction': {
-                'wind_catcher': row['wind_catcher'] or 0,
-                'river_turn': row['river_turn'] or 0
-            }
-        })
+        return jsonify(_load_signal_stats())
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
 
 
 @app.route('/api/system/status', methods=['GET'])
 def get_system_status():
     """Get system status information"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     try:
-        # Get latest price data timestamp
-        cursor.execute("""
-            SELECT MAX(timestamp) as latest_data
-            FROM price_data
-        """)
-        latest_data = cursor.fetchone()['latest_data']
+        return jsonify(_load_system_status())
 
-        # Get count of active watchlist pairs
-        cursor.execute("""
-            SELECT COUNT(DISTINCT symbol || timeframe) as active_pairs
-            FROM user_watchlists
-        """)
-        active_pairs = cursor.fetchone()['active_pairs']
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        # Get today's signal count
-        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_timestamp = int(today_start.timestamp())
 
-        cursor.execute("""
-            SELECT COUNT(*) as signals_today
-            FROM signals
-            WHERE timestamp >= ?
-        """, (today_timestamp,))
-        signals_today = cursor.fetchone()['signals_today']
+# ============================================================================
+# API ROUTES - ALIGNMENT
+# ============================================================================
+
+@app.route('/api/alignment', methods=['GET'])
+def get_alignment():
+    """
+    Get the Hull 21 trend/signal grid for every watchlist symbol
 
-        # Get database size
-        db_size_mb = os.path.getsize(str(DATABASE_FILE)) / (1024 * 1024)
+    Query params:
+        timeframes: Comma-separated timeframes (default: 15m,1h,4h,12h)
+        refresh: 1 to rebuild instead of using the cached matrix
 
-        return jsonify({
-            'status': 'ok',
-            'last_data_update': datetime.fromtimestamp(latest_data).strftime('%Y-%m-%d %H:%M:%S') if latest_data else 'N/A',
-            'active_pairs': active_pairs,
-            'signals_today': signals_today,
-            'database_size_mb': round(db_size_mb, 2),
-            'telegram_enabled': config.get('telegram', {}).get('enabled', False)
-        })
+    The matrix is shared with trading_dashboard.py and only rebuilt after
+    the next candle close of its shortest timeframe.
+    """
+    timeframes = [tf.strip() for tf in request.args.get('timeframes', '15m,1h,4h,12h').split(',') if tf.strip()]
+
+    try:
+        for tf in timeframes:
+            timeframe_to_seconds(tf)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if not timeframes:
+        return jsonify({'error': 'No timeframes given'}), 400
+
+    try:
+        with read_pool.connection() as conn:
+            symbols = [row['symbol'] for row in conn.execute(
+                "SELECT DISTINCT symbol FROM user_watchlists ORDER BY symbol"
+            ).fetchall()]
+
+        matrix = get_alignment_matrix(
+            symbols, timeframes,
+            pool=read_pool,
+            refresh=request.args.get('refresh') == '1',
+            settle_seconds=config.get('system', {}).get('data_collection_interval', 60)
+        )
+
+        response = jsonify(matrix)
+        max_age = max(matrix['expires_at'] - get_current_timestamp(), 0)
+        response.headers['Cache-Control'] = f'private, max-age={max_age}'
+        return response
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
+
+
+# ============================================================================
+# API ROUTES - METRICS
+# ============================================================================
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Scan pipeline timings in Prometheus text format
+
+    Serves the snapshot the signal detector writes after every cycle
+    (span histograms, last-cycle breakdown and counters).
+    """
+    snapshot = load_snapshot()
+
+    return Response(
+        render_prometheus(snapshot),
+        headers={'Cache-Control': 'no-cache'},
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+# ============================================================================
+# API ROUTES - EVENT STREAM
+# ============================================================================
+
+@app.route('/api/stream', methods=['GET'])
+def stream_events():
+    """
+    Server-Sent Events stream replacing the dashboard's polling timers
+
+    Events:
+        - signal: one new signal (same shape as /api/signals/recent items)
+        - stats: same payload as /api/signals/stats
+        - watchlists: same payload as /api/watchlists
+        - status: same payload as /api/system/status
+
+    All clients share a single database watcher, so database load does not
+    grow with the number of open tabs.
+    """
+    _ensure_event_watcher()
+    subscriber = broadcaster.subscribe()
+
+    def generate():
+        try:
+            yield "retry: 5000\n\n"
+
+            while True:
+                try:
+                    message = subscriber.get(timeout=EVENT_HEARTBEAT)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if message is EventBroadcaster.DISCONNECT:
+                    break
+
+                yield message
+        finally:
+            broadcaster.unsubscribe(subscriber)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _load_watchlists():
+    """Read user_watchlists organized by direction and timeframe"""
+    with read_pool.connection() as conn:
+        rows = conn.execute("""
+            SELECT symbol, timeframe, direction
+            FROM user_watchlists
+            ORDER BY symbol, timeframe
+        """).fetchall()
+
+    # Organize by direction and timeframe
+    watchlists = {
+        'wind_catcher': {'12h': [], '1h': [], '15m': [], '4h': []},
+        'river_turn': {'12h': [], '1h': [], '15m': [], '4h': []}
+    }
+
+    for row in rows:
+        symbol = row['symbol']
+        timeframe = row['timeframe']
+        direction = row['direction']
+
+        if timeframe not in watchlists[direction]:
+            watchlists[direction][timeframe] = []
+
+        watchlists[direction][timeframe].append(symbol)
+
+    return watchlists
+
+
+def _load_signal_stats():
+    """Count today's signals by class and direction"""
+    with read_pool.connection() as conn:
+        try:
+            # signal_daily_stats is kept current by triggers (database_migration_v3.py)
+            row = conn.execute("""
+                SELECT total, perfect, excellent, wind_catcher, river_turn
+                FROM signal_daily_stats
+                WHERE day = ?
+            """, (datetime.now().strftime('%Y-%m-%d'),)).fetchone()
+        except sqlite3.OperationalError:
+            # Database not migrated to v3 yet - aggregate on the fly
+            row = _aggregate_signal_stats(conn)
+
+    if row is None:
+        row = {'total': 0, 'perfect': 0, 'excellent': 0, 'wind_catcher': 0, 'river_turn': 0}
+
+    return {
+        'total_today': row['total'] or 0,
+        'perfect_count': row['perfect'] or 0,
+        'excellent_count': row['excellent'] or 0,
+        'by_direction': {
+            'wind_catcher': row['wind_catcher'] or 0,
+            'river_turn': row['river_turn'] or 0
+        }
+    }
+
+
+def _aggregate_signal_stats(conn):
+    """Scan today's signals (pre-v3 fallback for _load_signal_stats)"""
+    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    today_timestamp = int(today_start.timestamp())
+
+    return conn.execute("""
+        SELECT
+            COUNT(*) as total,
+            SUM(CASE WHEN confluence_score >= 3.0 THEN 1 ELSE 0 END) as perfect,
+            SUM(CASE WHEN confluence_score >= 2.5 AND confluence_score < 3.0 THEN 1 ELSE 0 END) as excellent,
+            SUM(CASE WHEN system = 'wind_catcher' THEN 1 ELSE 0 END) as wind_catcher,
+            SUM(CASE WHEN system = 'river_turn' THEN 1 ELSE 0 END) as river_turn
+        FROM signals
+        WHERE timestamp >= ?
+    """, (today_timestamp,)).fetchone()
+
+
+def _load_system_status():
+    """Collect data freshness, watchlist size and database size"""
+    with read_pool.connection() as conn:
+        cursor = conn.cursor()
+
+        # Get latest price data timestamp
+        try:
+            # pair_freshness is maintained by the collectors (database_migration_v3.py)
+            cursor.execute("""
+                SELECT MAX(last_timestamp) as latest_data
+                FROM pair_freshness
+            """)
+            latest_data = cursor.fetchone()['latest_data']
+        except sqlite3.OperationalError:
+            latest_data = None
+
+        if latest_data is None:
+            # Not migrated (or not backfilled) yet - scan price_data
+            cursor.execute("""
+                SELECT MAX(timestamp) as latest_data
+                FROM price_data
+            """)
+            latest_data = cursor.fetchone()['latest_data']
+
+        # Get count of active watchlist pairs (DISTINCT on columns can use the UNIQUE index)
+        cursor.execute("""
+            SELECT COUNT(*) as active_pairs
+            FROM (SELECT DISTINCT symbol, timeframe FROM user_watchlists)
+        """)
+        active_pairs = cursor.fetchone()['active_pairs']
+
+        # Get database size without touching the filesystem
+        cursor.execute("PRAGMA page_count")
+        page_count = cursor.fetchone()[0]
+        cursor.execute("PRAGMA page_size")
+        page_size = cursor.fetchone()[0]
+        cursor.close()
+
+    # Get today's signal count
+    signals_today = _load_signal_stats()['total_today']
+
+    db_size_mb = page_count * page_size / (1024 * 1024)
+
+    return {
+        'status': 'ok',
+        'last_data_update': datetime.fromtimestamp(latest_data).strftime('%Y-%m-%d %H:%M:%S') if latest_data else 'N/A',
+        'active_pairs': active_pairs,
+        'signals_today': signals_today,
+        'database_size_mb': round(db_size_mb, 2),
+        'telegram_enabled': config.get('telegram', {}).get('enabled', False)
+    }
+
+
+def _publish_watchlists():
+    """Push the current watchlists to connected streams after a mutation"""
+    if broadcaster.subscriber_count == 0:
+        return
+
+    try:
+        _broadcast_watchlists_if_changed(_load_watchlists(), force=True)
+    except Exception as e:
+        print(f"⚠️ Could not publish watchlist update: {e}")
+
+
+def _broadcast_watchlists_if_changed(watchlists, force=False):
+    """
+    Publish watchlists unless they match the last snapshot sent
+
+    Shared by the API routes and the watcher so a mutation made through
+    this app is pushed once, not again when the watcher notices it.
+
+    Args:
+        watchlists (dict): Current watchlists (as returned by _load_watchlists)
+        force (bool): Publish even without an earlier snapshot to compare against
+    """
+    global _last_watchlists
+
+    with _watchlists_lock:
+        if watchlists == _last_watchlists:
+            return
+        previous = _last_watchlists
+        _last_watchlists = watchlists
+
+    if previous is not None or force:
+        broadcaster.publish('watchlists', watchlists)
+
+
+def _ensure_event_watcher():
+    """Start the shared database watcher thread on first use"""
+    global _watcher_thread
+
+    with _watcher_lock:
+        if _watcher_thread is None or not _watcher_thread.is_alive():
+            _watcher_thread = threading.Thread(target=_watch_database, name='sse-watcher', daemon=True)
+            _watcher_thread.start()
+
+
+def _watch_database():
+    """
+    Background loop feeding the event stream
+
+    Checks the database files every EVENT_POLL_INTERVAL seconds and only
+    queries when they changed (new signals written by signal_detector_service,
+    watchlist edits from other tools, collector writes). Stats and status are
+    re-sent every EVENT_STATUS_INTERVAL so day rollovers reach the browser.
+    """
+    last_fingerprint = None
+    last_signal_id = None
+    last_status_push = 0
+
+    while True:
+        time.sleep(EVENT_POLL_INTERVAL)
+
+        if broadcaster.subscriber_count == 0:
+            # Re-baseline when clients return; they catch up over REST on connect
+            last_fingerprint = None
+            last_signal_id = None
+            continue
+
+        try:
+            fingerprint = _database_fingerprint()
+
+            if fingerprint != last_fingerprint:
+                last_fingerprint = fingerprint
+
+                with read_pool.connection() as conn:
+                    if last_signal_id is None:
+                        last_signal_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM signals").fetchone()[0]
+                        rows = []
+                    else:
+                        rows = conn.execute("""
+                            SELECT
+                                id, timestamp, symbol, timeframe, system, signal_type,
+                                price, confluence_score, confluence_class,
+                                indicators_firing, volume_level, volume_ratio,
+                                created_at
+                            FROM signals
+                            WHERE id > ?
+                            ORDER BY id
+                        """, (last_signal_id,)).fetchall()
+
+                for row in rows:
+                    last_signal_id = max(last_signal_id, row['id'])
+                    if (row['confluence_score'] or 0) >= 1.2:
+                        broadcaster.publish('signal', _format_signal_row(row), event_id=row['id'])
+
+                if rows:
+                    broadcaster.publish('stats', _load_signal_stats())
+
+                _broadcast_watchlists_if_changed(_load_watchlists())
+
+            if time.time() - last_status_push >= EVENT_STATUS_INTERVAL:
+                broadcaster.publish('stats', _load_signal_stats())
+                broadcaster.publish('status', _load_system_status())
+                last_status_push = time.time()
+
+        except Exception as e:
+            print(f"⚠️ Event watcher error: {e}")
+
+
 def _format_indicators_summary(indicators_json):
     """Format indicators firing JSON as readable string"""
     if not indicators_json:
@@ -457,6 +797,96 @@ def _format_indicators_summary(indicators_json):
         return "Unknown"
 
 
+def _format_signal_row(row):
+    """Convert a signals row into the JSON shape used by the signal feed"""
+    return {
+        'id': row['id'],
+        'timestamp': row['timestamp'],
+        'datetime': datetime.fromtimestamp(row['timestamp']).strftime('%Y-%m-%d %H:%M:%S'),
+        'symbol': row['symbol'],
+        'timeframe': row['timeframe'],
+        'direction': row['system'],
+        'confluence_score': row['confluence_score'],
+        'confluence_class': row['confluence_class'],
+        'price': row['price'],
+        'volume_level': row['volume_level'],
+        'volume_ratio': row['volume_ratio'],
+        'indicators_summary': _format_indicators_summary(row['indicators_firing']),
+        'emoji': _get_confluence_emoji(row['confluence_class']),
+        'system_emoji': '🌪️' if row['system'] == 'wind_catcher' else '🌊'
+    }
+
+
+def _make_cursor(row):
+    """Build a "timestamp:id" keyset cursor from a signals row"""
+    return f"{row['timestamp']}:{row['id']}"
+
+
+def _parse_cursor(value):
+    """
+    Parse a "timestamp:id" keyset cursor
+
+    Returns:
+        tuple: (timestamp, id) or None if no cursor was given
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not value:
+        return None
+
+    try:
+        timestamp, signal_id = value.split(':', 1)
+        return int(timestamp), int(signal_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {value} (expected timestamp:id)")
+
+
+def _database_fingerprint():
+    """Cheap change token for the database: mtime and size of the DB and WAL files"""
+    # Resolved like the pool's path - SQLite keeps the WAL next to the real file
+    database = str(read_pool.database)
+    parts = []
+    for path in (database, database + '-wal'):
+        try:
+            stat = os.stat(path)
+            parts.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            parts.append(None)
+    return tuple(parts)
+
+
+def _get_signals_version():
+    """
+    Get a token that changes whenever signals are inserted or deleted
+
+    The signals table is only read when the database files have changed
+    since the last call, so unchanged polls cost two stat() calls.
+    """
+    fingerprint = _database_fingerprint()
+
+    with _signals_version_lock:
+        if fingerprint == _signals_version['fingerprint']:
+            return _signals_version['version']
+
+    with read_pool.connection() as conn:
+        row = conn.execute("SELECT MIN(id), MAX(id) FROM signals").fetchone()
+
+    version = f"{row[0] or 0}-{row[1] or 0}"
+
+    with _signals_version_lock:
+        _signals_version['fingerprint'] = fingerprint
+        _signals_version['version'] = version
+
+    return version
+
+
+def _signals_etag(limit, since, after, before):
+    """ETag for a /api/signals/recent response: table version + query parameters"""
+    key = f"{_get_signals_version()}|{limit}|{since}|{after}|{before}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+
 def _get_confluence_emoji(confluence_class):
     """Get emoji for confluence classification"""
     emojis = {
@@ -480,6 +910,7 @@ if __name__ == '__main__':
     print(f"Starting Flask server...")
     print(f"Database: {DATABASE_FILE}")
     print(f"Open browser to: http://localhost:5000")
+    print("Development server - use serve.py for production")
     print("="*60)
 
     # Check if flask-cors is installed
@@ -0,0 +1,109 @@
+"""
+Server-Sent Events Broadcaster for Wind Catcher & River Turn
+Fans out signal, stats, watchlist and status updates to every connected browser
+"""
+
+import json
+import queue
+import threading
+
+
+def format_sse(event, data, event_id=None):
+    """
+    Format one Server-Sent Events message
+
+    Args:
+        event (str): Event name (e.g. 'signal', 'watchlists')
+        data: JSON-serializable payload
+        event_id: Optional id sent as the SSE "id:" field
+
+    Returns:
+        str: Wire-format message terminated by a blank line
+    """
+    message = ''
+    if event_id is not None:
+        message += f"id: {event_id}\n"
+    message += f"event: {event}\n"
+    message += f"data: {json.dumps(data)}\n\n"
+    return message
+
+
+class EventBroadcaster:
+    """
+    Thread-safe publish/subscribe hub for SSE streams
+
+    Each subscriber gets a bounded queue. A subscriber that falls too far
+    behind is disconnected (the browser reconnects and catches up over REST)
+    so one slow tab can never block publishing to the others.
+    """
+
+    # Sentinel telling a stream generator to end its response
+    DISCONNECT = None
+
+    def __init__(self, max_queue=100):
+        """
+        Initialize the broadcaster
+
+        Args:
+            max_queue (int): Messages buffered per subscriber before it is dropped
+        """
+        self.max_queue = max_queue
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self):
+        """Number of connected streams"""
+        with self._lock:
+            return len(self._subscribers)
+
+    def subscribe(self):
+        """
+        Register a new stream
+
+        Returns:
+            queue.Queue: Queue of formatted messages for this subscriber
+        """
+        subscriber = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Remove a stream (safe to call more than once)"""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event, data, event_id=None):
+        """
+        Send an event to every subscriber
+
+        Returns:
+            int: Number of subscribers the event was delivered to
+        """
+        message = format_sse(event, data, event_id)
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        delivered = 0
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+                delivered += 1
+            except queue.Full:
+                self._drop(subscriber)
+
+        return delivered
+
+    def _drop(self, subscriber):
+        """Disconnect a subscriber whose queue is full"""
+        self.unsubscribe(subscriber)
+
+        # Make room for the disconnect sentinel so the stream generator exits
+        while True:
+            try:
+                subscriber.get_nowait()
+            except queue.Empty:
+                break
+        subscriber.put_nowait(self.DISCONNECT)
@@ -0,0 +1,214 @@
+"""
+Load Test for the Wind Catcher & River Turn Web Interface
+Simulates many browser tabs polling an API endpoint and reports throughput
+and latency percentiles
+
+Usage:
+    python load_test.py                                  # 100 clients, 10s, /api/signals/recent
+    python load_test.py --clients 50 --duration 30
+    python load_test.py --path /api/signals/stats --no-etag
+    python load_test.py --compare http://localhost:8000  # same test against two servers
+
+Reproducible comparison (dev server vs production server on the same database):
+    python app.py                       # terminal 1, port 5000
+    python serve.py --port 8000         # terminal 2
+    python load_test.py --compare http://localhost:8000 --warmup 2
+"""
+
+import argparse
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list
+
+    Args:
+        sorted_values (list): Values in ascending order
+        pct (float): Percentile (0-100)
+
+    Returns:
+        float: Value at that percentile (0 for an empty list)
+    """
+    if not sorted_values:
+        return 0
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def run_client(url, deadline, use_etag, results, lock):
+    """
+    Poll `url` until `deadline`, replaying the last ETag like a browser does
+
+    Args:
+        url (str): Full URL to request
+        deadline (float): time.perf_counter() value to stop at
+        use_etag (bool): Send If-None-Match with the last seen ETag
+        results (dict): Shared counters (statuses, latencies)
+        lock (threading.Lock): Guards `results`
+    """
+    etag = None
+    statuses = Counter()
+    latencies = []
+
+    while time.perf_counter() < deadline:
+        request = urllib.request.Request(url, headers={'Accept-Encoding': 'gzip'})
+        if use_etag and etag:
+            request.add_header('If-None-Match', etag)
+
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                status = response.status
+                etag = response.headers.get('ETag', etag)
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except Exception:
+            status = 'error'
+
+        latencies.append(time.perf_counter() - started)
+        statuses[status] += 1
+
+    with lock:
+        results['statuses'].update(statuses)
+        results['latencies'].extend(latencies)
+
+
+def run_load_test(base_url, path, clients, duration, use_etag=True, warmup=0):
+    """
+    Run `clients` concurrent pollers against base_url + path for `duration` seconds
+
+    Args:
+        warmup (float): Seconds of unmeasured traffic first (fills pools and caches)
+
+    Returns:
+        dict: requests, requests_per_second, statuses, latency stats in ms
+    """
+    url = base_url.rstrip('/') + path
+
+    if warmup > 0:
+        _run_clients(url, clients, warmup, use_etag)
+
+    results, elapsed = _run_clients(url, clients, duration, use_etag)
+    latencies = sorted(results['latencies'])
+    total = len(latencies)
+
+    return {
+        'url': url,
+        'clients': clients,
+        'elapsed': elapsed,
+        'requests': total,
+        'requests_per_second': total / elapsed if elapsed > 0 else 0,
+        'statuses': dict(results['statuses']),
+        'mean_latency_ms': (sum(latencies) / total * 1000) if total else 0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p90_ms': percentile(latencies, 90) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': (latencies[-1] * 1000) if total else 0
+    }
+
+
+def _run_clients(url, clients, duration, use_etag):
+    """Run the client threads and return (results, elapsed seconds)"""
+    results = {'statuses': Counter(), 'latencies': []}
+    lock = threading.Lock()
+
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+
+    threads = [
+        threading.Thread(target=run_client, args=(url, deadline, use_etag, results, lock), daemon=True)
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results, time.perf_counter() - started
+
+
+def print_report(report):
+    """Print load test results"""
+    print("\n📊 LOAD TEST RESULTS")
+    print("=" * 60)
+    print(f"URL:            {report['url']}")
+    print(f"Clients:        {report['clients']}")
+    print(f"Duration:       {report['elapsed']:.1f}s")
+    print(f"Requests:       {report['requests']}")
+    print(f"Requests/sec:   {report['requests_per_second']:.1f}")
+    print(f"Mean latency:   {report['mean_latency_ms']:.1f} ms")
+    print(f"Latency p50:    {report['p50_ms']:.1f} ms")
+    print(f"Latency p90:    {report['p90_ms']:.1f} ms")
+    print(f"Latency p99:    {report['p99_ms']:.1f} ms")
+    print(f"Latency max:    {report['max_ms']:.1f} ms")
+    print(f"Status codes:   {report['statuses']}")
+    print("=" * 60)
+
+
+def print_comparison(baseline, candidate):
+    """Print two load test results side by side"""
+    rows = [
+        ('Requests/sec', 'requests_per_second'),
+        ('Mean (ms)', 'mean_latency_ms'),
+        ('p50 (ms)', 'p50_ms'),
+        ('p90 (ms)', 'p90_ms'),
+        ('p99 (ms)', 'p99_ms'),
+        ('Max (ms)', 'max_ms')
+    ]
+
+    print("\n📊 LOAD TEST COMPARISON")
+    print("=" * 60)
+    print(f"A: {baseline['url']}")
+    print(f"B: {candidate['url']}")
+    print(f"{baseline['clients']} clients, {baseline['elapsed']:.1f}s each")
+    print("-" * 60)
+    print(f"{'':<14}{'A':>14}{'B':>14}{'B vs A':>14}")
+
+    for label, key in rows:
+        a = baseline[key]
+        b = candidate[key]
+        change = f"{(b - a) / a * 100:+.0f}%" if a else 'n/a'
+        print(f"{label:<14}{a:>14.1f}{b:>14.1f}{change:>14}")
+
+    print("-" * 60)
+    print(f"Status codes A: {baseline['statuses']}")
+    print(f"Status codes B: {candidate['statuses']}")
+    print("=" * 60)
+
+
+def main():
+    """Main load test entry point"""
+    parser = argparse.ArgumentParser(description="Load test the web interface API")
+    parser.add_argument('--url', default='http://localhost:5000', help="Server base URL")
+    parser.add_argument('--path', default='/api/signals/recent?limit=50', help="Endpoint to poll")
+    parser.add_argument('--clients', type=int, default=100, help="Concurrent clients")
+    parser.add_argument('--duration', type=float, default=10.0, help="Test length in seconds")
+    parser.add_argument('--no-etag', action='store_true', help="Don't send If-None-Match")
+    parser.add_argument('--warmup', type=float, default=0, help="Unmeasured seconds before each run")
+    parser.add_argument('--compare', metavar='URL', help="Second server base URL to run the same test against")
+    args = parser.parse_args()
+
+    print("🚀 Wind Catcher & River Turn - API Load Test")
+    print(f"   {args.clients} clients polling {args.path} for {args.duration:.0f}s...")
+
+    report = run_load_test(args.url, args.path, args.clients, args.duration,
+                           use_etag=not args.no_etag, warmup=args.warmup)
+
+    if not args.compare:
+        print_report(report)
+        return
+
+    print(f"   ...then the same against {args.compare}")
+    other = run_load_test(args.compare, args.path, args.clients, args.duration,
+                          use_etag=not args.no_etag, warmup=args.warmup)
+    print_comparison(report, other)
+
+
+if __name__ == '__main__':
+    main()
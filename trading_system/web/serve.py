@@ -0,0 +1,132 @@
+"""
+Production Server for the Wind Catcher & River Turn Web Interface
+Runs web/app.py on a multi-threaded / multi-worker WSGI server instead of
+Flask's development server
+
+Usage:
+    python serve.py                         # waitress (Windows) or gunicorn (Linux/macOS)
+    python serve.py --server waitress --threads 32
+    python serve.py --server gunicorn --workers 4 --threads 8
+    python serve.py --port 8000
+
+Install a server with:
+    pip install waitress        (Windows and everywhere else)
+    pip install gunicorn        (Linux/macOS, enables multiple worker processes)
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path to import utils
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + '/..')
+
+from utils import DATABASE_FILE, load_config
+from db_pool import enable_wal
+
+
+def available_server(preferred):
+    """
+    Pick the WSGI server to run
+
+    Args:
+        preferred (str): 'auto', 'waitress' or 'gunicorn'
+
+    Returns:
+        str: Name of an importable server, or None
+    """
+    candidates = [preferred] if preferred != 'auto' else (
+        ['waitress'] if os.name == 'nt' else ['gunicorn', 'waitress']
+    )
+
+    for name in candidates:
+        try:
+            __import__(name)
+            return name
+        except ImportError:
+            continue
+
+    return None
+
+
+def run_waitress(app, host, port, threads):
+    """Serve with waitress (single process, thread pool)"""
+    from waitress import serve
+
+    # Every open event stream holds a thread, so size the pool for browser tabs + API calls
+    serve(app, host=host, port=port, threads=threads, channel_timeout=120, ident='wind-river')
+
+
+def run_gunicorn(host, port, workers, threads):
+    """Serve with gunicorn (worker processes, each with its own thread pool and DB pools)"""
+    from gunicorn.app.base import BaseApplication
+
+    class WindRiverApplication(BaseApplication):
+        """Embedded gunicorn application loading app.py in every worker"""
+
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            # Threaded workers so open event streams don't block other requests
+            self.cfg.set('worker_class', 'gthread')
+            # Event streams send a heartbeat well inside this
+            self.cfg.set('timeout', 120)
+
+        def load(self):
+            # Imported after fork so each worker has its own pools and watcher thread
+            from app import app
+            return app
+
+    WindRiverApplication().run()
+
+
+def main():
+    """Production server entry point"""
+    web_config = load_config().get('web', {})
+
+    parser = argparse.ArgumentParser(description="Run the web interface on a production WSGI server")
+    parser.add_argument('--server', choices=['auto', 'waitress', 'gunicorn'], default='auto',
+                        help="WSGI server (auto: waitress on Windows, else gunicorn if installed)")
+    parser.add_argument('--host', default=web_config.get('host', '0.0.0.0'), help="Bind address")
+    parser.add_argument('--port', type=int, default=web_config.get('port', 5000), help="Port")
+    parser.add_argument('--workers', type=int, default=web_config.get('workers', 2),
+                        help="Worker processes (gunicorn only)")
+    parser.add_argument('--threads', type=int, default=web_config.get('threads', 16),
+                        help="Threads per worker")
+    args = parser.parse_args()
+
+    server = available_server(args.server)
+    if server is None:
+        print("❌ No production WSGI server installed")
+        print("   Install with: pip install waitress")
+        return 1
+
+    print("🚀 Wind Catcher & River Turn - Web Interface (production)")
+    print("="*60)
+    print(f"Database: {DATABASE_FILE}")
+
+    # Readers never block the collectors/detector (and vice versa) in WAL mode
+    try:
+        print(f"Journal mode: {enable_wal(DATABASE_FILE)}")
+    except Exception as e:
+        print(f"⚠️ Could not enable WAL: {e}")
+
+    if server == 'gunicorn':
+        print(f"Server: gunicorn ({args.workers} workers x {args.threads} threads)")
+    else:
+        print(f"Server: waitress ({args.threads} threads)")
+    print(f"Open browser to: http://localhost:{args.port}")
+    print("="*60)
+
+    if server == 'gunicorn':
+        run_gunicorn(args.host, args.port, args.workers, args.threads)
+    else:
+        from app import app
+        run_waitress(app, args.host, args.port, args.threads)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
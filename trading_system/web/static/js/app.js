@@ -11,17 +11,7 @@ async function updateSystemStatus() {
         const response = await fetch('/api/system/status');
         const data = await response.json();
 
-        if (data.error) {
-            console.error('Error fetching system status:', data.error);
-            setSystemStatus('error', 'Error');
-            return;
-        }
-
-        // Update status indicator
-        setSystemStatus('ok', 'System Active');
-
-        // Could add more detailed status info here if needed
-        console.log('System status:', data);
+        renderSystemStatus(data);
 
     } catch (error) {
         console.error('Failed to fetch system status:', error);
@@ -29,6 +19,81 @@ async function updateSystemStatus() {
     }
 }
 
+/**
+ * Render system status (from the API or the event stream)
+ */
+function renderSystemStatus(data) {
+    if (data.error) {
+        console.error('Error fetching system status:', data.error);
+        setSystemStatus('error', 'Error');
+        return;
+    }
+
+    // Update status indicator
+    setSystemStatus('ok', 'System Active');
+
+    // Could add more detailed status info here if needed
+    console.log('System status:', data);
+}
+
+/**
+ * Open the Server-Sent Events stream that replaces the polling timers
+ * Falls back to polling if the browser or server can't stream
+ */
+let statusPollingStarted = false;
+
+function initEventStream() {
+    if (!window.EventSource) {
+        startPollingFallback();
+        return;
+    }
+
+    const source = new EventSource('/api/stream');
+
+    source.addEventListener('signal', (e) => {
+        if (typeof handleSignalEvent === 'function') handleSignalEvent(JSON.parse(e.data));
+    });
+    source.addEventListener('stats', (e) => {
+        if (typeof renderSignalStats === 'function') renderSignalStats(JSON.parse(e.data));
+    });
+    source.addEventListener('watchlists', (e) => {
+        if (typeof renderAllWatchlists === 'function') renderAllWatchlists(JSON.parse(e.data));
+    });
+    source.addEventListener('status', (e) => {
+        renderSystemStatus(JSON.parse(e.data));
+    });
+
+    source.onopen = () => {
+        // Catch up on anything missed while disconnected (304 if nothing changed)
+        if (typeof loadSignals === 'function') loadSignals();
+        setSystemStatus('ok', 'System Active');
+    };
+
+    source.onerror = () => {
+        // EventSource reconnects on its own unless the stream was closed for good
+        if (source.readyState === EventSource.CLOSED) {
+            console.warn('Event stream closed - falling back to polling');
+            startPollingFallback();
+        } else {
+            setSystemStatus('warning', 'Reconnecting');
+        }
+    };
+}
+
+/**
+ * Poll every endpoint on timers (pre-streaming behaviour)
+ */
+function startPollingFallback() {
+    if (typeof startSignalPolling === 'function') startSignalPolling();
+    if (typeof startWatchlistPolling === 'function') startWatchlistPolling();
+
+    if (!statusPollingStarted) {
+        statusPollingStarted = true;
+        // Refresh system status every 5 minutes
+        setInterval(updateSystemStatus, 300000);
+    }
+}
+
 /**
  * Set system status in UI
  */
@@ -86,8 +151,8 @@ async function initApp() {
     // Update system status
     await updateSystemStatus();
 
-    // Refresh system status every 5 minutes
-    setInterval(updateSystemStatus, 300000);
+    // Live updates for signals, stats, watchlists and status
+    initEventStream();
 
     console.log('✅ Application initialized successfully');
 }
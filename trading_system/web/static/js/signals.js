@@ -1,18 +1,25 @@
 /**
  * Signal Feed for Wind Catcher & River Turn
- * Handles real-time signal updates via polling
+ * Handles real-time signal updates via the event stream (polling as fallback)
  */
 
 // Global state
 let latestTimestamp = 0;
+let latestCursor = null;
+let latestSignalId = 0;
 let signalCount = 0;
+let signalPollingStarted = false;
 
 /**
  * Load recent signals from API
+ * Polls with a keyset cursor; unchanged polls are answered 304 by the server
  */
 async function loadSignals() {
     try {
-        const url = `/api/signals/recent?limit=50&since=${latestTimestamp}`;
+        let url = '/api/signals/recent?limit=50';
+        if (latestCursor) {
+            url += `&after=${encodeURIComponent(latestCursor)}`;
+        }
         const response = await fetch(url);
         const data = await response.json();
 
@@ -28,6 +35,8 @@ async function loadSignals() {
             });
 
             latestTimestamp = data.latest_timestamp;
+            latestCursor = data.latest_cursor;
+            latestSignalId = Math.max(latestSignalId, ...data.signals.map(signal => signal.id));
             signalCount += data.signals.length;
 
             // Auto-scroll to bottom to show latest
@@ -40,6 +49,26 @@ async function loadSignals() {
     }
 }
 
+/**
+ * Handle a signal pushed over the event stream
+ */
+function handleSignalEvent(signal) {
+    // Skip signals already shown by the initial load or a catch-up poll
+    if (signal.id <= latestSignalId) {
+        return;
+    }
+
+    appendSignal(signal);
+
+    latestSignalId = signal.id;
+    latestTimestamp = Math.max(latestTimestamp, signal.timestamp);
+    latestCursor = `${latestTimestamp}:${signal.id}`;
+    signalCount += 1;
+
+    const terminal = document.getElementById('signal-terminal');
+    terminal.scrollTop = terminal.scrollHeight;
+}
+
 /**
  * Append a signal to the terminal feed
  */
@@ -111,15 +140,7 @@ async function loadSignalStats() {
             return;
         }
 
-        // Update signal count display
-        const countElement = document.getElementById('signal-count');
-        if (countElement) {
-            const total = data.total_today || 0;
-            const perfect = data.perfect_count || 0;
-            const excellent = data.excellent_count || 0;
-
-            countElement.textContent = `${total} signals today (⭐${perfect} 🌟${excellent})`;
-        }
+        renderSignalStats(data);
 
     } catch (error) {
         console.error('Failed to load stats:', error);
@@ -127,14 +148,25 @@ async function loadSignalStats() {
 }
 
 /**
- * Initialize signal feed
+ * Render signal statistics (from the API or the event stream)
  */
-function initSignals() {
-    console.log('Initializing signal feed...');
+function renderSignalStats(data) {
+    const countElement = document.getElementById('signal-count');
+    if (countElement) {
+        const total = data.total_today || 0;
+        const perfect = data.perfect_count || 0;
+        const excellent = data.excellent_count || 0;
+
+        countElement.textContent = `${total} signals today (⭐${perfect} 🌟${excellent})`;
+    }
+}
 
-    // Load initial signals
-    loadSignals();
-    loadSignalStats();
+/**
+ * Fall back to polling when the event stream is unavailable
+ */
+function startSignalPolling() {
+    if (signalPollingStarted) return;
+    signalPollingStarted = true;
 
     // Poll for new signals every 60 seconds
     setInterval(loadSignals, 60000);
@@ -142,6 +174,20 @@ function initSignals() {
     // Update stats every 5 minutes
     setInterval(loadSignalStats, 300000);
 
+    console.log('Signal feed polling started');
+}
+
+/**
+ * Initialize signal feed
+ * Live updates arrive over the event stream opened in app.js
+ */
+function initSignals() {
+    console.log('Initializing signal feed...');
+
+    // Load initial signals
+    loadSignals();
+    loadSignalStats();
+
     console.log('Signal feed initialized');
 }
 
@@ -7,6 +7,7 @@
 let currentModalTimeframe = null;
 let currentModalDirection = null;
 let draggedItem = null;
+let watchlistPollingStarted = false;
 
 /**
  * Load all watchlists from API and render them
@@ -21,6 +22,18 @@ async function loadWatchlists() {
             return;
         }
 
+        renderAllWatchlists(data);
+
+    } catch (error) {
+        console.error('Failed to load watchlists:', error);
+    }
+}
+
+/**
+ * Render every watchlist (from the API or the event stream)
+ */
+function renderAllWatchlists(data) {
+    try {
         // Render Wind Catcher watchlists
         renderWatchlist('wind', '12h', data.wind_catcher['12h'] || []);
         renderWatchlist('wind', '1h', data.wind_catcher['1h'] || []);
@@ -32,7 +45,7 @@ async function loadWatchlists() {
         renderWatchlist('river', '15m', data.river_turn['15m'] || []);
 
     } catch (error) {
-        console.error('Failed to load watchlists:', error);
+        console.error('Failed to render watchlists:', error);
     }
 }
 
@@ -351,10 +364,18 @@ function initWatchlists() {
     // Set up drag and drop
     setupDragAndDrop();
 
+    console.log('Watchlists initialized');
+}
+
+/**
+ * Fall back to polling when the event stream is unavailable
+ */
+function startWatchlistPolling() {
+    if (watchlistPollingStarted) return;
+    watchlistPollingStarted = true;
+
     // Reload watchlists every 60 seconds
     setInterval(loadWatchlists, 60000);
-
-    console.log('Watchlists initialized');
 }
 
 // Auto-initialize when DOM is ready